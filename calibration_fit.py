@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 서보 캘리브레이션 피팅 (측정한 발 좌표 → 오프셋 / 게인)
+
+명령한 채널 각도와 실제로 측정한 발 좌표 묶음에서 서보별 오프셋과 게인
+(선택: 상부 / 하부 다리 길이)을 비선형 최소제곱으로 추정합니다.
+
+    채널 각도 = 90 + 게인 × (관절 각도 - 90) + 오프셋      (kinematics.joint_to_channel)
+    측정 발 좌표 ≈ FK(관절 각도, 다리 길이)
+
+모든 측정을 한 번에 FK로 계산하고 (벡터화), 야코비안도 파라미터별 섭동을
+배치 차원으로 쌓아 한 번의 FK 호출로 구합니다 (Levenberg-Marquardt).
+
+측정 파일 (CSV, '#' 주석, 머리글 생략 가능):
+    leg,shoulder,upper,lower,x,y,z
+    front_right,90,30,140,0.8,0.1,-14.2        # 채널 각도 (도), 어깨 기준 발 좌표 (cm)
+
+사용법:
+    python calibration_fit.py --plan 12 > measurements.csv   # 측정할 자세 목록 (x, y, z는 비워 둠)
+    python calibration_fit.py measurements.csv                # 피팅 + 잔차 보고
+    python calibration_fit.py measurements.csv --lengths --write   # 다리 길이 포함, 설정 덮어쓰기 파일에 저장
+    python calibration_fit.py --manual                        # 측정값 직접 입력
+    python calibration_fit.py --simulate 40                   # 임의의 오차로 만든 측정값으로 확인
+"""
+
+import argparse
+import collections
+import csv
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+import config
+import config_loader
+import kinematics
+
+FitResult = collections.namedtuple(
+    'FitResult', ['offsets', 'scales', 'geometry', 'errors', 'initial_errors', 'legs', 'counts',
+                  'iterations', 'converged', 'stalled'])
+FitResult.__doc__ = """
+피팅 결과
+
+    offsets, scales: (4, 3) 추정한 캘리브레이션 (측정이 없는 다리는 현재 값)
+    geometry: (어깨 오프셋, 상부 길이, 하부 길이) cm
+    errors: (N,) 피팅 후 측정별 발 위치 오차 (cm)
+    initial_errors: (N,) 현재 설정으로 계산한 발 위치 오차 (cm)
+    legs: (N,) 측정별 다리 인덱스
+    counts: (4,) 다리별 측정 수
+    iterations: 반복 횟수
+    converged: 비용 감소 / 이동량이 허용값 아래로 줄어서 끝남
+    stalled: 감쇠를 한계까지 올려도 비용을 줄이는 이동을 찾지 못해서 끝남 (수렴 아님)
+"""
+
+# 파라미터 배치: 오프셋 12개, 게인 12개, [어깨 오프셋, 상부 길이, 하부 길이]
+_OFFSETS = slice(0, 12)
+_SCALES = slice(12, 24)
+_GEOMETRY = slice(24, 27)
+_PARAM_COUNT = 27
+
+# 사전값 표준편차 (측정으로 정해지지 않는 파라미터를 현재 값 근처에 묶어 둠)
+_PRIOR_SIGMA = np.concatenate([np.full(12, 10.0), np.full(12, 0.1), [1.0, 1.0, 1.0]])
+_PRIOR_WEIGHT = 0.01
+
+# 수치 미분 간격
+_STEP = np.concatenate([np.full(12, 1e-3), np.full(12, 1e-5), [1e-4, 1e-4, 1e-4]])
+
+
+# ============================================================================
+# 측정값
+# ============================================================================
+
+def _parse_row(fields, line):
+    if len(fields) == 4:
+        raise ValueError(f"{line}번째 줄: 측정한 발 좌표 (x, y, z)가 비어 있습니다")
+    if len(fields) != 7:
+        raise ValueError(f"{line}번째 줄: leg, shoulder, upper, lower, x, y, z 일곱 값이 필요합니다")
+    leg = fields[0].strip()
+    if leg not in kinematics.LEG_INDEX:
+        raise ValueError(f"{line}번째 줄: 알 수 없는 다리 '{leg}'")
+    try:
+        values = [float(v) for v in fields[1:]]
+    except ValueError:
+        raise ValueError(f"{line}번째 줄: 숫자가 아닌 값이 있습니다 ({', '.join(fields[1:])})") from None
+    return kinematics.LEG_INDEX[leg], values[:3], values[3:]
+
+
+def parse_measurements(lines):
+    """
+    CSV 줄 → 측정 배열
+
+    Returns:
+        (legs, channels, feet): (N,) 다리 인덱스, (N, 3) 채널 각도, (N, 3) 발 좌표
+    """
+    legs, channels, feet = [], [], []
+    for number, fields in enumerate(csv.reader(lines), 1):
+        if not fields or fields[0].lstrip().startswith('#'):
+            continue
+        if fields[0].strip() == 'leg':
+            continue
+        # 줄 끝 주석 제거
+        fields = [f.split('#')[0] for f in fields]
+        fields = [f for f in fields if f.strip()]
+        leg, channel, foot = _parse_row(fields, number)
+        legs.append(leg)
+        channels.append(channel)
+        feet.append(foot)
+    if not legs:
+        raise ValueError("측정값이 없습니다")
+    return np.array(legs), np.array(channels, dtype=float), np.array(feet, dtype=float)
+
+
+def read_measurements(path):
+    """측정 파일 읽기 (CSV)"""
+    with open(path, encoding='utf-8', newline='') as f:
+        return parse_measurements(f)
+
+
+def plan(count, seed=0):
+    """
+    측정할 자세 목록 (기본 자세 주변의 발 좌표 → 현재 캘리브레이션의 채널 각도)
+
+    다리마다 count개, 관절마다 각도가 고르게 퍼지도록 발 좌표를 흩뜨립니다.
+    어깨 각도는 y / |x|로 정해지므로 x가 0 근처인 자세는 쓰지 않습니다.
+
+    Returns:
+        list: [(다리 이름, (어깨, 상부, 하부) 채널 각도)]
+    """
+    rng = np.random.default_rng(seed)
+    # 범위를 벗어나는 자세를 버리므로 넉넉하게 뽑은 뒤 다리마다 count개씩
+    shape = (count * 8, len(config.LEG_NAMES))
+    feet = np.empty(shape + (3,))
+    feet[..., 0] = rng.choice((-1.0, 1.0), shape) * rng.uniform(1.5, 5.0, shape)
+    feet[..., 1] = np.abs(feet[..., 0]) * rng.uniform(-0.4, 0.4, shape)
+    feet[..., 2] = config.STANDBY_Z + rng.uniform(-2.0, 4.0, shape)
+    angles, reachable = kinematics.inverse_kinematics(feet)
+    channels = kinematics.joint_to_channel(angles)
+    usable = (reachable
+              & ((angles >= config.ANGLE_MIN_LIMIT) & (angles <= config.ANGLE_MAX_LIMIT)).all(axis=-1)
+              & ((channels >= 0) & (channels <= 180)).all(axis=-1))
+    rows = []
+    for i, leg in enumerate(config.LEG_NAMES):
+        for k in np.flatnonzero(usable[:, i])[:count]:
+            rows.append((leg, tuple(np.round(channels[k, i], 1))))
+    return rows
+
+
+# ============================================================================
+# 모델
+# ============================================================================
+
+def _initial_params():
+    offsets, scales = kinematics.calibration_arrays()
+    geometry = [config.IK_SHOULDER_OFFSET, config.UPPER_SEG_LENGTH, config.LOWER_SEG_LENGTH]
+    return np.concatenate([offsets.ravel(), scales.ravel(), geometry])
+
+
+def predict(params, legs, channels):
+    """
+    파라미터 → 예측 발 좌표
+
+    Args:
+        params: (..., 27) 파라미터 (앞쪽 차원은 배치)
+        legs: (N,) 다리 인덱스
+        channels: (N, 3) 채널 각도
+
+    Returns:
+        np.ndarray: (..., N, 3) 발 좌표
+    """
+    params = np.asarray(params, dtype=float)
+    batch = params.shape[:-1]
+    offsets = params[..., _OFFSETS].reshape(batch + (4, 3))[..., legs, :]
+    scales = params[..., _SCALES].reshape(batch + (4, 3))[..., legs, :]
+    joints = 90.0 + (channels - 90.0 - offsets) / scales
+    geometry = tuple(params[..., k, np.newaxis] for k in range(24, 27))
+    x, y, z = kinematics.fk(joints[..., 0], joints[..., 1], joints[..., 2],
+                            kinematics.IS_LEFT[legs], kinematics.IS_REAR[legs], geometry=geometry)
+    return np.stack([x, y, z], axis=-1)
+
+
+def _free_mask(counts, fit_scale, fit_lengths):
+    leg_has_data = np.repeat(counts > 0, 3)
+    free = np.zeros(_PARAM_COUNT, dtype=bool)
+    free[_OFFSETS] = leg_has_data
+    free[_SCALES] = leg_has_data & fit_scale
+    free[25:27] = fit_lengths
+    return free
+
+
+def fit(legs, channels, feet, fit_scale=True, fit_lengths=False, max_iterations=100, tolerance=1e-10):
+    """
+    측정값으로 캘리브레이션 추정 (Levenberg-Marquardt)
+
+    Args:
+        legs, channels, feet: parse_measurements() 결과
+        fit_scale: 게인도 추정 (False면 오프셋만)
+        fit_lengths: 상부 / 하부 다리 길이도 추정
+
+    Returns:
+        FitResult
+    """
+    legs = np.asarray(legs)
+    channels = np.asarray(channels, dtype=float)
+    feet = np.asarray(feet, dtype=float)
+    counts = np.bincount(legs, minlength=len(config.LEG_NAMES))
+
+    initial = _initial_params()
+    free = _free_mask(counts, fit_scale, fit_lengths)
+    free_index = np.flatnonzero(free)
+    if feet.size < free.sum():
+        raise ValueError(f"측정값이 부족합니다 (측정 {len(feet)}개, 추정할 값 {free.sum()}개)")
+
+    prior_scale = _PRIOR_WEIGHT / _PRIOR_SIGMA[free]
+    step = _STEP[free]
+
+    def residuals(batch):
+        # (..., 27) → (..., 3N + 자유 파라미터 수)
+        error = (predict(batch, legs, channels) - feet).reshape(batch.shape[:-1] + (-1,))
+        prior = (batch[..., free] - initial[free]) * prior_scale
+        return np.concatenate([error, prior], axis=-1)
+
+    theta = initial.copy()
+    r = residuals(theta)
+    cost = r @ r
+    damping = 1e-3
+    converged = stalled = False
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        if cost < 1e-20:
+            # 측정과 이미 일치 (줄일 비용이 없으므로 정체가 아니라 수렴)
+            converged = True
+            break
+
+        # 자유 파라미터마다 한 칸씩 섭동한 배치 → 한 번의 FK로 야코비안
+        batch = np.repeat(theta[np.newaxis], len(free_index), axis=0)
+        batch[np.arange(len(free_index)), free_index] += step
+        jacobian = ((residuals(batch) - r) / step[:, np.newaxis]).T
+
+        jtj = jacobian.T @ jacobian
+        gradient = jacobian.T @ r
+        while True:
+            lhs = jtj + damping * np.diag(np.diag(jtj) + 1e-12)
+            delta = np.linalg.solve(lhs, -gradient)
+            candidate = theta.copy()
+            candidate[free_index] += delta
+            if (candidate[_SCALES] > 0.05).all() and (candidate[25:27] > 0).all():
+                r_new = residuals(candidate)
+                cost_new = r_new @ r_new
+                if cost_new < cost:
+                    break
+            damping *= 4.0
+            if damping > 1e12:
+                break
+        if damping > 1e12:
+            stalled = True
+            break
+
+        improvement = cost - cost_new
+        theta, r, cost = candidate, r_new, cost_new
+        damping = max(damping / 3.0, 1e-12)
+        if improvement <= tolerance * max(cost, 1e-12) or np.abs(delta).max() < 1e-9:
+            converged = True
+            break
+
+    def errors(params):
+        return np.linalg.norm(predict(params, legs, channels) - feet, axis=-1)
+
+    return FitResult(
+        offsets=theta[_OFFSETS].reshape(4, 3),
+        scales=theta[_SCALES].reshape(4, 3),
+        geometry=tuple(theta[_GEOMETRY]),
+        errors=errors(theta),
+        initial_errors=errors(initial),
+        legs=legs,
+        counts=counts,
+        iterations=iteration,
+        converged=converged,
+        stalled=stalled)
+
+
+# ============================================================================
+# 보고 / 저장
+# ============================================================================
+
+def _rms(values):
+    return float(np.sqrt(np.mean(np.square(values)))) if len(values) else float('nan')
+
+
+def report(result):
+    """피팅 결과 출력 (잔차, 다리별 오프셋 / 게인)"""
+    print("\n=== 서보 캘리브레이션 피팅 ===")
+    status = ('' if result.converged else
+              ' (정체: 비용을 줄이는 방향을 찾지 못함)' if result.stalled else ' (수렴 안 함)')
+    print(f"  측정 {len(result.errors)}개, 반복 {result.iterations}회{status}")
+    print(f"  발 위치 오차 RMS: {_rms(result.initial_errors):.3f}cm → {_rms(result.errors):.3f}cm "
+          f"(최대 {result.initial_errors.max():.3f} → {result.errors.max():.3f}cm)")
+    current_offsets, _ = kinematics.calibration_arrays()
+    for i, leg in enumerate(config.LEG_NAMES):
+        if not result.counts[i]:
+            print(f"  {leg:12s} 측정 없음 (현재 값 유지)")
+            continue
+        mask = result.legs == i
+        offsets = ', '.join(f"{v:+.2f}" for v in result.offsets[i])
+        scales = ', '.join(f"{v:.3f}" for v in result.scales[i])
+        before = ', '.join(f"{v:+g}" for v in current_offsets[i])
+        print(f"  {leg:12s} 오프셋 [{offsets}] (현재 [{before}]), 게인 [{scales}], "
+              f"RMS {_rms(result.initial_errors[mask]):.3f} → {_rms(result.errors[mask]):.3f}cm "
+              f"({result.counts[i]}개)")
+    _, upper, lower = result.geometry
+    if (upper, lower) != (config.UPPER_SEG_LENGTH, config.LOWER_SEG_LENGTH):
+        print(f"  다리 길이: 상부 {config.UPPER_SEG_LENGTH} → {upper:.3f}cm, "
+              f"하부 {config.LOWER_SEG_LENGTH} → {lower:.3f}cm")
+    worst = np.argsort(result.errors)[::-1][:3]
+    print("  가장 큰 잔차: " + ', '.join(
+        f"#{k + 1} {config.LEG_NAMES[result.legs[k]]} {result.errors[k]:.3f}cm" for k in worst))
+
+
+def override_values(result, lengths=False):
+    """설정 덮어쓰기 파일에 넣을 값 (측정이 있는 다리만)"""
+    offsets = {}
+    scales = {}
+    for i, leg in enumerate(config.LEG_NAMES):
+        if result.counts[i]:
+            offsets[leg] = [round(float(v), 2) for v in result.offsets[i]]
+            scales[leg] = [round(float(v), 4) for v in result.scales[i]]
+    values = {'SERVO_CALIBRATION_OFFSET': offsets, 'SERVO_CALIBRATION_SCALE': scales}
+    if lengths:
+        values['UPPER_SEG_LENGTH'] = round(float(result.geometry[1]), 3)
+        values['LOWER_SEG_LENGTH'] = round(float(result.geometry[2]), 3)
+    return values
+
+
+def write_override(result, path=None, lengths=False):
+    """
+    피팅 결과를 설정 덮어쓰기 파일 (JSON)에 저장
+
+    기존 내용은 유지하고 캘리브레이션 값만 바꾸며, 저장 전에 전체 설정을 검증합니다.
+    실행 중인 컨트롤러는 config_loader 감시 스레드가 바뀐 파일을 읽어 적용합니다.
+
+    Raises:
+        config_loader.ConfigError: JSON이 아니거나 검증 실패
+    """
+    if path is None:
+        path = config.CONFIG_OVERRIDE_FILE
+    if not path or not path.lower().endswith('.json'):
+        raise config_loader.ConfigError([f"캘리브레이션 저장은 JSON 설정 파일만 지원합니다 ({path})"], path)
+
+    data = config_loader.read_file(path) if os.path.exists(path) else {}
+    for name, value in override_values(result, lengths).items():
+        if isinstance(value, dict):
+            merged = dict(data.get(name, {}))
+            merged.update(value)
+            value = merged
+        data[name] = value
+
+    values = config_loader.merge(data)
+    errors = config_loader.validate(values)
+    if errors:
+        raise config_loader.ConfigError(errors, path)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp = tempfile.mkstemp(prefix='.calibration-', suffix='.json', dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(temp, path)
+    return path
+
+
+# ============================================================================
+# 확인용 측정값
+# ============================================================================
+
+def simulate(count, noise=0.05, seed=1, lengths=False):
+    """
+    임의의 캘리브레이션 오차를 넣은 로봇에서 측정한 것처럼 만든 측정값
+
+    Args:
+        noise: 측정 오차 표준편차 (cm)
+        lengths: 다리 길이 오차도 넣음
+
+    Returns:
+        (legs, channels, feet, true_params)
+    """
+    rng = np.random.default_rng(seed)
+    true = _initial_params()
+    true[_OFFSETS] += rng.normal(0.0, 3.0, 12)
+    true[_SCALES] *= rng.uniform(0.93, 1.07, 12)
+    if lengths:
+        true[25:27] += rng.normal(0.0, 0.2, 2)
+
+    rows = plan(count, seed=seed)
+    legs = np.array([kinematics.LEG_INDEX[leg] for leg, _ in rows])
+    channels = np.array([angles for _, angles in rows], dtype=float)
+    feet = predict(true, legs, channels) + rng.normal(0.0, noise, (len(rows), 3))
+    return legs, channels, feet, true
+
+
+def _read_manual():
+    print("측정값 입력: 다리,어깨,상부,하부,x,y,z (채널 각도, 발 좌표 cm). 빈 줄로 끝냅니다.")
+    lines = []
+    while True:
+        try:
+            line = input('> ').strip()
+        except EOFError:
+            break
+        if not line:
+            break
+        lines.append(line.replace(' ', ','))
+    return parse_measurements(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='측정한 발 좌표로 서보 오프셋 / 게인 추정')
+    parser.add_argument('measurements', nargs='?', help='측정 CSV 파일')
+    parser.add_argument('--manual', action='store_true', help='측정값 직접 입력')
+    parser.add_argument('--plan', type=int, metavar='N', help='다리마다 N개 측정 자세 목록 출력')
+    parser.add_argument('--simulate', type=int, metavar='N', help='임의의 오차를 넣은 측정값으로 확인')
+    parser.add_argument('--no-scale', action='store_true', help='게인은 추정하지 않음 (오프셋만)')
+    parser.add_argument('--lengths', action='store_true', help='상부 / 하부 다리 길이도 추정')
+    parser.add_argument('--write', nargs='?', const='', metavar='PATH',
+                        help=f'결과를 설정 덮어쓰기 파일에 저장 (기본 {config.CONFIG_OVERRIDE_FILE})')
+    args = parser.parse_args()
+
+    if args.plan:
+        print("leg,shoulder,upper,lower,x,y,z")
+        for leg, angles in plan(args.plan):
+            print(f"{leg},{angles[0]},{angles[1]},{angles[2]},,,")
+        return 0
+
+    true = None
+    try:
+        if args.simulate:
+            legs, channels, feet, true = simulate(args.simulate, lengths=args.lengths)
+        elif args.manual:
+            legs, channels, feet = _read_manual()
+        elif args.measurements:
+            legs, channels, feet = read_measurements(args.measurements)
+        else:
+            parser.print_usage()
+            return 2
+        result = fit(legs, channels, feet, fit_scale=not args.no_scale, fit_lengths=args.lengths)
+    except (OSError, ValueError) as e:
+        print(f"✗ {e}")
+        return 1
+
+    report(result)
+    if true is not None:
+        offset_error = np.abs(result.offsets.ravel() - true[_OFFSETS]).max()
+        scale_error = np.abs(result.scales.ravel() - true[_SCALES]).max()
+        print(f"  (확인) 실제 값과 차이: 오프셋 최대 {offset_error:.3f}°, 게인 최대 {scale_error:.4f}")
+
+    if args.write is not None:
+        try:
+            path = write_override(result, args.write or None, lengths=args.lengths)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"✗ 저장 실패: {e}")
+            return 1
+        print(f"✓ {path}에 저장했습니다 (실행 중인 컨트롤러는 다음 동작부터 적용)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
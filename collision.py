@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 자기 간섭 검사 (다리 ↔ 다리, 다리 ↔ 몸체)
+
+다리의 상부 / 하부 관절을 캡슐 (선분 + 반지름)로, 몸체를 상자로 모델링하고
+궤적 전체의 최소 간격을 NumPy로 한 번에 계산합니다.
+한 프레임 검사도 같은 함수로 처리되므로 프레임마다 온라인 가드로 쓸 수 있습니다.
+
+좌표계 (몸체 중앙 기준, stability.hip_positions()와 같음):
+    X: 앞(+) / 뒤(-)
+    Y: 오른쪽(+) / 왼쪽(-)
+    Z: 위(+) / 아래(-)  (어깨 회전축 높이 = 0)
+
+캡슐:
+    상부: 어깨 회전축 → 무릎 (config.COLLISION_UPPER_RADIUS)
+    하부: 무릎 → 발 (config.COLLISION_LOWER_RADIUS)
+무릎 / 발 좌표는 kinematics.joint_positions() (fk와 같은 모델)로 계산합니다.
+
+배열 형태:
+    angles: (T, 4, 3) 또는 (4, 3) 관절 각도 (도, 캘리브레이션 오프셋 미적용)
+"""
+
+import itertools
+
+import numpy as np
+import config
+import kinematics
+import stability
+
+_PARTS = ('상부', '하부')
+
+# 세그먼트 번호 = 다리 번호 × 2 + 부위 (0: 상부, 1: 하부)
+_LEG_PAIRS = np.array([(a * 2 + pa, b * 2 + pb)
+                       for a, b in itertools.combinations(range(4), 2)
+                       for pa in range(2) for pb in range(2)])
+
+# 몸체 검사에 쓰는 세그먼트 위 샘플 위치 (상부는 어깨 근처를 제외, 어깨는 몸체에 붙어 있음)
+_BODY_SAMPLES = {0: np.linspace(0.5, 1.0, 4), 1: np.linspace(0.0, 1.0, 7)}
+
+_EPS = 1e-9
+
+
+def _segment_name(index):
+    return f"{config.LEG_NAMES[index // 2]} {_PARTS[index % 2]}"
+
+
+def _radii():
+    return np.tile([config.COLLISION_UPPER_RADIUS, config.COLLISION_LOWER_RADIUS], 4)
+
+
+def segments(angles):
+    """
+    관절 각도 → 세그먼트 양 끝 좌표 (몸체 기준)
+
+    Returns:
+        (starts, ends): 각각 (T, 8, 3), 세그먼트 순서는 다리별 [상부, 하부]
+    """
+    hips = stability.hip_positions()
+    knees, feet = kinematics.joint_positions(angles)
+    knees = knees + hips
+    feet = feet + hips
+    hips = np.broadcast_to(hips, knees.shape)
+    starts = np.stack([hips, knees], axis=-2).reshape(knees.shape[:-2] + (8, 3))
+    ends = np.stack([knees, feet], axis=-2).reshape(knees.shape[:-2] + (8, 3))
+    return starts, ends
+
+
+def segment_distance(p1, q1, p2, q2):
+    """
+    선분 p1-q1 과 p2-q2 사이 최단 거리 (원소별, 브로드캐스팅 지원)
+
+    Args:
+        p1, q1, p2, q2: (..., 3) 선분 양 끝
+
+    Returns:
+        np.ndarray: (...) 거리
+    """
+    d1 = q1 - p1
+    d2 = q2 - p2
+    r = p1 - p2
+    a = np.einsum('...i,...i->...', d1, d1)
+    e = np.einsum('...i,...i->...', d2, d2)
+    f = np.einsum('...i,...i->...', d2, r)
+    c = np.einsum('...i,...i->...', d1, r)
+    b = np.einsum('...i,...i->...', d1, d2)
+    safe_a = np.maximum(a, _EPS)
+    safe_e = np.maximum(e, _EPS)
+
+    # 두 무한 직선의 최근접점 → 선분 범위로 제한 (평행하면 s = 0)
+    denom = a * e - b * b
+    s = np.where(denom > _EPS, np.clip((b * f - c * e) / np.maximum(denom, _EPS), 0.0, 1.0), 0.0)
+    t = (b * s + f) / safe_e
+
+    # t가 범위를 벗어나면 t를 고정하고 s를 다시 계산
+    s = np.where(t < 0.0, np.clip(-c / safe_a, 0.0, 1.0), s)
+    s = np.where(t > 1.0, np.clip((b - c) / safe_a, 0.0, 1.0), s)
+    t = np.clip(t, 0.0, 1.0)
+
+    closest = (p1 + d1 * s[..., np.newaxis]) - (p2 + d2 * t[..., np.newaxis])
+    return np.linalg.norm(closest, axis=-1)
+
+
+def _body_box():
+    """몸체 상자 (중심, 반 크기)"""
+    low = np.array([-config.BODY_LENGTH / 2.0, -config.COLLISION_BODY_HALF_WIDTH,
+                    config.COLLISION_BODY_BOTTOM])
+    high = np.array([config.BODY_LENGTH / 2.0, config.COLLISION_BODY_HALF_WIDTH,
+                     config.COLLISION_BODY_TOP])
+    return (low + high) / 2.0, (high - low) / 2.0
+
+
+def _box_distance(points, center, half):
+    """점 → 상자 부호 거리 (안쪽이면 음수)"""
+    q = np.abs(points - center) - half
+    outside = np.linalg.norm(np.maximum(q, 0.0), axis=-1)
+    inside = np.minimum(q.max(axis=-1), 0.0)
+    return outside + inside
+
+
+# ============================================================================
+# 검사
+# ============================================================================
+
+def clearances(angles):
+    """
+    모든 캡슐 쌍 / 몸체의 간격 (캡슐 표면 사이 거리, cm)
+
+    Args:
+        angles: (T, 4, 3) 또는 (4, 3) 관절 각도
+
+    Returns:
+        (leg_clearance, body_clearance):
+            leg_clearance: (T, 24) 다른 다리 세그먼트 쌍 간격 (_LEG_PAIRS 순서)
+            body_clearance: (T, 8) 세그먼트별 몸체 간격
+    """
+    angles = np.asarray(angles, dtype=float)
+    if angles.ndim == 2:
+        angles = angles[np.newaxis]
+    starts, ends = segments(angles)
+    radii = _radii()
+
+    a, b = _LEG_PAIRS[:, 0], _LEG_PAIRS[:, 1]
+    leg_clearance = (segment_distance(starts[:, a], ends[:, a], starts[:, b], ends[:, b])
+                     - radii[a] - radii[b])
+
+    center, half = _body_box()
+    body_clearance = np.empty(angles.shape[:1] + (8,))
+    for part, samples in _BODY_SAMPLES.items():
+        p = starts[:, part::2, np.newaxis]
+        q = ends[:, part::2, np.newaxis]
+        points = p + (q - p) * samples[:, np.newaxis]            # (T, 4, M, 3)
+        body_clearance[:, part::2] = (_box_distance(points, center, half).min(axis=-1)
+                                      - radii[part])
+    return leg_clearance, body_clearance
+
+
+def check_trajectory(angles, min_clearance=None):
+    """
+    궤적 전체의 자기 간섭 검사
+
+    Args:
+        angles: (T, 4, 3) 관절 각도
+        min_clearance: 요구 간격 (cm), None이면 config.COLLISION_MIN_CLEARANCE
+
+    Returns:
+        dict:
+            'clearance': (T,) 프레임별 최소 간격
+            'colliding': (T,) 간격이 부족한 프레임
+            'min_clearance': 궤적 중 최소 간격
+            'worst_index': 최소 간격이 나온 프레임 인덱스
+            'worst_pair': 최소 간격 세그먼트 쌍 이름
+            'clear': 모든 프레임이 요구 간격을 만족하는지
+    """
+    if min_clearance is None:
+        min_clearance = config.COLLISION_MIN_CLEARANCE
+
+    leg_clearance, body_clearance = clearances(angles)
+    combined = np.concatenate([leg_clearance, body_clearance], axis=1)
+    clearance = combined.min(axis=1)
+    colliding = clearance < min_clearance
+
+    worst = int(np.argmin(clearance))
+    column = int(np.argmin(combined[worst]))
+    if column < len(_LEG_PAIRS):
+        a, b = _LEG_PAIRS[column]
+        pair = f"{_segment_name(a)} ↔ {_segment_name(b)}"
+    else:
+        pair = f"{_segment_name(column - len(_LEG_PAIRS))} ↔ 몸체"
+
+    return {
+        'clearance': clearance,
+        'colliding': colliding,
+        'min_clearance': float(clearance[worst]),
+        'worst_index': worst,
+        'worst_pair': pair,
+        'clear': not bool(colliding.any()),
+    }
+
+
+def check_pose(angles, min_clearance=None):
+    """
+    단일 자세 검사 (동작 중 실시간 가드용)
+
+    Args:
+        angles: (4, 3) 관절 각도
+
+    Returns:
+        (clear, clearance, pair): 간섭 없음 여부, 최소 간격 (cm), 가장 가까운 쌍 이름
+    """
+    result = check_trajectory(angles, min_clearance)
+    return result['clear'], result['min_clearance'], result['worst_pair']
+
+
+def preflight_check(angles, min_clearance=None, name="궤적"):
+    """
+    재생 전 자기 간섭 사전 검사 (결과 출력)
+
+    Returns:
+        bool: 모든 프레임에 간섭이 없으면 True
+    """
+    result = check_trajectory(angles, min_clearance)
+    frames = len(result['clearance'])
+    if result['clear']:
+        if config.VERBOSE_LOGGING:
+            print(f"✓ {name} 간섭 검사 통과 ({frames} 프레임, 최소 간격 {result['min_clearance']:.2f}cm)")
+    else:
+        print(f"⚠ {name} 간섭 프레임 {int(result['colliding'].sum())}/{frames}개 "
+              f"({result['worst_pair']}, 최소 간격 {result['min_clearance']:.2f}cm "
+              f"@ 프레임 {result['worst_index']})")
+    return result['clear']
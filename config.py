@@ -18,6 +18,26 @@ SERVO_FREQUENCY = 50  # Hz
 SERVO_MIN_TICK = 150  # 0도에 해당하는 PWM 값
 SERVO_MAX_TICK = 600  # 180도에 해당하는 PWM 값
 
+# PWM 위상 분산 (채널별 펄스 시작 틱 오프셋, 0-4095)
+# 'auto': 사용 채널의 펄스 시작을 4096틱 주기에 고르게 분산 (돌입 전류 분산)
+# 'none': 모든 채널이 틱 0에서 시작 (기존 동작)
+# 직접 지정: {채널: 오프셋 틱, ...}
+PWM_PHASE_OFFSETS = 'auto'
+
+# PWM 주기 정렬 프레임 전송
+# True: 모든 채널이 같은 PWM 주기에 새 펄스를 받도록 전송 시점을 맞춤
+#       (채널 간 시간차와 명령 → 구동 지연이 일정해짐, 대신 최대 한 주기 대기)
+FRAME_ALIGNMENT = False
+PCA9685_OSCILLATOR_HZ = 25000000  # PCA9685 내부 오실레이터 (개체마다 약간 다름)
+I2C_BUS_SPEED_HZ = 100000         # I2C 버스 속도 (쓰기 시간 예측 초기값)
+
+# 비동기 I2C 전송 (전송 스레드가 버스를 전담, 밀린 프레임은 최신 값만 전송)
+I2C_ASYNC_WRITER = True
+I2C_RETRY_LIMIT = 3               # 일시적 오류 재시도 횟수 (모두 실패하면 PCA9685 재초기화)
+I2C_RETRY_BACKOFF = 0.002         # 첫 재시도 대기 (초), 재시도마다 2배
+I2C_RETRY_BACKOFF_MAX = 0.02      # 재시도 대기 최대값 (초)
+I2C_REINIT_LIMIT = 3              # 재초기화 후에도 연속 실패하면 복구를 포기하고 비상 정지
+
 # PCA9685 채널 맵핑
 # 각 다리: [어깨(좌우), 상부관절(상하), 하부관절(상하)]
 CHANNELS = {
@@ -27,6 +47,37 @@ CHANNELS = {
     'rear_right':  [2, 1, 0]       # 모터 10, 11, 12
 }
 
+# 배열 기반 계산에서 사용하는 다리 순서 (인덱스 0-3)
+LEG_NAMES = ('front_right', 'rear_right', 'front_left', 'rear_left')
+
+# ============================================================================
+# IK (Inverse Kinematics) 설정
+# ============================================================================
+UPPER_SEG_LENGTH = 11.0  # 상부 관절 길이 (cm)
+LOWER_SEG_LENGTH = 13.5  # 하부 관절 길이 (cm)
+IK_SHOULDER_OFFSET = 0.0  # 어깨 오프셋 (cm) - 오프셋 없음
+
+# ============================================================================
+# 좌표 기반 자세 설정 (어깨 회전축 기준, cm)
+# ============================================================================
+# 엎드린 자세 좌표
+LIE_X = 2.35
+LIE_Y = 0.0
+LIE_Z = -8.4
+
+# 걷기/회전 기본 자세 좌표
+STANDBY_X = 0.82   # 걷기 시 앞뒤 중립 위치
+STANDBY_Y = 0.0    # 걷기 시 좌우 중립 위치
+STANDBY_Z = -14.18  # 걷기 시 높이
+
+# 걷기 좌표 (walk_forward)
+WALK_PUSH_COORD = (-0.85, 0, -15.84)  # 다리 들기 (뒤쪽으로 밀기)
+WALK_LIFT_COORD = (2.63, 0, -14.81)   # 앞으로 뻗기
+
+# 동작 공통 파라미터
+TURN_LIFT_HEIGHT = 2.0   # 회전 시 다리 들어올리는 높이
+TILT_HEIGHT = 4.0        # 기울이기 높이 차이
+
 # ============================================================================
 # 각도 설정 (자세별)
 # ============================================================================
@@ -87,6 +138,14 @@ DEFAULT_WALK_STEP_DURATION = 0.3
 # 팁: 값이 클수록 더 부드럽게 움직이지만 처리 시간이 늘어납니다.
 DEFAULT_INTERPOLATION_STEPS = 20
 
+# 제어 주기 (Hz) - 스플라인 궤적을 샘플링/재생하는 속도
+# 팁: 서보 PWM 주파수(50Hz)보다 높여도 실제 반영은 PWM 주기 단위입니다.
+CONTROL_RATE = 50
+
+# 발 궤적 스플라인 종류
+# 'cubic': 3차 (속도 연속), 'quintic': 5차 (속도/가속도 연속)
+TRAJECTORY_SPLINE = 'cubic'
+
 # ============================================================================
 # 보행 설정
 # ============================================================================
@@ -98,6 +157,69 @@ DEFAULT_WALK_STEPS = 4
 # [다리 들기 시간 비율, 다리 내리기 시간 비율]
 WALK_PHASE_RATIO = [0.5, 0.5]
 
+# 연속 보행 (standby 복귀 없이 보행 전환 / 곡선 보행)
+GAIT_CYCLE_PERIOD = 0.6     # 한 사이클 시간 (두 대각선 쌍이 모두 한 번씩 스윙, 초)
+GAIT_DUTY_FACTOR = 0.5      # 한 사이클 중 발이 땅에 닿아 있는 비율
+GAIT_SWING_HEIGHT = 2.0     # 스윙 시 발 들어올리는 높이 (cm)
+GAIT_MAX_STEP_LENGTH = 4.0  # 최대 보폭 (cm) - 초과하면 속도를 줄여서 맞춤
+GAIT_BLEND_TIME = 0.3       # 보행 전환 시 블렌딩 시간 (초)
+
+# 크롤 보행 (trajectory.GAITS['crawl'], 한 번에 한 다리씩 - 경사 / 짐을 실었을 때)
+# 다리를 들기 전에 무게중심을 나머지 세 발의 지지 삼각형 안쪽으로 옮깁니다.
+CRAWL_LEG_ORDER = ('rear_left', 'front_left', 'rear_right', 'front_right')
+CRAWL_Z = -17.0              # 크롤 중 발 높이 (STANDBY_Z보다 낮게 두면 다리를 더 펴서 발 X 범위가 넓어짐)
+CRAWL_SWING_HEIGHT = 2.0     # 스윙 시 발 들어올리는 높이 (cm)
+CRAWL_STABILITY_MARGIN = 1.0 # 지지 삼각형 변에서 무게중심까지 최소 거리 (cm)
+CRAWL_LATERAL_WEIGHT = 3.0   # 몸체 옆 이동 비용 (앞뒤 이동 대비, 발 Y 이동은 어깨 각도를 크게 바꿈)
+CRAWL_MAX_SHOULDER_SWING = 40.0  # 어깨 회전 한계 (도, 90도 기준) - 안쪽 약 50도부터 몸체와 간섭
+
+# ============================================================================
+# 카메라 인식 → 동작 설정 (perception.py)
+# ============================================================================
+
+# 프레임 입력: 'camera', 'video', 'synthetic'
+PERCEPTION_SOURCE = 'camera'
+PERCEPTION_CAMERA = 0                   # 장치 번호 또는 GStreamer/RTSP 캡처 문자열
+PERCEPTION_VIDEO = 'test.mp4'           # 'video' 입력 파일
+
+# 검출기: 'yolo' (ultralytics), 'marker' (밝은 영역, 테스트용)
+PERCEPTION_DETECTOR = 'yolo'
+PERCEPTION_MODEL = 'yolov8n.pt'
+PERCEPTION_TARGET_LABELS = ('person',)  # 추적할 라벨 (비어 있으면 모든 라벨)
+PERCEPTION_MIN_CONFIDENCE = 0.5
+PERCEPTION_WORKERS = 2                  # 검출 워커 스레드 수
+
+# 명령 모드: 'velocity' (목표를 향해 회전/전진), 'body' (제자리에서 몸체 이동)
+PERCEPTION_MODE = 'velocity'
+PERCEPTION_TARGET_AREA = 0.15           # 이 크기(화면 비율)가 될 때까지 다가감
+PERCEPTION_MAX_VX = 4.0                 # 최대 전진 속도 (cm/s)
+PERCEPTION_MAX_YAW_RATE = 20.0          # 최대 회전 속도 (도/초)
+PERCEPTION_MAX_BODY_SHIFT = 2.0         # 'body' 모드 최대 몸체 이동 (cm)
+PERCEPTION_BODY_RATE = 4.0              # 몸체 이동 속도 제한 (cm/s)
+PERCEPTION_BODY_ACCEL = 20.0            # 몸체 이동 가속도 제한 (cm/s²)
+PERCEPTION_BODY_JERK = 200.0            # 몸체 이동 저크 제한 (cm/s³)
+PERCEPTION_VELOCITY_DEADBAND = 0.5      # 이보다 작은 속도 변화는 보행 전환하지 않음
+
+# 캡처 후 이 시간(초)이 지난 명령은 버리고 정지 (인식이 멈췄을 때)
+PERCEPTION_COMMAND_TIMEOUT = 0.5
+
+# ============================================================================
+# 실시간 제어 프로세스 설정 (rt_control.py)
+# ============================================================================
+
+# 프레임 전송 루프를 별도 프로세스에서 실행 (PCA9685는 그 프로세스가 전담)
+# 메인 프로세스는 공유 메모리 링에 프레임을 예정 시각과 함께 넣기만 합니다.
+# 사용하면 I2C_ASYNC_WRITER / FRAME_ALIGNMENT는 적용되지 않습니다.
+# 벤치마크: python rt_control.py --duration 10 --load
+RT_CONTROL_ENABLED = False
+RT_CPU = 3                  # 고정할 CPU 번호 (None이면 고정 안 함, 팁: isolcpus=3으로 비워 두기)
+RT_PRIORITY = 80            # SCHED_FIFO 우선순위 (1-99, 권한이 없으면 일반 스케줄링, 0 = 사용 안 함)
+RT_LOCK_MEMORY = True       # mlockall()로 메모리 잠금 (권한이 없으면 건너뜀)
+RT_LEAD_TIME = 0.04         # 재생 시 프레임을 미리 넣어 두는 시간 (초) - 메인 프로세스 지연 흡수
+RT_SPIN_TIME = 0.0005       # 예정 시각 직전 바쁜 대기 구간 (초)
+RT_POLL_INTERVAL = 0.001    # 새 프레임 확인 주기 (초)
+RT_RING_SIZE = 64           # 공유 프레임 링 슬롯 수
+
 # ============================================================================
 # 안전 설정
 # ============================================================================
@@ -109,6 +231,103 @@ ANGLE_MAX_LIMIT = 160
 # 비상 정지 시 자세 (lie_down 사용)
 EMERGENCY_POSE = 'lie_down'
 
+# 비상 정지 동작
+# 'pose': EMERGENCY_POSE까지 관절 속도를 제한해서 이동, 'cut': 모든 PWM 출력 차단
+ESTOP_ACTION = 'pose'
+ESTOP_MAX_JOINT_SPEED = 120.0   # 비상 자세로 이동할 때 최대 관절 속도 (도/초)
+ESTOP_ACK_TIMEOUT = 0.05        # 동작 루프가 응답하지 않으면 트리거 스레드가 직접 실행 (초)
+
+# 비상 정지 트리거 (None이면 사용 안 함)
+ESTOP_SIGNAL = 'SIGUSR1'                # kill -USR1 <pid>
+ESTOP_UDP_HOST = '127.0.0.1'
+ESTOP_UDP_PORT = 9750                   # echo ESTOP | nc -u 127.0.0.1 9750
+ESTOP_TRIGGER_FILE = '/tmp/spot_estop'  # touch /tmp/spot_estop
+
+# 상태 메트릭 HTTP 엔드포인트 (Prometheus 텍스트 형식, None이면 사용 안 함)
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9751                     # curl http://127.0.0.1:9751/metrics
+
+# UDP 텔레메트리 (프레임마다 관절 각도 / PWM 틱 / 발 좌표 / 보행 위상 패킷 전송)
+# 다른 PC로 보내려면 TELEMETRY_HOST를 그 PC의 LAN 주소로 설정하세요.
+TELEMETRY_HOST = '127.0.0.1'
+TELEMETRY_PORT = None                   # 예: 9752, 수신: python telemetry.py --port 9752 --plot
+
+# 제어 루프 워치독
+# 동작 중 하트비트가 예상 시각보다 WATCHDOG_TIMEOUT 이상 늦으면 개입합니다.
+# 'emergency': 비상 정지 (ESTOP_ACTION 실행), 'cut': 모든 PWM 출력 차단, 'count': 기록만
+WATCHDOG_ENABLED = True
+WATCHDOG_TIMEOUT = 0.1          # 하트비트 허용 지연 (초)
+WATCHDOG_ACTION = 'emergency'
+WATCHDOG_COMMAND_TIMEOUT = 0    # 스트리밍 명령이 이 시간 동안 없으면 개입 (초, 0 = 사용 안 함)
+WATCHDOG_BUS_TIMEOUT = 0.02     # 멈춘 스레드가 I2C 버스를 잡고 있을 때 기다리는 최대 시간 (초)
+
+# 서보 대기 전원 관리
+# 몸체가 바닥에 닿아 스스로 지지되는 자세에서 SERVO_IDLE_TIMEOUT 동안 명령이 없으면
+# 선택한 관절의 PWM을 끊습니다 (full-off). 다음 명령 시 마지막 각도로 다시 켭니다.
+SERVO_IDLE_TIMEOUT = 10.0          # 초, 0이면 사용 안 함
+SERVO_IDLE_JOINTS = (0, 1, 2)      # 끌 관절 (0: 어깨, 1: 상부관절, 2: 하부관절)
+SERVO_IDLE_MAX_FOOT_DEPTH = 9.0    # 모든 발이 어깨 아래 이 깊이(cm)보다 얕으면 몸체가 바닥에 닿은 자세
+SERVO_WAKE_TIME = 0.2              # 깨울 때 다리별로 나눠 켜는 총 시간 (돌입 전류 분산, 초)
+SERVO_HOLD_CURRENT = 0.15          # 자세 유지 전류 추정값 (A, 서보 하나, 부하 없음)
+
+# 보행별 에너지 / 서보 부하 추정 (energy.py)
+# 팁: 보행 파라미터를 바꿔 가며 동작별 에너지를 비교해서 배터리 사용 시간을 늘리세요.
+ENERGY_ESTIMATION = True
+ENERGY_PRINT = True                       # 동작이 끝날 때마다 추정값 출력
+SERVO_SUPPLY_VOLTAGE = 6.0                # 서보 전원 전압 (V)
+SERVO_LOAD_CURRENT = (0.05, 0.25, 0.30)   # 네 발 지지 시 관절별 정적 부하 전류 (A, 어깨/상부/하부)
+SERVO_MOVE_CURRENT = 0.6                  # 회전하는 동안 전류 (A)
+SERVO_MAX_SPEED = 430.0                   # 회전 속도 (도/초, MG966R 6V 약 0.14초/60도)
+
+# ============================================================================
+# 몸체 형상 및 안정성 설정
+# ============================================================================
+
+# 어깨 회전축 사이 거리 (cm)
+# 팁: 실제 로봇에서 앞/뒤 어깨축, 좌/우 어깨축 사이를 측정해서 입력하세요.
+BODY_LENGTH = 20.8   # 앞뒤 어깨축 거리
+BODY_WIDTH = 7.8     # 좌우 어깨축 거리
+
+# 무게중심 모델
+# 몸체 무게중심은 몸체 중앙 기준 오프셋 (cm, X=앞+, Y=오른쪽+)
+COM_OFFSET_X = 0.0
+COM_OFFSET_Y = 0.0
+BODY_MASS = 0.9      # 몸체 질량 (kg, 배터리/보드 포함)
+LEG_MASS = 0.15      # 다리 하나 질량 (kg, 서보 포함) - 어깨와 발의 중간에 있다고 가정
+
+# 정적 안정 여유 (cm)
+# 무게중심이 지지 다각형 경계로부터 이 거리 안쪽에 있어야 안정으로 판단합니다.
+STABILITY_MIN_MARGIN = 1.0
+
+# 접지 판단 기준 (cm)
+# 가장 낮은 발보다 이 값 이상 높은 발은 들린 발로 봅니다.
+STABILITY_CONTACT_THRESHOLD = 1.0
+
+# 동작 중 안정성 검사 모드
+# 'off': 검사 안 함, 'warn': 경고만 출력, 'block': 불안정한 자세는 실행하지 않음
+STABILITY_GUARD = 'off'
+
+# ============================================================================
+# 자기 간섭 검사 설정 (collision.py)
+# ============================================================================
+
+# 다리 세그먼트 캡슐 반지름 (cm) - 서보 몸체 / 브래킷 두께 포함
+COLLISION_UPPER_RADIUS = 1.0
+COLLISION_LOWER_RADIUS = 0.8
+
+# 몸체 상자 (어깨 회전축 기준, cm) - 길이는 BODY_LENGTH 사용
+# 팁: 좌우 폭은 양쪽 다리 평면 사이의 몸체 폭의 절반입니다.
+COLLISION_BODY_HALF_WIDTH = 2.5
+COLLISION_BODY_TOP = 4.0
+COLLISION_BODY_BOTTOM = -3.0
+
+# 요구 간격 (cm) - 캡슐 표면 사이 거리가 이보다 작으면 간섭으로 판단
+COLLISION_MIN_CLEARANCE = 0.2
+
+# 간섭 검사 모드
+# 'off': 검사 안 함, 'warn': 경고만 출력, 'block': 간섭하는 궤적/프레임은 실행하지 않음
+COLLISION_GUARD = 'warn'
+
 # ============================================================================
 # 디버그 설정
 # ============================================================================
@@ -132,6 +351,13 @@ SERVO_CALIBRATION_OFFSET = {
     'rear_right': [0, 0, 0],
 }
 
+# 서보별 게인 (필요시 사용, 기본 1.0)
+# 채널 각도 = 90 + 게인 × (관절 각도 - 90) + 오프셋
+# 팁: 직접 맞추기보다 calibration_fit.py로 측정값에서 오프셋과 함께 추정하세요.
+SERVO_CALIBRATION_SCALE = {
+    # 'front_left': [1.0, 1.0, 1.0],   # [어깨, 상부, 하부]
+}
+
 # 서보별 방향 반전 (필요시 사용)
 # True: 각도 반전 (180 - angle), False: 정상
 SERVO_REVERSE = {
@@ -167,40 +393,116 @@ PRESET_POSES = {
     # },
 }
 
+# 좌표로 정의한 자세 (어깨 기준 발 좌표, cm)
+# 값은 네 다리 공통 (x, y, z) 또는 {'front_right': (x, y, z), ...}
+# 이름이 PRESET_POSES와 겹치면 이쪽이 우선합니다.
+# 'lie' / 'standby'는 LIE_* / STANDBY_*에서 만들어지므로 여기에 두지 않습니다.
+COORDINATE_POSES = {
+    # 'crouch': (STANDBY_X, STANDBY_Y, -11.0),
+}
+
+# ============================================================================
+# 자세 전환 설정 (pose_library.py)
+# ============================================================================
+
+# 자세 전환 시 관절 속도 / 가속도 제한
+# 팁: SERVO_MAX_SPEED보다 낮게 두어야 부하가 걸린 상태에서도 명령을 따라갑니다.
+POSE_MAX_JOINT_SPEED = 300.0     # 도/초
+POSE_MAX_JOINT_ACCEL = 4000.0    # 도/초²
+
+# 전환 최소 시간 (초) - 아주 작은 이동도 이 시간 동안 나눠서 보냄
+POSE_MIN_TRANSITION_TIME = 0.1
+
+# ============================================================================
+# 온라인 궤적 설정 (online_trajectory.py)
+# ============================================================================
+
+# 이동 중 목표가 바뀌는 동작 (원격 조종, 카메라 목표)의 관절 제한
+# 새 목표는 현재 속도 / 가속도에서 이어서 따라가므로 점프하지 않습니다.
+ONLINE_MAX_JOINT_SPEED = 300.0   # 도/초
+ONLINE_MAX_JOINT_ACCEL = 4000.0  # 도/초²
+ONLINE_MAX_JOINT_JERK = 60000.0  # 도/초³
+
+# 목표 도달 판정 오차 (도)
+ONLINE_SETTLE_TOLERANCE = 0.01
+
+# ============================================================================
+# 시간 스케일링 설정 (time_scaling.py)
+# ============================================================================
+
+# 보행 속도 한계 계산 기준 관절 제한 (경로 모양은 그대로, 시간 배분만 계산)
+# 시간 최적 궤적은 거의 모든 구간에서 어느 한 관절이 이 값에 닿으므로 실제로 명령되는
+# 최대 속도입니다. 기본값은 SERVO_MAX_SPEED(무부하 430도/초) 바로 아래 -
+# 보행 중 서보가 따라가지 못하면 (발이 끌리거나 스텝이 짧아지면) 낮춥니다.
+TIME_SCALING_MAX_JOINT_SPEED = 400.0     # 도/초
+TIME_SCALING_MAX_JOINT_ACCEL = 20000.0   # 도/초²
+
+# 키프레임 구간 하나를 나누는 경로 샘플 수 (많을수록 정확, 계산은 느려짐)
+# 팁: 제어 주기 한 번에 여러 샘플이 들어가야 가속도 제한이 정확합니다.
+#     샘플 사이에서 제한을 넘는 곳은 전체를 늦춰서 맞추므로 적으면 조금 느려집니다.
+TIME_SCALING_PATH_SAMPLES = 40
+
+# ZMP 안정 여유 제약 (cm, None이면 사용 안 함)
+# 세 발 이상 접지한 구간에서 가속도를 반영한 지지점이 지지 다각형 안쪽으로
+# 이 거리 이상 있도록 속도를 줄입니다 (두 발 지지 구간은 시간 배분으로 고칠 수 없음).
+TIME_SCALING_MIN_MARGIN = None
+
+# ============================================================================
+# 설정 덮어쓰기 파일 (config_loader.py)
+# ============================================================================
+
+# 이 파일의 값을 덮어쓸 설정 파일 (.json / .toml / .yaml, None이면 사용 안 함)
+# 예: {"STANDBY_Z": -15.5, "SERVO_CALIBRATION_OFFSET": {"front_left": [4, 0, 0]}}
+# 딕셔너리 값은 키별로 합쳐지고, 파일에서 지운 설정은 이 파일의 기본값으로 돌아갑니다.
+CONFIG_OVERRIDE_FILE = 'config_override.json'
+
+# 실행 중 파일 변경 확인 주기 (초, 0이면 시작할 때 한 번만 읽음)
+# 바뀐 값은 검증을 통과해야 다음 동작 / 프레임 사이에 적용됩니다.
+# 팁: I2C / 채널 / 실시간 프로세스 설정은 재시작해야 적용됩니다.
+CONFIG_RELOAD_INTERVAL = 1.0
+
+# ============================================================================
+# 시작 캐시 설정 (startup_cache.py)
+# ============================================================================
+
+# 미리 계산한 자세 / 보행 배열 캐시 디렉터리 (None이면 매번 계산)
+# 설정이나 계산 코드가 바뀌면 자동으로 다시 만듭니다.
+STARTUP_CACHE_DIR = '.spot_cache'
+
+# 마지막으로 전송한 관절 각도 저장 파일 (None이면 항상 엎드린 자세에서 시작한다고 가정)
+STARTUP_STATE_FILE = '.spot_cache/last_pose.npy'
+
+# 이보다 오래된 마지막 자세는 믿지 않음 (초, 0이면 제한 없음)
+# 팁: 전원이 꺼진 채로 오래 두면 다리가 처지므로 엎드린 자세로 가정하는 편이 안전합니다.
+STARTUP_POSE_MAX_AGE = 3600.0
+
+# ============================================================================
+# 골든 트레이스 설정 (golden_trace.py)
+# ============================================================================
+
+# 동작별 기준 프레임 / 틱 기록 디렉터리 (상대 경로는 golden_trace.py가 있는 디렉터리 기준)
+GOLDEN_TRACE_DIR = 'golden_traces'
+
+# 기준 기록과 비교할 때 허용 오차
+GOLDEN_ANGLE_TOLERANCE = 1e-6   # 채널 각도 (도)
+GOLDEN_TICK_TOLERANCE = 0       # PWM 틱 (0이면 정확히 같아야 함)
+GOLDEN_TIME_TOLERANCE = 1e-6    # 프레임 시각 (초, 가상 시계)
+
+# IK 퍼징 (작업 공간 임의 좌표 → IK → FK 왕복)
+IK_FUZZ_POINTS = 2000000        # 좌표 수 (벡터화, 백만 개 단위로 나눠 계산)
+IK_FUZZ_TOLERANCE = 1e-6        # 왕복 위치 오차 허용값 (cm)
+# 이보다 |x|가 작은 좌표 (어깨 축 근처, y = |x|·tan)는 따로 세어서 보고 (왕복 검사에는 포함)
+IK_FUZZ_MIN_X = 0.01            # cm
+
 # ============================================================================
 # 설정 검증 함수
 # ============================================================================
 
 def validate_config():
     """설정 값의 유효성을 검증합니다."""
-    errors = []
-    
-    # 각도 범위 검증
-    for pose_name, pose_angles in PRESET_POSES.items():
-        for leg_name, angles in pose_angles.items():
-            for i, angle in enumerate(angles):
-                if not (ANGLE_MIN_LIMIT <= angle <= ANGLE_MAX_LIMIT):
-                    errors.append(
-                        f"{pose_name} 자세의 {leg_name} 다리, "
-                        f"관절 {i}의 각도 {angle}가 범위를 벗어났습니다. "
-                        f"(범위: {ANGLE_MIN_LIMIT}-{ANGLE_MAX_LIMIT})"
-                    )
-    
-    # PWM 범위 검증
-    if SERVO_MIN_TICK >= SERVO_MAX_TICK:
-        errors.append(
-            f"SERVO_MIN_TICK({SERVO_MIN_TICK})이 "
-            f"SERVO_MAX_TICK({SERVO_MAX_TICK})보다 작아야 합니다."
-        )
-    
-    # 채널 검증
-    all_channels = []
-    for leg_channels in CHANNELS.values():
-        all_channels.extend(leg_channels)
-    
-    if len(all_channels) != len(set(all_channels)):
-        errors.append("중복된 PCA9685 채널이 있습니다.")
-    
+    import config_loader
+    errors = config_loader.validate(config_loader.current_values())
+
     if errors:
         print("⚠️  설정 오류 발견:")
         for error in errors:
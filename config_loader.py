@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 설정 덮어쓰기 파일 + 실행 중 설정 교체
+
+config.CONFIG_OVERRIDE_FILE (JSON / TOML / YAML)의 값을 config.py 기본값 위에 합치고,
+전부 검증한 뒤 읽기 전용 스냅샷 (값 + 바뀐 이름)으로 만듭니다.
+감시 스레드는 파일이 바뀌면 새 스냅샷을 준비만 하고, 실제 교체 (config 모듈 값 갱신)는
+제어 스레드가 동작 시작 / 프레임 사이에 apply_pending()으로 처리하므로
+제어 스레드의 한 프레임 안에서는 옛 값과 새 값이 섞이지 않습니다.
+교체는 바뀐 이름마다 config 속성을 하나씩 바꾸는 방식이라, 같은 시각에 config를 읽는
+다른 스레드 (워치독, 서보 전원, I2C 전송, 텔레메트리)는 교체 도중 한 번은 일부만 바뀐
+값을 볼 수 있습니다 (각 스레드는 이름 하나씩 읽으므로 값 하나가 깨지지는 않음).
+
+    {"SERVO_CALIBRATION_OFFSET": {"front_left": [5, 0, 0]}, "STANDBY_Z": -15.5}
+
+- 딕셔너리 값은 기존 값에 키별로 합쳐지고, 파일에서 지운 키는 config.py 기본값으로 돌아갑니다.
+- 검증: 각도 범위, 채널 중복/범위, 좌표 도달 가능성 (IK), PWM 틱 범위, 시간 값, 선택지 값
+  하나라도 실패하면 파일 전체를 적용하지 않고 현재 설정을 유지합니다.
+- 교체 후에는 바뀐 키에 등록된 캐시만 다시 만듭니다 (register()).
+- RESTART_REQUIRED 설정 (I2C, 채널, 실시간 프로세스 등)은 시작할 때만 적용됩니다.
+"""
+
+import collections
+import copy
+import fnmatch
+import json
+import os
+import threading
+import time
+import types
+
+import numpy as np
+import config
+import kinematics
+import pwm_output
+
+Snapshot = collections.namedtuple('Snapshot', ['version', 'source', 'values', 'changed'])
+Snapshot.__doc__ = """
+설정 스냅샷 (읽기 전용)
+
+    values: {이름: 값} (리스트는 튜플, 딕셔너리는 MappingProxyType)
+    changed: 이전 스냅샷과 달라진 이름 (frozenset)
+"""
+
+# 실행 중에는 바꿀 수 없는 설정 (하드웨어 연결, 스레드 / 프로세스 시작 시 읽는 값)
+RESTART_REQUIRED = ('LEG_NAMES', 'CHANNELS', 'I2C_*', 'PCA9685_*', 'SERVO_FREQUENCY',
+                    'FRAME_ALIGNMENT', 'RT_*', 'METRICS_*', 'TELEMETRY_*', 'ESTOP_SIGNAL',
+                    'ESTOP_UDP_*', 'ESTOP_TRIGGER_FILE', 'PERCEPTION_SOURCE', 'PERCEPTION_CAMERA',
+                    'PERCEPTION_VIDEO', 'PERCEPTION_DETECTOR', 'PERCEPTION_MODEL',
+                    'PERCEPTION_WORKERS', 'CONFIG_*', 'STARTUP_*')
+
+# 0 이상이어야 하는 시간 설정 이름 끝
+_TIME_SUFFIXES = ('_TIME', '_DURATION', '_TIMEOUT', '_INTERVAL', '_PERIOD', '_DELAY', '_BACKOFF',
+                  '_BACKOFF_MAX')
+
+# 선택지가 정해진 설정
+_CHOICES = {
+    'TRAJECTORY_SPLINE': ('cubic', 'quintic'),
+    'STABILITY_GUARD': ('off', 'warn', 'block'),
+    'COLLISION_GUARD': ('off', 'warn', 'block'),
+    'ESTOP_ACTION': ('pose', 'cut'),
+    'WATCHDOG_ACTION': ('emergency', 'cut', 'count'),
+    'PERCEPTION_MODE': ('velocity', 'body'),
+}
+
+# 기본값이 정수로 적혀 있어도 실수를 쓸 수 있는 설정 (각도 / 좌표 / 캘리브레이션)
+_REAL_SETTINGS = ('SERVO_CALIBRATION_*', '*_ANGLES', 'PRESET_POSES', 'ANGLE_*_LIMIT', '*_COORD',
+                  'COORDINATE_POSES', 'LIE_*', 'STANDBY_*', '*_HEIGHT', '*_LENGTH')
+
+# 도달 가능해야 하는 좌표 설정 (이름, x, y, z 이름 또는 좌표 튜플 이름)
+_COORDINATE_SETTINGS = (('엎드린 자세', ('LIE_X', 'LIE_Y', 'LIE_Z')),
+                        ('기본 자세', ('STANDBY_X', 'STANDBY_Y', 'STANDBY_Z')),
+                        ('WALK_PUSH_COORD', 'WALK_PUSH_COORD'),
+                        ('WALK_LIFT_COORD', 'WALK_LIFT_COORD'))
+
+# 좌표 / 각도 범위 검사 허용 오차 (도)
+_LIMIT_TOLERANCE = 0.01
+
+_base = None               # config.py 기본값 (덮어쓰기 전)
+_current = None            # 적용된 스냅샷
+_pending = None            # 감시 스레드가 준비한 다음 스냅샷
+_swap_lock = threading.Lock()
+_rebuilders = []           # [(패턴, 함수)]
+_watcher = None
+
+
+class ConfigError(ValueError):
+    """덮어쓰기 파일을 읽을 수 없거나 검증에 실패함"""
+
+    def __init__(self, errors, source=None):
+        self.errors = list(errors)
+        self.source = source
+        super().__init__('\n'.join(self.errors))
+
+
+# ============================================================================
+# 값 수집 / 파일 읽기
+# ============================================================================
+
+def _setting_names(module=config):
+    return [name for name in dir(module) if name.isupper() and not name.startswith('_')]
+
+
+def base_values():
+    """config.py 기본값 (처음 호출할 때 저장, 이후 덮어쓰기와 무관)"""
+    global _base
+    if _base is None:
+        _base = {name: copy.deepcopy(getattr(config, name)) for name in _setting_names()}
+    return _base
+
+
+def _matches(name, patterns):
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def read_file(path):
+    """
+    덮어쓰기 파일 읽기 (확장자로 형식 구분)
+
+    Returns:
+        dict: {설정 이름: 값}
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    elif extension == '.toml':
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ImportError("TOML 설정 파일을 읽으려면 Python 3.11 이상 또는 tomli가 필요합니다 "
+                                  "(pip install tomli)") from None
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
+    elif extension in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML 설정 파일을 읽으려면 PyYAML이 필요합니다 "
+                              "(pip install pyyaml)") from None
+        with open(path, encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+    else:
+        raise ConfigError([f"지원하지 않는 설정 파일 형식: {extension} (.json / .toml / .yaml)"], path)
+
+    if not isinstance(data, dict):
+        raise ConfigError(["설정 파일 최상위는 {이름: 값} 형식이어야 합니다"], path)
+    return data
+
+
+def _coerce(name, value, base, errors, real=False):
+    """
+    파일 값 → 기본값과 같은 형태 (JSON 리스트 → 튜플, 문자열 키 → 정수 키 등)
+
+    real이 True면 기본값이 정수여도 실수를 허용 (각도 / 좌표 설정)
+    """
+    if value is None or base is None:
+        return value
+    if isinstance(base, bool):
+        if not isinstance(value, bool):
+            errors.append(f"{name}: true/false 값이어야 합니다 ({value!r})")
+        return value
+    if isinstance(base, (int, float)):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            errors.append(f"{name}: 숫자여야 합니다 ({value!r})")
+            return value
+        if isinstance(base, int) and not isinstance(value, int) and not real:
+            if not float(value).is_integer():
+                errors.append(f"{name}: 정수여야 합니다 ({value!r})")
+                return value
+            return int(value)
+        return value
+    if isinstance(base, (list, tuple)):
+        if not isinstance(value, (list, tuple)):
+            errors.append(f"{name}: 목록이어야 합니다 ({value!r})")
+            return value
+        if base:
+            value = [_coerce(f"{name}[{i}]", v, base[min(i, len(base) - 1)], errors, real)
+                     for i, v in enumerate(value)]
+        return type(base)(value)
+    if isinstance(base, dict):
+        if not isinstance(value, dict):
+            errors.append(f"{name}: {{키: 값}} 형식이어야 합니다 ({value!r})")
+            return value
+        # 기존 값에 키별로 합침 (JSON 객체 키는 문자열이므로 기본값 키 형식으로 변환)
+        merged = copy.deepcopy(base)
+        sample_key = next(iter(base), None)
+        for key, item in value.items():
+            if isinstance(sample_key, int) and isinstance(key, str) and key.lstrip('-').isdigit():
+                key = int(key)
+            template = base.get(key, base[sample_key] if sample_key is not None else None)
+            merged[key] = _coerce(f"{name}[{key!r}]", item, template, errors, real)
+        return merged
+    # 모드 문자열 설정은 {채널: 값}으로 바꿀 수 있음 (예: PWM_PHASE_OFFSETS)
+    if isinstance(value, dict):
+        return {int(k) if isinstance(k, str) and k.isdigit() else k: v for k, v in value.items()}
+    if isinstance(base, str) and not isinstance(value, str):
+        errors.append(f"{name}: 문자열이어야 합니다 ({value!r})")
+    return value
+
+
+def merge(overrides, base=None):
+    """
+    기본값 + 덮어쓰기 값
+
+    Raises:
+        ConfigError: 모르는 설정 이름이나 형식이 맞지 않는 값
+    """
+    if base is None:
+        base = base_values()
+    errors = []
+    values = copy.deepcopy(base)
+    for name, value in overrides.items():
+        if name not in base:
+            errors.append(f"알 수 없는 설정 '{name}'")
+            continue
+        values[name] = _coerce(name, value, base[name], errors, _matches(name, _REAL_SETTINGS))
+    if errors:
+        raise ConfigError(errors)
+    return values
+
+
+# ============================================================================
+# 검증
+# ============================================================================
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_angles(errors, label, angles, low, high):
+    if not isinstance(angles, (list, tuple)) or len(angles) != 3 or not all(map(_number, angles)):
+        errors.append(f"{label}: [어깨, 상부, 하부] 각도 세 개가 필요합니다 ({angles!r})")
+        return False
+    for joint, angle in enumerate(angles):
+        if not low - _LIMIT_TOLERANCE <= angle <= high + _LIMIT_TOLERANCE:
+            errors.append(f"{label} 관절 {joint}의 각도 {angle}가 범위를 벗어났습니다 "
+                          f"(범위: {low}-{high})")
+    return True
+
+
+def _per_leg_coords(value, legs):
+    if isinstance(value, dict):
+        return [value.get(leg) for leg in legs]
+    return [value] * len(legs)
+
+
+def validate(values):
+    """
+    설정 값 전체 검증
+
+    Args:
+        values: {이름: 값} (merge() 결과 또는 현재 config 값)
+
+    Returns:
+        list: 오류 메시지 (비어 있으면 통과)
+    """
+    errors = []
+    legs = values['LEG_NAMES']
+    low, high = values['ANGLE_MIN_LIMIT'], values['ANGLE_MAX_LIMIT']
+
+    # 각도 범위
+    if not 0 <= low < high <= 180:
+        errors.append(f"ANGLE_MIN_LIMIT({low}) / ANGLE_MAX_LIMIT({high})는 0 ≤ 최소 < 최대 ≤ 180이어야 합니다")
+    for pose_name, pose_angles in values['PRESET_POSES'].items():
+        for leg in legs:
+            if leg not in pose_angles:
+                errors.append(f"{pose_name} 자세에 {leg} 다리 각도가 없습니다")
+                continue
+            _check_angles(errors, f"{pose_name} 자세의 {leg} 다리", pose_angles[leg], low, high)
+    for name in values:
+        if name.startswith(('RIGHT_', 'LEFT_')) and name.endswith('_ANGLES'):
+            _check_angles(errors, name, values[name], 0, 180)
+
+    # 캘리브레이션 오프셋
+    for leg, offsets in values['SERVO_CALIBRATION_OFFSET'].items():
+        if leg not in legs:
+            errors.append(f"SERVO_CALIBRATION_OFFSET: 알 수 없는 다리 '{leg}'")
+        else:
+            _check_angles(errors, f"SERVO_CALIBRATION_OFFSET[{leg}]", offsets, -90, 90)
+    for leg, scales in values['SERVO_CALIBRATION_SCALE'].items():
+        if leg not in legs:
+            errors.append(f"SERVO_CALIBRATION_SCALE: 알 수 없는 다리 '{leg}'")
+        else:
+            _check_angles(errors, f"SERVO_CALIBRATION_SCALE[{leg}]", scales, 0.5, 1.5)
+    if not errors:
+        # 캘리브레이션을 적용한 자세 채널 각도가 서보 범위 (0-180) 안에 있어야 함
+        calibration, scale = kinematics.calibration_arrays(values['SERVO_CALIBRATION_OFFSET'],
+                                                           values['SERVO_CALIBRATION_SCALE'])
+        for pose_name, pose_angles in values['PRESET_POSES'].items():
+            if all(leg in pose_angles for leg in legs):
+                angles = np.array([pose_angles[leg] for leg in legs], dtype=float)
+                channel = kinematics.joint_to_channel(angles, calibration, scale)
+                if ((channel < 0) | (channel > 180)).any():
+                    errors.append(f"{pose_name} 자세에 캘리브레이션을 적용하면 채널 각도가 0-180을 벗어납니다")
+
+    # 채널
+    channels = values['CHANNELS']
+    if set(channels) != set(legs):
+        errors.append(f"CHANNELS의 다리가 LEG_NAMES와 다릅니다 ({sorted(channels)})")
+    all_channels = [ch for leg_channels in channels.values() for ch in leg_channels]
+    if any(not isinstance(ch, int) or not 0 <= ch < 16 for ch in all_channels):
+        errors.append("PCA9685 채널 번호는 0-15 정수여야 합니다")
+    if len(all_channels) != len(set(all_channels)):
+        errors.append("중복된 PCA9685 채널이 있습니다.")
+    if any(len(leg_channels) != 3 for leg_channels in channels.values()):
+        errors.append("CHANNELS: 다리마다 채널 세 개가 필요합니다")
+
+    # PWM
+    if not 0 <= values['SERVO_MIN_TICK'] < values['SERVO_MAX_TICK'] < pwm_output.PWM_PERIOD_TICKS:
+        errors.append(f"SERVO_MIN_TICK({values['SERVO_MIN_TICK']})이 "
+                      f"SERVO_MAX_TICK({values['SERVO_MAX_TICK']})보다 작아야 합니다 (0-4095)")
+    if values['SERVO_FREQUENCY'] <= 0 or values['CONTROL_RATE'] <= 0:
+        errors.append("SERVO_FREQUENCY / CONTROL_RATE는 0보다 커야 합니다")
+
+    # 궤적 제한 (0이면 저크 제한 궤적이 움직이지 못하거나 시간이 무한대)
+    for name in ('ONLINE_MAX_JOINT_SPEED', 'ONLINE_MAX_JOINT_ACCEL', 'ONLINE_MAX_JOINT_JERK',
+                 'PERCEPTION_BODY_RATE', 'PERCEPTION_BODY_ACCEL', 'PERCEPTION_BODY_JERK',
+                 'TIME_SCALING_MAX_JOINT_SPEED', 'TIME_SCALING_MAX_JOINT_ACCEL',
+                 'TIME_SCALING_PATH_SAMPLES'):
+        if values[name] <= 0:
+            errors.append(f"{name}: 0보다 커야 합니다 ({values[name]})")
+
+    # 시간 / 선택지
+    for name, value in values.items():
+        if name.endswith(_TIME_SUFFIXES) and _number(value) and value < 0:
+            errors.append(f"{name}: 시간은 0 이상이어야 합니다 ({value})")
+    for name, choices in _CHOICES.items():
+        if values.get(name) not in choices:
+            errors.append(f"{name}: {', '.join(choices)} 중 하나여야 합니다 ({values.get(name)!r})")
+    if not 0 < values['GAIT_DUTY_FACTOR'] < 1:
+        errors.append(f"GAIT_DUTY_FACTOR는 0과 1 사이여야 합니다 ({values['GAIT_DUTY_FACTOR']})")
+    if sorted(values['CRAWL_LEG_ORDER']) != sorted(legs):
+        errors.append(f"CRAWL_LEG_ORDER는 LEG_NAMES의 다리를 한 번씩 담아야 합니다 "
+                      f"({values['CRAWL_LEG_ORDER']})")
+    if values['CRAWL_STABILITY_MARGIN'] < 0 or values['CRAWL_LATERAL_WEIGHT'] <= 0:
+        errors.append("CRAWL_STABILITY_MARGIN은 0 이상, CRAWL_LATERAL_WEIGHT는 0보다 커야 합니다")
+    if not 0 <= values['CRAWL_MAX_SHOULDER_SWING'] < 90:
+        errors.append(f"CRAWL_MAX_SHOULDER_SWING은 0 이상 90 미만이어야 합니다 "
+                      f"({values['CRAWL_MAX_SHOULDER_SWING']})")
+    if values['EMERGENCY_POSE'] != 'lie_down' and values['EMERGENCY_POSE'] not in values['PRESET_POSES']:
+        errors.append(f"EMERGENCY_POSE: 'lie_down' 또는 PRESET_POSES 이름이어야 합니다 "
+                      f"({values['EMERGENCY_POSE']!r})")
+
+    # 좌표 도달 가능성
+    geometry = (values['IK_SHOULDER_OFFSET'], values['UPPER_SEG_LENGTH'], values['LOWER_SEG_LENGTH'])
+    if geometry[1] <= 0 or geometry[2] <= 0 or geometry[0] < 0:
+        errors.append(f"다리 길이 / 어깨 오프셋이 올바르지 않습니다 {geometry}")
+        return errors
+    coordinates = []
+    for label, names in _COORDINATE_SETTINGS:
+        if isinstance(names, tuple):
+            coordinates.append((label, [tuple(values[n] for n in names)] * len(legs)))
+        else:
+            coordinates.append((label, _per_leg_coords(values[names], legs)))
+    for pose_name, coords in values['COORDINATE_POSES'].items():
+        if pose_name in ('lie', 'standby'):
+            errors.append(f"COORDINATE_POSES: '{pose_name}' 자세는 "
+                          f"{'LIE' if pose_name == 'lie' else 'STANDBY'}_X/Y/Z로 지정합니다")
+            continue
+        coordinates.append((f"{pose_name} 자세", _per_leg_coords(coords, legs)))
+    for label, per_leg in coordinates:
+        if any(c is None or len(c) != 3 or not all(map(_number, c)) for c in per_leg):
+            errors.append(f"{label}: 다리마다 (x, y, z) 좌표가 필요합니다")
+            continue
+        p = np.asarray(per_leg, dtype=float)
+        shoulder, upper, lower, reachable = kinematics.ik(
+            p[:, 0], p[:, 1], p[:, 2], kinematics.IS_LEFT, kinematics.IS_REAR, geometry=geometry)
+        for i in np.flatnonzero(~reachable):
+            errors.append(f"{label}: {legs[i]} 다리 좌표 {tuple(per_leg[i])}에 도달할 수 없습니다")
+        if reachable.all():
+            angles = np.stack([shoulder, upper, lower], axis=-1)
+            out = (angles < low - _LIMIT_TOLERANCE) | (angles > high + _LIMIT_TOLERANCE)
+            for i, joint in zip(*np.nonzero(out)):
+                errors.append(f"{label}: {legs[i]} 다리 관절 {joint} 각도 "
+                              f"{angles[i, joint]:.1f}가 범위를 벗어났습니다 (범위: {low}-{high})")
+    return errors
+
+
+# ============================================================================
+# 스냅샷
+# ============================================================================
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return types.MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value, base):
+    """스냅샷 값 → config 모듈에 넣을 값 (기본값과 같은 리스트 / 튜플 / 딕셔너리 형태)"""
+    if isinstance(value, types.MappingProxyType):
+        sample = next(iter(base.values()), None) if isinstance(base, dict) else None
+        return {k: _thaw(v, base.get(k, sample) if isinstance(base, dict) else None)
+                for k, v in value.items()}
+    if isinstance(value, tuple):
+        item_base = base[0] if isinstance(base, (list, tuple)) and base else None
+        items = [_thaw(v, item_base) for v in value]
+        return list(items) if isinstance(base, list) else tuple(items)
+    return value
+
+
+def compile_snapshot(values, source=None, previous=None):
+    """
+    검증된 설정 값 → 읽기 전용 스냅샷 (바뀐 이름은 previous와 비교)
+
+    Raises:
+        ConfigError: 검증 실패
+    """
+    errors = validate(values)
+    if errors:
+        raise ConfigError(errors, source)
+
+    frozen = {name: _freeze(value) for name, value in values.items()}
+    if previous is None:
+        changed = frozenset(frozen)
+        version = 1
+    else:
+        changed = frozenset(name for name, value in frozen.items()
+                            if previous.values.get(name) != value)
+        version = previous.version + 1
+
+    return Snapshot(version=version, source=source, values=types.MappingProxyType(frozen),
+                    changed=changed)
+
+
+def load(path=None, previous=None):
+    """
+    덮어쓰기 파일 → 스냅샷 (파일이 없으면 config.py 기본값)
+
+    Raises:
+        ConfigError, OSError, ImportError
+    """
+    if path is None:
+        path = config.CONFIG_OVERRIDE_FILE
+    overrides = read_file(path) if path and os.path.exists(path) else {}
+    try:
+        values = merge(overrides)
+    except ConfigError as e:
+        raise ConfigError(e.errors, path) from None
+    return compile_snapshot(values, source=path if overrides else None, previous=previous)
+
+
+# ============================================================================
+# 교체
+# ============================================================================
+
+def register(patterns, rebuild):
+    """
+    설정이 바뀌었을 때 다시 만들 캐시 등록
+
+    Args:
+        patterns: 설정 이름 패턴 목록 (fnmatch, 예: 'STANDBY_*'), None이면 모든 교체
+        rebuild: 인자 없는 함수 (제어 스레드에서 교체 직후 호출)
+    """
+    _rebuilders.append((None if patterns is None else tuple(patterns), rebuild))
+
+
+def current():
+    """적용된 스냅샷 (아직 없으면 None)"""
+    return _current
+
+
+def pending():
+    return _pending
+
+
+def _apply(snapshot, initial=False):
+    global _current
+    base = base_values()
+    skipped = []
+    applied = set()
+    # 이름마다 속성 하나씩 교체 (다른 스레드는 교체 도중 일부만 바뀐 값을 볼 수 있음)
+    for name in snapshot.changed:
+        if not initial and _matches(name, RESTART_REQUIRED):
+            skipped.append(name)
+            continue
+        setattr(config, name, _thaw(snapshot.values[name], base[name]))
+        applied.add(name)
+
+    if skipped:
+        print(f"⚠ 재시작해야 적용되는 설정은 건너뜀: {', '.join(sorted(skipped))}")
+        # 실제 config 값과 맞도록 건너뛴 값은 이전 스냅샷 값 유지
+        values = dict(snapshot.values)
+        for name in skipped:
+            values[name] = _current.values[name]
+        snapshot = snapshot._replace(values=types.MappingProxyType(values),
+                                     changed=frozenset(applied))
+    _current = snapshot
+
+    for patterns, rebuild in _rebuilders:
+        if patterns is None or any(_matches(name, patterns) for name in applied):
+            rebuild()
+    return applied
+
+
+def apply_pending():
+    """
+    준비된 스냅샷이 있으면 적용 (제어 스레드가 동작 시작 / 프레임 사이에 호출)
+
+    Returns:
+        set: 적용한 설정 이름 (없으면 빈 집합)
+    """
+    global _pending
+    if _pending is None:
+        return set()
+    with _swap_lock:
+        snapshot, _pending = _pending, None
+        if snapshot is None:
+            return set()
+        begin = time.perf_counter()
+        applied = _apply(snapshot)
+    if applied:
+        print(f"✓ 설정 v{snapshot.version} 적용 ({(time.perf_counter() - begin) * 1000:.1f}ms): "
+              f"{', '.join(sorted(applied))}")
+    return applied
+
+
+def load_initial(path=None):
+    """
+    시작 시 덮어쓰기 파일 적용 (재시작이 필요한 설정 포함)
+
+    Returns:
+        bool: 오류 없이 읽었으면 True (실패하면 config.py 기본값 유지)
+    """
+    global _current
+    base_values()
+    try:
+        snapshot = load(path)
+    except (ConfigError, OSError, ImportError, ValueError) as e:
+        print(f"✗ 설정 파일 오류 ({path or config.CONFIG_OVERRIDE_FILE}), 기본값 사용:")
+        for line in str(e).splitlines():
+            print(f"  - {line}")
+        _current = load(path='')
+        return False
+
+    with _swap_lock:
+        base = base_values()
+        overridden = frozenset(name for name, value in snapshot.values.items()
+                               if value != _freeze(base[name]))
+        _current = snapshot._replace(changed=frozenset())
+        if overridden:
+            _apply(snapshot._replace(changed=overridden), initial=True)
+            print(f"✓ 설정 파일 {snapshot.source}: {', '.join(sorted(overridden))}")
+    return True
+
+
+# ============================================================================
+# 파일 감시
+# ============================================================================
+
+class Watcher:
+    """
+    덮어쓰기 파일 변경 감시 (수정 시각 / 크기 확인)
+
+    바뀌면 검증 / 컴파일까지만 하고 pending()에 두고, 적용은 apply_pending()이 합니다.
+    """
+
+    def __init__(self, path=None, interval=None):
+        self.path = path or config.CONFIG_OVERRIDE_FILE
+        self.interval = interval if interval is not None else config.CONFIG_RELOAD_INTERVAL
+        self._stop = threading.Event()
+        self._stamp = self._file_stamp()
+        self.reloads = 0
+        self.failures = 0
+        self._thread = threading.Thread(target=self._run, name='config-watcher', daemon=True)
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                continue
+            self._stamp = stamp
+            self.check()
+
+    def check(self):
+        """파일을 다시 읽어 바뀐 설정이 있으면 스냅샷 준비"""
+        global _pending
+        # 적용 대기 중인 스냅샷이 있으면 그것과 비교
+        previous = _pending or _current
+        try:
+            snapshot = load(self.path, previous=previous)
+        except (ConfigError, OSError, ImportError, ValueError) as e:
+            self.failures += 1
+            print(f"✗ 설정 파일 {self.path} 적용 안 함 (현재 설정 유지):")
+            for line in str(e).splitlines():
+                print(f"  - {line}")
+            return None
+        if not snapshot.changed:
+            return None
+        if _pending is not None:
+            # 적용 전에 또 바뀌면 현재 적용된 값과의 차이로 다시 계산
+            snapshot = snapshot._replace(changed=frozenset(
+                name for name, value in snapshot.values.items()
+                if _current.values.get(name) != value))
+        _pending = snapshot
+        self.reloads += 1
+        print(f"✓ 설정 v{snapshot.version} 준비 (다음 동작 / 프레임 사이에 적용): "
+              f"{', '.join(sorted(snapshot.changed))}")
+        return snapshot
+
+
+def start(path=None, interval=None):
+    """
+    시작 시 덮어쓰기 파일 적용 + 감시 스레드 시작 (interval이 0이면 감시 안 함)
+
+    Returns:
+        Watcher 또는 None
+    """
+    global _watcher
+    load_initial(path)
+    if interval is None:
+        interval = config.CONFIG_RELOAD_INTERVAL
+    if not interval or not (path or config.CONFIG_OVERRIDE_FILE):
+        return None
+    if _watcher is None:
+        _watcher = Watcher(path, interval).start()
+    return _watcher
+
+
+def current_values():
+    """현재 config 모듈 값 {이름: 값}"""
+    return {name: getattr(config, name) for name in _setting_names()}
+
+
+if __name__ == "__main__":
+    import sys
+    target = sys.argv[1] if len(sys.argv) > 1 else config.CONFIG_OVERRIDE_FILE
+    try:
+        result = load(target)
+    except (ConfigError, OSError, ImportError, ValueError) as e:
+        print(f"✗ {target}:")
+        for line in str(e).splitlines():
+            print(f"  - {line}")
+        sys.exit(1)
+    print(f"✓ {target}: 검증 통과 ({len(result.values)}개 설정)")
+    for name in sorted(result.values):
+        if result.values[name] != _freeze(base_values()[name]):
+            print(f"  {name} = {_thaw(result.values[name], base_values()[name])!r}")
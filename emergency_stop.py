@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 비상 정지 (config.EMERGENCY_POSE)
+
+트리거 (신호 / UDP 명령 / 파일)가 들어오면 실행 중인 동작을
+다음 제어 틱 안에 중단시키고, 비상 동작을 실행합니다.
+
+- 'pose': 현재 각도에서 EMERGENCY_POSE까지 관절 속도를 제한한
+          궤적으로 이동 (목표 각도는 미리 계산)
+- 'cut':  PCA9685 모든 출력 차단 (full-off)
+
+동작 코드는 time.sleep() 대신 sleep()을, 프레임 전송 전에 check()를
+호출합니다. 트리거되면 EmergencyStop 예외가 발생해 동작 루프를 빠져나옵니다.
+동작이 실행 중이 아니면 (예: input() 대기 중) ESTOP_ACK_TIMEOUT 후
+트리거 스레드가 직접 비상 동작을 실행합니다.
+
+트리거 → 첫 프레임 전송까지의 지연을 측정해 기록합니다.
+"""
+
+import os
+import signal
+import socket
+import threading
+import time
+
+import numpy as np
+import config
+import metrics
+import watchdog
+
+
+class EmergencyStop(Exception):
+    """비상 정지로 동작이 중단됨"""
+
+
+_event = threading.Event()         # 트리거 상태 (reset() 전까지 유지)
+_ack = threading.Event()           # 비상 동작 처리 시작됨
+_handling = threading.Lock()       # 비상 동작은 한 번만 실행
+_handler = None                    # 비상 동작 함수 (컨트롤러가 등록)
+
+trigger_time = None
+trigger_source = None
+latencies = []                     # 트리거 → 첫 전송 지연 기록 (초)
+_first_write_pending = False
+
+
+# ============================================================================
+# 트리거
+# ============================================================================
+
+def set_handler(handler):
+    """비상 동작 함수 등록 (인자 없음, 트리거 스레드에서도 호출될 수 있음)"""
+    global _handler
+    _handler = handler
+
+
+def trigger(source='manual'):
+    """비상 정지 트리거 (어느 스레드에서나 호출 가능)"""
+    global trigger_time, trigger_source, _first_write_pending
+    if _event.is_set():
+        return
+    trigger_time = time.perf_counter()
+    trigger_source = source
+    _first_write_pending = True
+    _event.set()
+
+    # 동작 루프가 처리하지 않으면 (대기 상태) 직접 실행
+    threading.Thread(target=_fallback, name='estop-fallback', daemon=True).start()
+
+
+def _fallback():
+    if not _ack.wait(config.ESTOP_ACK_TIMEOUT) and _handler is not None:
+        _handler()
+
+
+def triggered():
+    return _event.is_set()
+
+
+def check():
+    """트리거되었으면 EmergencyStop 발생 (제어 틱마다 호출)"""
+    if _event.is_set():
+        raise EmergencyStop(trigger_source)
+
+
+def sleep(duration):
+    """time.sleep() 대체 - 대기 중 트리거되면 즉시 EmergencyStop 발생"""
+    watchdog.heartbeat(max(duration, 0.0))
+    if duration > 0:
+        begin = time.perf_counter()
+        if _event.wait(duration):
+            raise EmergencyStop(trigger_source)
+        # 예정보다 늦게 깨어난 시간 (스케줄링 지터)
+        metrics.loop_jitter.observe(max(time.perf_counter() - begin - duration, 0.0))
+    check()
+
+
+def begin_handling():
+    """
+    비상 동작 시작 (한 번만 True 반환)
+
+    Returns:
+        bool: 이 호출자가 비상 동작을 실행해야 하면 True
+    """
+    _ack.set()
+    return _handling.acquire(blocking=False)
+
+
+def mark_write():
+    """비상 동작의 프레임 전송 시 호출 - 첫 전송이면 지연 기록"""
+    global _first_write_pending
+    if _first_write_pending:
+        _first_write_pending = False
+        latency = time.perf_counter() - trigger_time
+        latencies.append(latency)
+        print(f"⚠ 비상 정지 ({trigger_source}): 트리거 → 첫 전송 {latency * 1000:.2f}ms")
+
+
+def reset():
+    """비상 정지 해제 (다시 동작 가능)"""
+    global trigger_source
+    _ack.clear()
+    _event.clear()
+    trigger_source = None
+    if _handling.locked():
+        _handling.release()
+
+
+def report():
+    if not latencies:
+        print("비상 정지 기록 없음")
+        return
+    ms = np.array(latencies) * 1000
+    print(f"비상 정지 {len(ms)}회: 트리거 → 첫 전송 평균 {ms.mean():.2f}ms, 최대 {ms.max():.2f}ms")
+
+
+# ============================================================================
+# 트리거 소스
+# ============================================================================
+
+def install_signal_trigger(signal_name=None):
+    """신호 수신 시 비상 정지 (예: kill -USR1 <pid>)"""
+    if signal_name is None:
+        signal_name = config.ESTOP_SIGNAL
+    if not signal_name:
+        return False
+    signal.signal(getattr(signal, signal_name), lambda signum, frame: trigger(f'signal {signal_name}'))
+    return True
+
+
+def start_udp_trigger(host=None, port=None):
+    """UDP로 'ESTOP' 수신 시 비상 정지 (예: echo ESTOP | nc -u 127.0.0.1 9750)"""
+    if host is None:
+        host = config.ESTOP_UDP_HOST
+    if port is None:
+        port = config.ESTOP_UDP_PORT
+    if not port:
+        return None
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+
+    def listen():
+        while True:
+            data, addr = sock.recvfrom(64)
+            if data.strip().upper() == b'ESTOP':
+                trigger(f'udp {addr[0]}')
+
+    thread = threading.Thread(target=listen, name='estop-udp', daemon=True)
+    thread.start()
+    return thread
+
+
+def start_file_trigger(path=None, interval=None):
+    """파일이 생성되면 비상 정지 (예: touch /tmp/spot_estop)"""
+    if path is None:
+        path = config.ESTOP_TRIGGER_FILE
+    if interval is None:
+        interval = 1.0 / config.CONTROL_RATE
+    if not path:
+        return None
+
+    def watch():
+        while True:
+            if os.path.exists(path):
+                trigger(f'file {path}')
+                while os.path.exists(path):
+                    time.sleep(interval)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=watch, name='estop-file', daemon=True)
+    thread.start()
+    return thread
+
+
+# ============================================================================
+# 비상 궤적
+# ============================================================================
+
+def rate_limited_trajectory(start, target, max_speed=None, rate=None):
+    """
+    관절 속도를 제한한 직선 보간 궤적 (모든 관절이 동시에 도착)
+
+    Args:
+        start: (..., N) 시작 각도
+        target: (..., N) 목표 각도
+        max_speed: 최대 관절 속도 (도/초), None이면 config.ESTOP_MAX_JOINT_SPEED
+        rate: 제어 주기 (Hz)
+
+    Returns:
+        np.ndarray: (F, ...) 프레임별 각도 (첫 프레임은 start에서 한 틱 진행한 값)
+    """
+    if max_speed is None:
+        max_speed = config.ESTOP_MAX_JOINT_SPEED
+    if rate is None:
+        rate = config.CONTROL_RATE
+
+    start = np.asarray(start, dtype=float)
+    target = np.asarray(target, dtype=float)
+    max_delta = np.abs(target - start).max()
+    frames = max(int(np.ceil(max_delta * rate / max_speed)), 1)
+    s = (np.arange(1, frames + 1) / frames).reshape((-1,) + (1,) * start.ndim)
+    return start + (target - start) * s
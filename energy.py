@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 보행별 에너지 / 서보 부하 추정
+
+전송한 프레임(명령 각도)마다 관절별 회전량, 속도, 정적 부하를 적분해서
+동작 호출(walk_forward, rotate_body_left 등) 단위로 추정 에너지를 계산합니다.
+센서 없이 명령 값만 사용하므로 시뮬레이션과 실제 하드웨어에서 똑같이 동작합니다.
+
+서보 하나의 전류 모델 (config):
+    I = SERVO_HOLD_CURRENT                           (PWM을 받으며 자세 유지)
+      + 부하 비율 × SERVO_LOAD_CURRENT[관절]          (접지한 다리가 몸무게를 지탱)
+      + SERVO_MOVE_CURRENT (회전하는 동안)            (회전 시간 = 회전각 / SERVO_MAX_SPEED)
+
+부하 비율 = 4 / 접지한 다리 수 (네 발 지지 1.0, 대각선 두 발 지지 2.0).
+몸체가 바닥에 닿은 자세 (모든 발이 SERVO_IDLE_MAX_FOOT_DEPTH보다 얕음)는 0.
+"""
+
+import contextlib
+import time
+
+import numpy as np
+import config
+import kinematics
+import pwm_output
+import stability
+
+# 이 값보다 작은 각도 변화는 움직이지 않은 것으로 봄 (도)
+_MOTION_THRESHOLD = 0.5
+
+
+class EnergyEstimator:
+    """
+    프레임 기반 에너지 추정
+
+    사용 예:
+        meter = EnergyEstimator()
+        with meter.invocation('walk_forward'):
+            ...                     # 프레임마다 meter.record({채널: 각도})
+        meter.summary()
+    """
+
+    def __init__(self):
+        self._index = pwm_output.channel_joint_index()
+
+        self.angles = None            # (4, 3) 마지막 명령 각도 (채널 각도)
+        self._last_time = None
+        self._current = None          # 진행 중인 호출 누적값
+        self.history = []             # 호출별 결과
+
+    # ------------------------------------------------------------------
+    # 부하 모델
+    # ------------------------------------------------------------------
+
+    def hold_currents(self, angles):
+        """
+        자세 유지 전류 (움직이지 않을 때)
+
+        Args:
+            angles: (4, 3) 채널 각도 (캘리브레이션 오프셋 포함)
+
+        Returns:
+            np.ndarray: (4, 3) 관절별 전류 (A)
+        """
+        # 캘리브레이션은 매번 config에서 읽음 (설정 다시 불러오기 반영)
+        feet = kinematics.forward_kinematics(kinematics.channel_to_joint(angles))
+        if (feet[:, 2] > -config.SERVO_IDLE_MAX_FOOT_DEPTH).all():
+            load_factor = np.zeros(4)
+        else:
+            contacts = stability.infer_contacts(feet)
+            load_factor = np.where(contacts, 4.0 / max(contacts.sum(), 1), 0.0)
+        load = load_factor[:, np.newaxis] * np.asarray(config.SERVO_LOAD_CURRENT)
+        return config.SERVO_HOLD_CURRENT + load
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+
+    def record(self, angles_by_channel, now=None):
+        """
+        전송한 프레임 기록
+
+        Args:
+            angles_by_channel: {채널: 각도} (일부 채널만 있어도 됨)
+            now: 전송 시각 (perf_counter), None이면 현재 시각
+        """
+        if now is None:
+            now = time.perf_counter()
+
+        if self.angles is None:
+            self.angles = np.full((4, 3), 90.0)
+        previous = self.angles.copy()
+        for channel, angle in angles_by_channel.items():
+            if channel in self._index:
+                self.angles[self._index[channel]] = angle
+
+        acc = self._current
+        if acc is None or self._last_time is None:
+            self._last_time = now
+            return
+
+        dt = max(now - self._last_time, 0.0)
+        delta = np.abs(self.angles - previous)
+        moving = delta > _MOTION_THRESHOLD
+        # 서보는 최고 속도로 움직인 뒤 나머지 시간은 유지한다고 봄
+        # (한 프레임으로 크게 움직이면 다음 프레임 이후까지 회전이 이어짐)
+        move_time = delta / config.SERVO_MAX_SPEED * moving
+
+        current = self.hold_currents(previous) * dt + config.SERVO_MOVE_CURRENT * move_time
+        acc['charge'] += current
+        acc['travel'] += delta
+        acc['move_time'] += move_time
+        acc['peak_velocity'] = np.maximum(acc['peak_velocity'],
+                                          np.where(dt > 0, delta / max(dt, 1e-9), 0.0))
+        acc['peak_concurrent'] = max(acc['peak_concurrent'], int(moving.sum()))
+        acc['frames'] += 1
+        self._last_time = now
+
+    # ------------------------------------------------------------------
+    # 동작 호출 단위
+    # ------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def invocation(self, name):
+        """
+        동작 호출 하나를 측정 (중첩 호출은 바깥 호출에 합산)
+
+        동작이 예외(비상 정지 등)로 끝나도 그때까지의 값을 기록합니다.
+        """
+        if self._current is not None:
+            yield
+            return
+
+        begin = time.perf_counter()
+        self._current = {
+            'charge': np.zeros((4, 3)),        # 관절별 전하량 (A·s)
+            'travel': np.zeros((4, 3)),        # 관절별 회전량 (도)
+            'move_time': np.zeros((4, 3)),     # 관절별 회전 시간 (초)
+            'peak_velocity': np.zeros((4, 3)), # 관절별 최대 명령 속도 (도/초)
+            'peak_concurrent': 0,
+            'frames': 0,
+        }
+        self._last_time = begin
+        completed = False
+        try:
+            yield
+            completed = True
+        finally:
+            result = self._finish(name, begin, completed)
+            self.history.append(result)
+            if config.ENERGY_PRINT:
+                self.print_result(result)
+
+    def _finish(self, name, begin, completed):
+        acc = self._current
+        end = time.perf_counter()
+        # 마지막 프레임 이후 자세 유지
+        if self.angles is not None:
+            acc['charge'] += self.hold_currents(self.angles) * max(end - self._last_time, 0.0)
+        self._current = None
+
+        # 한 프레임으로 크게 움직인 경우 회전은 호출이 끝난 뒤에도 이어짐
+        duration = max(end - begin, float(acc['move_time'].max()))
+        energy = acc['charge'] * config.SERVO_SUPPLY_VOLTAGE
+        return {
+            'name': name,
+            'completed': completed,
+            'duration': duration,
+            'frames': acc['frames'],
+            'energy': float(energy.sum()),                  # J
+            'charge_mah': float(acc['charge'].sum() / 3.6),
+            'mean_power': float(energy.sum() / duration) if duration > 0 else 0.0,
+            'joint_energy': energy,                          # (4, 3) J
+            'travel': acc['travel'],                         # (4, 3) 도
+            'duty': np.minimum(acc['move_time'] / max(duration, 1e-9), 1.0),
+            'peak_velocity': acc['peak_velocity'],
+            'peak_concurrent': acc['peak_concurrent'],
+        }
+
+    # ------------------------------------------------------------------
+    # 출력
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def print_result(result):
+        status = "" if result['completed'] else " (중단됨)"
+        print(f"⚡ {result['name']}{status}: {result['energy']:.1f}J "
+              f"({result['charge_mah']:.2f}mAh, 평균 {result['mean_power']:.1f}W, "
+              f"{result['duration']:.2f}초), 동시 회전 최대 {result['peak_concurrent']}개, "
+              f"최대 듀티 {result['duty'].max() * 100:.0f}%")
+
+    def summary(self):
+        """동작별 평균 에너지 비교 출력"""
+        if not self.history:
+            print("에너지 추정: 기록 없음")
+            return
+        print("에너지 추정 (동작별 평균):")
+        names = sorted({r['name'] for r in self.history})
+        for name in names:
+            results = [r for r in self.history if r['name'] == name]
+            energy = np.mean([r['energy'] for r in results])
+            power = np.mean([r['mean_power'] for r in results])
+            duty = np.mean([r['duty'] for r in results], axis=0)
+            busiest = np.unravel_index(np.argmax(duty), duty.shape)
+            print(f"  {name}: {len(results)}회, 평균 {energy:.1f}J, {power:.1f}W, "
+                  f"최대 듀티 {duty.max() * 100:.0f}% "
+                  f"({config.LEG_NAMES[busiest[0]]} 관절 {busiest[1]})")
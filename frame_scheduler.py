@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - PWM 주기 정렬 프레임 전송 스케줄러
+
+PCA9685는 I2C로 받은 새 ON/OFF 값을 각 채널의 다음 ON 시점(LOW 구간 끝)에
+반영합니다. 프레임을 20ms PWM 주기의 아무 시점에나 쓰면, 어떤 채널은
+이번 주기에, 어떤 채널은 다음 주기에 새 펄스를 받아 한 자세 안에서
+최대 한 주기(20ms)의 채널 간 시간차(skew)가 생깁니다.
+
+이 스케줄러는
+- 설정된 프리스케일러로부터 실제 PWM 주기를 계산하고
+  (필요하면 기준 시각으로 주기/위상을 보정),
+- 블록 쓰기 시간 예측값으로 각 채널이 새 펄스를 받는 시각을 계산해
+  채널 간 시간차가 가장 작은 전송 시점을 골라 그때 프레임을 씁니다.
+- 실제 쓰기 시간을 측정해 예측값을 갱신하고, 달성한 시간차와
+  명령 → 구동 지연을 기록합니다.
+
+시각은 모두 time.perf_counter() 기준 (초)입니다.
+"""
+
+import math
+import time
+
+import numpy as np
+import config
+import pwm_output
+
+# 전송 시점 후보 수 (한 PWM 주기를 나눈 개수)
+_CANDIDATES = 128
+
+# 바이트당 I2C 전송 시간 계산용 (데이터 8비트 + ACK)
+_BITS_PER_BYTE = 9
+
+
+def prescale_value(frequency, oscillator_hz):
+    """Adafruit_PCA9685.set_pwm_freq()와 같은 방식의 프리스케일 값"""
+    prescale = oscillator_hz / 4096.0 / frequency - 1.0
+    return int(math.floor(prescale + 0.5))
+
+
+def pwm_period(frequency=None, oscillator_hz=None):
+    """프리스케일 반올림을 반영한 실제 PWM 주기 (초)"""
+    if frequency is None:
+        frequency = config.SERVO_FREQUENCY
+    if oscillator_hz is None:
+        oscillator_hz = config.PCA9685_OSCILLATOR_HZ
+    prescale = prescale_value(frequency, oscillator_hz)
+    return pwm_output.PWM_PERIOD_TICKS * (prescale + 1) / oscillator_hz
+
+
+class FrameScheduler:
+    """
+    PWM 주기에 맞춘 프레임 전송
+
+    Args:
+        epoch: PWM 카운터가 0이 된 기준 시각 (perf_counter),
+               None이면 생성 시각 (set_pwm_freq 직후에 생성하세요)
+        frequency: PWM 주파수 (Hz)
+        oscillator_hz: PCA9685 내부 오실레이터 주파수
+    """
+
+    def __init__(self, epoch=None, frequency=None, oscillator_hz=None):
+        self.period = pwm_period(frequency, oscillator_hz)
+        self.epoch = time.perf_counter() if epoch is None else epoch
+        self.tick = self.period / pwm_output.PWM_PERIOD_TICKS
+
+        # 블록 하나 쓰는 데 걸리는 시간 예측 (바이트 수 기반 초기값, 측정으로 갱신)
+        self.byte_time = _BITS_PER_BYTE / config.I2C_BUS_SPEED_HZ
+        self.block_overhead = 3 * self.byte_time   # 주소 + 레지스터 + START/STOP
+
+        # 통계
+        self.frames = 0
+        self.slipped = 0          # 일부 채널이 다음 주기로 밀린 프레임 수
+        self.skews = []
+        self.latencies = []
+
+    # ------------------------------------------------------------------
+    # 주기 모델 / 보정
+    # ------------------------------------------------------------------
+
+    def calibrate(self, reference_times):
+        """
+        기준 시각으로 주기와 위상 보정
+
+        오실로스코프/GPIO 인터럽트 등으로 측정한 PWM 주기 시작 시각
+        (연속된 주기일 필요는 없음)을 최소제곱으로 맞춥니다.
+
+        Args:
+            reference_times: 주기 시작 시각 목록 (perf_counter, 2개 이상)
+
+        Returns:
+            (period, residual): 보정된 주기 (초), 잔차 RMS (초)
+        """
+        t = np.sort(np.asarray(reference_times, dtype=float))
+        if len(t) < 2:
+            raise ValueError("기준 시각이 2개 이상 필요합니다")
+
+        # 현재 주기 모델로 각 기준 시각의 주기 번호를 정한 뒤 직선 맞춤
+        k = np.round((t - t[0]) / self.period)
+        A = np.stack([k, np.ones_like(k)], axis=1)
+        (period, epoch), *_ = np.linalg.lstsq(A, t, rcond=None)
+        residual = float(np.sqrt(np.mean((A @ [period, epoch] - t) ** 2)))
+
+        self.period = float(period)
+        self.epoch = float(epoch)
+        self.tick = self.period / pwm_output.PWM_PERIOD_TICKS
+        return self.period, residual
+
+    def phase_ticks(self, t):
+        """시각 t의 PWM 카운터 값 (0-4095)"""
+        return ((t - self.epoch) % self.period) / self.tick
+
+    # ------------------------------------------------------------------
+    # 구동 시각 예측
+    # ------------------------------------------------------------------
+
+    def block_durations(self, blocks):
+        """블록 쓰기 시간 예측 (초), blocks: pwm_output.frame_blocks() 결과"""
+        return np.array([self.block_overhead + len(data) * self.byte_time for _, data in blocks])
+
+    def actuation_times(self, completions, block_on):
+        """
+        채널별 새 펄스 시작 시각
+
+        Args:
+            completions: (..., B) 블록 쓰기 완료 시각
+            block_on: 길이 B 목록, 각 원소는 블록 채널들의 ON 틱 배열
+
+        Returns:
+            np.ndarray: (..., C) 채널별 구동 시각
+        """
+        completions = np.asarray(completions, dtype=float)
+        done = np.concatenate([np.repeat(completions[..., b:b + 1], len(on), axis=-1)
+                               for b, on in enumerate(block_on)], axis=-1)
+        on = np.concatenate(block_on) * self.tick
+        # 쓰기 완료 이후 처음 오는 ON 시점
+        k = np.ceil((done - self.epoch - on) / self.period)
+        return self.epoch + k * self.period + on
+
+    def plan(self, on_off, now=None):
+        """
+        채널 간 시간차가 가장 작은 전송 시작 시각 계산
+
+        Args:
+            on_off: {채널: (on, off)}
+            now: 현재 시각, None이면 perf_counter()
+
+        Returns:
+            dict: 'start' (전송 시작 시각), 'skew' (예상 채널 간 시간차, 초),
+                  'latency' (now → 마지막 채널 구동, 초)
+        """
+        if now is None:
+            now = time.perf_counter()
+
+        blocks = pwm_output.frame_blocks(on_off)
+        block_on = [np.array([on_off[ch][0] for ch in self._block_channels(reg, data)])
+                    for reg, data in blocks]
+        durations = self.block_durations(blocks)
+
+        starts = now + np.arange(_CANDIDATES) * (self.period / _CANDIDATES)
+        completions = starts[:, np.newaxis] + np.cumsum(durations)
+        actuation = self.actuation_times(completions, block_on)
+
+        skew = actuation.max(axis=1) - actuation.min(axis=1)
+        latency = actuation.max(axis=1) - now
+        # 시간차가 최소(틱 단위)인 후보 중 지연이 가장 짧은 것
+        skew_ticks = np.round(skew / self.tick)
+        best = np.lexsort((latency, skew_ticks))[0]
+
+        return {'start': float(starts[best]), 'skew': float(skew[best]),
+                'latency': float(latency[best])}
+
+    @staticmethod
+    def _block_channels(register, data):
+        first = (register - pwm_output.LED0_ON_L) // 4
+        return range(first, first + len(data) // 4)
+
+    # ------------------------------------------------------------------
+    # 전송
+    # ------------------------------------------------------------------
+
+    def commit(self, pca, on_off):
+        """
+        계획한 시각까지 기다린 뒤 프레임 블록 쓰기 (pca가 None이면 시뮬레이션)
+
+        Returns:
+            dict: 'skew' (달성한 채널 간 시간차, 초), 'latency' (명령 → 구동, 초),
+                  'slip' (위상 분산 설정을 넘는 추가 시간차, 초)
+        """
+        requested = time.perf_counter()
+        plan = self.plan(on_off, requested)
+
+        delay = plan['start'] - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        blocks = pwm_output.frame_blocks(on_off)
+        block_on = [np.array([on_off[ch][0] for ch in self._block_channels(reg, data)])
+                    for reg, data in blocks]
+
+        if pca is None:
+            completions = plan['start'] + np.cumsum(self.block_durations(blocks))
+        else:
+            completions = []
+            for register, data in blocks:
+                begin = time.perf_counter()
+                block = pwm_output.write_block(pca, register, data) == 1
+                end = time.perf_counter()
+                completions.append(end)
+                if block:
+                    # 채널별 set_pwm 대체 경로는 블록 쓰기 시간 모델에 맞지 않음
+                    self._learn(end - begin, len(data))
+
+        actuation = self.actuation_times(completions, block_on)
+        skew = float(actuation.max() - actuation.min())
+        latency = float(actuation.max() - requested)
+
+        # 위상 분산으로 의도한 시간차를 넘는 부분 = 주기가 밀린 채널
+        on = np.concatenate(block_on)
+        slip = max(0.0, skew - float(on.max() - on.min()) * self.tick)
+
+        self.frames += 1
+        self.skews.append(skew)
+        self.latencies.append(latency)
+        if slip > self.tick:
+            self.slipped += 1
+        if len(self.skews) > 1000:
+            del self.skews[:500]
+            del self.latencies[:500]
+        return {'skew': skew, 'latency': latency, 'slip': slip}
+
+    def _learn(self, duration, length):
+        """측정한 블록 쓰기 시간으로 바이트당 시간 갱신 (지수 이동 평균)"""
+        measured = max(duration - self.block_overhead, 0.0) / length
+        self.byte_time += 0.1 * (measured - self.byte_time)
+
+    def report(self):
+        """전송 통계 출력"""
+        if not self.frames:
+            print("PWM 주기 정렬: 전송한 프레임 없음")
+            return
+        skews = np.array(self.skews) * 1000
+        latencies = np.array(self.latencies) * 1000
+        print(f"PWM 주기 정렬: {self.frames} 프레임, 주기 {self.period * 1000:.3f}ms")
+        print(f"  채널 간 시간차: 평균 {skews.mean():.2f}ms, 최대 {skews.max():.2f}ms "
+              f"(주기 밀림 {self.slipped} 프레임)")
+        print(f"  명령 → 구동 지연: 평균 {latencies.mean():.2f}ms, "
+              f"최소 {latencies.min():.2f}ms, 최대 {latencies.max():.2f}ms")
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 보행 블렌딩 엔진
+
+보행이 끝날 때마다 STANDBY로 돌아가지 않고, 사이클 중간에서
+다른 보행(또는 다른 파라미터)으로 바로 넘어갈 수 있게 합니다.
+
+- 모든 보행은 위상(phase, 0~1)의 함수로 STANDBY 기준 발 오프셋을 만듭니다.
+- 전환 시 새 보행의 위상을 현재 발 위치와 가장 가까운 곳으로 맞추고
+  (위상 매칭), 두 보행의 발 궤적을 GAIT_BLEND_TIME 동안 섞습니다.
+- TrotSource는 전진 속도(vx)와 회전 속도(yaw_rate)를 함께 받아
+  곡선 보행(걸으면서 회전)을 만듭니다.
+
+좌표계 (spot_micro_controller와 동일):
+    X: 앞(+) / 뒤(-), Y: 오른쪽(+) / 왼쪽(-), Z: 위(+) / 아래(-)
+    yaw_rate: 왼쪽 회전(+) / 오른쪽 회전(-), 도/초
+"""
+
+import math
+
+import numpy as np
+import config
+import stability
+import trajectory
+
+# 위상 매칭 시 검사할 후보 위상 수
+_PHASE_CANDIDATES = 64
+
+
+def _min_jerk(s):
+    """0 → 1 부드러운 보간 곡선 (속도/가속도가 양 끝에서 0)"""
+    s = np.clip(s, 0.0, 1.0)
+    return s * s * s * (10 - 15 * s + 6 * s * s)
+
+
+def _standby():
+    return np.array([config.STANDBY_X, config.STANDBY_Y, config.STANDBY_Z])
+
+
+# ============================================================================
+# 보행 소스 (위상 → 발 오프셋)
+# ============================================================================
+
+class StandSource:
+    """제자리 정지 (모든 발 STANDBY)"""
+
+    def __init__(self, period=None):
+        self.period = period if period is not None else config.GAIT_CYCLE_PERIOD
+
+    def offsets(self, phase):
+        phase = np.atleast_1d(phase)
+        return np.zeros((len(phase), 4, 3))
+
+
+class TrotSource:
+    """
+    속도 명령으로 만드는 트로트 보행 (대각선 쌍 교대)
+
+    Args:
+        vx: 전진 속도 (cm/s, 뒤로는 음수)
+        vy: 옆 이동 속도 (cm/s, 오른쪽 +)
+        yaw_rate: 회전 속도 (도/초, 왼쪽 +)
+        period: 사이클 시간 (초)
+        duty: 지지 시간 비율
+        swing_height: 스윙 높이 (cm)
+    """
+
+    # 다리별 위상 차이: front_right + rear_left 쌍, rear_right + front_left 쌍
+    _LEG_PHASE = {'front_right': 0.0, 'rear_left': 0.0, 'rear_right': 0.5, 'front_left': 0.5}
+
+    def __init__(self, vx=0.0, vy=0.0, yaw_rate=0.0, period=None, duty=None, swing_height=None):
+        self.period = period if period is not None else config.GAIT_CYCLE_PERIOD
+        self.duty = duty if duty is not None else config.GAIT_DUTY_FACTOR
+        self.swing_height = swing_height if swing_height is not None else config.GAIT_SWING_HEIGHT
+        self.leg_phase = np.array([self._LEG_PHASE[leg] for leg in config.LEG_NAMES])
+
+        # 지지 구간 동안 발이 몸체 기준으로 이동하는 거리 (다리별 보폭)
+        hips = stability.hip_positions()
+        omega = math.radians(yaw_rate)
+        stance_time = self.duty * self.period
+        step = np.zeros((4, 2))
+        step[:, 0] = (vx + omega * hips[:, 1]) * stance_time
+        step[:, 1] = (vy - omega * hips[:, 0]) * stance_time
+
+        longest = np.linalg.norm(step, axis=1).max()
+        if longest > config.GAIT_MAX_STEP_LENGTH:
+            step *= config.GAIT_MAX_STEP_LENGTH / longest
+        self.step = step
+
+    def offsets(self, phase):
+        """
+        Args:
+            phase: 스칼라 또는 (N,) 위상 (0~1, 1 이상은 반복)
+
+        Returns:
+            np.ndarray: (N, 4, 3) STANDBY 기준 발 오프셋 (cm)
+        """
+        phase = np.atleast_1d(np.asarray(phase, dtype=float))
+        u = (phase[:, np.newaxis] + self.leg_phase) % 1.0          # (N, 4)
+
+        in_stance = u < self.duty
+        stance_s = u / self.duty
+        swing_s = (u - self.duty) / (1.0 - self.duty)
+
+        # 지지: +보폭/2 → -보폭/2 (등속), 스윙: -보폭/2 → +보폭/2 (부드럽게)
+        along = np.where(in_stance, 0.5 - stance_s, _min_jerk(swing_s) - 0.5)
+        lift = np.where(in_stance, 0.0, 16.0 * swing_s**2 * (1.0 - swing_s)**2)
+
+        out = np.empty((len(phase), 4, 3))
+        out[..., :2] = along[..., np.newaxis] * self.step
+        out[..., 2] = lift * self.swing_height
+        return out
+
+
+class KeyframeSource:
+    """
+    trajectory.GAITS의 키프레임 보행을 한 사이클 주기 함수로 사용
+
+    Args:
+        gait_name: 'walk_forward', 'strafe_left', 'rotate_body_left' 등
+        kind: 스플라인 종류
+        **params: 보행 파라미터
+    """
+
+    def __init__(self, gait_name, kind=None, **params):
+        times, positions = trajectory.gait_keyframes(gait_name, 1, **params)
+        self.name = gait_name
+        self.period = float(times[-1])
+        self.spline = trajectory.KeyframeSpline(
+            times, positions - _standby(), kind=kind or config.TRAJECTORY_SPLINE, periodic=True)
+
+    def offsets(self, phase):
+        phase = np.atleast_1d(np.asarray(phase, dtype=float)) % 1.0
+        return self.spline(phase * self.period)
+
+
+# ============================================================================
+# 블렌딩 엔진
+# ============================================================================
+
+class GaitBlender:
+    """
+    보행 전환 블렌딩 엔진
+
+    사용 예:
+        blender = GaitBlender()
+        blender.set_velocity(vx=5.0)              # 전진
+        times, feet = blender.sample(2.0)         # 2초 분량 발 좌표
+        blender.set_velocity(vx=5.0, yaw_rate=20) # 걸으면서 왼쪽 회전
+        times, feet = blender.sample(2.0)
+    """
+
+    def __init__(self, source=None):
+        self.source = source if source is not None else StandSource()
+        self.phase = 0.0
+        self.previous = None        # (source, phase) - 블렌딩 중인 이전 보행
+        self.blend_time = 0.0
+        self.blend_elapsed = 0.0
+
+    @property
+    def blending(self):
+        return self.previous is not None
+
+    def current_offsets(self):
+        """현재 출력 중인 발 오프셋 (4, 3)"""
+        out = self.source.offsets(self.phase)[0]
+        if self.previous is not None:
+            prev_source, prev_phase = self.previous
+            w = _min_jerk(self.blend_elapsed / self.blend_time)
+            out = (1 - w) * prev_source.offsets(prev_phase)[0] + w * out
+        return out
+
+    def _match_phase(self, source):
+        """새 보행에서 현재 발 위치와 가장 가까운 위상 찾기"""
+        if isinstance(source, TrotSource) and isinstance(self.source, TrotSource):
+            # 같은 다리 쌍 구조이므로 위상을 그대로 이어감
+            return self.phase
+        if isinstance(source, StandSource):
+            return self.phase
+
+        current = self.current_offsets()
+        candidates = np.arange(_PHASE_CANDIDATES) / _PHASE_CANDIDATES
+        distance = np.linalg.norm(source.offsets(candidates) - current, axis=-1).sum(axis=-1)
+        return float(candidates[np.argmin(distance)])
+
+    def set_command(self, source, blend_time=None):
+        """
+        새 보행으로 전환 (현재 위상에서 블렌딩 시작)
+
+        Args:
+            source: StandSource / TrotSource / KeyframeSource
+            blend_time: 블렌딩 시간 (초), None이면 config.GAIT_BLEND_TIME
+        """
+        if blend_time is None:
+            blend_time = config.GAIT_BLEND_TIME
+
+        new_phase = self._match_phase(source)
+        if blend_time > 0:
+            if self.previous is not None:
+                # 블렌딩 도중 다시 전환: 지금 섞인 결과를 고정해서 시작점으로 사용
+                self.previous = (_HoldSource(self.current_offsets(), self.source.period), 0.0)
+            else:
+                self.previous = (self.source, self.phase)
+            self.blend_time = blend_time
+            self.blend_elapsed = 0.0
+        else:
+            self.previous = None
+
+        self.source = source
+        self.phase = new_phase
+
+    def set_velocity(self, vx=0.0, vy=0.0, yaw_rate=0.0, blend_time=None):
+        """속도 명령 (트로트), 모두 0이면 제자리 정지"""
+        if vx == 0 and vy == 0 and yaw_rate == 0:
+            self.set_command(StandSource(self.source.period), blend_time)
+        else:
+            self.set_command(TrotSource(vx, vy, yaw_rate), blend_time)
+
+    def step(self, dt):
+        """
+        dt만큼 진행한 뒤 발 좌표 반환
+
+        Returns:
+            np.ndarray: (4, 3) 발 좌표 (어깨 기준, cm)
+        """
+        if self.previous is not None:
+            prev_source, prev_phase = self.previous
+            w = _min_jerk(self.blend_elapsed / self.blend_time)
+            period = (1 - w) * prev_source.period + w * self.source.period
+            self.previous = (prev_source, prev_phase + dt / period)
+            self.phase += dt / period
+            self.blend_elapsed += dt
+            if self.blend_elapsed >= self.blend_time:
+                self.previous = None
+        else:
+            self.phase += dt / self.source.period
+        self.phase %= 1.0
+        return _standby() + self.current_offsets()
+
+    def sample(self, duration, rate=None, with_phase=False):
+        """
+        duration 동안의 발 좌표를 제어 주기로 생성
+
+        Args:
+            with_phase: True면 프레임별 보행 위상도 반환
+
+        Returns:
+            (times, positions): (N,) 시각, (N, 4, 3) 발 좌표
+            with_phase=True면 (times, positions, phases)
+        """
+        if rate is None:
+            rate = config.CONTROL_RATE
+        count = max(int(round(duration * rate)), 1)
+        dt = 1.0 / rate
+        positions = np.empty((count, 4, 3))
+        phases = np.empty(count)
+        for i in range(count):
+            positions[i] = self.step(dt)
+            phases[i] = self.phase
+        times = np.arange(1, count + 1) * dt
+        if with_phase:
+            return times, positions, phases
+        return times, positions
+
+    def settle(self, rate=None):
+        """
+        정지 명령 후 블렌딩이 끝날 때까지 진행 (STANDBY로 부드럽게 복귀)
+
+        Returns:
+            (times, positions): 복귀 궤적
+        """
+        if not isinstance(self.source, StandSource):
+            self.set_command(StandSource(self.source.period))
+        remaining = self.blend_time - self.blend_elapsed if self.blending else 0.0
+        return self.sample(max(remaining, 1.0 / (rate or config.CONTROL_RATE)), rate)
+
+
+class _HoldSource:
+    """블렌딩 도중 재전환할 때 사용하는 고정 오프셋"""
+
+    def __init__(self, offsets, period):
+        self._offsets = np.array(offsets)
+        self.period = period
+
+    def offsets(self, phase):
+        phase = np.atleast_1d(phase)
+        return np.broadcast_to(self._offsets, (len(phase), 4, 3))
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 골든 트레이스 (동작 함수 출력 기록 / 비교) + IK 퍼징
+
+IK / 보간 / 출력 코드를 최적화해도 실제 동작이 바뀌지 않았는지 확인합니다.
+동작 함수를 기록용 출력 + 가상 시계로 실행해 전송한 프레임 (채널 각도, PWM 틱, 시각)을
+그대로 기록하고, 저장해 둔 기준 기록 (골든 파일)과 허용 오차 안에서 비교합니다.
+
+    기록용 출력: spot_micro_controller._write_frame 대체 (하드웨어 / 전송 스레드 사용 안 함)
+    가상 시계: time.perf_counter / sleep, emergency_stop.sleep 대체 (기다리지 않고 시각만 진행)
+
+    golden_traces/<동작>.npz     times (N,), angles (N, 4, 3), ticks (N, 4, 3), sent (N, 4, 3),
+                                 end (동작이 끝난 가상 시각), config (기록에 영향을 주는 설정 해시)
+
+동작이 끝난 뒤 워치독 하트비트 감시가 남아 있으면 (호출 사이 대기 시간에 비상 정지됨)
+record / compare 모두 실패로 표시합니다.
+
+IK 퍼징은 작업 공간 임의 좌표 수백만 개와 경계 좌표 (x == 0 등)를 kinematics.ik → fk로
+왕복시켜 위치 오차를 확인하고 (도달 가능하다고 한 좌표는 모두 검사), 일부 좌표는 coord_to_angles_3d()와 kinematics.ik의 결과가
+같은지 확인합니다.
+
+사용법:
+    python golden_trace.py record                 # 모든 동작 기준 기록 저장
+    python golden_trace.py record walk_forward    # 일부 동작만
+    python golden_trace.py compare                # 현재 코드와 비교 (다르면 종료 코드 1)
+    python golden_trace.py fuzz --points 5000000  # IK 퍼징
+"""
+
+import argparse
+import collections
+import contextlib
+import fnmatch
+import hashlib
+import io
+import os
+import sys
+
+import numpy as np
+import config
+import config_loader
+import emergency_stop
+import kinematics
+import pose_library
+import pwm_output
+import watchdog
+import spot_micro_controller as controller
+
+# 기록할 동작: 이름 → (시작 자세, 인자)
+# 시작 자세는 'standby' (config.STANDBY_*) 또는 'lie' (config.LIE_*)
+PRIMITIVES = {
+    'lie_down': ('standby', {}),
+    'stand_up': ('lie', {}),
+    'tilt_left': ('standby', {}),
+    'tilt_right': ('standby', {}),
+    'walk_forward': ('standby', {}),
+    'walk_backward': ('standby', {}),
+    'strafe_left': ('standby', {}),
+    'strafe_right': ('standby', {}),
+    'rotate_body_left': ('standby', {}),
+    'rotate_body_right': ('standby', {}),
+    'body_move_up_down': ('standby', {'height_offset': 2.0}),
+    'body_shift_weight': ('standby', {'shift_y': 1.5}),
+}
+
+Trace = collections.namedtuple('Trace', ['times', 'angles', 'ticks', 'sent', 'end', 'config'])
+Trace.__doc__ = """
+동작 하나의 전송 기록
+
+    times: (N,) 프레임 전송 시각 (초, 가상 시계, 동작 시작 = 0)
+    angles: (N, 4, 3) 프레임 전송 후 채널 각도 (캘리브레이션 포함, config.LEG_NAMES 순서)
+    ticks: (N, 4, 3) PWM 틱 (pwm_output.angle_to_tick)
+    sent: (N, 4, 3) 그 프레임에 포함된 채널
+    end: 동작 함수가 반환한 가상 시각 (마지막 대기 포함)
+    config: 기록할 때의 설정 해시
+"""
+
+FuzzResult = collections.namedtuple(
+    'FuzzResult', ['points', 'reachable', 'near_axis', 'max_error', 'worst', 'failures',
+                   'scalar_checked', 'scalar_mismatches'])
+FuzzResult.__doc__ = """
+IK 퍼징 결과
+
+    points: 검사한 좌표 수 (경계 좌표 포함)
+    reachable: 도달 가능한 좌표 수 (모두 왕복 검사)
+    near_axis: 그중 |x| < IK_FUZZ_MIN_X 인 좌표 수 (어깨 축 근처)
+    max_error: 최대 왕복 위치 오차 (cm)
+    worst: 최대 오차 좌표 (x, y, z, 다리 이름)
+    failures: 왕복 오차가 IK_FUZZ_TOLERANCE를 넘은 좌표 수
+    scalar_checked: coord_to_angles_3d()와 비교한 좌표 수
+    scalar_mismatches: [(좌표, 다리 이름, 내용)] 결과가 다르거나 예외가 난 좌표
+"""
+
+
+# PRIMITIVES가 읽는 설정 (config_loader 패턴) - 자세 전환 + 컨트롤러의 좌표 / 채널 설정
+# 이 밖의 설정을 추가 / 변경해도 해시가 바뀌지 않으므로 기준 기록을 다시 저장할 필요가 없음
+CONFIG_DEPENDENCIES = pose_library.CONFIG_DEPENDENCIES + (
+    'LEG_NAMES', 'CHANNELS', 'WALK_*_COORD', 'TURN_LIFT_HEIGHT', 'TILT_HEIGHT')
+
+
+def config_digest():
+    """기록에 영향을 주는 설정 값 해시 (CONFIG_DEPENDENCIES에 맞는 이름만)"""
+    digest = hashlib.sha256()
+    values = config_loader.current_values()
+    for name in sorted(values):
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in CONFIG_DEPENDENCIES):
+            digest.update(f"{name}={values[name]!r}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+# ============================================================================
+# 기록용 출력 + 가상 시계
+# ============================================================================
+
+class VirtualClock:
+    """time 모듈 대신 쓰는 가상 시계 (sleep은 기다리지 않고 시각만 진행)"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    monotonic = perf_counter
+    time = perf_counter
+
+    def sleep(self, duration):
+        if duration > 0:
+            self.now += duration
+
+
+class Recorder:
+    """_write_frame 대체 - 전송한 프레임을 (4, 3) 배열로 기록"""
+
+    def __init__(self, clock, start_angles):
+        self.clock = clock
+        self.index = pwm_output.channel_joint_index()
+        self.state = np.array(start_angles, dtype=float)
+        self.times = []
+        self.angles = []
+        self.sent = []
+
+    def write_frame(self, angles_by_channel, emergency=False):
+        sent = np.zeros(self.state.shape, dtype=bool)
+        for channel, angle in angles_by_channel.items():
+            i, joint = self.index[channel]
+            self.state[i, joint] = angle
+            sent[i, joint] = True
+        self.times.append(self.clock.now)
+        self.angles.append(self.state.copy())
+        self.sent.append(sent)
+        # 실제 전송처럼 하트비트 (동작이 끝난 뒤 감시 해제 확인용)
+        watchdog.heartbeat()
+
+    def trace(self):
+        shape = (0,) + self.state.shape
+        angles = np.array(self.angles) if self.angles else np.empty(shape)
+        return Trace(times=np.array(self.times, dtype=float),
+                     angles=angles,
+                     ticks=pwm_output.angle_to_tick(angles),
+                     sent=np.array(self.sent) if self.sent else np.empty(shape, dtype=bool),
+                     end=self.clock.now,
+                     config=config_digest())
+
+
+def _start_angles(pose):
+    """시작 자세의 채널 각도 (4, 3)"""
+    if pose == 'lie':
+        position = (config.LIE_X, config.LIE_Y, config.LIE_Z)
+    else:
+        position = (config.STANDBY_X, config.STANDBY_Y, config.STANDBY_Z)
+    joints, _ = kinematics.inverse_kinematics([position] * len(config.LEG_NAMES))
+    return controller.robot.to_channel(joints)
+
+
+@contextlib.contextmanager
+def _recording(recorder, clock):
+    """컨트롤러 출력 / 시계를 기록용으로 바꿔 둠 (끝나면 원복)"""
+    saved = (controller._write_frame, controller.time, controller.TEST_MODE,
+             controller.current_angles, emergency_stop.sleep)
+    controller._write_frame = recorder.write_frame
+    controller.time = clock
+    controller.TEST_MODE = True
+    emergency_stop.sleep = clock.sleep
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        (controller._write_frame, controller.time, controller.TEST_MODE,
+         controller.current_angles, emergency_stop.sleep) = saved
+
+
+def record(name):
+    """
+    동작 하나를 기록용 출력으로 실행
+
+    Args:
+        name: PRIMITIVES의 동작 이름
+
+    Returns:
+        Trace
+    """
+    pose, kwargs = PRIMITIVES[name]
+    start = _start_angles(pose)
+    clock = VirtualClock()
+    recorder = Recorder(clock, start)
+    with _recording(recorder, clock):
+        controller.robot.reset(start)
+        controller.current_angles = controller.robot.view
+        getattr(controller, name)(**kwargs)
+    return recorder.trace()
+
+
+# ============================================================================
+# 골든 파일
+# ============================================================================
+
+def golden_path(name, directory=None):
+    """기준 기록 경로 (config.GOLDEN_TRACE_DIR이 상대 경로면 이 파일 기준, --dir는 현재 디렉터리 기준)"""
+    if directory is None:
+        directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.GOLDEN_TRACE_DIR)
+    return os.path.join(directory, f'{name}.npz')
+
+
+def save(name, trace, directory=None):
+    """기준 기록 저장"""
+    path = golden_path(name, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, times=trace.times, angles=trace.angles, ticks=trace.ticks,
+                        sent=trace.sent, end=trace.end, config=trace.config)
+
+
+def load(name, directory=None):
+    """기준 기록 불러오기 (없으면 None)"""
+    try:
+        with np.load(golden_path(name, directory)) as data:
+            return Trace(times=data['times'], angles=data['angles'], ticks=data['ticks'],
+                         sent=data['sent'], end=float(data['end']), config=str(data['config']))
+    except FileNotFoundError:
+        return None
+
+
+def compare(trace, golden, angle_tol=None, tick_tol=None, time_tol=None):
+    """
+    기록을 기준 기록과 비교
+
+    Returns:
+        list: 차이 설명 (빈 리스트면 허용 오차 안에서 같음)
+    """
+    if angle_tol is None:
+        angle_tol = config.GOLDEN_ANGLE_TOLERANCE
+    if tick_tol is None:
+        tick_tol = config.GOLDEN_TICK_TOLERANCE
+    if time_tol is None:
+        time_tol = config.GOLDEN_TIME_TOLERANCE
+
+    if len(trace.times) != len(golden.times):
+        return [f"프레임 수가 다릅니다 ({len(trace.times)}개, 기준 {len(golden.times)}개)"]
+
+    errors = []
+    if not np.array_equal(trace.sent, golden.sent):
+        frame = int(np.flatnonzero((trace.sent != golden.sent).any(axis=(1, 2)))[0])
+        errors.append(f"프레임 {frame}: 전송한 채널이 다릅니다")
+
+    checks = (('시각', trace.times, golden.times, time_tol, '초'),
+              ('채널 각도', trace.angles, golden.angles, angle_tol, '도'),
+              ('PWM 틱', trace.ticks.astype(int), golden.ticks.astype(int), tick_tol, '틱'))
+    for label, values, expected, tol, unit in checks:
+        diff = np.abs(values - expected)
+        if len(diff) and diff.max() > tol:
+            frame = int(np.unravel_index(np.argmax(diff), diff.shape)[0])
+            errors.append(f"{label} 차이 최대 {diff.max():.3g}{unit} (프레임 {frame}, "
+                          f"허용 {tol:g}{unit}, {int((diff > tol).sum())}개 값)")
+
+    if abs(trace.end - golden.end) > time_tol:
+        errors.append(f"동작 시간이 다릅니다 ({trace.end:.4f}초, 기준 {golden.end:.4f}초)")
+    return errors
+
+
+# ============================================================================
+# IK 퍼징
+# ============================================================================
+
+def _workspace_points(rng, count):
+    """작업 공간을 감싸는 상자 안의 임의 좌표 + 다리 인덱스"""
+    reach = config.UPPER_SEG_LENGTH + config.LOWER_SEG_LENGTH + abs(config.IK_SHOULDER_OFFSET)
+    x = rng.uniform(-reach, reach, count)
+    y = rng.uniform(-reach, reach, count)
+    z = rng.uniform(-reach, reach, count)
+    legs = rng.integers(0, len(config.LEG_NAMES), count)
+    return x, y, z, legs
+
+
+def _edge_points():
+    """경계 좌표 (x == 0, y == 0, -0.0, 최대 도달 거리 근처)"""
+    reach = config.UPPER_SEG_LENGTH + config.LOWER_SEG_LENGTH
+    points = [(0.0, y, z) for y in (-3.0, -0.5, 0.5, 3.0) for z in (-10.0, -14.18, -20.0)]
+    points += [(0.0, 0.0, -14.0), (-0.0, 2.0, -14.0), (0.0, -0.0, -14.0),
+               (config.STANDBY_X, 0.0, config.STANDBY_Z), (config.LIE_X, 0.0, config.LIE_Z),
+               (0.0, 0.0, -reach), (reach, 0.0, 0.0), (0.0, 1.0, 0.0)]
+    x, y, z = np.array(points).T
+    return x, y, z
+
+
+def _scalar_check(x, y, z, legs):
+    """coord_to_angles_3d()와 kinematics.ik 비교 → [(좌표, 다리 이름, 내용)]"""
+    shoulder, upper, lower, reachable = kinematics.ik(x, y, z, kinematics.IS_LEFT[legs],
+                                                      kinematics.IS_REAR[legs])
+    expected = np.stack([shoulder, upper, lower], axis=-1)
+    mismatches = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, leg in enumerate(legs.tolist()):
+            point = (float(x[i]), float(y[i]), float(z[i]))
+            try:
+                result = controller.coord_to_angles_3d(*point, bool(kinematics.IS_LEFT[leg]),
+                                                       bool(kinematics.IS_REAR[leg]))
+            except Exception as e:
+                mismatches.append((point, config.LEG_NAMES[leg], f"{type(e).__name__}: {e}"))
+                continue
+            if (result is None) != (not reachable[i]):
+                mismatches.append((point, config.LEG_NAMES[leg], "도달 가능 여부가 다릅니다"))
+            elif result is not None:
+                diff = np.abs(np.array(result) - expected[i]).max()
+                if diff > 1e-9:
+                    mismatches.append((point, config.LEG_NAMES[leg], f"각도 차이 {diff:.3g}도"))
+    return mismatches
+
+
+def _round_trip_error(x, y, z, legs):
+    """IK → FK 왕복 위치 오차 (도달 불가능한 좌표는 0)와 도달 가능 여부"""
+    is_left = kinematics.IS_LEFT[legs]
+    is_rear = kinematics.IS_REAR[legs]
+    shoulder, upper, lower, reachable = kinematics.ik(x, y, z, is_left, is_rear)
+    fx, fy, fz = kinematics.fk(shoulder, upper, lower, is_left, is_rear)
+    error = np.where(reachable, np.sqrt((fx - x)**2 + (fy - y)**2 + (fz - z)**2), 0.0)
+    return error, reachable
+
+
+def fuzz(points=None, seed=0, scalar=20000, chunk=1000000):
+    """
+    IK → FK 왕복 퍼징 + coord_to_angles_3d() 비교
+
+    Args:
+        points: 임의 좌표 수, None이면 config.IK_FUZZ_POINTS
+        seed: 난수 시드
+        scalar: coord_to_angles_3d()와 비교할 임의 좌표 수 (경계 좌표는 항상 포함)
+        chunk: 한 번에 계산할 좌표 수 (메모리 제한)
+
+    Returns:
+        FuzzResult
+    """
+    if points is None:
+        points = config.IK_FUZZ_POINTS
+    rng = np.random.default_rng(seed)
+    reachable_count = near_axis = failures = 0
+    max_error = 0.0
+    worst = None
+
+    # 경계 좌표 (모든 다리)
+    ex, ey, ez = _edge_points()
+    tile = len(config.LEG_NAMES)
+    edge = (np.tile(ex, tile), np.tile(ey, tile), np.tile(ez, tile),
+            np.repeat(np.arange(tile), len(ex)))
+
+    # 첫 묶음은 경계 좌표, 이후 임의 좌표를 chunk개씩
+    sizes = [None] + [min(chunk, points - begin) for begin in range(0, points, chunk)]
+    for size in sizes:
+        x, y, z, legs = edge if size is None else _workspace_points(rng, size)
+        error, reachable = _round_trip_error(x, y, z, legs)
+        reachable_count += int(reachable.sum())
+        near_axis += int((reachable & (np.abs(x) < config.IK_FUZZ_MIN_X)).sum())
+        failures += int((error > config.IK_FUZZ_TOLERANCE).sum())
+        i = int(np.argmax(error))
+        if error[i] > max_error or worst is None:
+            max_error = float(error[i])
+            worst = (float(x[i]), float(y[i]), float(z[i]), config.LEG_NAMES[legs[i]])
+
+    # coord_to_angles_3d() 비교: 경계 좌표 + 별도 시드의 임의 좌표
+    x, y, z, legs = _workspace_points(np.random.default_rng(seed + 1), scalar)
+    mismatches = _scalar_check(*(np.concatenate([e, r]) for e, r in zip(edge, (x, y, z, legs))))
+    scalar_checked = len(edge[3]) + scalar
+
+    return FuzzResult(points=points + len(edge[3]), reachable=reachable_count, near_axis=near_axis,
+                      max_error=max_error, worst=worst, failures=failures,
+                      scalar_checked=scalar_checked, scalar_mismatches=mismatches)
+
+
+def report_fuzz(result):
+    """퍼징 결과 출력, 통과하면 True"""
+    print(f"IK 퍼징: 좌표 {result.points:,}개, 도달 가능 {result.reachable:,}개 "
+          f"(그중 |x| < {config.IK_FUZZ_MIN_X}cm {result.near_axis:,}개)")
+    x, y, z, leg = result.worst
+    print(f"  IK → FK 왕복 오차 최대 {result.max_error:.3g}cm "
+          f"({leg} ({x:.3f}, {y:.3f}, {z:.3f})), 허용 {config.IK_FUZZ_TOLERANCE:g}cm 초과 "
+          f"{result.failures:,}개")
+    print(f"  coord_to_angles_3d() 비교: {result.scalar_checked:,}개, "
+          f"불일치 {len(result.scalar_mismatches)}개")
+    for (x, y, z), leg, detail in result.scalar_mismatches[:10]:
+        print(f"    {leg} ({x:.3f}, {y:.3f}, {z:.3f}): {detail}")
+    return result.failures == 0 and not result.scalar_mismatches
+
+
+# ============================================================================
+# 명령줄
+# ============================================================================
+
+def _selected(names):
+    unknown = [n for n in names if n not in PRIMITIVES]
+    if unknown:
+        raise SystemExit(f"알 수 없는 동작: {', '.join(unknown)} (가능: {', '.join(PRIMITIVES)})")
+    return names or list(PRIMITIVES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동작 함수 골든 트레이스 기록 / 비교, IK 퍼징')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for command, help_text in (('record', '기준 기록 저장'), ('compare', '기준 기록과 비교')):
+        p = sub.add_parser(command, help=help_text)
+        p.add_argument('names', nargs='*', help='동작 이름 (생략하면 전체)')
+        p.add_argument('--dir', help=f'기준 기록 디렉터리 (기본 {config.GOLDEN_TRACE_DIR})')
+    cmp = sub.choices['compare']
+    cmp.add_argument('--angle-tol', type=float, help='채널 각도 허용 오차 (도)')
+    cmp.add_argument('--tick-tol', type=int, help='PWM 틱 허용 오차')
+    cmp.add_argument('--time-tol', type=float, help='프레임 시각 허용 오차 (초)')
+    fz = sub.add_parser('fuzz', help='IK → FK 왕복 퍼징')
+    fz.add_argument('--points', type=int, help=f'좌표 수 (기본 {config.IK_FUZZ_POINTS:,})')
+    fz.add_argument('--seed', type=int, default=0)
+    fz.add_argument('--scalar', type=int, default=20000, help='coord_to_angles_3d()와 비교할 좌표 수')
+    args = parser.parse_args()
+
+    if args.command == 'fuzz':
+        sys.exit(0 if report_fuzz(fuzz(args.points, args.seed, args.scalar)) else 1)
+
+    ok = True
+    for name in _selected(args.names):
+        trace = record(name)
+        if watchdog.armed():
+            # 다음 API 호출까지의 대기 시간에 워치독이 개입하면 안 됨
+            print(f"✗ {name}: 동작이 끝난 뒤에도 워치독 하트비트 감시 중")
+            watchdog.disarm()
+            ok = False
+        if args.command == 'record':
+            save(name, trace, args.dir)
+            print(f"✓ {name}: 프레임 {len(trace.times)}개, {trace.end:.2f}초 → "
+                  f"{golden_path(name, args.dir)}")
+            continue
+
+        golden = load(name, args.dir)
+        if golden is None:
+            print(f"? {name}: 기준 기록 없음 ({golden_path(name, args.dir)})")
+            ok = False
+            continue
+        errors = compare(trace, golden, args.angle_tol, args.tick_tol, args.time_tol)
+        if golden.config != trace.config:
+            print(f"  ⚠ {name}: 기준 기록과 설정이 다릅니다 (차이가 설정 때문일 수 있음)")
+        if errors:
+            ok = False
+            print(f"✗ {name}:")
+            for error in errors:
+                print(f"  - {error}")
+        else:
+            print(f"✓ {name}: 프레임 {len(trace.times)}개 일치")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
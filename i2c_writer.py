@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 비동기 I2C 전송 스레드
+
+전송 스레드 하나가 I2C 버스를 전담합니다. 동작 코드는 프레임을 post()로
+넘기고 바로 다음 프레임 계산을 계속하므로, 느린 트랜잭션이나 I2C 오류가
+보행 계산을 막거나 보행 도중 예외로 튀어나오지 않습니다.
+
+- 최신 값 우선: 버스가 밀려서 전송 전에 새 프레임이 오면 이전 프레임은
+  버리고 (채널별로 새 값으로 덮어써서) 가장 최신 자세만 보냅니다.
+- 일시적 오류 (OSError)는 지수 백오프로 I2C_RETRY_LIMIT번까지 재시도합니다.
+- 재시도가 모두 실패하면 PCA9685를 다시 초기화하고 (set_pwm_freq 포함)
+  최신 프레임을 다시 보냅니다. 그 사이 clear()가 호출되었으면 (비상 동작)
+  실패한 프레임은 다시 보내지 않습니다.
+- 재초기화 후에도 연속으로 I2C_REINIT_LIMIT번 실패하면 더 이상 재시도하지
+  않고 on_fault()를 호출합니다 (컨트롤러는 비상 정지로 연결).
+- 그 밖의 예외 (버그, 드라이버 오류 등)는 전송 스레드를 죽이지 않고 기록한 뒤
+  전송기를 실패 상태로 표시합니다. 실패 상태에서 post()는 호출한 스레드에서
+  바로 전송하므로, 오류가 계속되면 동작 코드로 예외가 전달됩니다.
+- 대기 프레임 수, 버린 프레임 수, 재시도/재초기화 횟수를 기록합니다.
+"""
+
+import threading
+import time
+
+import config
+
+
+class I2CWriter:
+    """
+    I2C 전송 스레드
+
+    Args:
+        write: 프레임 전송 함수 write(on_off), 실패 시 OSError 발생
+        reinit: PCA9685 재초기화 함수 (인자 없음), 실패 시 예외 발생
+        on_fault: 재초기화로도 복구되지 않을 때 호출 (인자 없음, 전송 스레드에서 호출)
+    """
+
+    def __init__(self, write, reinit=None, on_fault=None):
+        self._write = write
+        self._reinit = reinit
+        self._on_fault = on_fault
+        self._cond = threading.Condition()
+        self._pending = None          # 전송 대기 프레임 {채널: (on, off)}
+        self._busy_since = None       # 현재 전송 시작 시각 (None = 대기 중)
+        self._generation = 0          # clear() 호출마다 증가 (실패 프레임 재전송 판단)
+        self._failed_recoveries = 0   # 재초기화 후에도 연속으로 실패한 횟수
+        self.failure = None           # 예상하지 못한 예외 (None = 정상)
+
+        # 통계
+        self.posted = 0
+        self.written = 0
+        self.dropped = 0              # 전송 전에 새 프레임으로 대체된 프레임 수
+        self.retries = 0
+        self.errors = 0               # 재시도까지 모두 실패한 전송 수
+        self.reinits = 0
+        self.faults = 0               # 복구를 포기하고 on_fault()를 호출한 횟수
+        self.write_time = 0.0         # 전송에 걸린 총 시간 (초)
+
+        self._thread = threading.Thread(target=self._run, name='i2c-writer', daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # 생산자 쪽
+    # ------------------------------------------------------------------
+
+    def post(self, on_off):
+        """
+        프레임 전송 요청 (기다리지 않음)
+
+        전송기가 실패 상태이거나 전송 스레드가 멈췄으면 호출한 스레드에서 바로
+        전송합니다. 이때 전송 오류는 호출자에게 그대로 전달됩니다.
+        """
+        if self.failure is not None or not self._thread.is_alive():
+            self._write_direct(on_off)
+            return
+        with self._cond:
+            if self._pending is None:
+                self._pending = dict(on_off)
+            else:
+                # 아직 보내지 못한 프레임은 버리되, 새 프레임에 없는 채널 값은 유지
+                self._pending.update(on_off)
+                self.dropped += 1
+            self.posted += 1
+            self._cond.notify()
+
+    def _write_direct(self, on_off):
+        """실패 상태에서의 동기 전송 (성공하면 실패 상태 해제)"""
+        with self._cond:
+            # 전송 스레드에 남은 이전 프레임이 나중에 덮어쓰지 않도록 버림
+            if self._pending is not None:
+                self._pending = None
+                self.dropped += 1
+            self.posted += 1
+        begin = time.perf_counter()
+        self._write(on_off)
+        self.written += 1
+        self.write_time += time.perf_counter() - begin
+        if self.failure is not None:
+            print("✓ I2C 전송 복구 (전송 스레드 다시 사용)")
+            self.failure = None
+
+    def clear(self):
+        """대기 중인 프레임 버리기 (비상 동작 직전)"""
+        with self._cond:
+            self._generation += 1
+            if self._pending is not None:
+                self._pending = None
+                self.dropped += 1
+
+    def flush(self, timeout=1.0):
+        """
+        대기 프레임이 모두 전송될 때까지 기다림
+
+        Returns:
+            bool: 제한 시간 안에 끝났으면 True
+        """
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while self._pending is not None or self._busy_since is not None:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    @property
+    def queue_depth(self):
+        """전송 대기 프레임 수 (0 또는 1)"""
+        return 0 if self._pending is None else 1
+
+    def busy_time(self):
+        """현재 전송이 진행된 시간 (초, 전송 중이 아니면 0)"""
+        since = self._busy_since
+        return 0.0 if since is None else time.perf_counter() - since
+
+    # ------------------------------------------------------------------
+    # 전송 스레드
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                frame = self._pending
+                generation = self._generation
+                self._pending = None
+                self._busy_since = time.perf_counter()
+
+            try:
+                self._send(frame, generation)
+            except Exception as e:
+                # 예상하지 못한 오류: 스레드는 계속 살려 두고 실패 상태로 표시
+                self.errors += 1
+                self.failure = e
+                print(f"✗ I2C 전송 스레드 오류 ({type(e).__name__}): {e}")
+            finally:
+                with self._cond:
+                    self._busy_since = None
+                    self._cond.notify_all()
+
+    def _send(self, frame, generation):
+        backoff = config.I2C_RETRY_BACKOFF
+        for attempt in range(config.I2C_RETRY_LIMIT + 1):
+            begin = time.perf_counter()
+            try:
+                self._write(frame)
+                self.written += 1
+                self.write_time += time.perf_counter() - begin
+                self._failed_recoveries = 0
+                return
+            except OSError as e:
+                error = e
+            if attempt < config.I2C_RETRY_LIMIT:
+                self.retries += 1
+                time.sleep(backoff)
+                backoff = min(backoff * 2, config.I2C_RETRY_BACKOFF_MAX)
+
+        self.errors += 1
+        print(f"⚠ I2C 전송 실패 ({config.I2C_RETRY_LIMIT}회 재시도): {error}")
+        self._recover(frame, generation)
+
+    def _recover(self, frame, generation):
+        """PCA9685 재초기화 후 프레임 다시 전송 (그 사이 새 프레임이 왔으면 그것을 보냄)"""
+        if self._reinit is None:
+            return
+        if self._failed_recoveries >= config.I2C_REINIT_LIMIT:
+            # 재초기화로도 복구되지 않음: 재시도를 멈추고 비상 정지로 넘김
+            self._failed_recoveries = 0
+            self.faults += 1
+            print(f"✗ I2C 복구 포기 (재초기화 {config.I2C_REINIT_LIMIT}회 후에도 실패)")
+            if self._on_fault is not None:
+                self._on_fault()
+            return
+        self._failed_recoveries += 1
+        try:
+            self._reinit()
+            self.reinits += 1
+            print("✓ PCA9685 재초기화 완료")
+        except Exception as e:
+            print(f"✗ PCA9685 재초기화 실패: {e}")
+            time.sleep(config.I2C_RETRY_BACKOFF_MAX)
+
+        with self._cond:
+            if generation != self._generation:
+                # 그 사이 clear() (비상 동작): 실패한 프레임은 다시 보내지 않음
+                return
+            if self._pending is None:
+                self._pending = frame
+            else:
+                # 새 프레임이 우선, 새 프레임에 없는 채널은 실패한 프레임 값으로 채움
+                self._pending = {**frame, **self._pending}
+
+    # ------------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------------
+
+    def stats(self):
+        return {
+            'queue_depth': self.queue_depth,
+            'posted': self.posted,
+            'written': self.written,
+            'dropped': self.dropped,
+            'retries': self.retries,
+            'errors': self.errors,
+            'reinits': self.reinits,
+            'faults': self.faults,
+            'failed': self.failure is not None,
+        }
+
+    def report(self):
+        """전송 통계 출력"""
+        average = self.write_time / self.written * 1000 if self.written else 0.0
+        print(f"I2C 전송 스레드: 요청 {self.posted}, 전송 {self.written} "
+              f"(평균 {average:.2f}ms), 버림 {self.dropped}, 재시도 {self.retries}, "
+              f"실패 {self.errors}, 재초기화 {self.reinits}, 복구 포기 {self.faults}, "
+              f"대기 {self.queue_depth}")
+        if self.failure is not None:
+            print(f"  ⚠ 실패 상태 (동기 전송 중): {self.failure}")
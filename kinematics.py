@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 벡터화 기구학 (IK / FK)
+
+spot_micro_controller.coord_to_angles_3d()와 같은 계산을 NumPy 배열로
+한 번에 처리합니다. 궤적 전체(수백~수천 프레임)를 미리 각도로
+변환할 때 사용합니다.
+
+배열 형태:
+    positions: (..., 4, 3) 발 좌표 (cm), 다리 순서는 config.LEG_NAMES
+    angles:    (..., 4, 3) [어깨, 상부, 하부] 각도 (도, 캘리브레이션 오프셋 미적용)
+"""
+
+import numpy as np
+import config
+
+# 다리 이름 → 배열 인덱스 (config.LEG_NAMES 순서)
+LEG_INDEX = {leg: i for i, leg in enumerate(config.LEG_NAMES)}
+
+# 다리별 좌/우, 앞/뒤 구분 (config.LEG_NAMES 순서)
+IS_LEFT = np.array(['left' in leg for leg in config.LEG_NAMES])
+IS_REAR = np.array(['rear' in leg for leg in config.LEG_NAMES])
+
+
+def _shoulder_flipped(is_left, is_rear):
+    """어깨 방향이 반전된 다리인지 (front_left, rear_right)"""
+    return np.logical_xor(is_left, is_rear)
+
+
+def ik(x, y, z, is_left=False, is_rear=False, geometry=None):
+    """
+    좌표 → 관절 각도 (원소별, 브로드캐스팅 지원)
+
+    coord_to_angles_3d()와 같은 식을 사용합니다.
+    x == 0 이고 y != 0 인 좌표는 (어깨 오프셋이 없으면) 어깨 각도로 y를 만들 수
+    없으므로 (fk의 y = |x|·tan) 도달 불가능으로 표시합니다.
+
+    Args:
+        x, y, z: 목표 좌표 배열 (cm)
+        is_left: 왼쪽 다리 여부 (배열 가능)
+        is_rear: 뒷다리 여부 (배열 가능)
+        geometry: (어깨 오프셋, 상부 길이, 하부 길이) cm,
+                  None이면 config.IK_SHOULDER_OFFSET / UPPER_SEG_LENGTH / LOWER_SEG_LENGTH
+
+    Returns:
+        (shoulder, upper, lower, reachable): 각도 배열 (도)과 도달 가능 여부
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    z = np.asarray(z, dtype=float)
+    is_left = np.asarray(is_left, dtype=bool)
+    is_rear = np.asarray(is_rear, dtype=bool)
+    if geometry is None:
+        geometry = (config.IK_SHOULDER_OFFSET, config.UPPER_SEG_LENGTH, config.LOWER_SEG_LENGTH)
+    offset, upper_len, lower_len = geometry
+
+    # 왼쪽 다리는 Y를 반전시켜 오른쪽처럼 계산
+    y = np.where(is_left, -y, y)
+
+    # 1. 어깨 각도 (90°가 정면)
+    shoulder = 90.0 + np.degrees(np.arctan2(y, np.abs(x) + offset))
+    shoulder = np.where(_shoulder_flipped(is_left, is_rear), 180.0 - shoulder, shoulder)
+
+    # 2. 어깨 오프셋 적용 (X 방향으로만)
+    effective_x = np.where(x >= 0, x - offset, x + offset)
+
+    # 3. 2D IK (수직 평면)
+    distance = np.hypot(effective_x, z)
+    reachable = (distance <= upper_len + lower_len) & (distance >= abs(upper_len - lower_len))
+    # 어깨 축 위 (x == 0, 오프셋 없음)에서는 y를 만들 수 없음 (fk의 y = |x|·tan)
+    reachable = reachable & ((np.abs(x) + offset != 0) | (y == 0))
+    safe_distance = np.where(distance > 0, distance, 1.0)
+
+    angle_to_target = np.arctan2(z, effective_x)
+
+    cos_alpha = (upper_len**2 + safe_distance**2 - lower_len**2) / (2 * upper_len * safe_distance)
+    alpha = np.arccos(np.clip(cos_alpha, -1.0, 1.0))
+    upper_abs = angle_to_target - alpha
+
+    cos_beta = (upper_len**2 + lower_len**2 - distance**2) / (2 * upper_len * lower_len)
+    beta = np.arccos(np.clip(cos_beta, -1.0, 1.0))
+    lower_abs = upper_abs + (np.pi - beta)
+
+    upper = 180.0 + np.degrees(upper_abs)
+    lower = 180.0 + np.degrees(lower_abs)
+
+    # 왼쪽 다리는 180도 대칭
+    upper = np.where(is_left, 180.0 - upper, upper)
+    lower = np.where(is_left, 180.0 - lower, lower)
+
+    return shoulder, upper, lower, reachable
+
+
+def _motor_frame(shoulder, upper, lower, is_left, is_rear):
+    """왼쪽 / 반전 다리 대칭을 원복한 각도 (fk / joint_positions 공통)"""
+    shoulder = np.asarray(shoulder, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    lower = np.asarray(lower, dtype=float)
+    is_left = np.asarray(is_left, dtype=bool)
+    is_rear = np.asarray(is_rear, dtype=bool)
+
+    # 왼쪽 다리: 180도 대칭 원복
+    upper_motor = np.where(is_left, 180.0 - upper, upper)
+    lower_motor = np.where(is_left, 180.0 - lower, lower)
+    shoulder_motor = np.where(_shoulder_flipped(is_left, is_rear), 180.0 - shoulder, shoulder)
+    return (np.radians(shoulder_motor - 90.0), np.radians(upper_motor - 180.0),
+            np.radians(lower_motor - 180.0))
+
+
+def _plane_to_xyz(plane_x, plane_z, shoulder_rad, is_left, offset=None):
+    """수직 평면 좌표 (어깨 오프셋 제외) → 어깨 기준 좌표"""
+    if offset is None:
+        offset = config.IK_SHOULDER_OFFSET
+    x = np.where(plane_x >= 0, plane_x + offset, plane_x - offset)
+    y = np.abs(x) * np.tan(shoulder_rad)
+    y = np.where(np.asarray(is_left, dtype=bool), -y, y)
+    return x, y, plane_z
+
+
+def fk(shoulder, upper, lower, is_left=False, is_rear=False, geometry=None):
+    """
+    관절 각도 → 좌표 (원소별, 브로드캐스팅 지원)
+
+    set_leg_position_xyz()의 검증 계산과 같은 식을 사용합니다.
+
+    Args:
+        geometry: (어깨 오프셋, 상부 길이, 하부 길이) cm, None이면 config 값 (ik()와 같음)
+                  원소는 배열도 가능 (캘리브레이션 피팅에서 길이 후보를 한 번에 계산)
+
+    Returns:
+        (x, y, z): 발 좌표 배열 (cm)
+    """
+    shoulder_rad, upper_abs, lower_abs = _motor_frame(shoulder, upper, lower, is_left, is_rear)
+    if geometry is None:
+        geometry = (config.IK_SHOULDER_OFFSET, config.UPPER_SEG_LENGTH, config.LOWER_SEG_LENGTH)
+    offset, upper_len, lower_len = geometry
+
+    end_x = upper_len * np.cos(upper_abs) + lower_len * np.cos(lower_abs)
+    end_z = upper_len * np.sin(upper_abs) + lower_len * np.sin(lower_abs)
+
+    return _plane_to_xyz(end_x, end_z, shoulder_rad, is_left, offset)
+
+
+def inverse_kinematics(positions):
+    """
+    네 다리 좌표 배열 → 각도 배열
+
+    Args:
+        positions: (..., 4, 3) 발 좌표 (cm)
+
+    Returns:
+        (angles, reachable):
+            angles: (..., 4, 3) [어깨, 상부, 하부] 각도 (도)
+            reachable: (..., 4) 도달 가능 여부
+    """
+    p = np.asarray(positions, dtype=float)
+    shoulder, upper, lower, reachable = ik(p[..., 0], p[..., 1], p[..., 2], IS_LEFT, IS_REAR)
+    return np.stack([shoulder, upper, lower], axis=-1), reachable
+
+
+def forward_kinematics(angles):
+    """
+    네 다리 각도 배열 → 좌표 배열
+
+    Args:
+        angles: (..., 4, 3) [어깨, 상부, 하부] 각도 (도)
+
+    Returns:
+        np.ndarray: (..., 4, 3) 발 좌표 (cm)
+    """
+    a = np.asarray(angles, dtype=float)
+    x, y, z = fk(a[..., 0], a[..., 1], a[..., 2], IS_LEFT, IS_REAR)
+    return np.stack([x, y, z], axis=-1)
+
+
+def joint_positions(angles):
+    """
+    네 다리 각도 배열 → 무릎 / 발 좌표
+
+    발은 fk와 같고, 무릎은 어깨 회전축과 발을 지나는 다리 평면 위에 있다고 봅니다
+    (무릎 Y = 발 Y × 무릎 깊이 / 발 깊이).
+
+    Args:
+        angles: (..., 4, 3) [어깨, 상부, 하부] 각도 (도)
+
+    Returns:
+        (knees, feet): 각각 (..., 4, 3) 좌표 (cm, 어깨 기준)
+    """
+    a = np.asarray(angles, dtype=float)
+    shoulder_rad, upper_abs, lower_abs = _motor_frame(a[..., 0], a[..., 1], a[..., 2], IS_LEFT, IS_REAR)
+
+    knee_x = config.UPPER_SEG_LENGTH * np.cos(upper_abs)
+    knee_z = config.UPPER_SEG_LENGTH * np.sin(upper_abs)
+    foot_x = knee_x + config.LOWER_SEG_LENGTH * np.cos(lower_abs)
+    foot_z = knee_z + config.LOWER_SEG_LENGTH * np.sin(lower_abs)
+
+    feet = np.stack(_plane_to_xyz(foot_x, foot_z, shoulder_rad, IS_LEFT), axis=-1)
+    knee_x, _, knee_z = _plane_to_xyz(knee_x, knee_z, shoulder_rad, IS_LEFT)
+    depth_ratio = np.where(np.abs(foot_z) > 1e-9, knee_z / np.where(foot_z != 0, foot_z, 1.0), 0.0)
+    knees = np.stack([knee_x, feet[..., 1] * depth_ratio, knee_z], axis=-1)
+    return knees, feet
+
+
+# ============================================================================
+# 서보 캘리브레이션 (관절 각도 ↔ 채널 각도)
+# ============================================================================
+#
+#   채널 각도 = 90 + 게인 × (관절 각도 - 90) + 오프셋
+#
+# 오프셋은 config.SERVO_CALIBRATION_OFFSET, 게인은 config.SERVO_CALIBRATION_SCALE
+# (지정하지 않은 다리는 오프셋 0, 게인 1 → 채널 각도 = 관절 각도).
+
+def calibration_arrays(offsets=None, scales=None):
+    """
+    캘리브레이션 설정 → (4, 3) 배열
+
+    Args:
+        offsets, scales: {다리: [어깨, 상부, 하부]}, None이면 config 값
+
+    Returns:
+        (offsets, scales): 각각 (4, 3) 배열
+    """
+    if offsets is None:
+        offsets = config.SERVO_CALIBRATION_OFFSET
+    if scales is None:
+        scales = config.SERVO_CALIBRATION_SCALE
+    return (np.array([offsets.get(leg, (0, 0, 0)) for leg in config.LEG_NAMES], dtype=float),
+            np.array([scales.get(leg, (1, 1, 1)) for leg in config.LEG_NAMES], dtype=float))
+
+
+def _calibration_defaults(offsets, scales):
+    """None인 쪽만 config 값으로 (지정한 배열은 그대로 사용)"""
+    if offsets is None or scales is None:
+        config_offsets, config_scales = calibration_arrays()
+        if offsets is None:
+            offsets = config_offsets
+        if scales is None:
+            scales = config_scales
+    return offsets, scales
+
+
+def joint_to_channel(angles, offsets=None, scales=None):
+    """관절 각도 (..., 4, 3) → 채널 각도 (offsets / scales 중 None인 쪽은 config 값)"""
+    offsets, scales = _calibration_defaults(offsets, scales)
+    return 90.0 + scales * (np.asarray(angles, dtype=float) - 90.0) + offsets
+
+
+def channel_to_joint(channel_angles, offsets=None, scales=None):
+    """채널 각도 (..., 4, 3) → 관절 각도 (offsets / scales 중 None인 쪽은 config 값)"""
+    offsets, scales = _calibration_defaults(offsets, scales)
+    return 90.0 + (np.asarray(channel_angles, dtype=float) - 90.0 - offsets) / scales
+
+
+def positions_to_array(positions_dict):
+    """{'front_left': (x, y, z), ...} → (4, 3) 배열"""
+    return np.array([positions_dict[leg] for leg in config.LEG_NAMES], dtype=float)
+
+
+def array_to_angles_dict(angles):
+    """(4, 3) 각도 배열 → {'front_left': [s, u, l], ...}"""
+    return {leg: [float(v) for v in angles[i]] for i, leg in enumerate(config.LEG_NAMES)}
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 상태 메트릭 (Prometheus 텍스트 형식)
+
+제어 코드는 카운터 증가 / 히스토그램 버킷 증가만 하고 (잠금 없음, O(1)),
+HTTP 스레드가 요청을 받을 때 그 값을 읽어서 텍스트로 만듭니다.
+스크레이프가 제어 경로를 기다리게 하거나 막지 않습니다.
+
+    curl http://127.0.0.1:9751/metrics
+
+다른 모듈이 이미 모으고 있는 통계 (I2C 전송 스레드, 워치독 등)는
+add_collector()로 등록한 함수가 스크레이프 시점에 읽어 옵니다.
+"""
+
+import bisect
+import threading
+import config
+
+# 시간 히스토그램 기본 버킷 (초)
+TIME_BUCKETS = (0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+_metrics = []
+_collectors = []
+_server = None
+
+
+class Counter:
+    """증가만 하는 값"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        _metrics.append(self)
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        return [(self.name, '', self.value)]
+
+
+class Gauge:
+    """현재 값"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+        _metrics.append(self)
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self):
+        return [(self.name, '', self.value)]
+
+
+class State:
+    """문자열 상태 (예: 현재 동작) - 현재 값의 라벨만 1"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, label, initial='idle'):
+        self.name = name
+        self.help = help_text
+        self.label = label
+        self.value = initial
+        _metrics.append(self)
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self):
+        value = str(self.value).replace('\\', '\\\\').replace('"', '\\"')
+        return [(self.name, f'{{{self.label}="{value}"}}', 1)]
+
+
+class Histogram:
+    """버킷 히스토그램 (버킷별 개수만 저장, 누적은 스크레이프 시 계산)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=TIME_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        _metrics.append(self)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        counts = list(self.counts)
+        out = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            out.append((f'{self.name}_bucket', f'{{le="{bound}"}}', cumulative))
+        cumulative += counts[-1]
+        out.append((f'{self.name}_bucket', '{le="+Inf"}', cumulative))
+        out.append((f'{self.name}_sum', '', self.sum))
+        out.append((f'{self.name}_count', '', cumulative))
+        return out
+
+
+# ============================================================================
+# 컨트롤러 메트릭
+# ============================================================================
+
+frames = Counter('spot_frames_total', '전송한 동작 프레임 수')
+loop_interval = Histogram('spot_loop_interval_seconds', '연속한 동작 프레임 사이 간격')
+loop_rate = Gauge('spot_loop_rate_hz', '동작 중 프레임 전송 속도 (지수 이동 평균)')
+loop_jitter = Histogram('spot_loop_jitter_seconds', '대기 후 예정 시각보다 늦게 깨어난 시간')
+ik_time = Histogram('spot_ik_seconds', '좌표 → 각도 IK 계산 시간 (호출 한 번)')
+ik_failures = Counter('spot_ik_failures_total', '도달 불가능한 좌표로 IK 실패한 횟수')
+i2c_time = Histogram('spot_i2c_write_seconds', '프레임 하나의 I2C 전송 시간')
+clamps = Counter('spot_angle_clamps_total', '0-180도 범위를 벗어나 잘린 채널 값 수')
+current_motion = State('spot_current_motion', '실행 중인 동작', 'motion')
+perception_latency = Histogram('spot_perception_latency_seconds', '카메라 캡처 → 명령을 반영한 서보 프레임 전송')
+
+
+def add_collector(collect):
+    """
+    스크레이프 시점에 값을 읽어 올 함수 등록
+
+    Args:
+        collect: () → [(이름, 종류, 설명, 값), ...] 를 반환하는 함수
+    """
+    _collectors.append(collect)
+
+
+# ============================================================================
+# 출력 / HTTP 서버
+# ============================================================================
+
+def render():
+    """Prometheus 텍스트 형식 (0.0.4)"""
+    lines = []
+    for metric in _metrics:
+        lines.append(f'# HELP {metric.name} {metric.help}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        for name, labels, value in metric.samples():
+            lines.append(f'{name}{labels} {value}')
+    for collect in _collectors:
+        try:
+            collected = collect()
+        except Exception as e:
+            lines.append(f'# 수집 실패: {e}')
+            continue
+        for name, kind, help_text, value in collected:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def _handler_class():
+    # http.server는 서버를 시작할 때만 불러옴 (import 시간 단축)
+    from http.server import BaseHTTPRequestHandler
+
+    class _Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 요청마다 콘솔에 출력하지 않음
+            pass
+
+    return _Handler
+
+
+def start_server(host=None, port=None):
+    """메트릭 HTTP 서버 시작 (백그라운드 스레드), port가 None이면 사용 안 함"""
+    global _server
+    if host is None:
+        host = config.METRICS_HOST
+    if port is None:
+        port = config.METRICS_PORT
+    if not port or _server is not None:
+        return _server
+
+    from http.server import ThreadingHTTPServer
+    _server = ThreadingHTTPServer((host, port), _handler_class())
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name='metrics-http', daemon=True).start()
+    return _server
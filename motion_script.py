@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 모션 스크립트 (선언형 동작 시퀀스)
+
+동작 순서를 파이썬 코드 대신 짧은 텍스트로 작성합니다.
+스크립트는 재생 전에 하나의 시각별 발 좌표 / 각도 타임라인으로 컴파일되고,
+도달 가능 여부 / 각도 범위 / 관절 속도 (/ 안정성 / 자기 간섭)를 먼저 검사합니다.
+재생은 play_frames() 한 번으로 끝나므로 명령 사이에 파이썬 처리 시간이
+끼어들지 않고, 절대 시각 기준이라 시간이 밀리지 않습니다.
+
+문법 (한 줄에 명령 하나, # 뒤는 주석):
+    pose NAME [시간]                    자세로 이동 (pose_library 자세 이름: lie, standby, ...)
+    wait 시간                           대기
+    gait NAME [steps=N] [파라미터=값]   trajectory.GAITS 보행 (STANDBY 기준 오프셋)
+    body [x=] [y=] [z=] [tilt=] [시간]  몸체 오프셋 (cm, 지정하지 않은 값은 유지)
+                                        x: 전후, y: 무게중심 좌우 (body_shift_weight),
+                                        z: 높이 (body_move_up_down), tilt: 기울이기 (tilt_left +)
+    leg NAME [x=] [y=] [z=] [시간]      다리 하나의 발 좌표 오프셋 (cm)
+    repeat N ... end                    반복
+    parallel ... end                    블록 안의 명령을 같은 시각에 시작
+                                        (같은 트랙을 쓰는 명령은 함께 둘 수 없음)
+
+트랙: pose/gait는 'pose', body는 'body', leg는 'leg.NAME'.
+최종 발 좌표 = pose + gait 오프셋 + body 오프셋 + leg 오프셋.
+
+예시:
+    pose standby 1.5
+    parallel
+        gait walk_forward steps=4 step_duration=0.4
+        body z=1.0 0.5
+    end
+    body z=0 0.5
+"""
+
+import collections
+import os
+
+import numpy as np
+import collision
+import config
+import kinematics
+import pose_library
+import stability
+import trajectory
+
+# 명령별 기본 이동 시간 (초)
+DEFAULT_POSE_DURATION = 1.0
+DEFAULT_MOVE_DURATION = 0.5
+
+# 각도 범위 검사 허용 오차 (도) - 엎드린 자세가 범위 경계에 있음
+_LIMIT_TOLERANCE = 0.01
+
+_RIGHT_SIGN = np.where(kinematics.IS_LEFT, -1.0, 1.0)
+_STANDBY = np.tile([config.STANDBY_X, config.STANDBY_Y, config.STANDBY_Z], (4, 1)).astype(float)
+
+# 모듈 상수가 의존하는 설정 (config_loader 패턴, 바뀌면 clear_cache)
+CONFIG_DEPENDENCIES = ('STANDBY_*',)
+
+
+class ScriptError(ValueError):
+    """스크립트 문법 / 검증 오류 (줄 번호 포함)"""
+
+
+CompiledScript = collections.namedtuple(
+    'CompiledScript', ['name', 'times', 'positions', 'angles', 'phases', 'warnings'])
+
+
+# ============================================================================
+# 파싱
+# ============================================================================
+
+Command = collections.namedtuple('Command', ['kind', 'line', 'args', 'body'])
+
+
+def _number(token, line, what="값"):
+    try:
+        return float(token)
+    except ValueError:
+        raise ScriptError(f"{line}번째 줄: {what}이(가) 숫자가 아닙니다: '{token}'") from None
+
+
+def _split_args(tokens, line, allowed_keys):
+    """'key=value' 토큰과 위치 인자(숫자) 분리"""
+    keys = {}
+    positional = []
+    for token in tokens:
+        if '=' in token:
+            key, value = token.split('=', 1)
+            if allowed_keys is not None and key not in allowed_keys:
+                raise ScriptError(f"{line}번째 줄: 알 수 없는 파라미터 '{key}'")
+            keys[key] = _number(value, line, key)
+        else:
+            positional.append(_number(token, line, "시간"))
+    return keys, positional
+
+
+def _duration(positional, line, default):
+    if len(positional) > 1:
+        raise ScriptError(f"{line}번째 줄: 시간은 하나만 지정할 수 있습니다")
+    duration = positional[0] if positional else default
+    if duration < 0:
+        raise ScriptError(f"{line}번째 줄: 시간은 0 이상이어야 합니다")
+    return duration
+
+
+def _parse_line(tokens, line):
+    kind, rest = tokens[0], tokens[1:]
+
+    if kind == 'pose':
+        if not rest:
+            raise ScriptError(f"{line}번째 줄: pose 이름이 없습니다")
+        name = rest[0]
+        try:
+            pose_library.get(name)
+        except ValueError as e:
+            raise ScriptError(f"{line}번째 줄: {e}") from None
+        _, positional = _split_args(rest[1:], line, ())
+        return Command('pose', line, {'name': name,
+                                      'duration': _duration(positional, line, DEFAULT_POSE_DURATION)}, None)
+
+    if kind == 'wait':
+        _, positional = _split_args(rest, line, ())
+        if not positional:
+            raise ScriptError(f"{line}번째 줄: wait 시간이 없습니다")
+        return Command('wait', line, {'duration': _duration(positional, line, 0.0)}, None)
+
+    if kind == 'gait':
+        if not rest:
+            raise ScriptError(f"{line}번째 줄: gait 이름이 없습니다")
+        name = rest[0]
+        params, positional = _split_args(rest[1:], line, None)
+        if positional:
+            raise ScriptError(f"{line}번째 줄: gait 길이는 steps=N으로 지정합니다")
+        steps = params.pop('steps', 1)
+        if steps < 1 or steps != int(steps):
+            raise ScriptError(f"{line}번째 줄: steps는 1 이상의 정수여야 합니다")
+        try:
+            params = trajectory.gait_params(name, **params)
+        except ValueError as e:
+            raise ScriptError(f"{line}번째 줄: {e}") from None
+        for key, value in params.items():
+            if key.endswith(('_duration', '_height')) and value <= 0:
+                raise ScriptError(f"{line}번째 줄: {key}은(는) 0보다 커야 합니다 ({value:g})")
+        return Command('gait', line, {'name': name, 'steps': int(steps), 'params': params}, None)
+
+    if kind == 'body':
+        keys, positional = _split_args(rest, line, ('x', 'y', 'z', 'tilt'))
+        return Command('body', line, {'keys': keys,
+                                      'duration': _duration(positional, line, DEFAULT_MOVE_DURATION)}, None)
+
+    if kind == 'leg':
+        if not rest or rest[0] not in config.LEG_NAMES:
+            raise ScriptError(f"{line}번째 줄: 다리 이름이 필요합니다 ({', '.join(config.LEG_NAMES)})")
+        keys, positional = _split_args(rest[1:], line, ('x', 'y', 'z'))
+        return Command('leg', line, {'leg': rest[0], 'keys': keys,
+                                     'duration': _duration(positional, line, DEFAULT_MOVE_DURATION)}, None)
+
+    raise ScriptError(f"{line}번째 줄: 알 수 없는 명령 '{kind}'")
+
+
+def parse(text):
+    """
+    스크립트 텍스트 → 명령 트리
+
+    Returns:
+        list[Command]: 최상위 명령 목록 (repeat / parallel은 body에 하위 명령)
+    """
+    root = []
+    stack = [(None, root)]          # (블록 명령, 하위 명령 목록)
+
+    for line, raw in enumerate(text.splitlines(), start=1):
+        tokens = raw.split('#', 1)[0].split()
+        if not tokens:
+            continue
+        kind = tokens[0]
+
+        if kind == 'end':
+            if len(stack) == 1:
+                raise ScriptError(f"{line}번째 줄: 짝이 없는 end")
+            block, children = stack.pop()
+            if not children:
+                raise ScriptError(f"{block.line}번째 줄: 빈 {block.kind} 블록")
+            continue
+
+        if kind == 'repeat':
+            if len(tokens) != 2:
+                raise ScriptError(f"{line}번째 줄: repeat 횟수가 필요합니다")
+            count = _number(tokens[1], line, "반복 횟수")
+            if count < 1 or count != int(count):
+                raise ScriptError(f"{line}번째 줄: 반복 횟수는 1 이상의 정수여야 합니다")
+            block = Command('repeat', line, {'count': int(count)}, [])
+        elif kind == 'parallel':
+            block = Command('parallel', line, {}, [])
+        else:
+            stack[-1][1].append(_parse_line(tokens, line))
+            continue
+
+        stack[-1][1].append(block)
+        stack.append((block, block.body))
+
+    if len(stack) > 1:
+        block = stack[-1][0]
+        raise ScriptError(f"{block.line}번째 줄: {block.kind} 블록에 end가 없습니다")
+    if not root:
+        raise ScriptError("스크립트에 명령이 없습니다")
+    return root
+
+
+# ============================================================================
+# 타임라인 구성
+# ============================================================================
+
+class _Track:
+    """키프레임 트랙 (구간마다 최소 저크 보간, 구간 사이는 유지)"""
+
+    def __init__(self, initial):
+        self.times = [0.0]
+        self.values = [np.asarray(initial, dtype=float)]
+
+    @property
+    def value(self):
+        return self.values[-1]
+
+    def move(self, start, duration, target):
+        if start > self.times[-1]:
+            self.times.append(start)
+            self.values.append(self.value)
+        self.times.append(start + duration)
+        self.values.append(np.asarray(target, dtype=float))
+
+    def sample(self, t):
+        """t: (N,) → (N, ...) 값"""
+        times = np.array(self.times)
+        values = np.array(self.values)
+        idx = np.clip(np.searchsorted(times, t, side='right') - 1, 0, len(times) - 1)
+        nxt = np.minimum(idx + 1, len(times) - 1)
+        h = times[nxt] - times[idx]
+        u = np.where(h > 0, (t - times[idx]) / np.where(h > 0, h, 1.0), 1.0)
+        u = np.clip(u, 0.0, 1.0)
+        s = u * u * u * (10 - 15 * u + 6 * u * u)
+        s = s.reshape((-1,) + (1,) * (values.ndim - 1))
+        return values[idx] + (values[nxt] - values[idx]) * s
+
+
+def _tracks_of(command):
+    """명령이 사용하는 트랙 이름 집합"""
+    if command.kind in ('pose', 'gait'):
+        return {'pose'}
+    if command.kind == 'body':
+        return {'body'}
+    if command.kind == 'leg':
+        return {f"leg.{command.args['leg']}"}
+    if command.kind in ('repeat', 'parallel'):
+        return set().union(*(_tracks_of(c) for c in command.body))
+    return set()
+
+
+class _Timeline:
+
+    def __init__(self, start):
+        self.pose = _Track(start)
+        self.body = _Track(np.zeros(4))                 # x, y, z, tilt
+        self.legs = {leg: _Track(np.zeros(3)) for leg in config.LEG_NAMES}
+        self.gaits = []                                 # (시작, 스플라인, 한 스텝 시간)
+        self.spans = []                                 # (시작, 끝, 줄 번호) - 오류 위치 표시용
+
+    def schedule(self, command, t):
+        """명령을 시각 t에 배치하고 끝나는 시각 반환"""
+        kind, args = command.kind, command.args
+
+        if kind == 'repeat':
+            for _ in range(args['count']):
+                for child in command.body:
+                    t = self.schedule(child, t)
+            return t
+
+        if kind == 'parallel':
+            used = {}
+            for child in command.body:
+                for track in _tracks_of(child):
+                    if track in used:
+                        raise ScriptError(f"{child.line}번째 줄: '{track}' 트랙을 "
+                                          f"{used[track]}번째 줄과 동시에 사용할 수 없습니다")
+                    used[track] = child.line
+            return max(self.schedule(child, t) for child in command.body)
+
+        if kind == 'wait':
+            end = t + args['duration']
+        elif kind == 'pose':
+            end = t + args['duration']
+            self.pose.move(t, args['duration'], pose_library.get(args['name']).positions)
+        elif kind == 'gait':
+            try:
+                times, positions = trajectory.gait_keyframes(args['name'], args['steps'], **args['params'])
+            except ValueError as e:
+                raise ScriptError(f"{command.line}번째 줄: {e}") from None
+            spline = trajectory.KeyframeSpline(times, positions, kind=config.TRAJECTORY_SPLINE)
+            self.gaits.append((t, spline, spline.duration / args['steps']))
+            end = t + spline.duration
+            # gait 동안 pose 트랙은 유지 (겹치는 pose 명령 방지)
+            self.pose.move(t, spline.duration, self.pose.value)
+        elif kind == 'body':
+            target = self.body.value.copy()
+            for i, key in enumerate(('x', 'y', 'z', 'tilt')):
+                if key in args['keys']:
+                    target[i] = args['keys'][key]
+            end = t + args['duration']
+            self.body.move(t, args['duration'], target)
+        else:  # leg
+            track = self.legs[args['leg']]
+            target = track.value.copy()
+            for i, key in enumerate('xyz'):
+                if key in args['keys']:
+                    target[i] = args['keys'][key]
+            end = t + args['duration']
+            track.move(t, args['duration'], target)
+
+        self.spans.append((t, end, command.line))
+        return end
+
+    def sample(self, t):
+        """(N,) 시각 → (발 좌표 (N, 4, 3), 보행 위상 (N,))"""
+        feet = self.pose.sample(t)
+        phases = np.full(len(t), np.nan)
+
+        for start, spline, cycle in self.gaits:
+            mask = (t >= start) & (t <= start + spline.duration)
+            if mask.any():
+                local = t[mask] - start
+                feet[mask] += spline(local) - _STANDBY
+                phases[mask] = (local / cycle) % 1.0
+
+        body = self.body.sample(t)
+        feet[:, :, 0] += body[:, 0, np.newaxis]
+        feet[:, :, 1] += body[:, 1, np.newaxis] * _RIGHT_SIGN + body[:, 3, np.newaxis]
+        feet[:, :, 2] += body[:, 2, np.newaxis]
+
+        for i, leg in enumerate(config.LEG_NAMES):
+            feet[:, i] += self.legs[leg].sample(t)
+        return feet, phases
+
+    def line_at(self, time):
+        """시각 time에 실행 중인 명령의 줄 번호 (가장 나중에 시작한 명령)"""
+        lines = [line for start, end, line in self.spans if start <= time <= end]
+        return lines[-1] if lines else None
+
+
+# ============================================================================
+# 컴파일 / 검증
+# ============================================================================
+
+def _violation(timeline, times, frames, message):
+    index = int(np.flatnonzero(frames)[0])
+    line = timeline.line_at(times[index])
+    where = f"{line}번째 줄" if line is not None else "스크립트"
+    return f"{where} ({times[index]:.2f}초): {message} (프레임 {int(frames.sum())}개)"
+
+
+def compile_script(text, start=None, rate=None, name='<script>'):
+    """
+    스크립트 → 검증된 타임라인
+
+    Args:
+        text: 스크립트 텍스트
+        start: (4, 3) 시작 발 좌표 (현재 자세), None이면 STANDBY
+        rate: 샘플링 주기 (Hz), None이면 config.CONTROL_RATE
+        name: 출력용 이름
+
+    Returns:
+        CompiledScript: times (N,), positions (N, 4, 3), angles (N, 4, 3),
+                        phases (N,) (보행 중이 아니면 NaN), warnings
+
+    Raises:
+        ScriptError: 문법 오류, 도달 불가능 / 각도 범위 / 속도 초과 프레임,
+                     STABILITY_GUARD / COLLISION_GUARD가 'block'일 때
+                     불안정 / 간섭 프레임
+    """
+    commands = parse(text)
+    timeline = _Timeline(_STANDBY if start is None else start)
+    end = 0.0
+    for command in commands:
+        end = timeline.schedule(command, end)
+    if end <= 0:
+        raise ScriptError("스크립트 길이가 0초입니다")
+
+    try:
+        times = trajectory.sample_times(end, rate)
+        feet, phases = timeline.sample(times)
+        angles, reachable = kinematics.inverse_kinematics(feet)
+    except ValueError as e:
+        # 재생 쪽은 ScriptError만 처리하므로 다른 검증 오류도 같은 형태로
+        raise ScriptError(f"{name}: {e}") from None
+
+    errors = []
+    unreachable = ~reachable.all(axis=1)
+    if unreachable.any():
+        errors.append(_violation(timeline, times, unreachable, "도달 불가능한 좌표"))
+    else:
+        out_of_range = ((angles < config.ANGLE_MIN_LIMIT - _LIMIT_TOLERANCE) |
+                        (angles > config.ANGLE_MAX_LIMIT + _LIMIT_TOLERANCE)).any(axis=(1, 2))
+        if out_of_range.any():
+            errors.append(_violation(timeline, times, out_of_range,
+                                     f"각도 범위 초과 ({config.ANGLE_MIN_LIMIT}-{config.ANGLE_MAX_LIMIT}도)"))
+
+        speed = np.abs(np.diff(angles, axis=0)) / np.diff(times)[:, np.newaxis, np.newaxis]
+        too_fast = np.concatenate([[False], (speed > config.SERVO_MAX_SPEED).any(axis=(1, 2))])
+        if too_fast.any():
+            errors.append(_violation(timeline, times, too_fast,
+                                     f"관절 속도 초과 (최대 {speed.max():.0f}도/초 > "
+                                     f"{config.SERVO_MAX_SPEED:.0f}도/초)"))
+
+    warnings = []
+    if config.STABILITY_GUARD != 'off' and not errors:
+        # 몸체가 바닥에 닿은 자세(엎드리기)는 다리로 지지하지 않으므로 제외
+        standing = (feet[:, :, 2] <= -config.SERVO_IDLE_MAX_FOOT_DEPTH).any(axis=1)
+        if standing.any():
+            result = stability.analyze_trajectory(feet)
+            unstable = result['tip_over'] & standing
+            if unstable.any():
+                message = _violation(timeline, times, unstable,
+                                     f"불안정 (최소 여유 {result['margin'][standing].min():.2f}cm)")
+                (errors if config.STABILITY_GUARD == 'block' else warnings).append(message)
+
+    if config.COLLISION_GUARD != 'off' and not errors:
+        result = collision.check_trajectory(angles)
+        if not result['clear']:
+            message = _violation(timeline, times, result['colliding'],
+                                 f"자기 간섭 ({result['worst_pair']}, 최소 간격 "
+                                 f"{result['min_clearance']:.2f}cm)")
+            (errors if config.COLLISION_GUARD == 'block' else warnings).append(message)
+
+    if errors:
+        raise ScriptError(f"{name}:\n  " + "\n  ".join(errors))
+
+    return CompiledScript(name=name, times=times, positions=feet, angles=angles,
+                          phases=phases, warnings=warnings)
+
+
+def load(source, start=None, rate=None):
+    """
+    파일 경로 또는 스크립트 텍스트를 컴파일
+
+    Args:
+        source: 스크립트 파일 경로 또는 텍스트
+    """
+    if '\n' not in source and os.path.isfile(source):
+        with open(source, encoding='utf-8') as f:
+            return compile_script(f.read(), start, rate, name=os.path.basename(source))
+    return compile_script(source, start, rate)
+
+
+def clear_cache():
+    """기본 자세 좌표 다시 읽기 (설정 변경 후 호출)"""
+    _STANDBY[:] = (config.STANDBY_X, config.STANDBY_Y, config.STANDBY_Z)
+
+
+# 기본 데모 (spot_micro_controller.demo_sequence)
+DEMO_SCRIPT = """
+# 엎드린 상태에서 시작
+pose lie 2.0
+wait 1
+pose standby 2.0
+wait 1
+
+# 왼쪽 / 오른쪽 기울이기
+body tilt=0.2 1.0
+wait 0.5
+body tilt=0 0.5
+wait 0.5
+body tilt=-0.2 1.0
+wait 0.5
+body tilt=0 0.5
+wait 1
+
+# 걷기
+gait walk_forward steps=4 step_duration=0.4
+wait 1
+
+# 마무리
+pose lie 2.0
+"""
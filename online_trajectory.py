@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 온라인 저크 제한 궤적 생성기 (매 제어 주기 목표 변경 가능)
+
+현재 위치 / 속도 / 가속도에서 목표 위치까지 속도, 가속도, 저크 제한 안에서
+움직이는 궤적을 제어 주기마다 한 걸음씩 계산합니다. 목표는 아무 주기에나 바꿀 수
+있고, 바꾼 주기부터 현재 속도 / 가속도를 이어서 새 목표로 향합니다 (점프 없음).
+
+축마다 이번 주기에 쓸 저크를 고릅니다:
+    1. 세 주기 만에 목표에 정확히 멈추는 저크가 제한 안이면 그대로 사용 (마무리)
+    2. 아니면 이번 주기 저크 후보 K개로 한 주기 진행한 상태를 계산하고
+       (후보 × 축 배열 한 번에), 그 상태에서 바로 제동해도 (저크 제한 감속 →
+       속도 0, 가속도 0) 목표를 넘지 않고 속도 제한을 지키는 가장 큰 저크를 선택
+모든 축 (관절 12개, 발 좌표, 몸체 이동 등 배열 모양 그대로)을 한 번에 계산합니다.
+
+    otg = OnlineTrajectory(angles, max_velocity=300, max_acceleration=4000, max_jerk=60000)
+    otg.set_target(new_angles)        # 아무 주기에나 (이동 중이어도)
+    angles = otg.step(1 / 50)         # 제어 주기마다, 다음 위치 (내부 배열)
+    otg.settled                       # 목표에 멈췄으면 True
+"""
+
+import numpy as np
+import config
+
+# 한 주기 저크 후보 수 (홀수: 가운데 후보가 저크 0)
+_CANDIDATES = 65
+
+# 제동 거리 계산에 쓰는 저크 비율 (1이면 주기 단위 저크로 따라가지 못해 목표를 지나침)
+_PLAN_JERK = 0.35
+
+
+def _limit(value):
+    """제한 값 (스칼라는 float로 두어 원소별 연산을 빠르게)"""
+    value = np.asarray(value, dtype=float)
+    return float(value) if value.ndim == 0 else value
+
+
+def _deadbeat_matrix(dt, _cache={}):
+    """
+    상태 (위치 오차, 속도, 가속도) → 세 주기 만에 (목표, 속도 0, 가속도 0)에 도달하는
+    저크와 각 주기 끝 상태 (12, 3) 행렬 (이산 시간 삼중 적분기, 주기별 캐시)
+
+    행: 저크 ×3, 가속도 ×3, 속도 ×3, 남은 위치 오차 ×3
+    """
+    matrix = _cache.get(dt)
+    if matrix is None:
+        # 상태 x = [위치 - 목표, 속도, 가속도], 저크 u: x' = step @ x + inputs * u
+        step = np.array([[1.0, dt, dt**2 / 2], [0.0, 1.0, dt], [0.0, 0.0, 1.0]])
+        inputs = np.array([dt**3 / 6, dt**2 / 2, dt])
+        reach = np.column_stack([step @ step @ inputs, step @ inputs, inputs])
+        gain = -np.linalg.solve(reach, np.linalg.matrix_power(step, 3))
+        # 입력 상태는 [목표 - 위치, 속도, 가속도]
+        flip = np.diag([-1.0, 1.0, 1.0])
+        rows = [gain @ flip]
+        state = flip
+        states = []
+        for k in range(3):
+            state = step @ state + np.outer(inputs, gain[k] @ flip)
+            states.append(state)
+        rows.append(np.array([x[2] for x in states]))
+        rows.append(np.array([x[1] for x in states]))
+        rows.append(np.array([-x[0] for x in states]))
+        matrix = _cache[dt] = np.concatenate(rows)
+    return matrix
+
+
+def stop_distance(velocity, acceleration, max_acceleration, max_jerk):
+    """
+    지금부터 가장 빨리 멈출 때 (속도 0, 가속도 0) 이동 거리 (원소별)
+
+    저크 ±max_jerk로 가속도를 최대 max_acceleration까지 바꾼 뒤 (필요하면 유지)
+    다시 0으로 되돌리는 제동 프로파일의 이동 거리입니다.
+    """
+    J = max_jerk
+    half_inv_jerk = 0.5 / J
+    aa = acceleration * acceleration
+    # 가속도를 바로 0으로 줄였을 때의 속도 부호 (제동 가속도는 반대 방향)
+    sign = np.copysign(1.0, velocity + acceleration * np.abs(acceleration) * half_inv_jerk)
+    # 제동 방향을 +로 본 속도 / 가속도는 -u, -b
+    u = sign * velocity
+    b = sign * acceleration
+
+    # 삼각 프로파일 최대 가속도, 제한을 넘으면 사다리꼴 (유지 구간 t2)
+    peak = np.minimum(np.sqrt(np.maximum(aa * 0.5 + u * J, 0.0)), max_acceleration)
+    pp = peak * peak
+    t1 = (peak + b) / J
+    t2 = np.maximum((u - (2 * pp - aa) * half_inv_jerk) / np.maximum(peak, 1e-12), 0.0)
+
+    # 구간별 이동 거리: 가속도 증가 (t1), 유지 (t2), 0으로 복귀 (peak / J, 끝 속도 0)
+    ramp = t1 * (t1 * (J / 6 * t1 - 0.5 * b) - u)
+    hold = t2 * (pp * half_inv_jerk + 0.5 * peak * t2)
+    return sign * (hold + pp * peak / (6 * J * J) - ramp)
+
+
+class OnlineTrajectory:
+    """
+    축별 저크 제한 궤적 (배열 모양 그대로, 원소 하나가 축 하나)
+
+    Attributes:
+        position, velocity, acceleration: 현재 상태 배열
+        target: 목표 위치 배열
+        max_velocity, max_acceleration, max_jerk: 제한 (스칼라 또는 같은 모양 배열)
+        tolerance: 목표 도달 판정 위치 오차
+        settled: 모든 축이 목표에 멈췄으면 True
+    """
+
+    __slots__ = ('position', 'velocity', 'acceleration', 'target', 'max_velocity',
+                 'max_acceleration', 'max_jerk', 'tolerance', 'settled', '_grid')
+
+    def __init__(self, position, max_velocity=None, max_acceleration=None, max_jerk=None,
+                 tolerance=None):
+        """
+        Args:
+            position: 시작 위치 (이 배열 모양으로 계산)
+            max_velocity, max_acceleration, max_jerk: 제한,
+                None이면 config.ONLINE_MAX_JOINT_SPEED / ACCEL / JERK (관절 각도 단위)
+            tolerance: 도달 판정 오차, None이면 config.ONLINE_SETTLE_TOLERANCE
+        """
+        self.position = np.array(position, dtype=float)
+        self.velocity = np.zeros_like(self.position)
+        self.acceleration = np.zeros_like(self.position)
+        self.target = self.position.copy()
+        self.set_limits(max_velocity, max_acceleration, max_jerk, tolerance)
+        self.settled = True
+        shape = (_CANDIDATES,) + (1,) * self.position.ndim
+        self._grid = np.linspace(0.0, 1.0, _CANDIDATES).reshape(shape)
+
+    def set_limits(self, max_velocity=None, max_acceleration=None, max_jerk=None, tolerance=None):
+        """제한 변경 (None이면 config 값, 설정 변경 후 다시 호출)"""
+        self.max_velocity = _limit(config.ONLINE_MAX_JOINT_SPEED if max_velocity is None
+                                   else max_velocity)
+        self.max_acceleration = _limit(config.ONLINE_MAX_JOINT_ACCEL if max_acceleration is None
+                                       else max_acceleration)
+        self.max_jerk = _limit(config.ONLINE_MAX_JOINT_JERK if max_jerk is None else max_jerk)
+        self.tolerance = config.ONLINE_SETTLE_TOLERANCE if tolerance is None else tolerance
+
+    def reset(self, position, velocity=None, acceleration=None):
+        """상태를 바로 설정 (목표도 그 위치로)"""
+        self.position[:] = position
+        self.velocity[:] = 0.0 if velocity is None else velocity
+        self.acceleration[:] = 0.0 if acceleration is None else acceleration
+        self.target[:] = self.position
+        self.settled = velocity is None and acceleration is None
+
+    def set_target(self, target):
+        """새 목표 위치 (이동 중에도 가능, 현재 속도 / 가속도에서 이어서)"""
+        np.copyto(self.target, target)
+        self.settled = False
+
+    def _deadbeat(self, error, v, a, dt):
+        """
+        세 주기 만에 (목표, 속도 0, 가속도 0)에 도달하는 저크 (이산 시간 삼중 적분기)
+
+        Returns:
+            (jerk, reachable): 이번 주기 저크, 세 주기 동안 제한 안이고 목표를 지나치지 않는 축
+        """
+        shape = error.shape
+        rows = (_deadbeat_matrix(dt) @ np.stack([error.ravel(), v.ravel(), a.ravel()]))
+        rows = rows.reshape((4, 3) + shape)
+        jerk, accel, velocity, remaining = rows
+        reachable = ((np.abs(jerk) <= self.max_jerk).all(axis=0)
+                     & (np.abs(accel) <= self.max_acceleration).all(axis=0)
+                     & (np.abs(velocity) <= self.max_velocity).all(axis=0)
+                     & ((remaining * np.sign(error)) >= -self.tolerance).all(axis=0))
+        return jerk[0], reachable
+
+    def _braking_jerk(self, error, v, a, dt):
+        """제동해도 목표를 넘지 않고 속도 제한을 지키는 가장 큰 저크 (목표 방향)"""
+        A = self.max_acceleration
+        J = self.max_jerk
+        V = self.max_velocity
+        # 제동 계획은 저크 여유를 두고 계산 (주기 중간의 저크 전환을 다음 주기에 따라잡을 수 있게)
+        J_plan = np.minimum(J, A / dt) * _PLAN_JERK
+
+        # 목표 방향 (지금 제동해도 못 미치면 +, 넘어가면 -) 기준으로 부호를 맞춤
+        direction = np.where(error - stop_distance(v, a, A, J_plan) >= 0, 1.0, -1.0)
+        e = direction * error
+        vm = direction * v
+        am = direction * a
+        ahead = e >= 0
+
+        # 저크 후보 (가속도 제한 안에서)
+        low = np.maximum(-J, (-A - am) / dt)
+        high = np.maximum(np.minimum(J, (A - am) / dt), low)
+        jerk = low + (high - low) * self._grid
+        a_next = am + jerk * dt
+        v_next = vm + am * dt + jerk * (dt**2 / 2)
+        left = e - (vm * dt + am * (dt**2 / 2) + jerk * (dt**3 / 6))
+
+        # 제동 후 위치가 목표를 넘지 않고 (목표가 앞에 있으면 이번 주기 끝 위치도)
+        # 속도 제한 안인 가장 큰 후보 (조건은 저크에 대해 단조)
+        safe = ((left >= stop_distance(v_next, a_next, A, J_plan))
+                & (v_next + np.maximum(a_next, 0.0)**2 / (2 * J) <= V)
+                & ((left >= 0) | ~ahead))
+        last = np.maximum(safe.sum(axis=0) - 1, 0)
+
+        # 반대 방향 속도 제한이 우선 (목표에 맞춰 덜 제동하느라 속도 제한을 넘지 않게)
+        trough = v_next - np.minimum(a_next, 0.0)**2 / (2 * J) >= -V
+        first = np.minimum(_CANDIDATES - trough.sum(axis=0), _CANDIDATES - 1)
+        index = np.maximum(last, first)
+        return direction * (low + (high - low) * (index / (_CANDIDATES - 1)))
+
+    def step(self, dt):
+        """
+        한 제어 주기 진행
+
+        Args:
+            dt: 주기 (초)
+
+        Returns:
+            np.ndarray: 다음 위치 (내부 배열, 다음 호출 전까지만 사용)
+        """
+        if self.settled:
+            return self.position
+
+        p, v, a = self.position, self.velocity, self.acceleration
+        error = self.target - p
+
+        # 세 주기 안에 목표에 정확히 멈출 수 있으면 (제한 안에서) 그 저크를 그대로 사용
+        final, reachable = self._deadbeat(error, v, a, dt)
+        if reachable.all():
+            j = final
+        else:
+            j = np.where(reachable, final, self._braking_jerk(error, v, a, dt))
+
+        # 한 주기 정확히 적분 (저크 일정)
+        p += v * dt + a * dt**2 / 2 + j * dt**3 / 6
+        v += a * dt + j * dt**2 / 2
+        a += j * dt
+
+        # 목표에 멈췄으면 (세 주기 정지 저크의 반올림 오차만 남음) 목표에 맞춤
+        tol = self.tolerance
+        near = (np.abs(self.target - p) <= tol) & (np.abs(v) <= tol) & (np.abs(a) <= tol)
+        if near.all():
+            p[:] = self.target
+            v[:] = 0.0
+            a[:] = 0.0
+            self.settled = True
+        return p
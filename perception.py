@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 카메라 → 동작 명령 파이프라인
+
+프레임 입력 → 검출 → 명령 변환을 제어 루프와 분리된 스레드에서 처리하고,
+제어 루프는 가장 최근 명령만 기다림 없이 읽어 갑니다.
+카메라나 검출기가 멈춰도 제어 루프는 막히지 않고, 명령이 오래되면 정지 명령으로 바뀝니다.
+
+    [캡처 스레드] ─ 최신 프레임 1장 (이전 프레임은 버림)
+          ↓
+    [워커 스레드 × PERCEPTION_WORKERS] ─ 검출 + 후처리 + 명령 변환
+          ↓                               (늦게 끝난 오래된 프레임 결과는 버림)
+    latest_command() ← 제어 루프가 매 주기 읽음
+
+프레임 입력 (make_source):
+    'camera':    OpenCV VideoCapture (장치 번호 또는 GStreamer/RTSP 문자열, GigE 카메라 포함)
+    'video':     동영상 파일 (원래 프레임 속도로 재생)
+    'synthetic': 움직이는 밝은 사각형을 그린 테스트 영상 (OpenCV 불필요)
+
+검출기 (make_detector):
+    'yolo':   ultralytics YOLO 모델 (pip install ultralytics)
+    'marker': 밝은 영역의 경계 상자 (synthetic 입력 / 마커 추적용, NumPy만 사용)
+
+명령 (TargetMapper):
+    'velocity': 목표가 화면 중앙에 오도록 회전, 목표 크기가 PERCEPTION_TARGET_AREA가 될 때까지 전진
+    'body':     걷지 않고 몸체 좌우 / 높이를 목표 방향으로 이동
+
+단독 실행 (로봇 없이 검출 / 명령 / 지연 확인):
+    python perception.py --source synthetic --detector marker
+"""
+
+import argparse
+import collections
+import threading
+import time
+
+import numpy as np
+import config
+
+Detection = collections.namedtuple('Detection', ['label', 'confidence', 'box'])
+Detection.__doc__ = "검출 결과 (box: 정규화 좌표 (x1, y1, x2, y2), 0~1)"
+
+Command = collections.namedtuple(
+    'Command', ['sequence', 'capture_time', 'ready_time', 'vx', 'vy', 'yaw_rate',
+                'body_y', 'body_z', 'target'])
+
+
+# ============================================================================
+# 프레임 입력
+# ============================================================================
+
+def _import_cv2():
+    try:
+        import cv2
+    except ImportError:
+        raise ImportError("OpenCV가 없어서 카메라 / 동영상을 열 수 없습니다 "
+                          "(pip install opencv-python)") from None
+    return cv2
+
+
+class CameraSource:
+    """
+    카메라 입력 (OpenCV)
+
+    Args:
+        device: 장치 번호 또는 캡처 문자열 (GStreamer 파이프라인, RTSP URL 등)
+    """
+
+    def __init__(self, device=0):
+        cv2 = _import_cv2()
+        self._capture = cv2.VideoCapture(device)
+        if not self._capture.isOpened():
+            raise OSError(f"카메라를 열 수 없습니다: {device}")
+        # 드라이버 내부 버퍼에 쌓인 오래된 프레임을 줄임
+        self._capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def read(self):
+        """다음 프레임 (없으면 None)"""
+        ok, frame = self._capture.read()
+        return frame if ok else None
+
+    def close(self):
+        self._capture.release()
+
+
+class VideoSource(CameraSource):
+    """동영상 파일 입력 (파일의 프레임 속도에 맞춰 읽음, 끝나면 None)"""
+
+    def __init__(self, path, realtime=True):
+        cv2 = _import_cv2()
+        self._capture = cv2.VideoCapture(path)
+        if not self._capture.isOpened():
+            raise OSError(f"동영상을 열 수 없습니다: {path}")
+        fps = self._capture.get(cv2.CAP_PROP_FPS) or 30.0
+        self._interval = 1.0 / fps if realtime else 0.0
+        self._next = time.perf_counter()
+
+    def read(self):
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self._next = max(self._next + self._interval, time.perf_counter() - self._interval)
+        return super().read()
+
+
+class SyntheticSource:
+    """
+    테스트 영상: 검은 배경에 원을 그리며 움직이는 밝은 사각형
+
+    Args:
+        rate: 프레임 속도 (Hz)
+        size: (높이, 너비)
+        period: 사각형이 한 바퀴 도는 시간 (초)
+    """
+
+    def __init__(self, rate=30.0, size=(240, 320), period=6.0):
+        self.size = size
+        self.period = period
+        self._interval = 1.0 / rate
+        self._start = self._next = time.perf_counter()
+
+    def read(self):
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self._next += self._interval
+
+        height, width = self.size
+        angle = 2 * np.pi * (time.perf_counter() - self._start) / self.period
+        cx = int(width * (0.5 + 0.3 * np.cos(angle)))
+        cy = int(height * (0.5 + 0.2 * np.sin(angle)))
+        half = max(width // 16, 2)
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        frame[max(cy - half, 0):cy + half, max(cx - half, 0):cx + half] = 255
+        return frame
+
+    def close(self):
+        pass
+
+
+def make_source(kind=None):
+    """config.PERCEPTION_SOURCE에 맞는 프레임 입력 생성"""
+    kind = kind or config.PERCEPTION_SOURCE
+    if kind == 'camera':
+        return CameraSource(config.PERCEPTION_CAMERA)
+    if kind == 'video':
+        return VideoSource(config.PERCEPTION_VIDEO)
+    if kind == 'synthetic':
+        return SyntheticSource()
+    raise ValueError(f"알 수 없는 프레임 입력: {kind} (camera / video / synthetic)")
+
+
+# ============================================================================
+# 검출
+# ============================================================================
+
+class YoloDetector:
+    """
+    YOLO 검출 (ultralytics)
+
+    Returns (호출 시):
+        list[Detection]
+    """
+
+    def __init__(self, model=None):
+        try:
+            from ultralytics import YOLO
+        except ImportError:
+            raise ImportError("ultralytics가 없어서 YOLO 검출을 사용할 수 없습니다 "
+                              "(pip install ultralytics)") from None
+        self._model = YOLO(model or config.PERCEPTION_MODEL)
+        # 워커 스레드가 여러 개여도 모델 호출은 하나씩 (모델 객체는 스레드 안전하지 않음)
+        self._lock = threading.Lock()
+
+    def __call__(self, frame):
+        with self._lock:
+            result = self._model(frame, verbose=False)[0]
+        height, width = frame.shape[:2]
+        boxes = result.boxes
+        xyxy = boxes.xyxy.cpu().numpy() / [width, height, width, height]
+        confidence = boxes.conf.cpu().numpy()
+        labels = [result.names[int(c)] for c in boxes.cls.cpu().numpy()]
+        return [Detection(label, float(conf), tuple(box))
+                for label, conf, box in zip(labels, confidence, xyxy)]
+
+
+class MarkerDetector:
+    """밝은 영역(임계값 이상) 전체를 감싸는 경계 상자 하나를 'marker'로 검출"""
+
+    def __init__(self, threshold=200):
+        self.threshold = threshold
+
+    def __call__(self, frame):
+        gray = frame if frame.ndim == 2 else frame.max(axis=2)
+        rows = np.flatnonzero((gray >= self.threshold).any(axis=1))
+        cols = np.flatnonzero((gray >= self.threshold).any(axis=0))
+        if len(rows) == 0:
+            return []
+        height, width = gray.shape
+        box = (cols[0] / width, rows[0] / height, (cols[-1] + 1) / width, (rows[-1] + 1) / height)
+        return [Detection('marker', 1.0, box)]
+
+
+def make_detector(kind=None):
+    """config.PERCEPTION_DETECTOR에 맞는 검출기 생성"""
+    kind = kind or config.PERCEPTION_DETECTOR
+    if kind == 'yolo':
+        return YoloDetector()
+    if kind == 'marker':
+        return MarkerDetector()
+    raise ValueError(f"알 수 없는 검출기: {kind} (yolo / marker)")
+
+
+def select_target(detections, labels=None, min_confidence=None):
+    """
+    검출 후처리: 라벨 / 신뢰도로 거르고 가장 큰 목표 하나 선택
+
+    Args:
+        labels: 추적할 라벨 목록, None이면 config.PERCEPTION_TARGET_LABELS (비어 있으면 전부)
+
+    Returns:
+        Detection 또는 None
+    """
+    if labels is None:
+        labels = config.PERCEPTION_TARGET_LABELS
+    if min_confidence is None:
+        min_confidence = config.PERCEPTION_MIN_CONFIDENCE
+    candidates = [d for d in detections
+                  if d.confidence >= min_confidence and (not labels or d.label in labels)]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda d: (d.box[2] - d.box[0]) * (d.box[3] - d.box[1]))
+
+
+# ============================================================================
+# 명령 변환
+# ============================================================================
+
+class TargetMapper:
+    """
+    목표 검출 → 속도 / 몸체 자세 명령
+
+    Args:
+        mode: 'velocity' 또는 'body', None이면 config.PERCEPTION_MODE
+    """
+
+    def __init__(self, mode=None):
+        self.mode = mode or config.PERCEPTION_MODE
+        if self.mode not in ('velocity', 'body'):
+            raise ValueError(f"알 수 없는 명령 모드: {self.mode} (velocity / body)")
+
+    def __call__(self, target):
+        """
+        Returns:
+            dict: vx, vy, yaw_rate, body_y, body_z (목표가 없으면 모두 0)
+        """
+        command = {'vx': 0.0, 'vy': 0.0, 'yaw_rate': 0.0, 'body_y': 0.0, 'body_z': 0.0}
+        if target is None:
+            return command
+
+        x1, y1, x2, y2 = target.box
+        # 화면 중앙 기준 오차 (-1 ~ 1, 오른쪽 / 아래 +)
+        error_x = (x1 + x2) - 1.0
+        error_y = (y1 + y2) - 1.0
+
+        if self.mode == 'velocity':
+            area = (x2 - x1) * (y2 - y1)
+            approach = (config.PERCEPTION_TARGET_AREA - area) / config.PERCEPTION_TARGET_AREA
+            command['vx'] = float(np.clip(approach * config.PERCEPTION_MAX_VX, 0.0,
+                                          config.PERCEPTION_MAX_VX))
+            # 목표가 오른쪽에 있으면 오른쪽으로 회전 (yaw_rate는 왼쪽 +)
+            command['yaw_rate'] = float(np.clip(-error_x * config.PERCEPTION_MAX_YAW_RATE,
+                                                -config.PERCEPTION_MAX_YAW_RATE,
+                                                config.PERCEPTION_MAX_YAW_RATE))
+        else:
+            command['body_y'] = float(np.clip(error_x, -1.0, 1.0) * config.PERCEPTION_MAX_BODY_SHIFT)
+            command['body_z'] = float(np.clip(-error_y, -1.0, 1.0) * config.PERCEPTION_MAX_BODY_SHIFT)
+        return command
+
+
+# ============================================================================
+# 파이프라인
+# ============================================================================
+
+class LatestFrameQueue:
+    """한 장짜리 큐: 새 프레임이 오면 아직 처리하지 않은 이전 프레임은 버림"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """프레임을 꺼냄 (timeout 동안 없으면 None)"""
+        with self._cond:
+            if self._item is None:
+                self._cond.wait(timeout)
+            item, self._item = self._item, None
+            return item
+
+
+def _percentile_ms(values, q):
+    return float(np.percentile(values, q) * 1000) if values else float('nan')
+
+
+class PerceptionPipeline:
+    """
+    프레임 입력 → 검출 → 명령 (백그라운드 스레드)
+
+    Args:
+        source: read() / close()를 가진 프레임 입력
+        detector: frame → list[Detection]
+        mapper: Detection 또는 None → 명령 dict
+        workers: 검출 워커 스레드 수, None이면 config.PERCEPTION_WORKERS
+        labels: 추적할 라벨, None이면 config.PERCEPTION_TARGET_LABELS
+    """
+
+    def __init__(self, source, detector, mapper=None, workers=None, labels=None):
+        self.source = source
+        self.detector = detector
+        self.mapper = mapper or TargetMapper()
+        self.workers = workers or config.PERCEPTION_WORKERS
+        self.labels = labels
+
+        self._frames = LatestFrameQueue()
+        self._lock = threading.Lock()
+        self._running = False
+        self._threads = []
+        self._command = None          # 가장 최근 명령 (제어 루프는 속성 읽기만 함)
+
+        # 통계
+        self.captured = 0
+        self.processed = 0
+        self.stale_results = 0        # 더 새 프레임 결과가 먼저 나와서 버린 결과
+        self.errors = 0
+        self.ended = False            # 입력이 끝남 (동영상 끝 / 카메라 연결 끊김)
+        self.detect_latency = collections.deque(maxlen=1000)     # 캡처 → 명령 준비
+        self.servo_latency = collections.deque(maxlen=1000)      # 캡처 → 서보 프레임 전송
+
+    def start(self):
+        self._running = True
+        self._threads = [threading.Thread(target=self._capture_loop, name='perception-capture',
+                                          daemon=True)]
+        self._threads += [threading.Thread(target=self._worker_loop, name=f'perception-worker-{i}',
+                                           daemon=True) for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self.source.close()
+
+    def _capture_loop(self):
+        sequence = 0
+        while self._running:
+            frame = self.source.read()
+            if frame is None:
+                self.ended = True
+                break
+            sequence += 1
+            self.captured += 1
+            self._frames.put((sequence, time.perf_counter(), frame))
+
+    def _worker_loop(self):
+        while self._running:
+            item = self._frames.get(timeout=0.1)
+            if item is None:
+                continue
+            sequence, capture_time, frame = item
+            try:
+                target = select_target(self.detector(frame), self.labels)
+                setpoint = self.mapper(target)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠ 검출 오류: {e}")
+                continue
+            command = Command(sequence, capture_time, time.perf_counter(), target=target, **setpoint)
+
+            with self._lock:
+                self.processed += 1
+                # 워커가 여러 개면 결과 순서가 바뀔 수 있음 - 더 오래된 프레임 결과는 버림
+                if self._command is not None and self._command.sequence > sequence:
+                    self.stale_results += 1
+                    continue
+                self._command = command
+                self.detect_latency.append(command.ready_time - capture_time)
+
+    def latest_command(self, max_age=None):
+        """
+        가장 최근 명령 (기다리지 않음)
+
+        Args:
+            max_age: 캡처 후 이 시간(초)보다 오래된 명령은 None, None이면 config.PERCEPTION_COMMAND_TIMEOUT
+
+        Returns:
+            Command 또는 None
+        """
+        if max_age is None:
+            max_age = config.PERCEPTION_COMMAND_TIMEOUT
+        command = self._command
+        if command is None or time.perf_counter() - command.capture_time > max_age:
+            return None
+        return command
+
+    def record_servo_latency(self, command, sent_time=None):
+        """명령을 반영한 첫 서보 프레임 전송 시각 기록 (캡처 → 서보 지연)"""
+        if sent_time is None:
+            sent_time = time.perf_counter()
+        self.servo_latency.append(sent_time - command.capture_time)
+
+    def report(self):
+        """파이프라인 통계 출력"""
+        print(f"인식 파이프라인: 캡처 {self.captured}장, 처리 {self.processed}장, "
+              f"버린 프레임 {self._frames.dropped}장, 늦은 결과 {self.stale_results}개, "
+              f"오류 {self.errors}회")
+        detect = list(self.detect_latency)
+        servo = list(self.servo_latency)
+        if detect:
+            print(f"  캡처 → 명령: 중앙값 {_percentile_ms(detect, 50):.1f}ms, "
+                  f"p95 {_percentile_ms(detect, 95):.1f}ms, 최대 {max(detect) * 1000:.1f}ms")
+        if servo:
+            print(f"  캡처 → 서보: 중앙값 {_percentile_ms(servo, 50):.1f}ms, "
+                  f"p95 {_percentile_ms(servo, 95):.1f}ms, 최대 {max(servo) * 1000:.1f}ms")
+
+
+def make_pipeline(source=None, detector=None, mode=None):
+    """config 값으로 파이프라인 구성"""
+    detector = detector or config.PERCEPTION_DETECTOR
+    # 마커 검출기는 라벨이 'marker' 하나뿐이므로 라벨로 거르지 않음
+    labels = () if detector == 'marker' else None
+    return PerceptionPipeline(make_source(source), make_detector(detector), TargetMapper(mode),
+                              labels=labels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spot Micro 인식 파이프라인 (로봇 없이 실행)")
+    parser.add_argument('--source', choices=('camera', 'video', 'synthetic'), default=None)
+    parser.add_argument('--detector', choices=('yolo', 'marker'), default=None)
+    parser.add_argument('--mode', choices=('velocity', 'body'), default=None)
+    parser.add_argument('--duration', type=float, default=10.0, help="실행 시간 (초)")
+    args = parser.parse_args()
+
+    pipeline = make_pipeline(args.source, args.detector, args.mode).start()
+    end = time.perf_counter() + args.duration
+    try:
+        while time.perf_counter() < end and not pipeline.ended:
+            time.sleep(0.5)
+            command = pipeline.latest_command()
+            if command is None:
+                print("명령 없음 (검출 대기 / 오래된 명령)")
+                continue
+            label = command.target.label if command.target else '-'
+            print(f"#{command.sequence} {label}: vx={command.vx:+.1f} 회전={command.yaw_rate:+.1f} "
+                  f"몸체 y={command.body_y:+.1f} z={command.body_z:+.1f} "
+                  f"({(command.ready_time - command.capture_time) * 1000:.1f}ms)")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pipeline.stop()
+        pipeline.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 자세 라이브러리 + 최소 시간 자세 전환
+
+config에 정의된 이름 있는 자세를 모두 읽어서 관절 각도 / 발 좌표 / PWM 틱을
+미리 계산하고, 두 자세 사이를 속도 / 가속도 제한과 안정성 조건을 지키면서
+가장 빠르게 옮기는 전환 궤적을 만듭니다 (자세 쌍별로 캐시).
+
+자세 출처 (이름이 겹치면 위쪽이 우선):
+    config.LIE_* / STANDBY_*         'lie', 'standby' (보행 기준 자세와 같은 값)
+    config.COORDINATE_POSES          좌표로 정의한 자세
+    config.PRESET_POSES              다리별 관절 각도 자세
+    config.RIGHT_*_ANGLES / LEFT_*_ANGLES 쌍   (예: RIGHT_LIFT_ANGLES → 'lift')
+
+전환 후보:
+    'joint':     관절 공간 직선 보간 (항상 도달 가능, 각도 범위 유지)
+    'cartesian': 발 좌표 직선 보간 (발이 곧게 움직임, IK로 도달 가능한 경우만)
+두 후보 모두 최소 저크 속도 프로파일을 쓰고, 자기 간섭이 없고 안정한 후보 중
+가장 짧은 것을 고릅니다.
+"""
+
+import collections
+import functools
+import re
+
+import numpy as np
+import collision
+import config
+import kinematics
+import pwm_output
+import stability
+import trajectory
+
+Pose = collections.namedtuple(
+    'Pose', ['name', 'source', 'positions', 'angles', 'channel_angles', 'ticks'])
+
+Transition = collections.namedtuple(
+    'Transition', ['start', 'end', 'path', 'duration', 'times', 'angles', 'positions',
+                   'min_margin', 'stable'])
+
+# 시간 계산용 경로 샘플 수 (속도 / 가속도 최대값 추정)
+_PATH_SAMPLES = 101
+
+# 각도 범위 검사 허용 오차 (도)
+_LIMIT_TOLERANCE = 0.01
+
+# 캐시한 전환을 쓸 시작 각도 차이 (도, 수치 오차만 허용)
+# 이보다 다르면 캐시 궤적의 첫 프레임으로 각도가 순간 이동하므로 현재 각도에서 계획
+_CACHE_MATCH_TOLERANCE = 1e-6
+
+_poses = None
+
+
+# ============================================================================
+# 자세 로드
+# ============================================================================
+
+def _per_leg(value):
+    """(x, y, z) 하나 또는 {다리: 값} → (4, 3) 배열"""
+    if isinstance(value, dict):
+        return np.array([value[leg] for leg in config.LEG_NAMES], dtype=float)
+    return np.tile(np.asarray(value, dtype=float), (4, 1))
+
+
+def _angle_constant_poses():
+    """RIGHT_*_ANGLES / LEFT_*_ANGLES 쌍 → {이름: {다리: 각도}}"""
+    poses = {}
+    for attr in dir(config):
+        match = re.fullmatch(r'RIGHT_(\w+)_ANGLES', attr)
+        if match is None or not hasattr(config, f'LEFT_{match.group(1)}_ANGLES'):
+            continue
+        right = getattr(config, attr)
+        left = getattr(config, f'LEFT_{match.group(1)}_ANGLES')
+        poses[match.group(1).lower()] = {leg: left if kinematics.IS_LEFT[i] else right
+                                         for i, leg in enumerate(config.LEG_NAMES)}
+    return poses
+
+
+def _make_pose(name, source, positions=None, angles=None):
+    if angles is None:
+        angles, reachable = kinematics.inverse_kinematics(positions)
+        if not reachable.all():
+            raise ValueError(f"자세 '{name}'에 도달 불가능한 좌표가 있습니다")
+    else:
+        positions = kinematics.forward_kinematics(angles)
+    channel_angles = kinematics.joint_to_channel(angles)
+    arrays = [positions, angles, channel_angles, pwm_output.angle_to_tick(channel_angles)]
+    for array in arrays:
+        array.setflags(write=False)
+    return Pose(name, source, *arrays)
+
+
+def load(reload=False):
+    """
+    모든 이름 있는 자세 로드 (처음 한 번 계산 후 재사용)
+
+    Returns:
+        dict: {이름: Pose}
+    """
+    global _poses
+    if _poses is not None and not reload:
+        return _poses
+
+    poses = {}
+    for name, angles in _angle_constant_poses().items():
+        poses[name] = _make_pose(name, 'angles', angles=_per_leg(angles))
+    for name, angles in config.PRESET_POSES.items():
+        poses[name] = _make_pose(name, 'preset', angles=_per_leg(angles))
+    for name, coords in config.COORDINATE_POSES.items():
+        poses[name] = _make_pose(name, 'coordinates', positions=_per_leg(coords))
+    # 불러올 때마다 현재 값으로 (설정 덮어쓰기로 바뀐 STANDBY_Z 등이 보행과 같도록)
+    poses['lie'] = _make_pose('lie', 'coordinates',
+                              positions=_per_leg((config.LIE_X, config.LIE_Y, config.LIE_Z)))
+    poses['standby'] = _make_pose('standby', 'coordinates', positions=_per_leg(
+        (config.STANDBY_X, config.STANDBY_Y, config.STANDBY_Z)))
+
+    _poses = poses
+    transition.cache_clear()
+    return _poses
+
+
+def preload(poses):
+    """미리 계산한 자세 등록 (startup_cache에서 불러온 배열)"""
+    global _poses
+    _poses = dict(poses)
+    transition.cache_clear()
+
+
+def get(name):
+    """이름으로 자세 찾기"""
+    poses = load()
+    if name not in poses:
+        raise ValueError(f"알 수 없는 자세 '{name}' (사용 가능: {', '.join(sorted(poses))})")
+    return poses[name]
+
+
+def names():
+    return sorted(load())
+
+
+def match(angles, tolerance=1.0):
+    """
+    관절 각도가 이름 있는 자세와 같으면 그 이름 (좌표 자세 우선)
+
+    Args:
+        angles: (4, 3) 관절 각도 (캘리브레이션 오프셋 제외)
+        tolerance: 관절별 허용 차이 (도)
+
+    Returns:
+        str 또는 None
+    """
+    angles = np.asarray(angles, dtype=float)
+    best = None
+    for pose in load().values():
+        error = np.abs(pose.angles - angles).max()
+        if error <= tolerance and (best is None or error < best[0]):
+            best = (error, pose.name)
+    return best[1] if best else None
+
+
+# ============================================================================
+# 전환 계획
+# ============================================================================
+
+def _min_jerk(u):
+    return u * u * u * (10 - 15 * u + 6 * u * u)
+
+
+def _path(kind, start_angles, end_angles, start_positions, end_positions, u):
+    """
+    경로 위 샘플 (u: 0~1 경로 진행도)
+
+    Returns:
+        (angles (N, 4, 3), positions (N, 4, 3)) 또는 도달 불가능하면 None
+    """
+    s = u.reshape(-1, 1, 1)
+    if kind == 'joint':
+        angles = start_angles + (end_angles - start_angles) * s
+        return angles, kinematics.forward_kinematics(angles)
+    positions = start_positions + (end_positions - start_positions) * s
+    angles, reachable = kinematics.inverse_kinematics(positions)
+    if not reachable.all():
+        return None
+    return angles, positions
+
+
+def _minimum_time(angles):
+    """
+    속도 / 가속도 제한을 지키는 최소 시간
+
+    Args:
+        angles: (N, 4, 3) 시간 비율 u = t / T를 균등하게 나눈 샘플 (프로파일 적용 후)
+    """
+    u = np.linspace(0.0, 1.0, len(angles))
+    # t = u·T 이므로 dθ/dt = (dθ/du) / T, d²θ/dt² = (d²θ/du²) / T²
+    velocity = np.gradient(angles, u, axis=0)
+    acceleration = np.gradient(velocity, u, axis=0)
+    return float(max(np.abs(velocity).max() / config.POSE_MAX_JOINT_SPEED,
+                     np.sqrt(np.abs(acceleration).max() / config.POSE_MAX_JOINT_ACCEL),
+                     config.POSE_MIN_TRANSITION_TIME))
+
+
+def _stability(positions):
+    """(최소 여유, 안정 여부) - 몸체가 바닥에 닿은 프레임은 제외"""
+    standing = (positions[:, :, 2] <= -config.SERVO_IDLE_MAX_FOOT_DEPTH).any(axis=1)
+    if not standing.any():
+        return np.inf, True
+    margin = stability.analyze_trajectory(positions)['margin'][standing]
+    min_margin = float(margin.min())
+    return min_margin, min_margin >= config.STABILITY_MIN_MARGIN
+
+
+def plan(start_angles, end_name, duration=None, rate=None, start_name=None):
+    """
+    현재 관절 각도에서 이름 있는 자세로 가는 최소 시간 전환 (캐시 안 함)
+
+    Args:
+        start_angles: (4, 3) 시작 관절 각도 (캘리브레이션 오프셋 제외)
+        end_name: 목표 자세 이름
+        duration: 원하는 전환 시간 (초), 최소 시간보다 짧으면 최소 시간 사용
+        rate: 샘플링 주기 (Hz), None이면 config.CONTROL_RATE
+        start_name: 출력용 시작 자세 이름
+
+    Returns:
+        Transition: times (N,), angles (N, 4, 3), positions (N, 4, 3),
+                    path ('joint' / 'cartesian'), duration, min_margin, stable
+                    안정한 후보가 없으면 안정 여유가 가장 큰 후보 (stable=False)
+    """
+    end = get(end_name)
+    start_angles = np.asarray(start_angles, dtype=float)
+    start_positions = kinematics.forward_kinematics(start_angles)
+    u = _min_jerk(np.linspace(0.0, 1.0, _PATH_SAMPLES))
+
+    candidates = []
+    for kind in ('joint', 'cartesian'):
+        path = _path(kind, start_angles, end.angles, start_positions, end.positions, u)
+        if path is None:
+            continue
+        angles, positions = path
+        # 관절 보간은 양 끝 각도 사이만 지나므로 범위 검사는 좌표 보간에만 필요
+        if kind == 'cartesian' and ((angles < config.ANGLE_MIN_LIMIT - _LIMIT_TOLERANCE) |
+                                    (angles > config.ANGLE_MAX_LIMIT + _LIMIT_TOLERANCE)).any():
+            continue
+        min_margin, stable = _stability(positions)
+        candidates.append({'kind': kind, 'time': _minimum_time(angles),
+                           'margin': min_margin, 'stable': stable,
+                           'clear': collision.check_trajectory(angles)['clear']})
+
+    # 자기 간섭이 없는 후보를 우선 (모두 간섭하면 재생 시 COLLISION_GUARD가 처리)
+    clear = [c for c in candidates if c['clear']]
+    if clear:
+        candidates = clear
+
+    # 안정한 후보 중 가장 빠른 것, 없으면 안정 여유가 가장 큰 것
+    stable = [c for c in candidates if c['stable']]
+    if stable:
+        best = min(stable, key=lambda c: c['time'])
+    else:
+        best = max(candidates, key=lambda c: c['margin'])
+    kind = best['kind']
+
+    total = max(best['time'], duration or 0.0)
+    times = trajectory.sample_times(total, rate)
+    angles, positions = _path(kind, start_angles, end.angles, start_positions, end.positions,
+                              _min_jerk(times / total))
+    for array in (times, angles, positions):
+        array.setflags(write=False)
+    return Transition(start=start_name, end=end_name, path=kind, duration=total, times=times,
+                      angles=angles, positions=positions, min_margin=best['margin'],
+                      stable=best['stable'])
+
+
+@functools.lru_cache(maxsize=64)
+def transition(start_name, end_name, duration=None, rate=None):
+    """이름 있는 두 자세 사이 전환 (자세 쌍별 캐시)"""
+    return plan(get(start_name).angles, end_name, duration, rate, start_name=start_name)
+
+
+def plan_from(start_angles, end_name, duration=None, rate=None):
+    """
+    현재 각도에서 자세로 전환 (현재 각도가 이름 있는 자세와 같으면 캐시 사용)
+
+    자세와 조금이라도 다르면 (match()의 1° 허용 안이라도) 현재 각도에서 새로 계획해서
+    첫 프레임이 현재 각도와 같게 합니다.
+    """
+    start_name = match(start_angles, tolerance=_CACHE_MATCH_TOLERANCE)
+    if start_name is not None:
+        return transition(start_name, end_name, duration, rate)
+    return plan(start_angles, end_name, duration, rate)
+
+
+# 자세 / 전환 캐시가 의존하는 설정 (config_loader 패턴, 바뀌면 clear_cache)
+CONFIG_DEPENDENCIES = ('COORDINATE_POSES', 'LIE_*', 'STANDBY_*', 'PRESET_POSES', 'RIGHT_*_ANGLES', 'LEFT_*_ANGLES',
+                       'SERVO_CALIBRATION_*', 'SERVO_MIN_TICK', 'SERVO_MAX_TICK',
+                       'ANGLE_*_LIMIT', 'CONTROL_RATE', 'POSE_*', 'STABILITY_*',
+                       'SERVO_IDLE_MAX_FOOT_DEPTH', 'COLLISION_*', 'BODY_*', 'COM_OFFSET_*',
+                       '*_MASS', 'UPPER_SEG_LENGTH', 'LOWER_SEG_LENGTH', 'IK_SHOULDER_OFFSET')
+
+
+def clear_cache():
+    """자세 / 전환 캐시 비우기 (설정 변경 후 호출)"""
+    global _poses
+    _poses = None
+    transition.cache_clear()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - PCA9685 PWM 출력 단계
+
+- 각도 → PWM 틱 변환 (배열 일괄 처리)
+- 채널별 ON 시작 오프셋 (위상 분산)
+  12개 서보 펄스가 모두 틱 0에서 동시에 시작하면 돌입 전류가 겹쳐서
+  전원 전압이 떨어집니다. 채널마다 ON 시점을 4096틱 주기 안에서
+  분산시키고, OFF = ON + 펄스 폭으로 설정해 펄스 폭은 그대로 유지합니다.
+- 프레임 일괄 쓰기: 연속된 채널의 ON/OFF 레지스터를 한 번의
+  I2C 블록 쓰기로 전송 (PCA9685 자동 증가 모드 사용)
+- 시뮬레이션용 동시 펄스 수 계산
+"""
+
+import numpy as np
+import config
+
+# PCA9685 레지스터
+MODE1 = 0x00
+MODE1_AI = 0x20           # 레지스터 자동 증가
+LED0_ON_L = 0x06
+FULL_OFF = 0x1000         # LEDn_OFF_H bit 4: 출력 완전 끔
+
+PWM_PERIOD_TICKS = 4096
+
+# SMBus 블록 쓰기 최대 길이 (바이트) → 한 번에 8채널
+_MAX_BLOCK_BYTES = 32
+
+
+def angle_to_tick(angle):
+    """
+    각도 → PWM 틱 (0-180도로 제한, 배열 가능)
+
+    _set_servo_pwm()의 기존 변환식과 같습니다.
+    """
+    angle = np.clip(np.asarray(angle, dtype=float), 0, 180)
+    ticks = config.SERVO_MIN_TICK + (config.SERVO_MAX_TICK - config.SERVO_MIN_TICK) * angle / 180.0
+    return ticks.astype(int)
+
+
+def used_channels():
+    """config.CHANNELS에서 사용하는 채널 번호 (정렬)"""
+    return sorted(ch for leg_channels in config.CHANNELS.values() for ch in leg_channels)
+
+
+def channel_joint_index():
+    """채널 → (다리 인덱스, 관절 인덱스), 다리 인덱스는 config.LEG_NAMES 순서"""
+    index = {}
+    for leg_index, leg_name in enumerate(config.LEG_NAMES):
+        for joint, channel in enumerate(config.CHANNELS[leg_name]):
+            index[channel] = (leg_index, joint)
+    return index
+
+
+def phase_offsets(setting=None):
+    """
+    채널별 ON 시작 오프셋 (틱)
+
+    Args:
+        setting: 'auto' - 사용 채널을 4096틱 주기에 고르게 분산
+                 'none' - 모두 0 (모든 펄스가 동시에 시작)
+                 dict - {채널: 오프셋}, 지정하지 않은 채널은 0
+                 None이면 config.PWM_PHASE_OFFSETS 사용
+
+    Returns:
+        dict: {채널: 오프셋 틱}
+    """
+    if setting is None:
+        setting = config.PWM_PHASE_OFFSETS
+
+    channels = used_channels()
+    if setting == 'auto':
+        spacing = PWM_PERIOD_TICKS // len(channels)
+        return {ch: i * spacing for i, ch in enumerate(channels)}
+    if isinstance(setting, dict):
+        return {ch: int(setting.get(ch, 0)) % PWM_PERIOD_TICKS for ch in channels}
+    return {ch: 0 for ch in channels}
+
+
+def on_off_ticks(ticks_by_channel, offsets):
+    """
+    펄스 폭 → (ON, OFF) 틱 (OFF가 주기를 넘으면 다음 주기 앞쪽으로 감김)
+
+    Returns:
+        dict: {채널: (on, off)}
+    """
+    result = {}
+    for ch, width in ticks_by_channel.items():
+        on = offsets.get(ch, 0)
+        result[ch] = (on, (on + int(width)) % PWM_PERIOD_TICKS)
+    return result
+
+
+def frame_blocks(on_off):
+    """
+    연속된 채널끼리 묶어 블록 쓰기 데이터 생성
+
+    Args:
+        on_off: {채널: (on, off)}
+
+    Returns:
+        list: [(시작 레지스터, [바이트, ...]), ...]
+    """
+    blocks = []
+    run = []
+    for ch in sorted(on_off):
+        if run and (ch != run[-1] + 1 or len(run) * 4 >= _MAX_BLOCK_BYTES):
+            blocks.append(run)
+            run = []
+        run.append(ch)
+    if run:
+        blocks.append(run)
+
+    writes = []
+    for run in blocks:
+        data = []
+        for ch in run:
+            on, off = on_off[ch]
+            data.extend([on & 0xFF, on >> 8, off & 0xFF, off >> 8])
+        writes.append((LED0_ON_L + 4 * run[0], data))
+    return writes
+
+
+def enable_auto_increment(pca):
+    """MODE1 자동 증가 비트 설정 (블록 쓰기에 필요)"""
+    device = getattr(pca, '_device', None)
+    if device is None:
+        return False
+    mode1 = device.readU8(MODE1)
+    device.write8(MODE1, mode1 | MODE1_AI)
+    return True
+
+
+def cut_outputs(pca):
+    """모든 채널 출력 차단 (ALL_LED full-off, 서보 토크 해제)"""
+    pca.set_all_pwm(0, FULL_OFF)
+
+
+def write_frame(pca, on_off, block_write=True):
+    """
+    한 프레임(여러 채널)을 PCA9685에 전송
+
+    Args:
+        pca: Adafruit_PCA9685.PCA9685 객체
+        on_off: {채널: (on, off)}
+        block_write: True면 블록 쓰기, 불가능하면 채널별 set_pwm 사용
+
+    Returns:
+        int: I2C 트랜잭션 수
+    """
+    device = getattr(pca, '_device', None)
+    if block_write and device is not None:
+        writes = frame_blocks(on_off)
+        for register, data in writes:
+            device.writeList(register, data)
+        return len(writes)
+
+    for ch, (on, off) in on_off.items():
+        pca.set_pwm(ch, on, off)
+    return len(on_off) * 4
+
+
+def write_block(pca, register, data):
+    """
+    frame_blocks()의 블록 하나를 전송 (블록 쓰기가 불가능하면 채널별 set_pwm 사용)
+
+    Returns:
+        int: I2C 트랜잭션 수 (1이면 블록 쓰기)
+    """
+    device = getattr(pca, '_device', None)
+    if device is not None:
+        device.writeList(register, data)
+        return 1
+
+    first = (register - LED0_ON_L) // 4
+    for i in range(0, len(data), 4):
+        pca.set_pwm(first + i // 4, data[i] | data[i + 1] << 8, data[i + 2] | data[i + 3] << 8)
+    return len(data)
+
+
+def concurrent_pulses(on_off):
+    """
+    한 PWM 주기 동안 틱별로 HIGH인 채널 수 (시뮬레이션)
+
+    Returns:
+        np.ndarray: (4096,) 틱별 동시 HIGH 채널 수
+    """
+    if not on_off:
+        return np.zeros(PWM_PERIOD_TICKS, dtype=int)
+    on = np.array([v[0] for v in on_off.values()])
+    off = np.array([v[1] for v in on_off.values()])
+    t = np.arange(PWM_PERIOD_TICKS)[:, np.newaxis]
+    high = np.where(on <= off, (t >= on) & (t < off), (t >= on) | (t < off))
+    return high.sum(axis=1)
+
+
+def peak_concurrent_pulses(on_off):
+    """한 주기 중 동시에 HIGH인 최대 채널 수"""
+    return int(concurrent_pulses(on_off).max())
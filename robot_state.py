@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 배열 기반 관절 상태
+
+다리 / 관절을 고정 인덱스로 다룹니다.
+    다리: config.LEG_NAMES 순서 (kinematics.LEG_INDEX)
+    관절: [어깨, 상부, 하부]
+
+명령 각도와 현재 각도를 미리 할당한 (4, 3) 배열에 두고 제자리 연산(out=)으로만
+갱신하므로 프레임마다 각도 리스트 / 딕셔너리를 복사하지 않습니다.
+기존 current_angles 딕셔너리 API는 배열 행을 그대로 보여 주는 LegAngles 뷰로 유지합니다.
+
+    state.command_leg('front_left', angles)   # 명령 버퍼에 기록 (캘리브레이션 오프셋 / 게인 적용)
+    state.command_all(angles_array)            # (4, 3) 관절 각도를 한 번에
+    frame = state.frame()                      # 전송할 {채널: 각도}
+    state.commit()                             # 전송 성공 → 현재 각도 갱신
+    state.discard()                            # 전송 취소 → 명령 버퍼를 현재 각도로 되돌림
+"""
+
+import collections.abc
+
+import numpy as np
+import config
+import kinematics
+
+
+class LegAngles(collections.abc.MutableMapping):
+    """
+    (4, 3) 배열을 {다리 이름: [어깨, 상부, 하부]} 딕셔너리처럼 보여 주는 뷰
+
+    값은 배열 행의 뷰이고, 대입하면 배열에 바로 기록됩니다.
+    """
+
+    __slots__ = ('_array',)
+
+    def __init__(self, array):
+        self._array = array
+
+    def __getitem__(self, leg_name):
+        return self._array[kinematics.LEG_INDEX[leg_name]]
+
+    def __setitem__(self, leg_name, angles):
+        self._array[kinematics.LEG_INDEX[leg_name]] = angles
+
+    def __delitem__(self, leg_name):
+        raise TypeError("다리는 삭제할 수 없습니다")
+
+    def __iter__(self):
+        return iter(config.LEG_NAMES)
+
+    def __len__(self):
+        return len(config.LEG_NAMES)
+
+    def __repr__(self):
+        return repr({leg: self._array[i].tolist() for i, leg in enumerate(config.LEG_NAMES)})
+
+
+class RobotState:
+    """
+    관절 상태 (배열은 모두 (4, 3), config.LEG_NAMES 순서)
+
+    Attributes:
+        current: 마지막으로 전송한 채널 각도 (캘리브레이션 포함)
+        commanded: 다음 프레임 채널 각도 (명령하지 않은 다리는 current와 같음)
+        calibration: 캘리브레이션 오프셋 (config.SERVO_CALIBRATION_OFFSET)
+        scale: 캘리브레이션 게인 (config.SERVO_CALIBRATION_SCALE)
+        channels: PCA9685 채널 번호
+        legs: (4,) 이번 프레임에 명령한 다리
+        view: current의 딕셔너리 뷰 (LegAngles)
+        persist: 전송할 때마다 관절 각도를 기록할 (4, 3) 배열 (startup_cache 메모리 매핑, 없으면 None)
+    """
+
+    __slots__ = ('current', 'commanded', 'calibration', 'scale', 'channels', 'legs', 'view',
+                 'persist', '_bias', '_joints', '_channel_list')
+
+    def __init__(self):
+        shape = (len(config.LEG_NAMES), 3)
+        self.current = np.zeros(shape)
+        self.commanded = np.zeros(shape)
+        self.calibration = np.zeros(shape)
+        self.scale = np.ones(shape)
+        self._bias = np.zeros(shape)
+        self._joints = np.zeros(shape)
+        self.legs = np.zeros(len(config.LEG_NAMES), dtype=bool)
+        self.channels = np.array([config.CHANNELS[leg] for leg in config.LEG_NAMES])
+        self._channel_list = self.channels.ravel().tolist()
+        self.view = LegAngles(self.current)
+        self.persist = None
+        self.load_calibration()
+
+    def load_calibration(self):
+        """config.SERVO_CALIBRATION_OFFSET / SCALE 다시 읽기 (설정 변경 후 호출)"""
+        self.calibration[:], self.scale[:] = kinematics.calibration_arrays()
+        # 채널 각도 = 게인 × 관절 각도 + bias
+        self._bias[:] = self.calibration + 90.0 * (1.0 - self.scale)
+
+    def to_channel(self, joint_angles):
+        """(4, 3) 관절 각도 → 채널 각도"""
+        return joint_angles * self.scale + self._bias
+
+    def to_joint(self, channel_angles, out=None):
+        """(4, 3) 채널 각도 → 관절 각도"""
+        out = np.subtract(channel_angles, self._bias, out=out)
+        return np.divide(out, self.scale, out=out)
+
+    def reset(self, channel_angles):
+        """현재 / 명령 각도 설정 (채널 각도, 캘리브레이션 오프셋 포함)"""
+        self.current[:] = channel_angles
+        self.commanded[:] = channel_angles
+        self.legs[:] = False
+        self._persist()
+
+    # ------------------------------------------------------------------
+    # 명령
+    # ------------------------------------------------------------------
+
+    def command_leg(self, leg_name, joint_angles):
+        """다리 하나의 관절 각도를 명령 버퍼에 기록"""
+        i = kinematics.LEG_INDEX[leg_name]
+        np.multiply(joint_angles, self.scale[i], out=self.commanded[i])
+        self.commanded[i] += self._bias[i]
+        self.legs[i] = True
+
+    def command_all(self, joint_angles):
+        """(4, 3) 관절 각도를 명령 버퍼에 기록"""
+        np.multiply(joint_angles, self.scale, out=self.commanded)
+        self.commanded += self._bias
+        self.legs[:] = True
+
+    def frame(self):
+        """명령한 다리의 {채널: 각도} (전송용)"""
+        if self.legs.all():
+            return dict(zip(self._channel_list, self.commanded.ravel().tolist()))
+        frame = {}
+        for i in np.flatnonzero(self.legs):
+            frame.update(zip(self.channels[i].tolist(), self.commanded[i].tolist()))
+        return frame
+
+    def channel_frame(self, channel_angles):
+        """(4, 3) 채널 각도 → {채널: 각도}"""
+        return dict(zip(self._channel_list, np.ravel(channel_angles).tolist()))
+
+    def commit(self):
+        """명령한 다리의 현재 각도 갱신"""
+        np.copyto(self.current, self.commanded, where=self.legs[:, np.newaxis])
+        self.legs[:] = False
+        self._persist()
+
+    def _persist(self):
+        if self.persist is not None:
+            self.to_joint(self.current, out=self.persist)
+
+    def discard(self):
+        """명령 취소 (명령 버퍼를 현재 각도로)"""
+        np.copyto(self.commanded, self.current)
+        self.legs[:] = False
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def joint_angles(self, out=None):
+        """현재 관절 각도 (캘리브레이션 제외)"""
+        return self.to_joint(self.current, out=out)
+
+    def pending_joint_angles(self):
+        """
+        명령 버퍼의 관절 각도 (명령하지 않은 다리는 현재 각도)
+
+        내부 버퍼를 반환하므로 다음 호출 전까지만 사용하세요.
+        """
+        return self.to_joint(self.commanded, out=self._joints)
+
+    def channel_angles(self):
+        """현재 {채널: 각도}"""
+        return self.channel_frame(self.current)
@@ -0,0 +1,736 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 격리된 실시간 제어 프로세스
+
+프레임 전송 루프 (예정 시각 맞춤 + I2C 쓰기)를 별도 프로세스에서 실행합니다.
+메인 프로세스의 IK / 인식 / 메트릭 스레드와 가비지 컬렉션이 전송 시각을
+흔들지 않도록 제어 프로세스는
+- 전용 CPU에 고정하고 (os.sched_setaffinity, config.RT_CPU)
+- 권한이 있으면 SCHED_FIFO 실시간 우선순위로 실행하며 (없으면 일반 스케줄링으로 계속)
+- mlockall()로 메모리를 잠그고 (페이지 폴트 방지)
+- 준비가 끝나면 gc.freeze() 후 루프 동안 GC를 끕니다.
+- 블록 쓰기 버퍼는 채널 조합별로 미리 만들어 두고 루프 안에서는 값만 채웁니다.
+
+메인 프로세스와는 공유 메모리 (multiprocessing.shared_memory)로만 통신합니다 (잠금 없음).
+    프레임 링: 단일 생산자 (메인) / 단일 소비자 (제어 프로세스) 링 버퍼
+              슬롯을 채운 뒤 쓰기 인덱스를 올리고, 소비자는 전송한 뒤 읽기 인덱스를 올림
+              (각 인덱스는 한쪽 프로세스만 씀)
+    상태 블록: 시퀀스 잠금 (seqlock) - 제어 프로세스가 쓰는 동안 시퀀스가 홀수,
+              메인은 앞뒤 시퀀스가 같은 짝수일 때의 값만 사용
+    오류 메시지: 제어 루프에서 난 마지막 예외 (UTF-8, 루프가 멈췄으면 _FAILED 헤더도 설정)
+              제어 루프가 멈췄거나 프로세스가 종료되면 post()는 OSError를 발생시킵니다.
+슬롯마다 예정 시각 (time.perf_counter(), Linux에서는 프로세스 간 공통인 CLOCK_MONOTONIC)이
+들어 있어서, 메인 프로세스는 config.RT_LEAD_TIME만큼 미리 넣고
+정확한 전송 시각은 제어 프로세스가 맞춥니다.
+
+벤치마크 (프로세스 내 전송 스레드 ↔ 격리 프로세스의 전송 지터 히스토그램 비교):
+    python rt_control.py --duration 10 --load
+"""
+
+import argparse
+import bisect
+import ctypes
+import ctypes.util
+import gc
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import config
+import pwm_output
+
+# 전송 지터 히스토그램 버킷 (초) - 예정 시각보다 늦게 전송을 시작한 시간
+JITTER_BUCKETS = (0.00002, 0.00005, 0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005,
+                  0.01, 0.02, 0.05)
+
+# 이보다 늦게 전송한 프레임은 늦은 프레임으로 셈 (초)
+LATE_THRESHOLD = 0.001
+
+_CHANNELS = 16
+
+# 헤더 (int64)
+_WRITE, _READ, _CLEAR, _STOP, _READY, _SETUP, _FAILED = range(7)
+_HEADER_SIZE = 8
+
+# 상태 블록 (int64 / float64)
+_SEQ, _FRAMES, _LATE, _DROPPED, _ERRORS, _REINITS, _FAULTS = range(7)
+_LAST_WRITE, _JITTER_SUM, _JITTER_MAX = range(3)
+_STATUS_SIZE = 8
+
+# 마지막 오류 메시지 버퍼 (바이트)
+_ERROR_SIZE = 256
+
+# 슬롯 플래그
+_FLAG_CUT = 1
+
+# 격리 설정 결과 비트 (_SETUP)
+SETUP_AFFINITY = 1
+SETUP_FIFO = 2
+SETUP_MLOCK = 4
+SETUP_GC = 8
+
+# mlockall 플래그 (Linux)
+_MCL_CURRENT = 1
+_MCL_FUTURE = 2
+
+
+# ============================================================================
+# 공유 버퍼
+# ============================================================================
+
+class SharedBuffers:
+    """
+    프레임 링 + 상태 블록 (공유 메모리 하나 위의 NumPy 뷰)
+
+    Args:
+        ring_size: 프레임 슬롯 수
+        name: 기존 공유 메모리 이름 (None이면 새로 만듦)
+    """
+
+    def __init__(self, ring_size, name=None):
+        self.ring_size = ring_size
+        self._owner = name is None
+        layout = [
+            ('header', np.int64, (_HEADER_SIZE,)),
+            ('status', np.int64, (_STATUS_SIZE,)),
+            ('timing', np.float64, (_STATUS_SIZE,)),
+            ('histogram', np.int64, (len(JITTER_BUCKETS) + 1,)),
+            ('error', np.uint8, (_ERROR_SIZE,)),
+            ('due', np.float64, (ring_size,)),
+            ('mask', np.int64, (ring_size,)),
+            ('flags', np.int64, (ring_size,)),
+            ('registers', np.uint16, (ring_size, _CHANNELS, 2)),
+        ]
+        size = sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in layout)
+
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._shm.buf[:size] = bytes(size)
+        else:
+            # spawn으로 만든 자식은 메인 프로세스의 자원 추적기를 같이 쓰므로 정리는 메인이 함
+            self._shm = shared_memory.SharedMemory(name=name)
+
+        offset = 0
+        for field, dtype, shape in layout:
+            array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+        # 슬롯별 레지스터 바이트 (LEDn_ON_L, ON_H, OFF_L, OFF_H 순서 = 레지스터 순서)
+        self.register_bytes = self.registers.reshape(ring_size, -1).view(np.uint8)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def close(self):
+        # NumPy 뷰가 남아 있으면 공유 메모리를 닫을 수 없음
+        for field in ('header', 'status', 'timing', 'histogram', 'error', 'due', 'mask', 'flags',
+                      'registers', 'register_bytes'):
+            setattr(self, field, None)
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def set_error(self, error):
+        """마지막 오류 메시지 기록 (제어 루프 쪽)"""
+        data = f"{type(error).__name__}: {error}".encode('utf-8')[:_ERROR_SIZE - 1]
+        self.error[:] = 0
+        self.error[:len(data)] = np.frombuffer(data, dtype=np.uint8)
+
+    def last_error(self):
+        """마지막 오류 메시지 (없으면 None)"""
+        data = self.error.tobytes().split(b'\0', 1)[0]
+        return data.decode('utf-8', errors='replace') or None
+
+
+# ============================================================================
+# 프로세스 격리
+# ============================================================================
+
+def _mlockall():
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    return libc.mlockall(_MCL_CURRENT | _MCL_FUTURE) == 0
+
+
+def isolate(cpu=None, priority=None, lock_memory=None):
+    """
+    현재 프로세스를 실시간 제어용으로 설정 (가능한 것만)
+
+    Args:
+        cpu: 고정할 CPU 번호, None이면 config.RT_CPU
+        priority: SCHED_FIFO 우선순위, None이면 config.RT_PRIORITY (0이면 사용 안 함)
+        lock_memory: mlockall 사용, None이면 config.RT_LOCK_MEMORY
+
+    Returns:
+        int: 적용된 설정 비트 (SETUP_AFFINITY | SETUP_FIFO | SETUP_MLOCK)
+    """
+    if cpu is None:
+        cpu = config.RT_CPU
+    if priority is None:
+        priority = config.RT_PRIORITY
+    if lock_memory is None:
+        lock_memory = config.RT_LOCK_MEMORY
+
+    setup = 0
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, {cpu})
+            setup |= SETUP_AFFINITY
+        except Exception:
+            pass      # 없는 CPU 번호 / 잘못된 값
+    if priority and hasattr(os, 'SCHED_FIFO'):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+            setup |= SETUP_FIFO
+        except Exception:
+            pass      # 권한 없음 (CAP_SYS_NICE / RLIMIT_RTPRIO) / 범위 밖 우선순위
+    if lock_memory:
+        try:
+            if _mlockall():
+                setup |= SETUP_MLOCK
+        except (OSError, AttributeError):
+            pass      # libc 없음
+    return setup
+
+
+def describe_setup(setup):
+    """설정 비트 → 출력용 문자열"""
+    parts = [f"CPU {config.RT_CPU} 고정" if setup & SETUP_AFFINITY else "CPU 고정 안 됨",
+             f"SCHED_FIFO {config.RT_PRIORITY}" if setup & SETUP_FIFO else "일반 스케줄링",
+             "mlockall" if setup & SETUP_MLOCK else "메모리 잠금 안 됨",
+             "GC 정지" if setup & SETUP_GC else "GC 사용"]
+    return ', '.join(parts)
+
+
+# ============================================================================
+# 제어 루프 (제어 프로세스 / 프로세스 내 스레드 공통)
+# ============================================================================
+
+def _open_pca():
+    """PCA9685 연결 (제어 프로세스 안에서 호출)"""
+    import Adafruit_PCA9685
+    pca = Adafruit_PCA9685.PCA9685(address=config.PCA9685_ADDRESS, busnum=config.I2C_BUS_NUM)
+    pca.set_pwm_freq(config.SERVO_FREQUENCY)
+    pwm_output.enable_auto_increment(pca)
+    return pca
+
+
+class _ControlLoop:
+    """
+    프레임 링을 예정 시각에 맞춰 PCA9685로 전송
+
+    Args:
+        buffers: SharedBuffers
+        pca: PCA9685 객체, None이면 전송 시뮬레이션 (시각 맞춤과 인코딩만)
+        reopen: PCA9685 재초기화 함수 (재시도가 모두 실패했을 때)
+        parent_pid: 이 프로세스가 사라지면 루프 종료 (None이면 확인 안 함)
+    """
+
+    def __init__(self, buffers, pca=None, reopen=None, parent_pid=None):
+        self.buffers = buffers
+        self.pca = pca
+        self._reopen = reopen
+        self._parent_pid = parent_pid
+        self._raw = memoryview(buffers.register_bytes.reshape(-1))
+        self._slot_bytes = buffers.register_bytes.shape[1]
+        self._blocks = {}      # 채널 마스크 → [(레지스터, 시작 바이트, 끝 바이트, 데이터 리스트)]
+
+    def prepare(self):
+        """사용 채널 전체 프레임의 블록 버퍼를 미리 만듦"""
+        mask = 0
+        for channel in pwm_output.used_channels():
+            mask |= 1 << channel
+        self._blocks_for(mask)
+
+    def _blocks_for(self, mask):
+        blocks = self._blocks.get(mask)
+        if blocks is None:
+            on_off = {ch: (0, 0) for ch in range(_CHANNELS) if mask >> ch & 1}
+            blocks = []
+            for register, data in pwm_output.frame_blocks(on_off):
+                start = register - pwm_output.LED0_ON_L
+                blocks.append((register, start, start + len(data), [0] * len(data)))
+            self._blocks[mask] = blocks
+        return blocks
+
+    def _write(self, slot):
+        b = self.buffers
+        if b.flags[slot] & _FLAG_CUT:
+            if self.pca is not None:
+                pwm_output.cut_outputs(self.pca)
+            return
+
+        base = slot * self._slot_bytes
+        for register, start, end, data in self._blocks_for(int(b.mask[slot])):
+            data[:] = self._raw[base + start:base + end]
+            if self.pca is not None:
+                pwm_output.write_block(self.pca, register, data)
+
+    def _send(self, slot):
+        """
+        전송 (일시적 오류는 재시도, 모두 실패하면 PCA9685 재초기화 후 한 번 더)
+
+        OSError가 아닌 예외 (버그, 드라이버 오류)는 재시도하지 않고 상태 블록에
+        기록한 뒤 다음 프레임으로 넘어갑니다 (루프는 계속).
+        """
+        backoff = config.I2C_RETRY_BACKOFF
+        for attempt in range(config.I2C_RETRY_LIMIT + 1):
+            try:
+                self._write(slot)
+                return
+            except OSError as e:
+                error = e
+            except Exception as e:
+                self.buffers.set_error(e)
+                self._update(errors=1)
+                return
+            if attempt < config.I2C_RETRY_LIMIT:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, config.I2C_RETRY_BACKOFF_MAX)
+
+        self.buffers.set_error(error)
+        self._update(errors=1)
+        if self._reopen is None:
+            return
+        try:
+            self.pca = self._reopen()
+            self._update(reinits=1)
+            self._write(slot)
+        except Exception as e:
+            self.buffers.set_error(e)
+            time.sleep(config.I2C_RETRY_BACKOFF_MAX)
+
+    def _update(self, jitter=None, now=0.0, dropped=0, errors=0, reinits=0, faults=0):
+        """상태 블록 갱신 (seqlock: 쓰는 동안 시퀀스가 홀수)"""
+        status = self.buffers.status
+        timing = self.buffers.timing
+        status[_SEQ] += 1
+        if jitter is not None:
+            status[_FRAMES] += 1
+            if jitter > LATE_THRESHOLD:
+                status[_LATE] += 1
+            self.buffers.histogram[bisect.bisect_left(JITTER_BUCKETS, jitter)] += 1
+            timing[_JITTER_SUM] += jitter
+            if jitter > timing[_JITTER_MAX]:
+                timing[_JITTER_MAX] = jitter
+            timing[_LAST_WRITE] = now
+        status[_DROPPED] += dropped
+        status[_ERRORS] += errors
+        status[_REINITS] += reinits
+        status[_FAULTS] += faults
+        status[_SEQ] += 1
+
+    def fail(self, error):
+        """제어 루프 중단 기록 (메인 프로세스의 post()가 이후 OSError 발생)"""
+        self.buffers.set_error(error)
+        self._update(faults=1)
+        self.buffers.header[_FAILED] = 1
+
+    def run(self):
+        """제어 루프 (예상하지 못한 예외로 멈추면 상태 블록에 기록)"""
+        try:
+            self._run()
+        except Exception as e:
+            self.fail(e)
+            print(f"✗ 실시간 제어 루프 중단 ({type(e).__name__}): {e}")
+
+    def _run(self):
+        b = self.buffers
+        header = b.header
+        size = b.ring_size
+        spin = config.RT_SPIN_TIME
+        poll = config.RT_POLL_INTERVAL
+        clock = time.perf_counter
+
+        while not header[_STOP]:
+            read = int(header[_READ])
+            if read == header[_WRITE]:
+                time.sleep(poll)
+                if self._parent_pid is not None and os.getppid() != self._parent_pid:
+                    break      # 메인 프로세스 종료 (서보는 마지막 펄스를 유지)
+                continue
+
+            if read < header[_CLEAR]:
+                # 비상 동작 전에 비운 프레임
+                header[_READ] = read + 1
+                self._update(dropped=1)
+                continue
+
+            slot = read % size
+            due = b.due[slot]
+            wait = due - clock()
+            if wait > spin:
+                # 중간에 비우기 / 종료 요청을 확인하도록 최대 poll마다 깨어남
+                time.sleep(min(wait - spin, poll))
+                continue
+            while clock() < due:
+                pass
+
+            begin = clock()
+            self._send(slot)
+            header[_READ] = read + 1
+            self._update(jitter=begin - due, now=begin)
+
+
+def _process_main(name, ring_size, simulate):
+    """제어 프로세스 진입점"""
+    # Ctrl+C는 메인 프로세스가 처리 (종료 전 자세 전환 프레임을 이 프로세스가 보냄)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    buffers = SharedBuffers(ring_size, name=name)
+    try:
+        pca = None
+        if not simulate:
+            try:
+                pca = _open_pca()
+            except Exception as e:
+                print(f"✗ 실시간 제어 프로세스: PCA9685 초기화 오류: {e}")
+                buffers.header[_READY] = -1
+                return
+
+        _run_isolated(buffers, pca, simulate)
+    finally:
+        buffers.close()
+
+
+def _run_isolated(buffers, pca, simulate):
+    setup = isolate()
+    loop = _ControlLoop(buffers, pca, reopen=None if simulate else _open_pca,
+                        parent_pid=os.getppid())
+    try:
+        loop.prepare()
+    except Exception as e:
+        loop.fail(e)
+        buffers.header[_READY] = -1
+        raise
+
+    # 지금까지 만든 객체는 GC 대상에서 빼고, 루프 동안 GC 정지
+    gc.collect()
+    gc.freeze()
+    gc.disable()
+    buffers.header[_SETUP] = setup | SETUP_GC
+    buffers.header[_READY] = 1
+    loop.run()
+
+
+# ============================================================================
+# 메인 프로세스 쪽
+# ============================================================================
+
+class RtController:
+    """
+    실시간 제어 프로세스 (또는 비교용 프로세스 내 전송 스레드)
+
+    Args:
+        simulate: True면 PCA9685 없이 시각 맞춤만 (테스트 모드 / 벤치마크)
+        isolated: True면 별도 프로세스, False면 이 프로세스의 스레드에서 같은 루프 실행
+        ring_size: 프레임 슬롯 수, None이면 config.RT_RING_SIZE
+    """
+
+    def __init__(self, simulate=False, isolated=True, ring_size=None):
+        self.simulate = simulate
+        self.isolated = isolated
+        self.buffers = SharedBuffers(ring_size or config.RT_RING_SIZE)
+        self._process = None
+        self._thread = None
+        self.posted = 0
+
+    def start(self, timeout=5.0):
+        """
+        제어 루프 시작 (준비될 때까지 대기)
+
+        Returns:
+            bool: 준비되면 True (PCA9685 초기화 실패 / 시간 초과면 False)
+        """
+        header = self.buffers.header
+        if self.isolated:
+            context = multiprocessing.get_context('spawn')
+            self._process = context.Process(
+                target=_process_main, name='spot-rt-control', daemon=True,
+                args=(self.buffers.name, self.buffers.ring_size, self.simulate))
+            self._process.start()
+        else:
+            pca = None if self.simulate else _open_pca()
+            loop = _ControlLoop(self.buffers, pca, reopen=None if self.simulate else _open_pca)
+            loop.prepare()
+            self._thread = threading.Thread(target=loop.run, name='spot-rt-control', daemon=True)
+            self._thread.start()
+            header[_READY] = 1
+
+        end = time.perf_counter() + timeout
+        while header[_READY] == 0:
+            if time.perf_counter() > end or not self.alive():
+                return False
+            time.sleep(0.01)
+        return header[_READY] == 1
+
+    def alive(self):
+        if self._process is not None:
+            return self._process.is_alive()
+        return self._thread is not None and self._thread.is_alive()
+
+    def _check_alive(self):
+        """제어 루프가 멈췄으면 OSError (프레임이 조용히 쌓이지 않도록)"""
+        if self.buffers.header[_FAILED] or not self.alive():
+            error = self.buffers.last_error()
+            raise OSError("실시간 제어 프로세스가 종료되었습니다"
+                          + (f" ({error})" if error else ""))
+
+    @property
+    def pid(self):
+        return self._process.pid if self._process is not None else os.getpid()
+
+    @property
+    def setup(self):
+        return int(self.buffers.header[_SETUP])
+
+    @property
+    def queue_depth(self):
+        header = self.buffers.header
+        return int(header[_WRITE] - header[_READ])
+
+    def _claim_slot(self):
+        """빈 슬롯을 기다려서 (쓰기 인덱스, 슬롯) 반환"""
+        header = self.buffers.header
+        write = int(header[_WRITE])
+        self._check_alive()
+        while write - header[_READ] >= self.buffers.ring_size:
+            time.sleep(config.RT_POLL_INTERVAL)
+            self._check_alive()
+        return write, write % self.buffers.ring_size
+
+    def post(self, on_off, due=None):
+        """
+        프레임 예약
+
+        Args:
+            on_off: {채널: (on, off)}
+            due: 전송 시각 (perf_counter), None이면 바로
+
+        Raises:
+            OSError: 제어 루프가 멈췄거나 프로세스가 종료됨
+        """
+        b = self.buffers
+        write, slot = self._claim_slot()
+        registers = b.registers[slot]
+        mask = 0
+        for channel, (on, off) in on_off.items():
+            registers[channel, 0] = on
+            registers[channel, 1] = off
+            mask |= 1 << channel
+        b.mask[slot] = mask
+        b.flags[slot] = 0
+        b.due[slot] = time.perf_counter() if due is None else due
+        # 슬롯을 다 채운 뒤 공개
+        b.header[_WRITE] = write + 1
+        self.posted += 1
+
+    def cut(self):
+        """모든 출력 차단 (대기 프레임을 버리고 바로)"""
+        self.clear()
+        b = self.buffers
+        write, slot = self._claim_slot()
+        b.mask[slot] = 0
+        b.flags[slot] = _FLAG_CUT
+        b.due[slot] = time.perf_counter()
+        b.header[_WRITE] = write + 1
+
+    def clear(self):
+        """아직 전송하지 않은 프레임 버리기 (비상 동작 전)"""
+        header = self.buffers.header
+        header[_CLEAR] = header[_WRITE]
+
+    def flush(self, timeout=1.0):
+        """예약한 프레임을 모두 전송할 때까지 대기"""
+        end = time.perf_counter() + timeout
+        while self.queue_depth > 0 and self.alive():
+            if time.perf_counter() > end:
+                return False
+            time.sleep(config.RT_POLL_INTERVAL)
+        return True
+
+    def stop(self, timeout=2.0):
+        """남은 프레임을 전송한 뒤 제어 루프 종료"""
+        if self.buffers is None:
+            return
+        self.flush(timeout)
+        self.buffers.header[_STOP] = 1
+        if self._process is not None:
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def close(self):
+        self.stop()
+        if self.buffers is not None:
+            self.buffers.close()
+            self.buffers = None
+
+    # ------------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------------
+
+    def stats(self):
+        """상태 블록 스냅샷 (seqlock으로 일관된 값)"""
+        b = self.buffers
+        while True:
+            seq = int(b.status[_SEQ])
+            if seq % 2 == 0 or not self.alive():
+                status = b.status.copy()
+                timing = b.timing.copy()
+                histogram = b.histogram.copy()
+                if b.status[_SEQ] == seq:
+                    break
+            time.sleep(0)
+
+        frames = int(status[_FRAMES])
+        return {
+            'queue_depth': self.queue_depth,
+            'posted': self.posted,
+            'frames': frames,
+            'late': int(status[_LATE]),
+            'dropped': int(status[_DROPPED]),
+            'errors': int(status[_ERRORS]),
+            'reinits': int(status[_REINITS]),
+            'faults': int(status[_FAULTS]),
+            'alive': self.alive() and not b.header[_FAILED],
+            'last_error': b.last_error(),
+            'mean_jitter': timing[_JITTER_SUM] / frames if frames else 0.0,
+            'max_jitter': float(timing[_JITTER_MAX]),
+            'histogram': histogram.tolist(),
+            'setup': self.setup,
+        }
+
+    def report(self):
+        """전송 통계 출력"""
+        s = self.stats()
+        mode = "격리 프로세스" if self.isolated else "프로세스 내 스레드"
+        print(f"실시간 제어 ({mode}, {describe_setup(s['setup'])}): 전송 {s['frames']}, "
+              f"지터 평균 {s['mean_jitter'] * 1000:.3f}ms / 최대 {s['max_jitter'] * 1000:.3f}ms, "
+              f"늦음 {s['late']}, 버림 {s['dropped']}, 실패 {s['errors']}, 재초기화 {s['reinits']}")
+        if s['last_error']:
+            print(f"  {'✗ 제어 루프 중단' if not s['alive'] else '⚠ 마지막 오류'}: {s['last_error']}")
+
+
+# ============================================================================
+# 벤치마크
+# ============================================================================
+
+def _load_worker(stop):
+    """메인 프로세스 부하 (IK 계산 + 순환 참조 객체로 GC 유발)"""
+    import kinematics
+    rng = np.random.default_rng(0)
+    while not stop.is_set():
+        positions = rng.uniform([-3, -2, -18], [3, 2, -12], size=(2000, 4, 3))
+        kinematics.inverse_kinematics(positions)
+        garbage = []
+        for i in range(20000):
+            node = {'index': i}
+            node['self'] = node
+            garbage.append(node)
+        del garbage
+
+
+def _benchmark_frames(count):
+    """벤치마크용 보행 프레임 → [{채널: (on, off)}, ...]"""
+    import kinematics
+    import trajectory
+    angles = trajectory.compile_gait('walk_forward', cycles=4).angles
+    offsets = pwm_output.phase_offsets()
+    index = pwm_output.channel_joint_index()
+    frames = []
+    for frame in kinematics.joint_to_channel(angles[np.arange(count) % len(angles)]):
+        ticks = pwm_output.angle_to_tick([frame[index[ch]] for ch in index])
+        frames.append(pwm_output.on_off_ticks(dict(zip(index, ticks)), offsets))
+    return frames
+
+
+def run_benchmark(isolated, duration=5.0, rate=None, load=False):
+    """
+    한 모드의 전송 지터 측정 (메인 프로세스가 RT_LEAD_TIME만큼 미리 예약)
+
+    Returns:
+        dict: RtController.stats()
+    """
+    rate = rate or config.CONTROL_RATE
+    count = int(duration * rate)
+    frames = _benchmark_frames(count)
+    controller = RtController(simulate=True, isolated=isolated)
+    if not controller.start():
+        raise RuntimeError("실시간 제어 루프를 시작하지 못했습니다")
+
+    stop = threading.Event()
+    workers = [threading.Thread(target=_load_worker, args=(stop,), daemon=True)] if load else []
+    for worker in workers:
+        worker.start()
+    try:
+        start = time.perf_counter() + config.RT_LEAD_TIME
+        for i, on_off in enumerate(frames):
+            due = start + i / rate
+            delay = due - config.RT_LEAD_TIME - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            controller.post(on_off, due)
+        controller.flush(timeout=1.0)
+        return controller.stats()
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+        controller.close()
+
+
+def _percentile_bound(histogram, fraction):
+    """히스토그램에서 비율 fraction 이하가 들어가는 버킷 상한 (문자열)"""
+    total = sum(histogram)
+    cumulative = 0
+    for bound, n in zip(JITTER_BUCKETS, histogram):
+        cumulative += n
+        if total and cumulative >= fraction * total:
+            return f"≤{bound * 1000:g}ms"
+    return f">{JITTER_BUCKETS[-1] * 1000:g}ms"
+
+
+def print_comparison(results):
+    """모드별 지터 히스토그램 비교 출력 ({모드 이름: stats})"""
+    names = list(results)
+    print(f"\n{'지터':>12} " + ''.join(f"{name:>22}" for name in names))
+    labels = [f"≤{b * 1000:g}ms" for b in JITTER_BUCKETS] + [f">{JITTER_BUCKETS[-1] * 1000:g}ms"]
+    for i, label in enumerate(labels):
+        row = ''
+        for name in names:
+            histogram = results[name]['histogram']
+            total = sum(histogram) or 1
+            row += f"{histogram[i]:>12} ({histogram[i] / total * 100:5.1f}%)"
+        print(f"{label:>12} {row}")
+    print()
+    for name in names:
+        s = results[name]
+        print(f"{name}: {describe_setup(s['setup'])}")
+        print(f"  프레임 {s['frames']}, 평균 {s['mean_jitter'] * 1000:.3f}ms, "
+              f"최대 {s['max_jitter'] * 1000:.3f}ms, "
+              f"p50 {_percentile_bound(s['histogram'], 0.5)}, "
+              f"p99 {_percentile_bound(s['histogram'], 0.99)}, 늦음 {s['late']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="실시간 제어 프로세스 지터 벤치마크 (서보 출력 없음)")
+    parser.add_argument('--duration', type=float, default=5.0, help="모드별 측정 시간 (초)")
+    parser.add_argument('--rate', type=float, default=None, help="프레임 속도 (Hz)")
+    parser.add_argument('--load', action='store_true', help="메인 프로세스에 IK / GC 부하 추가")
+    args = parser.parse_args()
+
+    results = {}
+    for name, isolated in (("프로세스 내", False), ("격리 프로세스", True)):
+        print(f"{name} 측정 중 ({args.duration:g}초)...")
+        results[name] = run_benchmark(isolated, args.duration, args.rate, args.load)
+    print_comparison(results)
+
+
+if __name__ == "__main__":
+    main()
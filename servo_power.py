@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 서보 대기 전원 관리
+
+엎드린 자세처럼 몸체가 바닥에 닿아 스스로 지지되는 자세에서도
+12개 서보는 PWM을 계속 받아 위치를 능동적으로 유지합니다.
+(MG966R 유지 전류 + 발열 → 배터리 사용 시간 감소)
+
+- 명령 없이 SERVO_IDLE_TIMEOUT이 지나고 현재 자세가 스스로 지지되면
+  선택한 관절(SERVO_IDLE_JOINTS) 채널을 full-off로 끕니다.
+- 다음 명령이 오면 마지막으로 명령한 각도(current_angles)로 다리별로
+  나눠 다시 켠 뒤 (돌입 전류 분산) 동작을 시작합니다.
+- prewarm(): 명령을 받자마자 백그라운드에서 미리 깨워서
+  동작 시작 시 깨우기 대기 시간을 줄입니다.
+"""
+
+import threading
+import time
+
+import config
+import pwm_output
+
+
+class ServoPower:
+    """
+    서보 대기 전원 관리
+
+    Args:
+        write: 프레임 전송 함수 write(on_off)
+        angles: 마지막으로 명령한 채널 각도를 반환하는 함수 → {채널: 각도}
+        self_supporting: 현재 자세가 스스로 지지되면 True를 반환하는 함수
+        offsets: 채널별 PWM 위상 오프셋 {채널: 틱}
+    """
+
+    def __init__(self, write, angles, self_supporting, offsets=None):
+        self._write = write
+        self._angles = angles
+        self._self_supporting = self_supporting
+        self._offsets = offsets or {}
+
+        self._lock = threading.RLock()
+        self._asleep = []                 # 꺼진 채널 그룹 (다리별 채널 목록)
+        self._last_activity = time.perf_counter()
+        self._prewarm = None              # 미리 깨우기 스레드
+
+        # 통계
+        self.sleeps = 0
+        self.wakes = 0
+        self.asleep_since = None
+        self.asleep_channel_seconds = 0.0
+        self.wake_waits = []              # 동작이 깨우기를 기다린 시간 (초)
+
+        if config.SERVO_IDLE_TIMEOUT > 0:
+            threading.Thread(target=self._run, name='servo-power', daemon=True).start()
+
+    @property
+    def asleep(self):
+        return bool(self._asleep)
+
+    # ------------------------------------------------------------------
+    # 끄기
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        interval = min(config.SERVO_IDLE_TIMEOUT / 4, 0.5)
+        while True:
+            time.sleep(interval)
+            self.power_down_if_idle()
+
+    def power_down_if_idle(self):
+        """
+        명령 없이 SERVO_IDLE_TIMEOUT이 지났으면 power_down()
+
+        대기 시간 확인과 끄기를 같은 잠금 안에서 하므로, 그 사이 activity()로
+        동작이 시작되면 끄지 않습니다 (동작 프레임 직후에 끄는 경합 방지).
+
+        Returns:
+            bool: 껐으면 True
+        """
+        with self._lock:
+            if time.perf_counter() - self._last_activity < config.SERVO_IDLE_TIMEOUT:
+                return False
+            return self.power_down()
+
+    def power_down(self):
+        """
+        선택한 관절 채널 끄기 (스스로 지지되는 자세일 때만)
+
+        Returns:
+            bool: 껐으면 True
+        """
+        with self._lock:
+            if self._asleep or not self._self_supporting():
+                return False
+            groups = []
+            for leg_name in config.LEG_NAMES:
+                leg_channels = config.CHANNELS[leg_name]
+                groups.append([leg_channels[j] for j in config.SERVO_IDLE_JOINTS])
+            channels = [ch for group in groups for ch in group]
+            if not channels:
+                return False
+
+            self._write({ch: (0, pwm_output.FULL_OFF) for ch in channels})
+            self._asleep = groups
+            self.asleep_since = time.perf_counter()
+            self.sleeps += 1
+            print(f"💤 대기 전원 차단: {len(channels)}개 채널")
+            return True
+
+    # ------------------------------------------------------------------
+    # 깨우기
+    # ------------------------------------------------------------------
+
+    def activity(self):
+        """동작 프레임 전송 알림 (대기 시간 초기화)"""
+        with self._lock:
+            self._last_activity = time.perf_counter()
+
+    def wake(self):
+        """
+        꺼진 채널을 마지막 각도로 다시 켜기 (완료될 때까지 대기)
+
+        동작 프레임 전송 직전에 호출합니다. 미리 깨우는 중이면 끝날 때까지 기다립니다.
+        """
+        self.activity()
+        if not self._asleep:
+            return
+        begin = time.perf_counter()
+        # 미리 깨우는 중이면 잠금을 기다리는 동안 끝남
+        self._wake()
+        self.wake_waits.append(time.perf_counter() - begin)
+
+    def prewarm(self):
+        """백그라운드에서 미리 깨우기 시작 (명령을 받은 직후 호출)"""
+        self.activity()
+        with self._lock:
+            if not self._asleep or self._prewarm is not None:
+                return
+            self._prewarm = threading.Thread(target=self._wake, name='servo-prewarm', daemon=True)
+            self._prewarm.start()
+
+    def _wake(self):
+        with self._lock:
+            if not self._asleep:
+                self._prewarm = None
+                return
+            angles = self._angles()
+            groups = self._asleep
+            # 다리별로 나눠 켜서 돌입 전류가 겹치지 않게 함
+            stagger = config.SERVO_WAKE_TIME / len(groups)
+            for i, group in enumerate(groups):
+                ticks = pwm_output.angle_to_tick([angles[ch] for ch in group])
+                self._write(pwm_output.on_off_ticks(dict(zip(group, ticks)), self._offsets))
+                if i < len(groups) - 1:
+                    time.sleep(stagger)
+
+            self._clear_asleep()
+            self._prewarm = None
+            self.wakes += 1
+
+    def mark_awake(self):
+        """다른 경로(비상 동작 등)로 모든 채널이 다시 켜졌을 때 상태만 갱신"""
+        with self._lock:
+            if self._asleep:
+                self._clear_asleep()
+            self.activity()
+
+    def _clear_asleep(self):
+        channel_count = sum(len(group) for group in self._asleep)
+        self.asleep_channel_seconds += (time.perf_counter() - self.asleep_since) * channel_count
+        self.asleep_since = None
+        self._asleep = []
+
+    # ------------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------------
+
+    def report(self):
+        """대기 전원 통계 출력 (절약한 전하량은 SERVO_HOLD_CURRENT 기준 추정)"""
+        channel_seconds = self.asleep_channel_seconds
+        if self.asleep_since is not None:
+            channel_seconds += (time.perf_counter() - self.asleep_since) * sum(len(g) for g in self._asleep)
+        saved_mah = channel_seconds * config.SERVO_HOLD_CURRENT / 3.6
+        print(f"서보 대기 전원: 차단 {self.sleeps}회, 복구 {self.wakes}회, "
+              f"차단 시간 {channel_seconds:.0f} 채널·초 (약 {saved_mah:.1f}mAh 절약)")
+        if self.wake_waits:
+            print(f"  동작 시작 시 깨우기 대기: 최대 {max(self.wake_waits) * 1000:.1f}ms")
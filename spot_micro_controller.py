@@ -5,20 +5,41 @@ MG966R 서보 모터 사용, PCA9685 제어
 """
 
 import time
+_import_begin = time.perf_counter()  # 시작 시간 측정 (모듈 import 포함)
 import sys
 import math
+import functools
+import threading
+import numpy as np
 import config
+import stability
+import kinematics
+import trajectory
+import time_scaling
+import gait_blend
+import pwm_output
+import frame_scheduler
+import emergency_stop
+import watchdog
+import i2c_writer
+import servo_power
+import energy
+import metrics
+import telemetry
+import motion_script
+import pose_library
+import collision
+import perception
+import rt_control
+import robot_state
+import online_trajectory
+import config_loader
+import startup_cache
 
 # 테스트 모드 설정 (True: 각도만 출력, False: 실제 모터 제어)
+# Adafruit_PCA9685가 없으면 init_pca9685()에서 테스트 모드로 전환합니다.
 TEST_MODE = False
 
-if not TEST_MODE:
-    try:
-        import Adafruit_PCA9685
-    except ImportError:
-        print("경고: Adafruit_PCA9685 라이브러리를 찾을 수 없습니다. 테스트 모드로 전환합니다.")
-        TEST_MODE = True
-
 # ============================================================================
 # 하드웨어 설정 (config.py에서 가져옴)
 # ============================================================================
@@ -32,6 +53,9 @@ SERVO_MAX_TICK = config.SERVO_MAX_TICK
 # [어깨(좌우), 상부관절(상하), 하부관절(상하)]
 channels = config.CHANNELS
 
+# 채널별 PWM 시작 오프셋 (틱) - 서보 펄스 시작 시점 분산
+PWM_OFFSETS = pwm_output.phase_offsets()
+
 # ============================================================================
 # 서보 캘리브레이션 오프셋 (config.py에서 가져옴)
 # ============================================================================
@@ -39,35 +63,107 @@ channels = config.CHANNELS
 SERVO_CALIBRATION_OFFSET = config.SERVO_CALIBRATION_OFFSET
 
 # ============================================================================
-# IK (Inverse Kinematics) 설정
+# IK (Inverse Kinematics) 설정 (config.py에서 가져옴)
 # ============================================================================
-UPPER_SEG_LENGTH = 11.0  # 상부 관절 길이 (cm)
-LOWER_SEG_LENGTH = 13.5  # 하부 관절 길이 (cm)
-IK_SHOULDER_OFFSET = 0.0  # 어깨 오프셋 (cm) - 오프셋 없음
+UPPER_SEG_LENGTH = config.UPPER_SEG_LENGTH  # 상부 관절 길이 (cm)
+LOWER_SEG_LENGTH = config.LOWER_SEG_LENGTH  # 하부 관절 길이 (cm)
+IK_SHOULDER_OFFSET = config.IK_SHOULDER_OFFSET  # 어깨 오프셋 (cm)
 
 # ============================================================================
-# 동작 기본 설정 (모든 값은 사용자가 조정 가능)
+# 동작 기본 설정 (config.py에서 가져옴, 모든 값은 사용자가 조정 가능)
 # ============================================================================
 # 엎드린 자세 좌표
-LIE_X = 2.35     # 엎드린 자세 X (cm)
-LIE_Y = 0.0     # 엎드린 자세 Y (cm)
-LIE_Z = -8.4   # 엎드린 자세 Z (cm)
+LIE_X = config.LIE_X     # 엎드린 자세 X (cm)
+LIE_Y = config.LIE_Y     # 엎드린 자세 Y (cm)
+LIE_Z = config.LIE_Z     # 엎드린 자세 Z (cm)
 
 # 걷기/회전 기본 자세 좌표 => 기본 좌표로 변경
-STANDBY_X = 0.82   # 걷기 시 앞뒤 중립 위치 (cm)
-STANDBY_Y = 0.0    # 걷기 시 좌우 중립 위치 (cm)
-STANDBY_Z = -14.18  # 걷기 시 높이 (cm)
+STANDBY_X = config.STANDBY_X   # 걷기 시 앞뒤 중립 위치 (cm)
+STANDBY_Y = config.STANDBY_Y   # 걷기 시 좌우 중립 위치 (cm)
+STANDBY_Z = config.STANDBY_Z   # 걷기 시 높이 (cm)
 
 # 동작 공통 파라미터
-TURN_LIFT_HEIGHT = 2.0   # 회전 시 다리 들어올리는 높이 (cm)
-TILT_HEIGHT = 4.0        # 기울이기 높이 차이 (cm)
+TURN_LIFT_HEIGHT = config.TURN_LIFT_HEIGHT   # 회전 시 다리 들어올리는 높이 (cm)
+TILT_HEIGHT = config.TILT_HEIGHT             # 기울이기 높이 차이 (cm)
 
 # ============================================================================
 # 전역 변수
 # ============================================================================
 pca = None
-# 좌표 기반 초기 각도 (IK 함수가 정의된 후, init_pca9685()에서 초기화됨)
+# 관절 상태 (명령 / 현재 채널 각도 (4, 3) 배열, config.LEG_NAMES 순서)
+robot = robot_state.RobotState()
+# robot.current의 {다리: 각도} 딕셔너리 뷰 (init_pca9685()에서 초기 각도 계산 후 설정)
 current_angles = None
+# 연속 보행 블렌딩 엔진 (walk_curve() 첫 호출 시 생성)
+gait_blender = None
+# 테스트 모드 PWM 시뮬레이션: 한 주기 내 동시 HIGH 펄스 수 최댓값
+pwm_peak_concurrent = 0
+# PWM 주기 정렬 스케줄러 (config.FRAME_ALIGNMENT, init_pca9685()에서 생성)
+frame_sched = None
+# I2C 버스 잠금 (프레임 전송 / 비상 동작 / 워치독이 공유)
+bus_lock = threading.Lock()
+# 버스를 잡은 스레드가 멈춰 있어서 잠금 없이 강제로 전송한 횟수
+bus_forced_writes = 0
+# 비동기 I2C 전송 스레드 (config.I2C_ASYNC_WRITER, init_pca9685()에서 생성)
+bus_writer = None
+# 서보 대기 전원 관리 (config.SERVO_IDLE_TIMEOUT, init_pca9685()에서 생성)
+power_manager = None
+# 동작별 에너지 / 서보 부하 추정 (config.ENERGY_ESTIMATION)
+energy_meter = energy.EnergyEstimator() if config.ENERGY_ESTIMATION else None
+# 마지막 프레임 전송 시각 (메트릭)
+_last_frame_time = None
+# UDP 텔레메트리 송신 (config.TELEMETRY_PORT, init_telemetry()에서 생성)
+telemetry_sender = None
+# 재생 중인 보행 위상 (0~1, 모르면 NaN) - 텔레메트리용
+gait_phase = math.nan
+# 재생 중인 궤적이 이미 간섭 검사를 통과했는지 (프레임별 검사 생략)
+_collision_prechecked = False
+# 프레임별 간섭 가드가 막은 프레임 수
+collision_blocked_frames = 0
+# 격리된 실시간 제어 프로세스 (config.RT_CONTROL_ENABLED, init_pca9685()에서 시작)
+rt_controller = None
+# 재생 중인 프레임의 전송 예정 시각 (perf_counter, 실시간 제어 프로세스용, None = 바로)
+_frame_due = None
+# 시작 단계별 소요 시간 (초, 'import' / 'cache' / 'init')
+startup_times = {}
+# 시작 캐시를 그대로 썼는지 (None = 사용 안 함)
+startup_cache_hit = None
+# 지난 실행에서 마지막으로 전송한 관절 각도 (4, 3) (없으면 None → 엎드린 자세로 가정)
+_last_pose = None
+
+# ============================================================================
+# 동작 호출 계측 (직접 제어 / 고수준 동작 공통)
+# ============================================================================
+
+def _tracked_motion(label=None):
+    """
+    동작 함수 호출 단위 계측 (에너지 추정, 현재 동작 메트릭)
+
+    Args:
+        label: 호출 인자로 이름을 만드는 함수, None이면 함수 이름 사용
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            name = label(*args, **kwargs) if label is not None else func.__name__
+            # 중첩 호출 (demo 안의 walk_forward 등)은 바깥 동작 이름 유지
+            outer = metrics.current_motion.value
+            if outer == 'idle':
+                # 동작 시작 전에 바뀐 설정 파일 적용
+                config_loader.apply_pending()
+                metrics.current_motion.set(name)
+            try:
+                if energy_meter is None:
+                    return func(*args, **kwargs)
+                with energy_meter.invocation(name):
+                    return func(*args, **kwargs)
+            finally:
+                metrics.current_motion.set(outer)
+                if outer == 'idle':
+                    # 동작 사이 대기 (다음 API 호출까지)는 하트비트 감시 안 함
+                    watchdog.disarm()
+        return wrapper
+    return decorator
 
 # ============================================================================
 # IK (Inverse Kinematics) 함수
@@ -103,6 +199,8 @@ def coord_to_angles_3d(x, y, z, is_left=False, is_rear=False):
         (shoulder, upper, lower): 3개 관절 각도 (도)
         실패 시 None 반환
     """
+    begin = time.perf_counter()
+
     # 왼쪽 다리는 Y를 반전시켜 오른쪽처럼 계산
     if is_left:
         y = -y
@@ -110,10 +208,8 @@ def coord_to_angles_3d(x, y, z, is_left=False, is_rear=False):
     # 1. 어깨 각도 계산
     # 어깨는 좌우 회전만 담당 (Y 좌표로만 결정)
     # Y=0 → 90° (정면), Y>0 → 90°+ (바깥), Y<0 → 90°- (안쪽)
-    if y != 0:
-        shoulder_angle_offset = math.degrees(math.atan(y / (abs(x) + IK_SHOULDER_OFFSET)))
-    else:
-        shoulder_angle_offset = 0
+    # atan2: x == 0 이고 y != 0 이면 ±90°가 되지만 그 자세로는 y를 만들 수 없음 (아래에서 도달 불가 처리)
+    shoulder_angle_offset = math.degrees(math.atan2(y, abs(x) + IK_SHOULDER_OFFSET))
 
     shoulder = 90 + shoulder_angle_offset  # 90도가 정면
 
@@ -138,7 +234,9 @@ def coord_to_angles_3d(x, y, z, is_left=False, is_rear=False):
     max_reach = UPPER_SEG_LENGTH + LOWER_SEG_LENGTH
     min_reach = abs(UPPER_SEG_LENGTH - LOWER_SEG_LENGTH)
 
-    if distance > max_reach or distance < min_reach:
+    # 어깨 축 위 (x == 0, 오프셋 없음)에서는 어깨 각도로 y를 만들 수 없음 (kinematics.ik와 같음)
+    if distance > max_reach or distance < min_reach or (abs(x) + IK_SHOULDER_OFFSET == 0 and y != 0):
+        metrics.ik_failures.inc()
         print(f"⚠ 좌표 ({x:.1f}, {y:.1f}, {z:.1f})은 도달 불가능")
         return None
 
@@ -175,11 +273,14 @@ def coord_to_angles_3d(x, y, z, is_left=False, is_rear=False):
     if is_left:
         upper = 180 - upper
         lower = 180 - lower
-        
-    print(f"각도 : [{shoulder}, {upper}, {lower}]")
+
+    metrics.ik_time.observe(time.perf_counter() - begin)
+    if config.VERBOSE_LOGGING:
+        print(f"각도 : [{shoulder}, {upper}, {lower}]")
 
     return (shoulder, upper, lower)
 
+@_tracked_motion()
 def set_leg_position_xyz(leg_name, x, y, z, duration=0.5, steps=20):
     """
     개별 다리를 3D 좌표로 제어
@@ -192,10 +293,12 @@ def set_leg_position_xyz(leg_name, x, y, z, duration=0.5, steps=20):
         duration: 이동 시간 (초)
         steps: 부드러운 이동을 위한 스텝 수
     """
-    # 왼쪽 다리 여부 판단
-    is_left = 'left' in leg_name
-    # 뒷다리 여부 판단
-    is_rear = 'rear' in leg_name
+    if leg_name not in kinematics.LEG_INDEX:
+        print(f"경고: 알 수 없는 다리 이름 '{leg_name}'")
+        return False
+    leg_index = kinematics.LEG_INDEX[leg_name]
+    is_left = kinematics.IS_LEFT[leg_index]
+    is_rear = kinematics.IS_REAR[leg_index]
 
     # IK 계산
     result = coord_to_angles_3d(x, y, z, is_left, is_rear)
@@ -282,27 +385,23 @@ def _calculate_initial_angles():
     엎드린 자세의 초기 각도 계산 (좌표 기반 IK 사용)
 
     Returns:
-        dict: 각 다리의 초기 각도 {'leg_name': [shoulder, upper, lower]}
-    """
-    angles = {}
-    legs_config = [
-        ('front_right', False, False),
-        ('rear_right', False, True),
-        ('front_left', True, False),
-        ('rear_left', True, True)
-    ]
+        np.ndarray: (4, 3) 채널 각도, config.LEG_NAMES 순서
+                    (robot.current와 같이 캘리브레이션 오프셋 포함)
+    """
+    angles = np.empty((len(config.LEG_NAMES), 3))
 
-    for leg_name, is_left, is_rear in legs_config:
-        result = coord_to_angles_3d(LIE_X, LIE_Y, LIE_Z, is_left, is_rear)
+    for i, leg_name in enumerate(config.LEG_NAMES):
+        result = coord_to_angles_3d(LIE_X, LIE_Y, LIE_Z, kinematics.IS_LEFT[i], kinematics.IS_REAR[i])
         if result:
-            angles[leg_name] = list(result)
+            angles[i] = result
         else:
             # IK 실패 시 안전한 기본값 (90도 정면, 중립 자세)
             print(f"⚠ {leg_name}: IK 계산 실패, 기본값 사용")
-            angles[leg_name] = [90.0, 90.0, 90.0]
+            angles[i] = [90.0, 90.0, 90.0]
 
-    return angles
+    return robot.to_channel(angles)
 
+@_tracked_motion()
 def set_all_legs_position_xyz(positions_dict, duration=0.5, steps=20):
     """
     모든 다리를 3D 좌표로 동시에 제어
@@ -312,17 +411,24 @@ def set_all_legs_position_xyz(positions_dict, duration=0.5, steps=20):
         duration: 이동 시간 (초)
         steps: 부드러운 이동을 위한 스텝 수
     """
+    # 안정성 가드 (config.STABILITY_GUARD)
+    if config.STABILITY_GUARD != 'off' and all(leg in positions_dict for leg in config.LEG_NAMES):
+        stable, margin = stability.check_pose(positions_dict)
+        if not stable:
+            print(f"⚠ 불안정한 자세 (안정 여유 {margin:.2f}cm)")
+            if config.STABILITY_GUARD == 'block':
+                print("✗ 안정성 가드로 동작을 실행하지 않습니다")
+                return False
+
     # 각 다리의 좌표를 각도로 변환
     angles_dict = {}
 
     for leg_name, (x, y, z) in positions_dict.items():
-        # 왼쪽 다리 여부 판단
-        is_left = 'left' in leg_name
-        # 뒷다리 여부 판단
-        is_rear = 'rear' in leg_name
+        leg_index = kinematics.LEG_INDEX[leg_name]
 
         # IK 계산
-        result = coord_to_angles_3d(x, y, z, is_left, is_rear)
+        result = coord_to_angles_3d(x, y, z, kinematics.IS_LEFT[leg_index],
+                                    kinematics.IS_REAR[leg_index])
 
         if result is None:
             print(f"✗ {leg_name} 다리를 목표 위치로 이동할 수 없습니다")
@@ -335,35 +441,136 @@ def set_all_legs_position_xyz(positions_dict, duration=0.5, steps=20):
             print(f"[좌표 제어] {leg_name}: ({x:.1f}, {y:.1f}, {z:.1f})cm → [{shoulder:.1f}°, {upper:.1f}°, {lower:.1f}°]")
 
     # 모든 다리를 동시에 각도로 이동
-    set_all_legs_angles(angles_dict, duration, steps)
-
-    return True
+    return set_all_legs_angles(angles_dict, duration, steps)
 
 
 # ============================================================================
 # 초기화 함수
 # ============================================================================
+def init_startup_cache():
+    """
+    시작 캐시 준비 + 마지막 자세 불러오기 (config.STARTUP_CACHE_DIR / STARTUP_STATE_FILE)
+
+    설정 덮어쓰기 파일을 적용한 뒤 (init_config_reload()), init_pca9685() 전에 호출합니다.
+    """
+    global startup_cache_hit, _last_pose
+    begin = time.perf_counter()
+    startup_times['import'] = begin - _import_begin
+
+    if config.STARTUP_CACHE_DIR:
+        try:
+            startup_cache_hit = startup_cache.warm()
+        except (OSError, ValueError) as e:
+            print(f"⚠ 시작 캐시 사용 실패: {e}")
+    if config.STARTUP_STATE_FILE:
+        try:
+            robot.persist, _last_pose = startup_cache.open_pose_store()
+        except (OSError, ValueError) as e:
+            print(f"⚠ 마지막 자세 파일 사용 실패: {e}")
+
+    startup_times['cache'] = time.perf_counter() - begin
+
+def _report_startup():
+    """시작 시간 출력 (import부터 초기화 완료까지)"""
+    total = time.perf_counter() - _import_begin
+    startup_times['total'] = total
+    parts = [f"{name} {startup_times[name] * 1000:.1f}ms"
+             for name in ('import', 'cache', 'init') if name in startup_times]
+    if startup_cache_hit is not None:
+        parts.append("캐시 적중" if startup_cache_hit else "캐시 생성")
+    print(f"✓ 시작 시간 {total * 1000:.1f}ms ({', '.join(parts)})")
+
 def init_pca9685():
     """PCA9685 및 초기 각도 초기화"""
-    global pca, current_angles
+    global current_angles, bus_writer, power_manager, rt_controller, TEST_MODE
+    begin = time.perf_counter()
 
-    # 좌표 기반 초기 각도 계산
-    if current_angles is None:
-        current_angles = _calculate_initial_angles()
-        print("✓ 초기 각도 계산 완료 (좌표 기반 IK)")
+    if not TEST_MODE and _pca_driver() is None:
+        print("경고: Adafruit_PCA9685 라이브러리를 찾을 수 없습니다. 테스트 모드로 전환합니다.")
+        TEST_MODE = True
 
-    if TEST_MODE:
+    # 초기 각도: 지난 실행의 마지막 자세, 없으면 엎드린 자세 (좌표 기반 IK)
+    if current_angles is None:
+        if _last_pose is not None:
+            robot.reset(robot.to_channel(_last_pose))
+            print("✓ 초기 각도: 지난 실행의 마지막 자세")
+        else:
+            robot.reset(_calculate_initial_angles())
+            print("✓ 초기 각도 계산 완료 (좌표 기반 IK)")
+        current_angles = robot.view
+
+    if config.RT_CONTROL_ENABLED:
+        # 실시간 제어 프로세스가 PCA9685를 전담 (이 프로세스는 버스를 열지 않음)
+        if rt_controller is None:
+            rt_controller = rt_control.RtController(simulate=TEST_MODE)
+            if not rt_controller.start():
+                print("✗ 실시간 제어 프로세스를 시작하지 못했습니다")
+                rt_controller.close()
+                rt_controller = None
+                return False
+            print(f"✓ 실시간 제어 프로세스 (pid {rt_controller.pid}, "
+                  f"{rt_control.describe_setup(rt_controller.setup)})")
+    elif TEST_MODE:
         print("[테스트 모드] PCA9685 초기화 시뮬레이션")
-        return True
+        _open_pca()
+    else:
+        try:
+            _open_pca()
+            print(f"✓ I2C 버스 {I2C_BUS_NUM}번에서 PCA9685가 성공적으로 초기화되었습니다.")
+        except Exception as e:
+            print(f"✗ I2C 초기화 오류: {e}")
+            return False
+
+    if config.I2C_ASYNC_WRITER and bus_writer is None and rt_controller is None:
+        bus_writer = i2c_writer.I2CWriter(_locked_bus_write, reinit=_reinit_pca,
+                                          on_fault=lambda: emergency_stop.trigger('i2c'))
+    if config.SERVO_IDLE_TIMEOUT > 0 and power_manager is None:
+        power_manager = servo_power.ServoPower(_post_frame, _current_channel_angles,
+                                               _resting_on_body, PWM_OFFSETS)
+    startup_times['init'] = time.perf_counter() - begin
+    return True
 
+def _pca_driver():
+    """Adafruit_PCA9685 모듈 (처음 연결할 때 불러옴, 없으면 None)"""
     try:
-        pca = Adafruit_PCA9685.PCA9685(address=PCA9685_ADDRESS, busnum=I2C_BUS_NUM)
+        import Adafruit_PCA9685
+    except ImportError:
+        return None
+    return Adafruit_PCA9685
+
+def _open_pca():
+    """PCA9685 연결 및 설정 (PWM 주파수, 자동 증가, 주기 정렬 스케줄러)"""
+    global pca, frame_sched
+
+    if not TEST_MODE:
+        pca = _pca_driver().PCA9685(address=PCA9685_ADDRESS, busnum=I2C_BUS_NUM)
         pca.set_pwm_freq(SERVO_FREQUENCY)
-        print(f"✓ I2C 버스 {I2C_BUS_NUM}번에서 PCA9685가 성공적으로 초기화되었습니다.")
-        return True
-    except Exception as e:
-        print(f"✗ I2C 초기화 오류: {e}")
-        return False
+        pwm_output.enable_auto_increment(pca)
+    # PWM 카운터는 set_pwm_freq()에서 오실레이터가 재시작된 시점부터 셈
+    if config.FRAME_ALIGNMENT:
+        frame_sched = frame_scheduler.FrameScheduler()
+
+def _current_channel_angles():
+    """마지막으로 명령한 각도 {채널: 각도} (캘리브레이션 오프셋 포함)"""
+    return robot.channel_angles()
+
+def _current_joint_angles():
+    """마지막으로 명령한 관절 각도 (4, 3) (캘리브레이션 오프셋 제외), config.LEG_NAMES 순서"""
+    return robot.joint_angles()
+
+def _current_foot_positions():
+    """마지막으로 명령한 각도의 발 좌표 (4, 3), config.LEG_NAMES 순서"""
+    return kinematics.forward_kinematics(_current_joint_angles())
+
+def _resting_on_body():
+    """몸체가 바닥에 닿아 스스로 지지되는 자세인지 (모든 발이 SERVO_IDLE_MAX_FOOT_DEPTH보다 얕음)"""
+    feet = _current_foot_positions()
+    return bool((feet[:, 2] > -config.SERVO_IDLE_MAX_FOOT_DEPTH).all())
+
+def _reinit_pca():
+    """I2C 오류 / PCA9685 리셋 후 재초기화 (전송 스레드에서 호출)"""
+    with bus_lock:
+        _open_pca()
 
 # ============================================================================
 # 저수준 서보 제어 함수
@@ -377,10 +584,154 @@ def _set_servo_pwm(channel, angle):
         # 테스트 모드: 각도만 출력
         return
 
-    # PWM 값 계산 및 적용
-    pwm_value = int(SERVO_MIN_TICK + (SERVO_MAX_TICK - SERVO_MIN_TICK) * angle / 180.0)
-    pca.set_pwm(channel, 0, pwm_value)
+    # 한 채널짜리 프레임으로 전송 (채널 오프셋 적용, 펄스 폭은 동일)
+    _write_frame({channel: angle})
+
+def _write_frame(angles_by_channel, emergency=False):
+    """
+    여러 채널을 한 프레임으로 전송 (블록 쓰기, 채널별 위상 오프셋 적용)
+
+    Args:
+        angles_by_channel: {채널: 각도}
+        emergency: 비상 동작 프레임 (비상 정지 상태에서도 전송)
+    """
+    global pwm_peak_concurrent
+
+    # 비상 정지가 트리거되면 일반 동작 프레임은 보내지 않고 중단
+    if not emergency:
+        emergency_stop.check()
+
+    ticks = pwm_output.angle_to_tick(list(angles_by_channel.values()))
+    on_off = pwm_output.on_off_ticks(dict(zip(angles_by_channel, ticks)), PWM_OFFSETS)
+
+    if TEST_MODE:
+        # 테스트 모드: PCA9685 출력 시뮬레이션 (동시 펄스 수 계산)
+        peak = pwm_output.peak_concurrent_pulses(on_off)
+        pwm_peak_concurrent = max(pwm_peak_concurrent, peak)
+
+    if emergency and rt_controller is not None:
+        # 실시간 제어 프로세스에 예약된 프레임을 버리고 바로 전송
+        rt_controller.clear()
+        rt_controller.post(on_off)
+        if power_manager is not None:
+            power_manager.mark_awake()
+        _frame_committed(angles_by_channel, emergency=True)
+        return
+
+    if emergency:
+        # 비상 동작은 대기 프레임을 버리고 바로 전송 (전송 스레드를 기다리지 않음)
+        if bus_writer is not None:
+            bus_writer.clear()
+        locked = _acquire_bus(emergency=True)
+        try:
+            _bus_write(on_off)
+        finally:
+            if locked:
+                bus_lock.release()
+        if power_manager is not None:
+            power_manager.mark_awake()
+        _frame_committed(angles_by_channel, emergency=True)
+        return
+
+    if power_manager is not None:
+        # 대기 전원으로 꺼진 서보는 마지막 각도로 먼저 다시 켠 뒤 이동
+        power_manager.wake()
+    _post_frame(on_off)
+    _frame_committed(angles_by_channel)
+    watchdog.heartbeat()
+
+def _frame_committed(angles_by_channel, emergency=False):
+    """전송한 프레임 기록 (메트릭, 에너지 추정, 텔레메트리)"""
+    global _last_frame_time
+    if energy_meter is not None:
+        energy_meter.record(angles_by_channel)
+    if telemetry_sender is not None:
+        telemetry_sender.publish(angles_by_channel, gait_phase, emergency)
+
+    now = time.perf_counter()
+    metrics.frames.inc()
+    metrics.clamps.inc(sum(1 for angle in angles_by_channel.values() if not 0 <= angle <= 180))
+    if _last_frame_time is not None:
+        interval = now - _last_frame_time
+        metrics.loop_interval.observe(interval)
+        # 명령 대기 구간은 전송 속도에서 제외
+        if 0 < interval < 1.0:
+            rate = metrics.loop_rate.value
+            metrics.loop_rate.set(1.0 / interval if rate == 0 else 0.9 * rate + 0.1 / interval)
+    _last_frame_time = now
+
+def _post_frame(on_off):
+    """프레임 전송 요청 (전송 스레드가 있으면 넘기고 바로 반환)"""
+    if rt_controller is not None:
+        # 재생 중이면 예정 시각에 전송 (시각은 실시간 제어 프로세스가 맞춤)
+        rt_controller.post(on_off, _frame_due)
+    elif bus_writer is not None:
+        # 버스가 밀리면 최신 프레임만 전송
+        bus_writer.post(on_off)
+    else:
+        with bus_lock:
+            _bus_write(on_off)
+
+def _bus_write(on_off):
+    """
+    프레임을 PCA9685에 전송 (호출자가 버스 잠금을 가진 상태)
+
+    I2C 오류는 OSError로 그대로 전달됩니다 (전송 스레드가 재시도).
+    """
+    if TEST_MODE:
+        if frame_sched is not None:
+            frame_sched.commit(None, on_off)
+        return
+
+    begin = time.perf_counter()
+    if frame_sched is not None:
+        # PWM 주기에 맞춰 전송 (채널 간 시간차 최소화)
+        frame_sched.commit(pca, on_off)
+    else:
+        pwm_output.write_frame(pca, on_off)
+    metrics.i2c_time.observe(time.perf_counter() - begin)
+
+def _locked_bus_write(on_off):
+    """전송 스레드용 프레임 전송 (버스 잠금)"""
+    with bus_lock:
+        _bus_write(on_off)
+
+def _acquire_bus(emergency=False):
+    """
+    I2C 버스 잠금
+
+    비상 동작은 버스를 잡은 스레드가 멈춰 있어도 (I2C 응답 없음 등)
+    WATCHDOG_BUS_TIMEOUT 후 잠금 없이 강제로 전송합니다.
+
+    Returns:
+        bool: 잠금을 얻었으면 True (호출자가 해제)
+    """
+    global bus_forced_writes
+    if not emergency:
+        return bus_lock.acquire()
+    if bus_lock.acquire(timeout=config.WATCHDOG_BUS_TIMEOUT):
+        return True
+    bus_forced_writes += 1
+    return False
+
+def _cut_outputs():
+    """모든 PWM 출력 차단 (비상 동작 버스 잠금 사용)"""
+    if robot.persist is not None:
+        # 힘이 빠진 다리가 어디로 갈지 모르므로 다음 시작 때는 엎드린 자세로 가정
+        robot.persist[:] = np.nan
+    if rt_controller is not None:
+        rt_controller.cut()
+        return
+    if TEST_MODE:
+        return
+    locked = _acquire_bus(emergency=True)
+    try:
+        pwm_output.cut_outputs(pca)
+    finally:
+        if locked:
+            bus_lock.release()
 
+@_tracked_motion()
 def set_leg_angles(leg_name, angles, duration=0.5, steps=20):
     """
     특정 다리의 모든 관절을 즉시 이동 (보간 없음)
@@ -391,33 +742,40 @@ def set_leg_angles(leg_name, angles, duration=0.5, steps=20):
         duration: (사용 안 함, 호환성 유지)
         steps: (사용 안 함, 호환성 유지)
     """
-    if leg_name not in channels:
+    if leg_name not in kinematics.LEG_INDEX:
         print(f"경고: 알 수 없는 다리 이름 '{leg_name}'")
         return
 
-    leg_channels = channels[leg_name]
-    start_angles = current_angles[leg_name].copy()
-
-    # offset 적용 (config.py의 SERVO_CALIBRATION_OFFSET 사용)
-    angles_with_offset = angles.copy()
-    if leg_name in config.SERVO_CALIBRATION_OFFSET:
-        offsets = config.SERVO_CALIBRATION_OFFSET[leg_name]
-        for i in range(len(angles_with_offset)):
-            angles_with_offset[i] += offsets[i]
+    # 캘리브레이션 적용 (config.py의 SERVO_CALIBRATION_OFFSET / SCALE 사용)
+    robot.command_leg(leg_name, angles)
 
     if TEST_MODE:
-        if leg_name in config.SERVO_CALIBRATION_OFFSET:
-            print(f"[테스트] {leg_name}: {start_angles} → {angles} (offset 적용 후: {angles_with_offset})")
-        else:
-            print(f"[테스트] {leg_name}: {start_angles} → {angles}")
+        i = kinematics.LEG_INDEX[leg_name]
+        print(f"[테스트] {leg_name}: {robot.current[i].tolist()} → {list(angles)} "
+              f"(offset 적용 후: {robot.commanded[i].tolist()})")
 
     # 보간 없이 바로 이동 (빠르고 정확한 동작)
-    for i, channel in enumerate(leg_channels):
-        _set_servo_pwm(channel, angles_with_offset[i])
+    _send_commanded_frame()
 
-    # 현재 각도 업데이트 (offset이 적용된 각도로)
-    current_angles[leg_name] = angles_with_offset.copy()
-    
+def _collision_guard():
+    """
+    명령 버퍼 프레임의 자기 간섭 검사 (명령하지 않은 다리는 현재 각도)
+
+    Returns:
+        bool: 전송해도 되면 True ('block' 모드에서 간섭하면 False)
+    """
+    global collision_blocked_frames
+    clear, clearance, pair = collision.check_pose(robot.pending_joint_angles())
+    if clear:
+        return True
+    print(f"⚠ 자기 간섭: {pair} (간격 {clearance:.2f}cm)")
+    if config.COLLISION_GUARD == 'block':
+        collision_blocked_frames += 1
+        print("✗ 간섭 가드로 프레임을 전송하지 않습니다")
+        return False
+    return True
+
+@_tracked_motion()
 def set_all_legs_angles(angles_dict, duration=0.5, steps=20):
     """
     모든 다리를 동시에 즉시 이동 (보간 없음)
@@ -426,84 +784,334 @@ def set_all_legs_angles(angles_dict, duration=0.5, steps=20):
         angles_dict: {'front_left': [...], 'front_right': [...], ...}
         duration: (사용 안 함, 호환성 유지)
         steps: (사용 안 함, 호환성 유지)
+
+    Returns:
+        bool: 전송했으면 True (간섭 가드가 막으면 False)
     """
-    # offset 적용된 각도 딕셔너리 생성
-    angles_with_offset_dict = {}
+    # offset 적용 (명령 버퍼에 제자리 기록)
     for leg_name, target_angles in angles_dict.items():
-        angles_with_offset = target_angles.copy()
-        if leg_name in config.SERVO_CALIBRATION_OFFSET:
-            offsets = config.SERVO_CALIBRATION_OFFSET[leg_name]
-            for i in range(len(angles_with_offset)):
-                angles_with_offset[i] += offsets[i]
-        angles_with_offset_dict[leg_name] = angles_with_offset
+        robot.command_leg(leg_name, target_angles)
+    return _send_commanded_frame()
 
-    # 시작 각도 저장
-    start_angles_dict = {leg: current_angles[leg].copy() for leg in angles_dict.keys()}
+def set_all_legs_angle_array(angles):
+    """
+    (4, 3) 관절 각도 배열로 모든 다리를 즉시 이동 (궤적 재생용, 딕셔너리 변환 없음)
+
+    Args:
+        angles: (4, 3) [어깨, 상부, 하부] 각도 (config.LEG_NAMES 순서, 오프셋 미적용)
+
+    Returns:
+        bool: 전송했으면 True (간섭 가드가 막으면 False)
+    """
+    robot.command_all(angles)
+    return _send_commanded_frame()
+
+def _send_commanded_frame():
+    """
+    명령 버퍼 (robot.commanded)를 한 프레임으로 전송하고 현재 각도 갱신
+
+    Returns:
+        bool: 전송했으면 True (간섭 가드가 막으면 False)
+    """
+    # 간섭 가드 (config.COLLISION_GUARD) - 미리 검사한 궤적 재생 중에는 생략
+    if config.COLLISION_GUARD != 'off' and not _collision_prechecked:
+        if not _collision_guard():
+            robot.discard()
+            return False
 
     if TEST_MODE:
         print(f"[테스트] 모든 다리 이동:")
-        for leg_name, target_angles in angles_dict.items():
-            if leg_name in config.SERVO_CALIBRATION_OFFSET:
-                print(f"  {leg_name}: {start_angles_dict[leg_name]} → {target_angles} (offset 적용 후: {angles_with_offset_dict[leg_name]})")
-            else:
-                print(f"  {leg_name}: {start_angles_dict[leg_name]} → {target_angles}")
+        joints = robot.pending_joint_angles()
+        for i in np.flatnonzero(robot.legs):
+            print(f"  {config.LEG_NAMES[i]}: {robot.current[i].tolist()} → {joints[i].tolist()} "
+                  f"(offset 적용 후: {robot.commanded[i].tolist()})")
 
-    # 보간 없이 바로 이동 (빠르고 정확한 동작)
-    for leg_name in angles_dict.keys():
-        leg_channels = channels[leg_name]
-        target_angles_with_offset = angles_with_offset_dict[leg_name]
+    # 보간 없이 바로 이동 (빠르고 정확한 동작) - 한 프레임으로 일괄 전송
+    try:
+        _write_frame(robot.frame())
+    except BaseException:
+        # 비상 정지 등으로 전송하지 못한 프레임은 버림
+        robot.discard()
+        raise
 
-        for i, channel in enumerate(leg_channels):
-            _set_servo_pwm(channel, target_angles_with_offset[i])
+    if TEST_MODE:
+        print(f"  PWM 동시 펄스 최대: {pwm_peak_concurrent}개")
 
     # 현재 각도 업데이트 (offset이 적용된 각도로)
-    for leg_name in angles_dict.keys():
-        current_angles[leg_name] = angles_with_offset_dict[leg_name].copy()
+    robot.commit()
+
+    # 바뀐 설정 파일은 프레임 사이에 적용 (다음 프레임부터 새 값)
+    if config_loader.pending() is not None:
+        config_loader.apply_pending()
+    return True
+
+# ============================================================================
+# 비상 정지
+# ============================================================================
+
+def _emergency_target():
+    """
+    비상 자세의 채널 각도 (캘리브레이션 적용, config.LEG_NAMES 순서)
+
+    Returns:
+        np.ndarray: (4, 3) 각도
+    """
+    pose = config.EMERGENCY_POSE
+    if pose == 'lie_down':
+        positions = [(LIE_X, LIE_Y, LIE_Z)] * 4
+        target, _ = kinematics.inverse_kinematics(positions)
+    else:
+        target = [config.PRESET_POSES[pose][leg] for leg in config.LEG_NAMES]
+
+    return kinematics.joint_to_channel(target)
+
+def handle_emergency():
+    """
+    비상 동작 실행 (config.ESTOP_ACTION)
+
+    'pose': 현재 각도에서 EMERGENCY_POSE까지 관절 속도 제한 궤적으로 이동
+    'cut':  모든 PWM 출력 차단
+    """
+    if not emergency_stop.begin_handling():
+        print("⚠ 비상 정지 상태입니다. 'reset' 명령으로 해제하세요.")
+        return
+
+    if config.ESTOP_ACTION == 'cut' or current_angles is None:
+        _cut_outputs()
+        emergency_stop.mark_write()
+        print("⚠ 비상 정지: 모든 서보 출력 차단")
+        return
+
+    frames = emergency_stop.rate_limited_trajectory(robot.current.copy(), EMERGENCY_TARGET)
+
+    period = 1.0 / config.CONTROL_RATE
+    begin = time.perf_counter()
+    for i, frame in enumerate(frames):
+        # 동작 루프가 남긴 명령 버퍼는 버리고 비상 궤적 프레임으로 덮어씀
+        robot.reset(frame)
+        _write_frame(robot.channel_frame(frame), emergency=True)
+        emergency_stop.mark_write()
+
+        delay = begin + (i + 1) * period - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    print(f"⚠ 비상 정지: {config.EMERGENCY_POSE} 자세로 이동 완료 ({len(frames)} 프레임)")
+
+def init_emergency_stop():
+    """비상 정지 트리거 (신호 / UDP / 파일) 설치"""
+    emergency_stop.set_handler(handle_emergency)
+    try:
+        emergency_stop.install_signal_trigger()
+        emergency_stop.start_udp_trigger()
+        emergency_stop.start_file_trigger()
+    except (OSError, ValueError) as e:
+        print(f"⚠ 비상 정지 트리거 설치 실패: {e}")
+
+def _watchdog_takeover(reason):
+    """
+    워치독 개입 (워치독 스레드에서 실행, config.WATCHDOG_ACTION)
+
+    'emergency': 비상 정지 트리거 - 제어 루프가 깨어나면 다음 틱에 중단되고,
+                 계속 멈춰 있으면 트리거 스레드가 비상 동작을 실행
+    'cut':       비상 정지 상태로 만들고 직접 모든 출력 차단
+    """
+    if emergency_stop.triggered():
+        # 이미 비상 정지 처리 중 (비상 동작 중에는 하트비트가 없음)
+        return
+    print(f"\n⚠ 워치독: {reason}")
+    emergency_stop.trigger('watchdog')
+    if config.WATCHDOG_ACTION == 'cut' and emergency_stop.begin_handling():
+        _cut_outputs()
+        emergency_stop.mark_write()
+        print("⚠ 워치독: 모든 서보 출력 차단")
+
+def init_watchdog():
+    """제어 루프 워치독 시작 (config.WATCHDOG_ENABLED)"""
+    if not config.WATCHDOG_ENABLED:
+        return
+    # 초기화 중 하트비트는 감시하지 않음 (첫 동작부터 감시)
+    watchdog.disarm()
+    if bus_writer is not None:
+        # 전송 스레드가 I2C 트랜잭션에서 멈춘 경우
+        watchdog.add_check(lambda: "I2C 전송 응답 없음"
+                           if bus_writer.busy_time() > config.WATCHDOG_TIMEOUT else None)
+    watchdog.start(_watchdog_takeover)
+
+def _collect_metrics():
+    """다른 모듈이 모은 통계를 메트릭으로 변환 (스크레이프 시 호출)"""
+    out = [
+        ('spot_estop_triggered', 'gauge', '비상 정지 상태', int(emergency_stop.triggered())),
+        ('spot_estop_total', 'counter', '비상 정지 처리 횟수', len(emergency_stop.latencies)),
+    ]
+    if 'total' in startup_times:
+        out.append(('spot_startup_seconds', 'gauge', '시작 소요 시간 (import ~ 초기화 완료)',
+                    startup_times['total']))
+    if bus_writer is not None:
+        s = bus_writer.stats()
+        out += [
+            ('spot_i2c_queue_depth', 'gauge', 'I2C 전송 대기 프레임 수', s['queue_depth']),
+            ('spot_frame_drops_total', 'counter', '전송 전에 새 프레임으로 대체된 프레임 수', s['dropped']),
+            ('spot_i2c_retries_total', 'counter', 'I2C 전송 재시도 횟수', s['retries']),
+            ('spot_i2c_errors_total', 'counter', '재시도까지 실패한 I2C 전송 수', s['errors']),
+            ('spot_pca9685_reinits_total', 'counter', 'PCA9685 재초기화 횟수', s['reinits']),
+            ('spot_i2c_faults_total', 'counter', '복구를 포기하고 비상 정지한 횟수', s['faults']),
+            ('spot_i2c_writer_failed', 'gauge', 'I2C 전송 스레드 실패 상태 (동기 전송 중)', int(s['failed'])),
+        ]
+    if rt_controller is not None:
+        s = rt_controller.stats()
+        out += [
+            ('spot_rt_queue_depth', 'gauge', '실시간 제어 프로세스 예약 프레임 수', s['queue_depth']),
+            ('spot_rt_late_frames_total', 'counter', '예정 시각보다 1ms 이상 늦게 전송한 프레임 수', s['late']),
+            ('spot_rt_max_jitter_seconds', 'gauge', '실시간 제어 프로세스 최대 전송 지터', s['max_jitter']),
+            ('spot_i2c_errors_total', 'counter', '재시도까지 실패한 I2C 전송 수', s['errors']),
+            ('spot_rt_alive', 'gauge', '실시간 제어 루프 동작 중', int(s['alive'])),
+        ]
+    if config.WATCHDOG_ENABLED:
+        s = watchdog.stats()
+        out += [
+            ('spot_watchdog_missed_deadlines_total', 'counter', '워치독 마감 초과 횟수', s['missed_deadlines']),
+            ('spot_watchdog_max_lateness_seconds', 'gauge', '워치독 마감 초과 최대 시간', s['max_lateness']),
+        ]
+    if power_manager is not None:
+        out.append(('spot_servos_asleep', 'gauge', '대기 전원으로 꺼진 상태', int(power_manager.asleep)))
+    return out
+
+def init_metrics():
+    """상태 메트릭 HTTP 엔드포인트 시작 (config.METRICS_PORT)"""
+    metrics.add_collector(_collect_metrics)
+    try:
+        if metrics.start_server():
+            print(f"✓ 메트릭: http://{config.METRICS_HOST}:{config.METRICS_PORT}/metrics")
+    except OSError as e:
+        print(f"⚠ 메트릭 서버 시작 실패: {e}")
+
+def init_telemetry():
+    """UDP 텔레메트리 송신 시작 (config.TELEMETRY_PORT)"""
+    global telemetry_sender
+    if not config.TELEMETRY_PORT or telemetry_sender is not None:
+        return
+    telemetry_sender = telemetry.TelemetrySender()
+    print(f"✓ 텔레메트리: {config.TELEMETRY_HOST}:{config.TELEMETRY_PORT} (UDP)")
+
+def _refresh_config_mirrors():
+    """config.py에서 가져온 모듈 전역 값 다시 읽기 (설정 교체 후)"""
+    global SERVO_MIN_TICK, SERVO_MAX_TICK, SERVO_CALIBRATION_OFFSET
+    global UPPER_SEG_LENGTH, LOWER_SEG_LENGTH, IK_SHOULDER_OFFSET
+    global LIE_X, LIE_Y, LIE_Z, STANDBY_X, STANDBY_Y, STANDBY_Z, TURN_LIFT_HEIGHT, TILT_HEIGHT
+    SERVO_MIN_TICK = config.SERVO_MIN_TICK
+    SERVO_MAX_TICK = config.SERVO_MAX_TICK
+    SERVO_CALIBRATION_OFFSET = config.SERVO_CALIBRATION_OFFSET
+    UPPER_SEG_LENGTH = config.UPPER_SEG_LENGTH
+    LOWER_SEG_LENGTH = config.LOWER_SEG_LENGTH
+    IK_SHOULDER_OFFSET = config.IK_SHOULDER_OFFSET
+    LIE_X, LIE_Y, LIE_Z = config.LIE_X, config.LIE_Y, config.LIE_Z
+    STANDBY_X, STANDBY_Y, STANDBY_Z = config.STANDBY_X, config.STANDBY_Y, config.STANDBY_Z
+    TURN_LIFT_HEIGHT = config.TURN_LIFT_HEIGHT
+    TILT_HEIGHT = config.TILT_HEIGHT
+
+def _refresh_emergency_target():
+    global EMERGENCY_TARGET
+    EMERGENCY_TARGET = _emergency_target()
+
+def _refresh_phase_offsets():
+    # servo_power가 같은 딕셔너리를 들고 있으므로 제자리 갱신
+    PWM_OFFSETS.update(pwm_output.phase_offsets())
+
+def init_config_reload():
+    """
+    설정 덮어쓰기 파일 적용 + 변경 감시 시작 (config.CONFIG_OVERRIDE_FILE)
+
+    바뀐 설정에 따라 필요한 캐시만 다시 만듭니다.
+    실시간 제어 프로세스 / I2C / 채널 설정은 재시작해야 적용됩니다.
+    """
+    # 등록 순서대로 실행 (모듈 전역 값을 먼저 갱신)
+    config_loader.register(None, _refresh_config_mirrors)
+    config_loader.register(('SERVO_CALIBRATION_*',), robot.load_calibration)
+    config_loader.register(('PWM_PHASE_OFFSETS',), _refresh_phase_offsets)
+    config_loader.register(('EMERGENCY_POSE', 'PRESET_POSES', 'LIE_*', 'SERVO_CALIBRATION_*',
+                            'UPPER_SEG_LENGTH', 'LOWER_SEG_LENGTH', 'IK_SHOULDER_OFFSET'),
+                           _refresh_emergency_target)
+    config_loader.register(trajectory.CONFIG_DEPENDENCIES, trajectory.clear_cache)
+    config_loader.register(time_scaling.CONFIG_DEPENDENCIES, time_scaling.clear_cache)
+    config_loader.register(pose_library.CONFIG_DEPENDENCIES, pose_library.clear_cache)
+    config_loader.register(motion_script.CONFIG_DEPENDENCIES, motion_script.clear_cache)
+
+    watcher = config_loader.start()
+    if watcher is not None:
+        print(f"✓ 설정 파일 감시: {watcher.path} ({watcher.interval}초마다)")
+
+# 비상 자세 채널 각도 (미리 계산)
+EMERGENCY_TARGET = _emergency_target()
 
 # ============================================================================
 # 고수준 동작 함수
 # ============================================================================
 
-def lie_down(duration=1.0):
+@_tracked_motion(lambda pose_name, *args, **kwargs: f"자세 {pose_name}")
+def move_to_pose(pose_name, duration=None):
+    """
+    이름 있는 자세로 전환 (pose_library 최소 시간 전환 궤적)
+
+    관절 속도 / 가속도 제한(config.POSE_MAX_JOINT_SPEED / POSE_MAX_JOINT_ACCEL) 안에서
+    가장 빠른 안정한 경로를 재생합니다. 현재 자세가 이름 있는 자세면 캐시된 궤적을 씁니다.
+
+    Args:
+        pose_name: pose_library 자세 이름 ('lie', 'standby', 'stand', ...)
+        duration: 전환 시간 (초), None이거나 최소 시간보다 짧으면 최소 시간
+
+    Returns:
+        bool: 실행했으면 True
+    """
+    try:
+        transition = pose_library.plan_from(_current_joint_angles(), pose_name, duration)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return False
+
+    if not transition.stable and config.STABILITY_GUARD != 'off':
+        print(f"⚠ 자세 전환 중 불안정 (안정 여유 {transition.min_margin:.2f}cm)")
+        if config.STABILITY_GUARD == 'block':
+            print("✗ 안정성 가드로 동작을 실행하지 않습니다")
+            return False
+
+    if TEST_MODE:
+        print(f"[자세 전환] {transition.start or '현재 자세'} → {pose_name}: "
+              f"{transition.path} 경로, {transition.duration:.2f}초")
+    play_frames(transition.times, transition.angles)
+    return True
+
+@_tracked_motion()
+def lie_down(duration=None):
     """
     엎드리기 동작 (좌표 기반, 네 발 동시 동작)
+
+    Args:
+        duration: 동작 시간 (초), None이면 속도 제한 안의 최소 시간
     """
     print("동작: 엎드리기")
 
-    # 동작 단계 수
-    steps = max(int(duration * 30), 10)  # 최소 10 스텝
-
-    # 모든 다리를 동시에 엎드린 위치로 이동
-    positions = {
-        'front_right': (LIE_X, LIE_Y, LIE_Z),
-        'rear_right': (LIE_X, LIE_Y, LIE_Z),
-        'front_left': (LIE_X, LIE_Y, LIE_Z),
-        'rear_left': (LIE_X, LIE_Y, LIE_Z)
-    }
-    set_all_legs_position_xyz(positions, duration, steps)
+    # 모든 다리를 동시에 엎드린 위치 (config.LIE_*)로 이동
+    move_to_pose('lie', duration)
 
     print("✓ 엎드리기 완료")
 
-def stand_up(duration=1.0):
+@_tracked_motion()
+def stand_up(duration=None):
     """
     서기 동작 (좌표 기반, 네 발 동시 동작)
+
+    Args:
+        duration: 동작 시간 (초), None이면 속도 제한 안의 최소 시간
     """
     print("동작: 서기")
 
-    # 동작 단계 수
-    steps = max(int(duration * 30), 10)  # 최소 10 스텝
-
-    # 모든 다리를 동시에 서있는 위치로 이동
-    positions = {
-        'front_right': (STANDBY_X, STANDBY_Y, STANDBY_Z),
-        'rear_right': (STANDBY_X, STANDBY_Y, STANDBY_Z),
-        'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
-        'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
-    }
-    set_all_legs_position_xyz(positions, duration, steps)
+    # 모든 다리를 동시에 서있는 위치 (config.STANDBY_*)로 이동
+    move_to_pose('standby', duration)
 
     print("✓ 서기 완료")
 
+@_tracked_motion()
 def tilt_left(duration=0.5, tilt_height=0.2):
     """
     왼쪽으로 기울이기 (좌표 기반, 네 발 동시 동작)
@@ -526,6 +1134,7 @@ def tilt_left(duration=0.5, tilt_height=0.2):
 
     print("✓ 왼쪽 기울이기 완료")
 
+@_tracked_motion()
 def tilt_right(duration=0.5, tilt_height=0.2):
     """
     오른쪽으로 기울이기 (좌표 기반, 네 발 동시 동작)
@@ -552,6 +1161,7 @@ def tilt_right(duration=0.5, tilt_height=0.2):
 
     print("✓ 오른쪽 기울이기 완료")
 
+@_tracked_motion()
 def walk_forward(steps_count=4, step_duration=0.3):
     """
     전진 걷기 동작 (좌표 기반, backup2 시퀀스 사용)
@@ -563,10 +1173,10 @@ def walk_forward(steps_count=4, step_duration=0.3):
     # 걷기 좌표 설정 (사용자 입력 위치)
     # ============================================================
     # Phase 1-1: 다리 들기 (PUSH 위치 - 뒤쪽으로 밀기)
-    PUSH_COORD = (-0.85, 0, -15.84)   
+    PUSH_COORD = config.WALK_PUSH_COORD
 
     # Phase 1-2: 앞으로 뻗기 (PUSH 유지, 지지다리는 LIFT로)
-    LIFT_COORD = (2.63, 0, -14.81)    
+    LIFT_COORD = config.WALK_LIFT_COORD
 
     # ============================================================
 
@@ -587,7 +1197,7 @@ def walk_forward(steps_count=4, step_duration=0.3):
         #     'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
         #     'rear_right': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         # }, lift_time, 3)
-        # time.sleep(lift_time)
+        # emergency_stop.sleep(lift_time)
 
         # 1. 다리 들기 (지면에서 떼기)
         set_all_legs_position_xyz({
@@ -596,7 +1206,7 @@ def walk_forward(steps_count=4, step_duration=0.3):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': PUSH_COORD
         }, push_time, 3)
-        time.sleep(push_time)
+        emergency_stop.sleep(push_time)
 
         # 2. 앞으로 뻗기 (공중에서 앞으로 이동)
         set_all_legs_position_xyz({
@@ -605,7 +1215,7 @@ def walk_forward(steps_count=4, step_duration=0.3):
             'front_left': LIFT_COORD,
             'rear_left': PUSH_COORD            
         }, lift_time, 3)
-        time.sleep(lift_time)
+        emergency_stop.sleep(lift_time)
 
         # 3. 착지하기
         set_all_legs_position_xyz({
@@ -614,7 +1224,7 @@ def walk_forward(steps_count=4, step_duration=0.3):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, land_time, 3)
-        time.sleep(land_time)
+        emergency_stop.sleep(land_time)
 
         # ===== Phase 2: 왼쪽 앞 + 오른쪽 뒤 이동 =====
         print(f"  스텝 {step + 1}/{steps_count} - Phase 2: 왼쪽 앞/오른쪽 뒤 이동")
@@ -626,7 +1236,7 @@ def walk_forward(steps_count=4, step_duration=0.3):
             'front_left': PUSH_COORD,
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, push_time * 0.5, 5)
-        time.sleep(push_time * 0.5)
+        emergency_stop.sleep(push_time * 0.5)
 
         # 5. 앞으로 뻗기 (착지 전)
         set_all_legs_position_xyz({
@@ -635,7 +1245,7 @@ def walk_forward(steps_count=4, step_duration=0.3):
             'front_left': PUSH_COORD,
             'rear_left': LIFT_COORD
         }, lift_time * 0.5, 5)
-        time.sleep(lift_time * 0.5)
+        emergency_stop.sleep(lift_time * 0.5)
 
         # 6. 착지하기 (중립 자세로 복귀)
         set_all_legs_position_xyz({
@@ -644,7 +1254,7 @@ def walk_forward(steps_count=4, step_duration=0.3):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)            
         }, land_time, 3)
-        time.sleep(land_time)
+        emergency_stop.sleep(land_time)
 
     print("✓ 걷기 완료")
 
@@ -655,6 +1265,7 @@ def walk_backward(steps_count=4, step_duration=0.3):
     walk_forward(steps_count, step_duration)
     print("✓ 후진 걷기 완료")
 
+@_tracked_motion()
 def strafe_left(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
     """
     왼쪽으로 제자리 회전 (좌표 기반)
@@ -681,7 +1292,7 @@ def strafe_left(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z + TURN_LIFT_HEIGHT)                     
         }, lift_time, 3)
-        time.sleep(lift_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(lift_time)  # 서보가 움직일 시간 대기
 
         # 2. 회전 (Y 좌표 변경) - 두 다리 동시
         # 왼쪽 회전: 오른쪽 다리는 바깥쪽(+Y), 왼쪽 다리는 안쪽(-Y)
@@ -691,7 +1302,7 @@ def strafe_left(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y + turn_angle_offset, STANDBY_Z + TURN_LIFT_HEIGHT)
         }, rotate_time, 4)
-        time.sleep(rotate_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(rotate_time)  # 서보가 움직일 시간 대기
 
         # 3. 착지 - 두 다리 동시
         set_all_legs_position_xyz({
@@ -700,7 +1311,7 @@ def strafe_left(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y + turn_angle_offset, STANDBY_Z)
         }, land_time, 3)
-        time.sleep(land_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(land_time)  # 서보가 움직일 시간 대기
 
         # ===== 두 번째 다리 쌍: 왼쪽 앞 + 오른쪽 뒤 =====
         print(f"  스텝 {step + 1}/{steps_count} - 2단계: 왼쪽 앞/오른쪽 뒤 회전")
@@ -712,7 +1323,7 @@ def strafe_left(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z + TURN_LIFT_HEIGHT),
             'rear_left': (STANDBY_X, STANDBY_Y + turn_angle_offset, STANDBY_Z)
         }, lift_time, 3)
-        time.sleep(lift_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(lift_time)  # 서보가 움직일 시간 대기
 
         # 2. 회전 (Y 좌표 변경) - 두 다리 동시
         set_all_legs_position_xyz({
@@ -721,7 +1332,7 @@ def strafe_left(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y + turn_angle_offset, STANDBY_Z + TURN_LIFT_HEIGHT),            
             'rear_left': (STANDBY_X, STANDBY_Y + turn_angle_offset, STANDBY_Z)
         }, rotate_time, 4)
-        time.sleep(rotate_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(rotate_time)  # 서보가 움직일 시간 대기
 
         # 3. 착지하고 중립 자세로 복귀 - 네 발 동시
         set_all_legs_position_xyz({
@@ -730,10 +1341,11 @@ def strafe_left(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),            
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, land_time, 3)
-        time.sleep(land_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(land_time)  # 서보가 움직일 시간 대기
 
     print("✓ 왼쪽 회전 완료")
 
+@_tracked_motion()
 def strafe_right(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
     """
     오른쪽으로 제자리 회전 (좌표 기반)
@@ -760,7 +1372,7 @@ def strafe_right(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z + TURN_LIFT_HEIGHT)
         }, lift_time, 3)
-        time.sleep(lift_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(lift_time)  # 서보가 움직일 시간 대기
 
         # 2. 회전 (Y 좌표 변경) - 두 다리 동시
         # 오른쪽 회전: 오른쪽 다리는 안쪽(-Y), 왼쪽 다리는 바깥쪽(+Y)
@@ -770,7 +1382,7 @@ def strafe_right(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y - turn_angle_offset, STANDBY_Z + TURN_LIFT_HEIGHT)
         }, rotate_time, 4)
-        time.sleep(rotate_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(rotate_time)  # 서보가 움직일 시간 대기
 
         # 3. 착지 - 두 다리 동시
         set_all_legs_position_xyz({
@@ -779,7 +1391,7 @@ def strafe_right(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y - turn_angle_offset, STANDBY_Z)
         }, land_time, 3)
-        time.sleep(land_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(land_time)  # 서보가 움직일 시간 대기
 
         # ===== 두 번째 다리 쌍: 왼쪽 앞 + 오른쪽 뒤 =====
         print(f"  스텝 {step + 1}/{steps_count} - 2단계: 왼쪽 앞/오른쪽 뒤 회전")
@@ -791,7 +1403,7 @@ def strafe_right(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z + TURN_LIFT_HEIGHT),
             'rear_left': (STANDBY_X, STANDBY_Y - turn_angle_offset, STANDBY_Z)
         }, lift_time, 3)
-        time.sleep(lift_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(lift_time)  # 서보가 움직일 시간 대기
 
         # 2. 회전 (Y 좌표 변경) - 두 다리 동시
         set_all_legs_position_xyz({
@@ -800,7 +1412,7 @@ def strafe_right(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y - turn_angle_offset, STANDBY_Z + TURN_LIFT_HEIGHT),
             'rear_left': (STANDBY_X, STANDBY_Y - turn_angle_offset, STANDBY_Z)
         }, rotate_time, 4)
-        time.sleep(rotate_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(rotate_time)  # 서보가 움직일 시간 대기
 
         # 3. 착지하고 중립 자세로 복귀 - 네 발 동시
         set_all_legs_position_xyz({
@@ -809,10 +1421,11 @@ def strafe_right(steps_count=4, step_duration=0.4, turn_angle_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, land_time, 3)
-        time.sleep(land_time)  # 서보가 움직일 시간 대기
+        emergency_stop.sleep(land_time)  # 서보가 움직일 시간 대기
 
     print("✓ 오른쪽 회전 완료")
 
+@_tracked_motion()
 def rotate_body_left(steps_count=4, step_duration=0.4, rotate_offset=0.2):
     """
     몸체 왼쪽 회전 (제자리 회전, 같은 쪽 다리 쌍 사용)
@@ -850,7 +1463,7 @@ def rotate_body_left(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z + TURN_LIFT_HEIGHT)
         }, lift_time, 3)
-        time.sleep(lift_time)
+        emergency_stop.sleep(lift_time)
 
         # 2. 오른쪽 다리들 회전 위치로 이동
         # 왼쪽 회전: front_right는 왼쪽(-Y), rear_right는 오른쪽(+Y)
@@ -860,7 +1473,7 @@ def rotate_body_left(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y + rotate_offset, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z + TURN_LIFT_HEIGHT)
         }, rotate_time, 4)
-        time.sleep(rotate_time)
+        emergency_stop.sleep(rotate_time)
 
         # 3. 오른쪽 다리들 착지
         set_all_legs_position_xyz({
@@ -869,7 +1482,7 @@ def rotate_body_left(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y + rotate_offset, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, land_time, 3)
-        time.sleep(land_time)
+        emergency_stop.sleep(land_time)
         
         # . 오른쪽 다리들 착지
         set_all_legs_position_xyz({
@@ -878,7 +1491,7 @@ def rotate_body_left(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, land_time, 3)
-        time.sleep(land_time)
+        emergency_stop.sleep(land_time)
 
         # ===== Phase 2: 왼쪽 다리들 (front_left + rear_left) =====
         print(f"  스텝 {step + 1}/{steps_count} - Phase 2: 왼쪽 다리들 회전")
@@ -890,7 +1503,7 @@ def rotate_body_left(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z + TURN_LIFT_HEIGHT),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, lift_time, 3)
-        time.sleep(lift_time)
+        emergency_stop.sleep(lift_time)
 
         # 5. 왼쪽 다리들 회전 위치로 이동 (오른쪽 다리들에 맞춤)
         # 왼쪽 회전: front_left는 왼쪽(-Y), rear_left는 오른쪽(+Y)
@@ -900,7 +1513,7 @@ def rotate_body_left(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y - rotate_offset, STANDBY_Z + TURN_LIFT_HEIGHT),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, rotate_time, 4)
-        time.sleep(rotate_time)
+        emergency_stop.sleep(rotate_time)
         
         # 왼쪽 회전: front_left는 왼쪽(-Y), rear_left는 오른쪽(+Y)
         set_all_legs_position_xyz({
@@ -909,7 +1522,7 @@ def rotate_body_left(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y - rotate_offset, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, rotate_time, 4)
-        time.sleep(rotate_time)
+        emergency_stop.sleep(rotate_time)
 
         # 6. 왼쪽 다리들 착지 및 중립 자세로 복귀
         set_all_legs_position_xyz({
@@ -918,9 +1531,10 @@ def rotate_body_left(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, land_time + adjust_time, 3)
-        time.sleep(land_time + adjust_time)
+        emergency_stop.sleep(land_time + adjust_time)
     print("✓ 몸체 오른쪽 회전 완료")
 
+@_tracked_motion()
 def rotate_body_right(steps_count=4, step_duration=0.4, rotate_offset=0.2):
     """
     몸체 오른쪽 회전 (제자리 회전, 같은 쪽 다리 쌍 사용)
@@ -966,7 +1580,7 @@ def rotate_body_right(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z + TURN_LIFT_HEIGHT),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, lift_time, 3)
-        time.sleep(lift_time)
+        emergency_stop.sleep(lift_time)
 
         # 2. 오른쪽 다리들 회전 위치로 이동
         # 오른쪽 회전: front_right는 오른쪽(+Y), rear_right는 왼쪽(-Y)
@@ -976,7 +1590,7 @@ def rotate_body_right(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y + rotate_offset, STANDBY_Z + TURN_LIFT_HEIGHT),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, rotate_time, 4)
-        time.sleep(rotate_time)
+        emergency_stop.sleep(rotate_time)
 
         # 3. 오른쪽 다리들 착지
         set_all_legs_position_xyz({
@@ -985,7 +1599,7 @@ def rotate_body_right(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y + rotate_offset, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, land_time, 3)
-        time.sleep(land_time)
+        emergency_stop.sleep(land_time)
 
         set_all_legs_position_xyz({
             'front_right': (STANDBY_X, STANDBY_Y, STANDBY_Z),
@@ -993,7 +1607,7 @@ def rotate_body_right(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, lift_time, 3)
-        time.sleep(lift_time)
+        emergency_stop.sleep(lift_time)
 
         # ===== Phase 2: 왼쪽 다리들 (front_left + rear_left) =====
         print(f"  스텝 {step + 1}/{steps_count} - Phase 2: 왼쪽 다리들 회전")
@@ -1005,7 +1619,7 @@ def rotate_body_right(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z + TURN_LIFT_HEIGHT)
         }, lift_time, 3)
-        time.sleep(lift_time)
+        emergency_stop.sleep(lift_time)
 
         # 5. 왼쪽 다리들 회전 위치로 이동 (오른쪽 다리들에 맞춤)
         # 오른쪽 회전: front_left는 오른쪽(+Y), rear_left는 왼쪽(-Y)
@@ -1015,7 +1629,7 @@ def rotate_body_right(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y + rotate_offset, STANDBY_Z + TURN_LIFT_HEIGHT)
         }, rotate_time, 4)
-        time.sleep(rotate_time)
+        emergency_stop.sleep(rotate_time)
 
         set_all_legs_position_xyz({
             'front_right': (STANDBY_X, STANDBY_Y - rotate_offset, STANDBY_Z),
@@ -1023,7 +1637,7 @@ def rotate_body_right(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y + rotate_offset, STANDBY_Z)
         }, rotate_time, 4)
-        time.sleep(rotate_time)
+        emergency_stop.sleep(rotate_time)
 
         # 6. 왼쪽 다리들 착지 및 중립 자세로 복귀
         set_all_legs_position_xyz({
@@ -1032,10 +1646,11 @@ def rotate_body_right(steps_count=4, step_duration=0.4, rotate_offset=0.2):
             'front_left': (STANDBY_X, STANDBY_Y, STANDBY_Z),
             'rear_left': (STANDBY_X, STANDBY_Y, STANDBY_Z)
         }, land_time + adjust_time, 3)
-        time.sleep(land_time + adjust_time)
+        emergency_stop.sleep(land_time + adjust_time)
 
     print("✓ 몸체 왼쪽 회전 완료")
 
+@_tracked_motion()
 def body_move_up_down(height_offset, duration=0.5):
     """
     몸체 상하 이동 (좌표 기반)
@@ -1077,6 +1692,7 @@ def body_move_up_down(height_offset, duration=0.5):
 
     print(f"✓ 몸체 상하 이동 완료 (목표 높이: {target_z:.1f}cm)")
 
+@_tracked_motion()
 def body_shift_weight(shift_y, shift_x=0.0, duration=0.5):
     """
     몸체 무게중심 이동 (좌표 기반)
@@ -1121,53 +1737,435 @@ def body_shift_weight(shift_y, shift_x=0.0, duration=0.5):
 
     print("✓ 무게중심 이동 완료")
 
+# ============================================================================
+# 스플라인 궤적 재생
+# ============================================================================
+
+def play_frames(times, angles, phases=None):
+    """
+    미리 계산된 각도 프레임을 시각에 맞춰 재생
+
+    각 프레임은 시작 시각 기준 절대 시각에 맞춰 전송되므로
+    프레임 처리 시간이 누적되어 느려지지 않습니다.
+
+    Args:
+        times: (N,) 각 프레임의 시각 (초, 0부터 시작)
+        angles: (N, 4, 3) [어깨, 상부, 하부] 각도 (config.LEG_NAMES 순서)
+        phases: (N,) 프레임별 보행 위상 (0~1, 텔레메트리용), None이면 기록 안 함
+
+    Returns:
+        bool: 재생했으면 True (간섭 가드 'block'으로 거부하면 False)
+    """
+    global gait_phase, _collision_prechecked, _frame_due
+    # 궤적 전체를 한 번에 간섭 검사 (프레임별 검사 대신)
+    if config.COLLISION_GUARD != 'off':
+        if not collision.preflight_check(angles) and config.COLLISION_GUARD == 'block':
+            print("✗ 간섭 가드로 동작을 실행하지 않습니다")
+            return False
+        _collision_prechecked = True
+
+    # 실시간 제어 프로세스를 쓰면 RT_LEAD_TIME만큼 미리 예약 (전송 시각은 그쪽이 맞춤)
+    lead = config.RT_LEAD_TIME if rt_controller is not None else 0.0
+    start = time.perf_counter() + lead
+    try:
+        for i, (t, frame) in enumerate(zip(times, angles)):
+            delay = start + t - lead - time.perf_counter()
+            if delay > 0:
+                emergency_stop.sleep(delay)
+            if phases is not None:
+                gait_phase = float(phases[i])
+            if rt_controller is not None:
+                _frame_due = start + t
+            set_all_legs_angle_array(frame)
+        if rt_controller is not None:
+            # 예약한 프레임이 모두 나갈 때까지 (다음 동작이 바로 이어서 예약하지 않도록)
+            emergency_stop.sleep(max(start + times[-1] - time.perf_counter(), 0.0))
+    finally:
+        gait_phase = math.nan
+        _collision_prechecked = False
+        _frame_due = None
+    return True
+
+@_tracked_motion(lambda gait_name, *args, **params: f"{gait_name} (스플라인)")
+def play_gait_smooth(gait_name, steps_count=4, **params):
+    """
+    스플라인으로 부드럽게 연결한 보행 실행
+
+    Args:
+        gait_name: 'walk_forward', 'strafe_left', 'strafe_right',
+                   'rotate_body_left', 'rotate_body_right', 'crawl'
+        steps_count: 스텝 수
+        **params: 보행 파라미터 (step_duration, turn_angle_offset, rotate_offset, stride)
+
+    예시:
+        play_gait_smooth('walk_forward', 4, step_duration=0.3)
+    """
+    gait = trajectory.compile_gait(gait_name, steps_count, **params)
+    if not gait.reachable:
+        print(f"✗ {gait_name} 궤적에 도달 불가능한 좌표가 있습니다")
+        return False
+
+    print(f"동작: {gait_name} 스플라인 보행 ({steps_count} 스텝, {len(gait.times)} 프레임)")
+    cycle = gait.times[-1] / steps_count
+    play_frames(gait.times, gait.angles, phases=(gait.times / cycle) % 1.0)
+    print(f"✓ {gait_name} 스플라인 보행 완료")
+    return True
+
+@_tracked_motion(lambda gait_name, *args, **params: f"{gait_name} (시간 최적)")
+def play_gait_fastest(gait_name='walk_forward', steps_count=4, **params):
+    """
+    키프레임 보행을 관절 속도 / 가속도 제한에 맞춘 가장 빠른 시간 배분으로 재생
+
+    발 경로 모양은 play_gait_smooth()와 같고, 시간 배분만 time_scaling으로 계산합니다
+    (config.TIME_SCALING_*).
+
+    Args:
+        gait_name: trajectory.GAITS의 보행 이름
+        steps_count: 스텝 수
+        **params: 보행 파라미터 (발 경로 모양)
+
+    Returns:
+        bool: 재생했으면 True
+    """
+    # 궤적 계산 중에는 프레임이 없음 (첫 프레임 전송에서 다시 감시)
+    watchdog.disarm()
+    try:
+        timing = time_scaling.gait_timing(gait_name, steps_count, **params)
+    except ValueError as e:
+        print(f"✗ {gait_name} 시간 최적 궤적을 만들 수 없습니다: {e}")
+        return False
+
+    print(f"동작: {gait_name} 시간 최적 보행 ({steps_count} 스텝, 스텝당 {timing.step_time:.3f}초, "
+          f"키프레임 최소 step_duration {timing.step_duration:.3f})")
+    play_frames(timing.times, timing.angles, phases=(timing.progress * steps_count) % 1.0)
+    print(f"✓ {gait_name} 시간 최적 보행 완료")
+    return True
+
+def crawl(steps_count=2, **params):
+    """
+    정적 안정 크롤 보행 (한 번에 한 다리씩, config.CRAWL_*)
+
+    무게중심을 지지 삼각형 안쪽으로 옮기면서 걷기 때문에 느리지만, 어느 순간에
+    멈춰도 넘어지지 않습니다. 계획된 안정 여유가 config.CRAWL_STABILITY_MARGIN에
+    못 미치면 (관절 범위 때문에 줄어든 경우) 경고 후 그대로 실행합니다.
+
+    Args:
+        steps_count: 스텝 수 (한 스텝 = 네 다리 한 번씩)
+        **params: 보행 파라미터 (step_duration, stride)
+
+    Returns:
+        bool: 재생했으면 True
+    """
+    # 궤적 계산 중에는 프레임이 없음 (첫 프레임 전송에서 다시 감시)
+    watchdog.disarm()
+    gait = trajectory.compile_gait('crawl', steps_count, **params)
+    result = stability.analyze_trajectory(gait.positions, min_margin=config.CRAWL_STABILITY_MARGIN)
+    if not result['stable']:
+        print(f"⚠ 크롤 안정 여유 {result['min_margin']:.2f}cm "
+              f"(목표 {config.CRAWL_STABILITY_MARGIN}cm)")
+    return play_gait_smooth('crawl', steps_count, **params)
+
+@_tracked_motion(lambda source, *args, **kwargs: "스크립트")
+def play_script(source):
+    """
+    모션 스크립트 실행 (motion_script.py 문법)
+
+    현재 자세에서 시작하는 타임라인으로 전체를 먼저 컴파일/검증한 뒤
+    한 번에 재생합니다. 검증에 실패하면 아무 동작도 하지 않습니다.
+
+    Args:
+        source: 스크립트 파일 경로 또는 스크립트 텍스트
+
+    예시:
+        play_script('routine.motion')
+        play_script("pose stand 1.0\nwait 0.5\ngait walk_forward steps=2")
+    """
+    # 컴파일 중에는 프레임이 없음 (첫 프레임 전송에서 다시 감시)
+    watchdog.disarm()
+    try:
+        script = motion_script.load(source, start=_current_foot_positions())
+    except motion_script.ScriptError as e:
+        print(f"✗ 스크립트 오류: {e}")
+        return False
+    except OSError as e:
+        print(f"✗ 스크립트 파일을 읽을 수 없습니다: {e}")
+        return False
+    for warning in script.warnings:
+        print(f"⚠ {warning}")
+
+    print(f"동작: 스크립트 {script.name} ({script.times[-1]:.1f}초, {len(script.times)} 프레임)")
+    play_frames(script.times, script.angles, script.phases)
+    print(f"✓ 스크립트 {script.name} 완료")
+    return True
+
+# ============================================================================
+# 연속 보행 (보행 전환 블렌딩 / 곡선 보행)
+# ============================================================================
+
+def _run_gait_blender(duration):
+    """블렌딩 엔진을 duration 동안 진행시키며 재생"""
+    times, feet, phases = gait_blender.sample(duration, with_phase=True)
+    angles, reachable = kinematics.inverse_kinematics(feet)
+    if not reachable.all():
+        metrics.ik_failures.inc()
+        print("✗ 연속 보행 궤적에 도달 불가능한 좌표가 있습니다")
+        return False
+    play_frames(times - times[0], angles, phases)
+    return True
+
+@_tracked_motion()
+def walk_curve(vx, yaw_rate=0.0, duration=2.0, vy=0.0):
+    """
+    곡선 보행 (전진 + 회전 동시, STANDBY 복귀 없이 이어서 실행)
+
+    이전 연속 보행이 진행 중이면 현재 위상에서 새 속도로 블렌딩됩니다.
+    끝난 뒤에도 다리는 보행 중인 자세로 남아 있으므로,
+    멈추려면 stop_walking()을 호출하세요.
+
+    Args:
+        vx: 전진 속도 (cm/s, 뒤로는 음수)
+        yaw_rate: 회전 속도 (도/초, 왼쪽 +)
+        duration: 실행 시간 (초)
+        vy: 옆 이동 속도 (cm/s, 오른쪽 +)
+
+    예시:
+        walk_curve(5.0, 15.0, 3.0)   # 5cm/s로 걸으면서 왼쪽으로 15도/초 회전
+    """
+    global gait_blender
+    if gait_blender is None:
+        gait_blender = gait_blend.GaitBlender()
+
+    print(f"동작: 연속 보행 (vx={vx:+.1f}cm/s, vy={vy:+.1f}cm/s, 회전={yaw_rate:+.1f}°/s, {duration:.1f}초)")
+    gait_blender.set_velocity(vx, vy, yaw_rate)
+    return _run_gait_blender(duration)
+
+@_tracked_motion()
+def switch_gait(gait_name, duration=2.0, **params):
+    """
+    키프레임 보행으로 전환 (STANDBY 복귀 없이 위상을 맞춰 블렌딩)
+
+    Args:
+        gait_name: trajectory.GAITS의 보행 이름
+        duration: 실행 시간 (초)
+        **params: 보행 파라미터
+    """
+    global gait_blender
+    if gait_blender is None:
+        gait_blender = gait_blend.GaitBlender()
+
+    print(f"동작: 연속 보행 전환 → {gait_name} ({duration:.1f}초)")
+    gait_blender.set_command(gait_blend.KeyframeSource(gait_name, **params))
+    return _run_gait_blender(duration)
+
+@_tracked_motion()
+def stop_walking():
+    """연속 보행 정지 (STANDBY 자세로 부드럽게 복귀)"""
+    global gait_blender
+    if gait_blender is None:
+        return
+
+    times, feet = gait_blender.settle()
+    angles, _ = kinematics.inverse_kinematics(feet)
+    play_frames(times - times[0], angles)
+    gait_blender = None
+    print("✓ 연속 보행 정지")
+
+# ============================================================================
+# 온라인 궤적 추종 (이동 중 목표 변경)
+# ============================================================================
+
+@_tracked_motion()
+def track_joint_targets(source, duration=None):
+    """
+    관절 목표를 저크 제한 궤적으로 추종 (제어 주기마다 목표를 바꿀 수 있음)
+
+    현재 각도에서 시작해 config.ONLINE_MAX_JOINT_SPEED / ACCEL / JERK 제한 안에서
+    움직입니다. 목표가 바뀌면 현재 속도 / 가속도에서 이어서 새 목표로 향합니다.
+
+    Args:
+        source: (4, 3) 목표 관절 각도 (config.LEG_NAMES 순서), 또는 제어 주기마다 호출해
+                새 목표 (4, 3)를 돌려주는 함수 (목표가 그대로면 None)
+        duration: 최대 실행 시간 (초), None이면 목표 배열은 도달할 때까지,
+                  함수는 Ctrl+C까지
+
+    Returns:
+        bool: 마지막 목표에 멈췄으면 True
+    """
+    period = 1.0 / config.CONTROL_RATE
+    tracker = online_trajectory.OnlineTrajectory(_current_joint_angles())
+    follow = callable(source)
+    if not follow:
+        tracker.set_target(source)
+
+    start = next_tick = time.perf_counter()
+    try:
+        while duration is None or time.perf_counter() - start < duration:
+            if follow:
+                target = source()
+                if target is not None:
+                    tracker.set_target(target)
+            elif tracker.settled:
+                break
+
+            if not tracker.settled and not set_all_legs_angle_array(tracker.step(period)):
+                # 간섭 가드가 막으면 명령 각도와 궤적 상태가 어긋나므로 멈춤
+                print("✗ 간섭 가드로 추종을 멈춥니다")
+                return False
+
+            # 절대 시각 기준 주기, 밀린 주기는 따라잡지 않고 건너뜀
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            emergency_stop.sleep(delay)
+            if delay < 0:
+                next_tick = time.perf_counter()
+    except KeyboardInterrupt:
+        print("\n목표 추종 중단")
+    return tracker.settled
+
+def move_feet_smooth(positions_dict, duration=None):
+    """
+    발 좌표 목표로 저크 제한 궤적을 따라 이동 (지정하지 않은 다리는 그대로)
+
+    Args:
+        positions_dict: {다리 이름: (x, y, z)} 목표 발 좌표 (cm)
+        duration: 최대 실행 시간 (초), None이면 도달할 때까지
+
+    Returns:
+        bool: 목표에 도달했으면 True (도달 불가능한 좌표면 움직이지 않고 False)
+    """
+    feet = _current_foot_positions()
+    for leg_name, position in positions_dict.items():
+        feet[kinematics.LEG_INDEX[leg_name]] = position
+    angles, reachable = kinematics.inverse_kinematics(feet)
+    if not reachable.all():
+        unreachable = [config.LEG_NAMES[i] for i in np.flatnonzero(~reachable)]
+        print(f"✗ 도달 불가능한 좌표: {', '.join(unreachable)}")
+        return False
+
+    # 지정하지 않은 다리는 FK → IK 반올림 오차 없이 현재 각도 유지
+    target = _current_joint_angles().copy()
+    for leg_name in positions_dict:
+        i = kinematics.LEG_INDEX[leg_name]
+        target[i] = angles[i]
+    return track_joint_targets(target, duration)
+
+# ============================================================================
+# 카메라 목표 추종
+# ============================================================================
+
+def _velocity_changed(target, current):
+    """보행 전환이 필요한 속도 변화인지 (정지 ↔ 이동 전환은 항상)"""
+    if any(target) != any(current):
+        return True
+    return any(abs(t - c) > config.PERCEPTION_VELOCITY_DEADBAND for t, c in zip(target, current))
+
+@_tracked_motion()
+def follow_target(duration=None, pipeline=None):
+    """
+    카메라 목표 추종 (perception 파이프라인의 최신 명령을 제어 주기마다 반영)
+
+    인식은 별도 스레드에서 돌고, 제어 루프는 최신 명령을 기다리지 않고 읽습니다.
+    명령이 PERCEPTION_COMMAND_TIMEOUT보다 오래되면 정지 명령으로 처리합니다.
+
+    Args:
+        duration: 실행 시간 (초), None이면 Ctrl+C / 입력 종료까지
+        pipeline: 실행 중인 PerceptionPipeline, None이면 config 값으로 생성
+
+    Returns:
+        bool: 실행했으면 True
+    """
+    global gait_blender
+    own_pipeline = pipeline is None
+    if own_pipeline:
+        try:
+            pipeline = perception.make_pipeline().start()
+        except (ImportError, OSError, ValueError) as e:
+            print(f"✗ 인식 파이프라인을 시작할 수 없습니다: {e}")
+            return False
+    if gait_blender is None:
+        gait_blender = gait_blend.GaitBlender()
+
+    print(f"동작: 목표 추종 ({config.PERCEPTION_MODE} 모드, Ctrl+C로 중단)")
+    period = 1.0 / config.CONTROL_RATE
+    body_sign = np.where(kinematics.IS_LEFT, -1.0, 1.0)
+    velocity = (0.0, 0.0, 0.0)
+    # 몸체 이동 (y, z)은 저크 제한 궤적으로 목표를 따라감 (명령이 바뀌어도 이어서)
+    body = online_trajectory.OnlineTrajectory(
+        np.zeros(2), config.PERCEPTION_BODY_RATE, config.PERCEPTION_BODY_ACCEL,
+        config.PERCEPTION_BODY_JERK, tolerance=1e-3)
+    applied = None            # 마지막으로 반영한 명령 번호
+    pending = None            # 아직 서보로 나가지 않은 새 명령 (지연 측정용)
+    start = next_tick = time.perf_counter()
+    try:
+        while duration is None or time.perf_counter() - start < duration:
+            if pipeline.ended:
+                print("인식 입력이 끝났습니다")
+                break
+
+            command = pipeline.latest_command()
+            if command is None:
+                target_velocity, target_body = (0.0, 0.0, 0.0), (0.0, 0.0)
+            else:
+                if command.sequence != applied:
+                    applied = command.sequence
+                    pending = command
+                    watchdog.command_received()
+                target_velocity = (command.vx, command.vy, command.yaw_rate)
+                target_body = (command.body_y, command.body_z)
+
+            if _velocity_changed(target_velocity, velocity):
+                gait_blender.set_velocity(*target_velocity)
+                velocity = target_velocity
+
+            if target_body[0] != body.target[0] or target_body[1] != body.target[1]:
+                body.set_target(target_body)
+            body_y, body_z = body.step(period)
+
+            feet = gait_blender.step(period)
+            feet[:, 1] += body_sign * body_y
+            feet[:, 2] += body_z
+            angles, reachable = kinematics.inverse_kinematics(feet)
+            if reachable.all():
+                set_all_legs_angle_array(angles)
+                if pending is not None:
+                    pipeline.record_servo_latency(pending)
+                    metrics.perception_latency.observe(pipeline.servo_latency[-1])
+                    pending = None
+            else:
+                metrics.ik_failures.inc()
+
+            # 절대 시각 기준 주기, 밀린 주기는 따라잡지 않고 건너뜀
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            emergency_stop.sleep(delay)
+            if delay < 0:
+                next_tick = time.perf_counter()
+    except KeyboardInterrupt:
+        print("\n목표 추종 중단")
+    finally:
+        watchdog.end_commands()
+        if own_pipeline:
+            pipeline.stop()
+            pipeline.report()
+
+    stop_walking()
+    return True
+
 # ============================================================================
 # 데모 및 테스트 함수
 # ============================================================================
 
 def demo_sequence():
-    """전체 동작 데모 시퀀스"""
+    """전체 동작 데모 시퀀스 (motion_script.DEMO_SCRIPT)"""
     print("\n" + "="*60)
     print("Spot Micro 로봇 데모 시작")
     print("="*60 + "\n")
     
     try:
-        # 1. 엎드린 상태에서 시작
-        print("\n[1/6] 초기 자세: 엎드리기")
-        lie_down(duration=2.0)
-        time.sleep(1)
-        
-        # 2. 일어서기
-        print("\n[2/6] 일어서기")
-        stand_up(duration=2.0)
-        time.sleep(1)
-        
-        # 3. 왼쪽으로 기울이기
-        print("\n[3/6] 왼쪽 기울이기")
-        tilt_left(duration=1.0)
-        time.sleep(0.5)
-        stand_up(duration=0.5)
-        time.sleep(0.5)
-        
-        # 4. 오른쪽으로 기울이기
-        print("\n[4/6] 오른쪽 기울이기")
-        tilt_right(duration=1.0)
-        time.sleep(0.5)
-        stand_up(duration=0.5)
-        time.sleep(1)
-        
-        # 5. 걷기
-        print("\n[5/6] 걷기")
-        walk_forward(steps_count=4, step_duration=0.4)
-        time.sleep(1)
-        
-        # 6. 다시 엎드리기
-        print("\n[6/6] 마무리: 엎드리기")
-        lie_down(duration=2.0)
-        
-        print("\n" + "="*60)
-        print("데모 완료!")
-        print("="*60 + "\n")
+        if play_script(motion_script.DEMO_SCRIPT):
+            print("\n" + "="*60)
+            print("데모 완료!")
+            print("="*60 + "\n")
         
     except KeyboardInterrupt:
         print("\n\n데모 중단됨")
@@ -1194,131 +2192,192 @@ def interactive_mode():
     print("\n몸체 회전:")
     print("  rl 또는 rotl    : 몸체 왼쪽 회전 (같은 쪽 쌍)")
     print("  rr 또는 rotr    : 몸체 오른쪽 회전 (같은 쪽 쌍)")
+    print("\n부드러운 보행 (스플라인):")
+    print("  sw 또는 swalk   : 부드러운 걷기")
+    print("  fw 또는 fwalk   : 가장 빠른 걷기 (관절 속도 / 가속도 한계)")
+    print("  cr 또는 crawl   : 크롤 보행 (한 번에 한 다리씩, 정적 안정)")
+    print("  c 또는 curve    : 연속/곡선 보행 (전진 속도 + 회전 속도)")
+    print("  s 또는 stop     : 연속 보행 정지")
     print("\n기타:")
     print("  8 또는 demo     : 전체 데모")
+    print("  m 또는 script   : 모션 스크립트 파일 실행")
+    print("  f 또는 follow   : 카메라 목표 추종 (config.PERCEPTION_*)")
     print("  9 또는 xyz      : 개별 다리 좌표 제어 (X, Y, Z)")
+    print("  x 또는 estop    : 비상 정지")
+    print("  reset           : 비상 정지 해제")
     print("  q 또는 quit     : 종료")
     print("="*60 + "\n")
 
     try:
         while True:
+            # 명령 대기 중에는 제어 루프가 멈춰 있는 것이 정상 (워치독 감시 해제)
+            watchdog.disarm()
             cmd = input("명령어 입력: ").strip().lower()
 
-            if cmd in ['q', 'quit', 'exit']:
-                print("종료합니다...")
-                lie_down(duration=1.0)
-                break
-            elif cmd in ['1', 'lie']:
-                lie_down()
-            elif cmd in ['2', 'stand']:
-                stand_up()
-            elif cmd in ['3', 'tiltl']:
-                tilt_left()
-                time.sleep(0.5)
-                stand_up(duration=0.5)
-            elif cmd in ['4', 'tiltr']:
-                tilt_right()
-                time.sleep(0.5)
-                stand_up(duration=0.5)
-            elif cmd in ['5', 'walk']:
-                steps = input("걸음 수 (기본값 4): ").strip()
-                steps = int(steps) if steps.isdigit() else 4
-                walk_forward(steps_count=steps, step_duration=0.4)
-            elif cmd in ['6', 'turnl']:
-                steps = input("회전 스텝 수 (기본값 4): ").strip()
-                steps = int(steps) if steps.isdigit() else 4
-                strafe_left(steps_count=steps)
-            elif cmd in ['7', 'turnr']:
-                steps = input("회전 스텝 수 (기본값 4): ").strip()
-                steps = int(steps) if steps.isdigit() else 4
-                strafe_right(steps_count=steps)
-            elif cmd in ['u', 'up']:
-                height = input("높이 조정 (cm, 기본값 +3): ").strip()
-                try:
-                    height = float(height) if height else -3.0
-                    body_move_up_down(height)
-                except ValueError:
-                    print("✗ 잘못된 숫자 형식입니다.")
-            elif cmd in ['d', 'down']:
-                height = input("높이 조정 (cm, 기본값 -3): ").strip()
-                try:
-                    height = float(height) if height else 3.0
-                    body_move_up_down(height)
-                except ValueError:
-                    print("✗ 잘못된 숫자 형식입니다.")
-            elif cmd in ['l', 'left']:
-                shift = input("이동량 (cm, 기본값 -2): ").strip()
-                try:
-                    shift = float(shift) if shift else -0.2
-                    body_shift_weight(shift)
-                    time.sleep(0.5)
-                    stand_up(duration=0.5)  # 중립 자세로 복귀
-                except ValueError:
-                    print("✗ 잘못된 숫자 형식입니다.")
-            elif cmd in ['r', 'right']:
-                shift = input("이동량 (cm, 기본값 +2): ").strip()
-                try:
-                    shift = float(shift) if shift else 0.2
-                    body_shift_weight(shift)
-                    time.sleep(0.5)
-                    stand_up(duration=0.5)  # 중립 자세로 복귀
-                except ValueError:
-                    print("✗ 잘못된 숫자 형식입니다.")
-            elif cmd in ['rl', 'rotl']:
-                steps = input("회전 스텝 수 (기본값 4): ").strip()
-                steps = int(steps) if steps.isdigit() else 4
-                rotate_body_left(steps_count=steps)
-            elif cmd in ['rr', 'rotr']:
-                steps = input("회전 스텝 수 (기본값 4): ").strip()
-                steps = int(steps) if steps.isdigit() else 4
-                rotate_body_right(steps_count=steps)
-            elif cmd in ['8', 'demo']:
-                demo_sequence()
-            elif cmd in ['9', 'xyz']:
-                print("\n다리 선택:")
-                print("  1. front_right (오른쪽 앞)")
-                print("  2. front_left (왼쪽 앞)")
-                print("  3. rear_right (오른쪽 뒤)")
-                print("  4. rear_left (왼쪽 뒤)")
-                leg_choice = input("다리 번호 (1-4): ").strip()
-
-                leg_map = {
-                    '1': 'front_right',
-                    '2': 'front_left',
-                    '3': 'rear_right',
-                    '4': 'rear_left'
-                }
-
-                if leg_choice in leg_map:
-                    leg_name = leg_map[leg_choice]
-                    print(f"\n{leg_name} 다리의 목표 좌표를 입력하세요 (cm 단위)")
-                    print("좌표계 (어깨 기준): X=앞(+)/뒤(-), Y=오른쪽(+)/왼쪽(-), Z=위(+)/아래(-)")
-                    print(f"도달 범위: 최대 {UPPER_SEG_LENGTH + LOWER_SEG_LENGTH}cm, 최소 {abs(UPPER_SEG_LENGTH - LOWER_SEG_LENGTH)}cm")
-
+            # 대기 전원으로 꺼진 서보를 명령 처리와 동시에 미리 깨움
+            if cmd and cmd not in ['x', 'estop'] and power_manager is not None:
+                power_manager.prewarm()
+
+            try:
+                if cmd in ['q', 'quit', 'exit']:
+                    print("종료합니다...")
+                    if not emergency_stop.triggered():
+                        lie_down(duration=1.0)
+                    break
+                elif cmd in ['x', 'estop']:
+                    emergency_stop.trigger('keyboard')
+                    handle_emergency()
+                elif cmd == 'reset':
+                    emergency_stop.reset()
+                    print("✓ 비상 정지 해제")
+                elif cmd in ['1', 'lie']:
+                    lie_down()
+                elif cmd in ['2', 'stand']:
+                    stand_up()
+                elif cmd in ['3', 'tiltl']:
+                    tilt_left()
+                    emergency_stop.sleep(0.5)
+                    stand_up(duration=0.5)
+                elif cmd in ['4', 'tiltr']:
+                    tilt_right()
+                    emergency_stop.sleep(0.5)
+                    stand_up(duration=0.5)
+                elif cmd in ['5', 'walk']:
+                    steps = input("걸음 수 (기본값 4): ").strip()
+                    steps = int(steps) if steps.isdigit() else 4
+                    walk_forward(steps_count=steps, step_duration=0.4)
+                elif cmd in ['6', 'turnl']:
+                    steps = input("회전 스텝 수 (기본값 4): ").strip()
+                    steps = int(steps) if steps.isdigit() else 4
+                    strafe_left(steps_count=steps)
+                elif cmd in ['7', 'turnr']:
+                    steps = input("회전 스텝 수 (기본값 4): ").strip()
+                    steps = int(steps) if steps.isdigit() else 4
+                    strafe_right(steps_count=steps)
+                elif cmd in ['u', 'up']:
+                    height = input("높이 조정 (cm, 기본값 +3): ").strip()
                     try:
-                        x = float(input("X 좌표 (cm): ").strip())
-                        y = float(input("Y 좌표 (cm): ").strip())
-                        z = float(input("Z 좌표 (cm): ").strip())
-
-                        print(f"\n→ {leg_name} 다리를 ({x:.2f}, {y:.2f}, {z:.2f})cm로 이동합니다...")
-                        success = set_leg_position_xyz(leg_name, x, y, z, duration=0.5, steps=20)
-
-                        if success:
-                            print("✓ 이동 완료")
-                        else:
-                            print("✗ 이동 실패 (도달 불가능한 좌표)")
+                        height = float(height) if height else -3.0
+                        body_move_up_down(height)
                     except ValueError:
                         print("✗ 잘못된 숫자 형식입니다.")
+                elif cmd in ['d', 'down']:
+                    height = input("높이 조정 (cm, 기본값 -3): ").strip()
+                    try:
+                        height = float(height) if height else 3.0
+                        body_move_up_down(height)
+                    except ValueError:
+                        print("✗ 잘못된 숫자 형식입니다.")
+                elif cmd in ['l', 'left']:
+                    shift = input("이동량 (cm, 기본값 -2): ").strip()
+                    try:
+                        shift = float(shift) if shift else -0.2
+                        body_shift_weight(shift)
+                        emergency_stop.sleep(0.5)
+                        stand_up(duration=0.5)  # 중립 자세로 복귀
+                    except ValueError:
+                        print("✗ 잘못된 숫자 형식입니다.")
+                elif cmd in ['r', 'right']:
+                    shift = input("이동량 (cm, 기본값 +2): ").strip()
+                    try:
+                        shift = float(shift) if shift else 0.2
+                        body_shift_weight(shift)
+                        emergency_stop.sleep(0.5)
+                        stand_up(duration=0.5)  # 중립 자세로 복귀
+                    except ValueError:
+                        print("✗ 잘못된 숫자 형식입니다.")
+                elif cmd in ['rl', 'rotl']:
+                    steps = input("회전 스텝 수 (기본값 4): ").strip()
+                    steps = int(steps) if steps.isdigit() else 4
+                    rotate_body_left(steps_count=steps)
+                elif cmd in ['rr', 'rotr']:
+                    steps = input("회전 스텝 수 (기본값 4): ").strip()
+                    steps = int(steps) if steps.isdigit() else 4
+                    rotate_body_right(steps_count=steps)
+                elif cmd in ['sw', 'swalk']:
+                    steps = input("걸음 수 (기본값 4): ").strip()
+                    steps = int(steps) if steps.isdigit() else 4
+                    play_gait_smooth('walk_forward', steps_count=steps, step_duration=0.4)
+                elif cmd in ['fw', 'fwalk']:
+                    steps = input("걸음 수 (기본값 4): ").strip()
+                    steps = int(steps) if steps.isdigit() else 4
+                    play_gait_fastest('walk_forward', steps_count=steps)
+                elif cmd in ['cr', 'crawl']:
+                    steps = input("걸음 수 (기본값 2): ").strip()
+                    steps = int(steps) if steps.isdigit() else 2
+                    crawl(steps_count=steps)
+                elif cmd in ['c', 'curve']:
+                    try:
+                        vx = input("전진 속도 (cm/s, 기본값 5): ").strip()
+                        vx = float(vx) if vx else 5.0
+                        yaw = input("회전 속도 (도/초, 왼쪽+, 기본값 0): ").strip()
+                        yaw = float(yaw) if yaw else 0.0
+                        walk_curve(vx, yaw, duration=2.0)
+                    except ValueError:
+                        print("✗ 잘못된 숫자 형식입니다.")
+                elif cmd in ['s', 'stop']:
+                    stop_walking()
+                elif cmd in ['8', 'demo']:
+                    demo_sequence()
+                elif cmd in ['f', 'follow']:
+                    seconds = input("추종 시간 (초, 기본값 10): ").strip()
+                    try:
+                        follow_target(duration=float(seconds) if seconds else 10.0)
+                    except ValueError:
+                        print("✗ 잘못된 숫자 형식입니다.")
+                elif cmd in ['m', 'script']:
+                    path = input("스크립트 파일 경로: ").strip()
+                    if path:
+                        play_script(path)
+                elif cmd in ['9', 'xyz']:
+                    print("\n다리 선택:")
+                    print("  1. front_right (오른쪽 앞)")
+                    print("  2. front_left (왼쪽 앞)")
+                    print("  3. rear_right (오른쪽 뒤)")
+                    print("  4. rear_left (왼쪽 뒤)")
+                    leg_choice = input("다리 번호 (1-4): ").strip()
+
+                    leg_map = {
+                        '1': 'front_right',
+                        '2': 'front_left',
+                        '3': 'rear_right',
+                        '4': 'rear_left'
+                    }
+
+                    if leg_choice in leg_map:
+                        leg_name = leg_map[leg_choice]
+                        print(f"\n{leg_name} 다리의 목표 좌표를 입력하세요 (cm 단위)")
+                        print("좌표계 (어깨 기준): X=앞(+)/뒤(-), Y=오른쪽(+)/왼쪽(-), Z=위(+)/아래(-)")
+                        print(f"도달 범위: 최대 {UPPER_SEG_LENGTH + LOWER_SEG_LENGTH}cm, 최소 {abs(UPPER_SEG_LENGTH - LOWER_SEG_LENGTH)}cm")
+
+                        try:
+                            x = float(input("X 좌표 (cm): ").strip())
+                            y = float(input("Y 좌표 (cm): ").strip())
+                            z = float(input("Z 좌표 (cm): ").strip())
+
+                            print(f"\n→ {leg_name} 다리를 ({x:.2f}, {y:.2f}, {z:.2f})cm로 이동합니다...")
+                            success = move_feet_smooth({leg_name: (x, y, z)})
+
+                            if success:
+                                print("✓ 이동 완료")
+                            else:
+                                print("✗ 이동 실패 (도달 불가능한 좌표)")
+                        except ValueError:
+                            print("✗ 잘못된 숫자 형식입니다.")
+                    else:
+                        print("✗ 잘못된 다리 번호입니다.")
                 else:
-                    print("✗ 잘못된 다리 번호입니다.")
-            else:
-                print("알 수 없는 명령어입니다.")
+                    print("알 수 없는 명령어입니다.")
+            except emergency_stop.EmergencyStop:
+                # 동작 도중 비상 정지 → 비상 동작 실행 (이미 실행됐으면 안내만)
+                handle_emergency()
 
             print()
 
     except KeyboardInterrupt:
         print("\n\n프로그램 종료")
-        lie_down(duration=1.0)
+        if not emergency_stop.triggered():
+            lie_down(duration=1.0)
 
 # ============================================================================
 # 메인 함수
@@ -1338,12 +2397,24 @@ def main():
         print("테스트 모드: 실제 모터를 제어하지 않고 각도만 출력합니다")
         print("="*60 + "\n")
     
+    # 설정 덮어쓰기 파일 (하드웨어 설정이 있으므로 PCA9685 초기화 전에)
+    init_config_reload()
+    # 미리 계산한 자세 / 보행 배열, 지난 실행의 마지막 자세
+    init_startup_cache()
+
     # PCA9685 초기화
     if not init_pca9685():
         if not TEST_MODE:
             print("초기화 실패. 프로그램을 종료합니다.")
             return
     
+    # 비상 정지 트리거 설치, 제어 루프 워치독 / 메트릭 서버 시작
+    init_emergency_stop()
+    init_watchdog()
+    init_metrics()
+    init_telemetry()
+    _report_startup()
+
     time.sleep(0.5)
     
     # 사용 모드 선택
@@ -1364,10 +2435,34 @@ def main():
             
     except KeyboardInterrupt:
         print("\n\n프로그램 중단")
+    except emergency_stop.EmergencyStop:
+        handle_emergency()
     finally:
-        if not TEST_MODE:
+        if not TEST_MODE and not emergency_stop.triggered():
             print("\n로봇을 안전한 자세로 전환합니다...")
             lie_down(duration=1.0)
+        if power_manager is not None:
+            power_manager.report()
+        if energy_meter is not None:
+            energy_meter.summary()
+        if bus_writer is not None:
+            # 마지막 프레임까지 전송한 뒤 종료
+            bus_writer.flush()
+            bus_writer.report()
+        if frame_sched is not None:
+            frame_sched.report()
+        if rt_controller is not None:
+            # 마지막 프레임까지 전송한 뒤 제어 프로세스 종료
+            rt_controller.stop()
+            rt_controller.report()
+            rt_controller.close()
+        emergency_stop.report()
+        if config.WATCHDOG_ENABLED:
+            watchdog.report()
+            if bus_forced_writes:
+                print(f"  I2C 버스 강제 전송: {bus_forced_writes}회")
+        if collision_blocked_frames:
+            print(f"간섭 가드로 막은 프레임: {collision_blocked_frames}개")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
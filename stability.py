@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 정적 안정성 검사 (지지 다각형 / 무게중심)
+
+발 좌표 시퀀스와 접지 여부로 지지 다각형을 구성하고,
+무게중심(COM)이 다각형 안쪽에 얼마나 여유 있게 있는지(안정 여유)를
+전체 궤적에 대해 NumPy로 한 번에 계산합니다.
+
+좌표계 (각 다리의 어깨 회전축 기준, spot_micro_controller와 동일):
+    X: 앞(+) / 뒤(-)
+    Y: 오른쪽(+) / 왼쪽(-)
+    Z: 위(+) / 아래(-)
+
+배열 형태:
+    foot_positions: (T, 4, 3) 또는 (4, 3) - 다리 순서는 config.LEG_NAMES
+    contacts:       (T, 4) 또는 (4,) bool - True = 접지
+"""
+
+import numpy as np
+import config
+
+# ============================================================================
+# 몸체 형상
+# ============================================================================
+
+# 몸체 중앙 기준 각 어깨 회전축 위치 (cm), config.LEG_NAMES 순서
+_HIP_SIGN = {
+    'front_right': (1.0, 1.0),
+    'rear_right': (-1.0, 1.0),
+    'front_left': (1.0, -1.0),
+    'rear_left': (-1.0, -1.0),
+}
+
+# 지지 다각형을 만들 때 도는 순서 (위에서 봤을 때 한 방향으로 회전)
+# front_right → rear_right → rear_left → front_left
+_POLYGON_ORDER = np.array([
+    config.LEG_NAMES.index('front_right'),
+    config.LEG_NAMES.index('rear_right'),
+    config.LEG_NAMES.index('rear_left'),
+    config.LEG_NAMES.index('front_left'),
+])
+
+
+def hip_positions(body_length=None, body_width=None):
+    """
+    몸체 중앙 기준 어깨 회전축 좌표
+
+    Returns:
+        np.ndarray: (4, 3) 어깨 좌표 (cm), config.LEG_NAMES 순서
+    """
+    if body_length is None:
+        body_length = config.BODY_LENGTH
+    if body_width is None:
+        body_width = config.BODY_WIDTH
+
+    hips = np.zeros((4, 3))
+    for i, leg_name in enumerate(config.LEG_NAMES):
+        sx, sy = _HIP_SIGN[leg_name]
+        hips[i, 0] = sx * body_length / 2.0
+        hips[i, 1] = sy * body_width / 2.0
+    return hips
+
+
+def _as_trajectory(foot_positions, contacts):
+    """입력을 (T, 4, 3), (T, 4) 배열로 정리"""
+    feet = np.asarray(foot_positions, dtype=float)
+    single = feet.ndim == 2
+    if single:
+        feet = feet[np.newaxis]
+    if feet.shape[1:] != (4, 3):
+        raise ValueError(f"foot_positions 형태가 잘못되었습니다: {feet.shape} (T, 4, 3) 필요")
+
+    if contacts is None:
+        contacts = infer_contacts(feet)
+    else:
+        contacts = np.asarray(contacts, dtype=bool)
+        if contacts.ndim == 1:
+            contacts = np.broadcast_to(contacts, feet.shape[:2])
+    return feet, contacts, single
+
+
+def infer_contacts(foot_positions, threshold=None):
+    """
+    Z 좌표로 접지 여부 추정
+
+    각 시점에서 가장 낮은 발보다 threshold 이상 높은 발은 들린 것으로 봅니다.
+
+    Args:
+        foot_positions: (T, 4, 3) 또는 (4, 3) 발 좌표
+        threshold: 들린 발 판단 기준 (cm), None이면 config 값 사용
+
+    Returns:
+        np.ndarray: (T, 4) 또는 (4,) bool 배열
+    """
+    if threshold is None:
+        threshold = config.STABILITY_CONTACT_THRESHOLD
+
+    feet = np.asarray(foot_positions, dtype=float)
+    z = feet[..., 2]
+    lowest = z.min(axis=-1, keepdims=True)
+    return z <= lowest + threshold
+
+
+def center_of_mass(foot_positions, hips=None):
+    """
+    몸체 + 다리 질량 모델로 무게중심 계산 (몸체 중앙 기준, cm)
+
+    다리 질량은 어깨와 발의 중간 지점에 있다고 가정합니다.
+
+    Args:
+        foot_positions: (T, 4, 3) 발 좌표 (어깨 기준)
+        hips: (4, 3) 어깨 좌표, None이면 config 값으로 계산
+
+    Returns:
+        np.ndarray: (T, 3) 무게중심 좌표
+    """
+    if hips is None:
+        hips = hip_positions()
+
+    feet = np.asarray(foot_positions, dtype=float)
+    body_com = np.array([config.COM_OFFSET_X, config.COM_OFFSET_Y, 0.0])
+    leg_com = hips + feet / 2.0                      # (T, 4, 3)
+
+    total_mass = config.BODY_MASS + 4 * config.LEG_MASS
+    com = config.BODY_MASS * body_com + config.LEG_MASS * leg_com.sum(axis=-2)
+    return com / total_mass
+
+
+def support_polygon(foot_positions, contacts=None, hips=None):
+    """
+    지지 다각형 꼭짓점 (지면 투영, 회전 순서대로 정렬)
+
+    Args:
+        foot_positions: (T, 4, 3) 또는 (4, 3) 발 좌표 (어깨 기준)
+        contacts: (T, 4) 접지 여부, None이면 Z 좌표로 추정
+        hips: (4, 3) 어깨 좌표
+
+    Returns:
+        (vertices, mask):
+            vertices: (T, 4, 2) 몸체 기준 XY 좌표 (회전 순서)
+            mask: (T, 4) 해당 꼭짓점이 접지 발인지 여부
+    """
+    if hips is None:
+        hips = hip_positions()
+
+    feet, contacts, single = _as_trajectory(foot_positions, contacts)
+    vertices = (hips + feet)[:, _POLYGON_ORDER, :2]
+    mask = contacts[:, _POLYGON_ORDER]
+
+    if single:
+        return vertices[0], mask[0]
+    return vertices, mask
+
+
+def edge_distances(foot_positions, contacts=None, hips=None):
+    """
+    무게중심에서 지지 다각형 각 변까지의 부호 있는 거리 (전체 궤적 한 번에)
+
+    Args:
+        foot_positions: (T, 4, 3) 또는 (4, 3) 발 좌표 (어깨 기준)
+        contacts: (T, 4) 접지 여부, None이면 Z 좌표로 추정
+        hips: (4, 3) 어깨 좌표
+
+    Returns:
+        (distance, normal, com):
+            distance: (T, 4) 변별 거리 (양수 = 안쪽), 접지하지 않은 꼭짓점에서 시작하는 변은 inf
+                      접지 발이 하나면 그 발까지 거리의 음수
+            normal: (T, 4, 2) 변의 안쪽 단위 법선 (변이 없으면 0)
+            com: (T, 3) 무게중심 좌표
+            변 순서는 지지 다각형 회전 순서 (front_right → rear_right → rear_left → front_left)
+    """
+    if hips is None:
+        hips = hip_positions()
+
+    feet, contacts, single = _as_trajectory(foot_positions, contacts)
+    com = center_of_mass(feet, hips)
+
+    points = (hips + feet)[:, _POLYGON_ORDER, :2]    # (T, 4, 2)
+    mask = contacts[:, _POLYGON_ORDER]               # (T, 4)
+
+    # 각 꼭짓점의 다음 접지 꼭짓점 찾기 (회전 순서, 없으면 자기 자신)
+    k = np.arange(4)
+    next_idx = np.broadcast_to(k, mask.shape).copy()
+    for shift in (3, 2, 1):
+        candidate = (k + shift) % 4
+        next_idx = np.where(mask[:, candidate], candidate, next_idx)
+
+    start = points
+    end = np.take_along_axis(points, next_idx[..., np.newaxis], axis=1)
+    edge = end - start
+    to_com = com[:, np.newaxis, :2] - start
+    edge_len = np.linalg.norm(edge, axis=-1)
+
+    # 변이 있으면 부호 있는 거리 (왼쪽 = 안쪽), 점 하나면 거리의 음수
+    has_edge = edge_len > 1e-9
+    safe_len = np.where(has_edge, edge_len, 1.0)
+    normal = np.where(has_edge[..., np.newaxis],
+                      np.stack([-edge[..., 1], edge[..., 0]], axis=-1) / safe_len[..., np.newaxis],
+                      0.0)
+    distance = np.where(has_edge,
+                        (normal * to_com).sum(axis=-1),
+                        -np.linalg.norm(to_com, axis=-1))
+    distance = np.where(mask, distance, np.inf)
+
+    if single:
+        return distance[0], normal[0], com[0]
+    return distance, normal, com
+
+
+def stability_margin(foot_positions, contacts=None, hips=None):
+    """
+    정적 안정 여유 계산 (전체 궤적 한 번에)
+
+    무게중심의 지면 투영점에서 지지 다각형 각 변까지의 부호 있는 거리 중
+    최솟값입니다. 양수 = 다각형 안쪽, 음수 = 바깥쪽(넘어짐).
+    접지 발이 2개 이하이면 항상 0 이하가 됩니다.
+
+    Args:
+        foot_positions: (T, 4, 3) 또는 (4, 3) 발 좌표 (어깨 기준)
+        contacts: (T, 4) 접지 여부, None이면 Z 좌표로 추정
+        hips: (4, 3) 어깨 좌표
+
+    Returns:
+        (margin, com):
+            margin: (T,) 안정 여유 (cm), 접지 발이 없으면 -inf
+            com: (T, 3) 무게중심 좌표
+    """
+    distance, _, com = edge_distances(foot_positions, contacts, hips)
+    margin = distance.min(axis=-1)
+    # 접지 발이 없으면 모든 변이 inf
+    return np.where(np.isfinite(margin), margin, -np.inf)[()], com
+
+
+def analyze_trajectory(foot_positions, contacts=None, min_margin=None):
+    """
+    궤적 전체의 안정성 분석
+
+    Args:
+        foot_positions: (T, 4, 3) 발 좌표 시퀀스
+        contacts: (T, 4) 접지 여부, None이면 Z 좌표로 추정
+        min_margin: 요구 안정 여유 (cm), None이면 config 값 사용
+
+    Returns:
+        dict:
+            'margin': (T,) 안정 여유
+            'com': (T, 3) 무게중심
+            'tip_over': (T,) 넘어질 위험이 있는 프레임 (margin < min_margin)
+            'risk': (T,) 0(안전) ~ 1(다각형 밖) 위험도
+            'min_margin': 궤적 중 최소 여유
+            'worst_index': 최소 여유가 나온 프레임 인덱스
+            'stable': 모든 프레임이 요구 여유를 만족하는지
+    """
+    if min_margin is None:
+        min_margin = config.STABILITY_MIN_MARGIN
+
+    margin, com = stability_margin(foot_positions, contacts)
+    margin = np.atleast_1d(margin)
+    com = np.atleast_2d(com)
+
+    tip_over = margin < min_margin
+    if min_margin > 0:
+        risk = np.clip((min_margin - margin) / min_margin, 0.0, 1.0)
+    else:
+        risk = (margin < 0).astype(float)
+
+    worst = int(np.argmin(margin))
+    return {
+        'margin': margin,
+        'com': com,
+        'tip_over': tip_over,
+        'risk': risk,
+        'min_margin': float(margin[worst]),
+        'worst_index': worst,
+        'stable': not bool(tip_over.any()),
+    }
+
+
+def preflight_check(foot_positions, contacts=None, min_margin=None, name="궤적"):
+    """
+    재생 전 안정성 사전 검사 (결과 출력)
+
+    Args:
+        foot_positions: (T, 4, 3) 발 좌표 시퀀스
+        contacts: (T, 4) 접지 여부
+        min_margin: 요구 안정 여유 (cm)
+        name: 출력용 이름
+
+    Returns:
+        bool: 모든 프레임이 안정하면 True
+    """
+    result = analyze_trajectory(foot_positions, contacts, min_margin)
+    frames = len(result['margin'])
+    unstable = int(result['tip_over'].sum())
+
+    if result['stable']:
+        print(f"✓ {name} 안정성 검사 통과 ({frames} 프레임, 최소 여유 {result['min_margin']:.2f}cm)")
+    else:
+        print(f"⚠ {name} 불안정 프레임 {unstable}/{frames}개 "
+              f"(최소 여유 {result['min_margin']:.2f}cm @ 프레임 {result['worst_index']})")
+    return result['stable']
+
+
+def check_pose(positions_dict, contacts=None, min_margin=None):
+    """
+    단일 자세 안정성 검사 (동작 중 실시간 가드용)
+
+    Args:
+        positions_dict: {'front_left': (x, y, z), ...} 네 다리 좌표
+        contacts: (4,) 접지 여부, None이면 Z 좌표로 추정
+        min_margin: 요구 안정 여유 (cm)
+
+    Returns:
+        (stable, margin): 안정 여부, 안정 여유 (cm)
+    """
+    if min_margin is None:
+        min_margin = config.STABILITY_MIN_MARGIN
+
+    feet = np.array([positions_dict[leg] for leg in config.LEG_NAMES], dtype=float)
+    margin, _ = stability_margin(feet, contacts)
+    margin = float(margin)
+    return margin >= min_margin, margin
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 시작 캐시 (미리 계산한 배열 + 마지막 자세)
+
+시작할 때마다 다시 계산하던 자세 IK 테이블과 기본 보행 궤적을 설정별 디렉터리에
+.npy 파일로 저장해 두고, 다음 시작 때 np.load(mmap_mode='r')로 바로 매핑합니다.
+디렉터리 이름은 설정 값 + 계산 코드(kinematics / trajectory / pose_library / pwm_output)의
+해시이므로 설정이나 코드가 바뀌면 자동으로 다시 만듭니다.
+
+    .spot_cache/<해시>/manifest.json         자세 / 보행 목록
+    .spot_cache/<해시>/pose_*.npy            (P, 4, 3) 자세 배열
+    .spot_cache/<해시>/gait_*.npy            보행 배열 (이어 붙임, manifest의 구간으로 나눔)
+    .spot_cache/last_pose.npy               마지막으로 전송한 관절 각도 (4, 3)
+
+마지막 자세 파일은 메모리 매핑 배열이라 프레임마다 RobotState.commit()이 제자리에
+기록하고 (파일 쓰기 호출 없음), 다음 시작 때 첫 동작이 그 자세에서 시작합니다.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import config
+import config_loader
+import kinematics
+import pose_library
+import pwm_output
+import trajectory
+
+# 캐시 형식 버전 (형식을 바꾸면 올림)
+CACHE_FORMAT = 1
+
+# 캐시 키에 포함할 계산 코드
+_SOURCE_MODULES = (kinematics, trajectory, pose_library, pwm_output)
+
+_POSE_FIELDS = ('positions', 'angles', 'channel_angles', 'ticks')
+_GAIT_FIELDS = ('times', 'positions', 'angles')
+
+
+def config_key():
+    """현재 설정 + 계산 코드 해시 (캐시 디렉터리 이름)"""
+    digest = hashlib.sha256(f"format {CACHE_FORMAT}\n".encode())
+    values = config_loader.current_values()
+    for name in sorted(values):
+        if not name.startswith('STARTUP_'):
+            digest.update(f"{name}={values[name]!r}\n".encode())
+    for module in _SOURCE_MODULES:
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def default_gaits():
+    """캐시할 보행 (GAITS 전체, 기본 걸음 수 / 파라미터)"""
+    return [(name, config.DEFAULT_WALK_STEPS) for name in trajectory.GAITS]
+
+
+# ============================================================================
+# 저장 / 불러오기
+# ============================================================================
+
+def save(directory, poses, gaits):
+    """
+    자세 / 보행 배열을 캐시 디렉터리에 저장 (임시 디렉터리에 쓴 뒤 교체)
+
+    Args:
+        directory: 캐시 디렉터리 (<STARTUP_CACHE_DIR>/<해시>)
+        poses: {이름: pose_library.Pose}
+        gaits: [(캐시 키, trajectory.CompiledGait)]
+    """
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+    try:
+        names = list(poses)
+        for field in _POSE_FIELDS:
+            np.save(os.path.join(staging, f'pose_{field}.npy'),
+                    np.stack([getattr(poses[n], field) for n in names]))
+
+        entries = []
+        start = 0
+        for key, gait in gaits:
+            stop = start + len(gait.times)
+            entries.append({'key': [key[0], key[1], key[2], key[3], [list(p) for p in key[4]]],
+                            'start': start, 'stop': stop, 'reachable': gait.reachable})
+            start = stop
+        for field in _GAIT_FIELDS:
+            arrays = [getattr(gait, field) for _, gait in gaits]
+            np.save(os.path.join(staging, f'gait_{field}.npy'),
+                    np.concatenate(arrays) if arrays else np.empty(0))
+
+        manifest = {'format': CACHE_FORMAT,
+                    'poses': [[n, poses[n].source] for n in names],
+                    'gaits': entries}
+        with open(os.path.join(staging, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        os.replace(staging, directory)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def load(directory):
+    """
+    캐시 디렉터리 → (자세, 보행) (배열은 읽기 전용 메모리 매핑)
+
+    Returns:
+        (poses, gaits): {이름: Pose}, [(캐시 키, CompiledGait)]
+        캐시가 없거나 형식이 다르면 None
+    """
+    try:
+        with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != CACHE_FORMAT:
+            return None
+        pose_arrays = {field: np.load(os.path.join(directory, f'pose_{field}.npy'), mmap_mode='r')
+                       for field in _POSE_FIELDS}
+        gait_arrays = {field: np.load(os.path.join(directory, f'gait_{field}.npy'), mmap_mode='r')
+                       for field in _GAIT_FIELDS}
+    except (OSError, ValueError):
+        return None
+
+    poses = {}
+    for i, (name, source) in enumerate(manifest['poses']):
+        poses[name] = pose_library.Pose(name, source,
+                                        *(pose_arrays[field][i] for field in _POSE_FIELDS))
+    gaits = []
+    for entry in manifest['gaits']:
+        name, cycles, rate, kind, params = entry['key']
+        key = (name, cycles, rate, kind, tuple(tuple(p) for p in params))
+        window = slice(entry['start'], entry['stop'])
+        gaits.append((key, trajectory.CompiledGait(
+            name=name,
+            times=gait_arrays['times'][window],
+            positions=gait_arrays['positions'][window],
+            angles=gait_arrays['angles'][window],
+            reachable=entry['reachable'])))
+    return poses, gaits
+
+
+def _prune(parent, keep):
+    """다른 설정의 오래된 캐시 디렉터리 삭제"""
+    for entry in os.listdir(parent):
+        path = os.path.join(parent, entry)
+        if entry != keep and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def warm(cache_dir=None):
+    """
+    자세 / 기본 보행 캐시 준비 (있으면 매핑, 없으면 계산 후 저장)
+
+    Returns:
+        bool: 캐시를 그대로 썼으면 True (계산했으면 False)
+    """
+    if cache_dir is None:
+        cache_dir = config.STARTUP_CACHE_DIR
+    key = config_key()
+    directory = os.path.join(cache_dir, key)
+
+    loaded = load(directory)
+    if loaded is not None:
+        poses, gaits = loaded
+        pose_library.preload(poses)
+        for gait_key, gait in gaits:
+            trajectory.preload(gait_key, gait)
+        return True
+
+    poses = pose_library.load()
+    gaits = []
+    for name, cycles in default_gaits():
+        gait_key = trajectory.gait_cache_key(name, cycles)
+        gaits.append((gait_key, trajectory.compile_gait(name, cycles)))
+    try:
+        save(directory, poses, gaits)
+        _prune(cache_dir, key)
+    except OSError as e:
+        print(f"⚠ 시작 캐시 저장 실패: {e}")
+    return False
+
+
+# ============================================================================
+# 마지막 자세
+# ============================================================================
+
+def open_pose_store(path=None):
+    """
+    마지막 자세 파일 열기 (없으면 만듦)
+
+    Returns:
+        (store, previous): store는 (4, 3) 쓰기 가능한 메모리 매핑 배열,
+        previous는 저장되어 있던 관절 각도 (없거나 오래됐거나 잘못된 값이면 None)
+    """
+    if path is None:
+        path = config.STARTUP_STATE_FILE
+    shape = (len(config.LEG_NAMES), 3)
+    previous = None
+    store = None
+    try:
+        age = time.time() - os.path.getmtime(path)
+        store = np.load(path, mmap_mode='r+')
+        if store.shape != shape or store.dtype != np.float64:
+            store = None
+        elif np.isfinite(store).all() and ((store >= 0) & (store <= 180)).all():
+            if not config.STARTUP_POSE_MAX_AGE or age <= config.STARTUP_POSE_MAX_AGE:
+                previous = np.array(store)
+    except (OSError, ValueError):
+        store = None
+
+    if store is None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        store = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=shape)
+        store[:] = np.nan
+    return store, previous
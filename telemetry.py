@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - UDP 텔레메트리 (관절 / 발 상태)
+
+프레임을 전송할 때마다 고정 길이 바이너리 패킷 하나를 UDP로 보냅니다.
+소켓은 non-blocking이라 수신 측이 없거나 느려도 제어 루프를 막지 않고
+패킷만 버립니다.
+
+패킷 구조 (little-endian, 140 바이트):
+    2s   magic 'SM'
+    B    버전 (PACKET_VERSION)
+    B    플래그 (bit 0: 비상 동작 프레임)
+    I    시퀀스 번호 (빠진 패킷 확인용)
+    d    타임스탬프 (초, 송신 시작 기준)
+    12f  명령 각도 (도, config.LEG_NAMES 순서 × [어깨, 상부, 하부], 캘리브레이션 포함)
+    12H  PWM 펄스 폭 (틱)
+    12f  발 목표 좌표 (cm, config.LEG_NAMES 순서 × [x, y, z])
+    f    보행 위상 (0~1, 모르면 NaN)
+
+수신 / 기록 / 그래프:
+    python telemetry.py --port 9752                 # 수신 상태 출력
+    python telemetry.py --port 9752 --out log.csv   # CSV로 저장
+    python telemetry.py --port 9752 --plot          # 실시간 그래프 (matplotlib 필요)
+"""
+
+import argparse
+import math
+import socket
+import struct
+import time
+
+import numpy as np
+import config
+import kinematics
+import pwm_output
+
+PACKET_MAGIC = b'SM'
+PACKET_VERSION = 1
+PACKET = struct.Struct('<2sBBId12f12H12ff')
+
+FLAG_EMERGENCY = 0x01
+
+
+# ============================================================================
+# 송신
+# ============================================================================
+
+class TelemetrySender:
+    """
+    프레임 상태 UDP 송신
+
+    Args:
+        host, port: 수신 주소, None이면 config.TELEMETRY_HOST / TELEMETRY_PORT
+    """
+
+    def __init__(self, host=None, port=None):
+        self.address = (host or config.TELEMETRY_HOST, port or config.TELEMETRY_PORT)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+
+        self._index = pwm_output.channel_joint_index()
+        self.angles = np.full((4, 3), 90.0)
+        self.sequence = 0
+        self.start = time.perf_counter()
+
+        self.sent = 0
+        self.dropped = 0          # 소켓 버퍼가 차거나 수신 측이 없어서 버린 패킷
+
+    def publish(self, angles_by_channel, phase=math.nan, emergency=False):
+        """
+        전송한 프레임 상태 송신 (기다리지 않음)
+
+        Args:
+            angles_by_channel: {채널: 각도} (일부 채널만 있어도 이전 값 유지)
+            phase: 보행 위상 (0~1), 모르면 NaN
+            emergency: 비상 동작 프레임 여부
+        """
+        for channel, angle in angles_by_channel.items():
+            if channel in self._index:
+                self.angles[self._index[channel]] = angle
+
+        ticks = pwm_output.angle_to_tick(self.angles).ravel()
+        # 캘리브레이션은 매번 config에서 읽음 (설정 다시 불러오기 반영)
+        joints = kinematics.channel_to_joint(self.angles)
+        feet = kinematics.forward_kinematics(joints).ravel()
+        packet = PACKET.pack(PACKET_MAGIC, PACKET_VERSION, FLAG_EMERGENCY if emergency else 0,
+                             self.sequence & 0xFFFFFFFF, time.perf_counter() - self.start,
+                             *self.angles.ravel(), *ticks, *feet, phase)
+        self.sequence += 1
+        try:
+            self.sock.sendto(packet, self.address)
+            self.sent += 1
+        except OSError:
+            # BlockingIOError (버퍼 가득), ConnectionRefusedError (수신 측 없음) 등
+            self.dropped += 1
+
+
+# ============================================================================
+# 수신
+# ============================================================================
+
+def decode(packet):
+    """
+    패킷 → dict
+
+    Returns:
+        dict: 'sequence', 'timestamp', 'emergency', 'angles' (4, 3), 'ticks' (4, 3),
+              'feet' (4, 3), 'phase'
+    """
+    if len(packet) != PACKET.size:
+        raise ValueError(f"패킷 길이 오류: {len(packet)} (예상 {PACKET.size})")
+    values = PACKET.unpack(packet)
+    magic, version, flags, sequence, timestamp = values[:5]
+    if magic != PACKET_MAGIC or version != PACKET_VERSION:
+        raise ValueError(f"알 수 없는 패킷: {magic!r} 버전 {version}")
+    return {
+        'sequence': sequence,
+        'timestamp': timestamp,
+        'emergency': bool(flags & FLAG_EMERGENCY),
+        'angles': np.array(values[5:17]).reshape(4, 3),
+        'ticks': np.array(values[17:29]).reshape(4, 3),
+        'feet': np.array(values[29:41]).reshape(4, 3),
+        'phase': values[41],
+    }
+
+
+def csv_header():
+    joints = ('shoulder', 'upper', 'lower')
+    columns = ['sequence', 'timestamp', 'emergency', 'phase']
+    columns += [f'{leg}_{j}_angle' for leg in config.LEG_NAMES for j in joints]
+    columns += [f'{leg}_{j}_tick' for leg in config.LEG_NAMES for j in joints]
+    columns += [f'{leg}_{axis}' for leg in config.LEG_NAMES for axis in 'xyz']
+    return ','.join(columns)
+
+
+def csv_row(sample):
+    values = [sample['sequence'], f"{sample['timestamp']:.6f}", int(sample['emergency']),
+              f"{sample['phase']:.4f}"]
+    values += [f'{v:.3f}' for v in sample['angles'].ravel()]
+    values += [str(int(v)) for v in sample['ticks'].ravel()]
+    values += [f'{v:.3f}' for v in sample['feet'].ravel()]
+    return ','.join(str(v) for v in values)
+
+
+def receive(port, host='0.0.0.0'):
+    """패킷을 받아 디코딩한 샘플을 차례로 반환 (제너레이터)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    while True:
+        packet, _ = sock.recvfrom(PACKET.size + 64)
+        try:
+            yield decode(packet)
+        except ValueError as e:
+            print(f"⚠ {e}")
+
+
+class _LivePlot:
+    """관절 각도와 발 높이 실시간 그래프"""
+
+    def __init__(self, window):
+        import matplotlib.pyplot as plt
+        self.plt = plt
+        self.window = window
+        self.fig, (self.ax_angle, self.ax_foot) = plt.subplots(2, 1, sharex=True)
+        self.times, self.angles, self.feet_z = [], [], []
+        self.angle_lines = [self.ax_angle.plot([], [], label=f'{leg} {j}')[0]
+                            for leg in config.LEG_NAMES for j in ('S', 'U', 'L')]
+        self.foot_lines = [self.ax_foot.plot([], [], label=leg)[0] for leg in config.LEG_NAMES]
+        self.ax_angle.set_ylabel('각도 (도)')
+        self.ax_foot.set_ylabel('발 Z (cm)')
+        self.ax_foot.set_xlabel('시간 (초)')
+        self.ax_foot.legend(loc='upper right', fontsize='small')
+        plt.ion()
+        plt.show()
+
+    def add(self, sample):
+        self.times.append(sample['timestamp'])
+        self.angles.append(sample['angles'].ravel())
+        self.feet_z.append(sample['feet'][:, 2])
+        if len(self.times) > self.window:
+            del self.times[0], self.angles[0], self.feet_z[0]
+
+    def draw(self):
+        if not self.times:
+            return
+        angles = np.array(self.angles)
+        feet_z = np.array(self.feet_z)
+        for i, line in enumerate(self.angle_lines):
+            line.set_data(self.times, angles[:, i])
+        for i, line in enumerate(self.foot_lines):
+            line.set_data(self.times, feet_z[:, i])
+        for ax in (self.ax_angle, self.ax_foot):
+            ax.relim()
+            ax.autoscale_view()
+        self.plt.pause(0.001)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spot Micro 텔레메트리 수신기")
+    parser.add_argument('--port', type=int, default=config.TELEMETRY_PORT or 9752)
+    parser.add_argument('--host', default='0.0.0.0', help="수신 주소 (기본: 모든 인터페이스)")
+    parser.add_argument('--out', help="CSV 파일로 저장")
+    parser.add_argument('--plot', action='store_true', help="실시간 그래프 (matplotlib 필요)")
+    parser.add_argument('--window', type=int, default=500, help="그래프에 표시할 샘플 수")
+    args = parser.parse_args()
+
+    plot = None
+    if args.plot:
+        try:
+            plot = _LivePlot(args.window)
+        except ImportError:
+            print("⚠ matplotlib이 없어서 그래프를 표시할 수 없습니다 (pip install matplotlib)")
+
+    out = open(args.out, 'w') if args.out else None
+    if out is not None:
+        out.write(csv_header() + '\n')
+
+    print(f"텔레메트리 수신 대기: {args.host}:{args.port}")
+    received = lost = 0
+    last_sequence = None
+    last_report = last_draw = time.perf_counter()
+    try:
+        for sample in receive(args.port, args.host):
+            received += 1
+            if last_sequence is not None and sample['sequence'] > last_sequence + 1:
+                lost += sample['sequence'] - last_sequence - 1
+            last_sequence = sample['sequence']
+
+            if out is not None:
+                out.write(csv_row(sample) + '\n')
+            if plot is not None:
+                plot.add(sample)
+
+            now = time.perf_counter()
+            if plot is not None and now - last_draw > 0.1:
+                plot.draw()
+                last_draw = now
+            if now - last_report > 1.0:
+                phase = sample['phase']
+                phase_text = '-' if math.isnan(phase) else f'{phase:.2f}'
+                print(f"수신 {received}개 (손실 {lost}), 위상 {phase_text}, "
+                      f"발 Z {np.round(sample['feet'][:, 2], 1).tolist()}")
+                last_report = now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not None:
+            out.close()
+        print(f"\n수신 {received}개, 손실 {lost}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""공통 픽스처 (저장소 루트 모듈을 그대로 import)"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import emergency_stop  # noqa: E402
+import watchdog  # noqa: E402
+
+
+@pytest.fixture
+def controller():
+    """테스트 모드 컨트롤러 (하드웨어 없이 프레임 전송, 끝나면 비상 정지 / 워치독 원복)"""
+    import spot_micro_controller
+    saved = spot_micro_controller.TEST_MODE
+    spot_micro_controller.TEST_MODE = True
+    emergency_stop.reset()
+    watchdog.disarm()
+    try:
+        yield spot_micro_controller
+    finally:
+        watchdog.disarm()
+        emergency_stop.reset()
+        spot_micro_controller.TEST_MODE = saved
@@ -0,0 +1,31 @@
+"""캘리브레이션 피팅: 수렴 / 정체 구분"""
+
+import numpy as np
+
+import calibration_fit
+
+
+def test_noisy_measurements_converge():
+    legs, channels, feet, _ = calibration_fit.simulate(40)
+    result = calibration_fit.fit(legs, channels, feet)
+    assert result.converged and not result.stalled
+    assert result.errors.max() < result.initial_errors.max()
+
+
+def test_measurements_matching_current_calibration_converge():
+    legs, channels, _, _ = calibration_fit.simulate(10)
+    feet = calibration_fit.predict(calibration_fit._initial_params(), legs, channels)
+    result = calibration_fit.fit(legs, channels, feet)
+    assert result.converged and not result.stalled
+
+
+def test_flat_cost_is_reported_as_stalled(monkeypatch):
+    legs, channels, feet, _ = calibration_fit.simulate(40)
+    predict = calibration_fit.predict
+
+    # 계단 모양 비용 (유한 차분 야코비안이 0): 비용을 줄이는 이동이 없음
+    monkeypatch.setattr(calibration_fit, 'predict',
+                        lambda *args: np.round(predict(*args) * 2.0) / 2.0)
+    result = calibration_fit.fit(legs, channels, feet)
+    assert result.stalled
+    assert not result.converged
@@ -0,0 +1,53 @@
+"""PWM 주기 정렬 전송: 블록 쓰기 / 채널별 set_pwm 대체 경로"""
+
+import pytest
+
+import frame_scheduler
+import pwm_output
+
+ON_OFF = {0: (0, 300), 1: (256, 560), 2: (512, 820), 5: (100, 400)}
+
+
+class _Device:
+    def __init__(self):
+        self.blocks = []
+
+    def writeList(self, register, data):
+        self.blocks.append((register, list(data)))
+
+
+class _Pca:
+    """set_pwm만 있는 드라이버 (블록 쓰기 장치 없음)"""
+
+    def __init__(self):
+        self.channels = {}
+
+    def set_pwm(self, channel, on, off):
+        self.channels[channel] = (on, off)
+
+
+class _BlockPca(_Pca):
+    def __init__(self):
+        super().__init__()
+        self._device = _Device()
+
+
+@pytest.mark.parametrize('pca_class', [_Pca, _BlockPca], ids=['set_pwm', 'block'])
+def test_commit_writes_every_channel(pca_class):
+    pca = pca_class()
+    scheduler = frame_scheduler.FrameScheduler()
+    result = scheduler.commit(pca, ON_OFF)
+    assert result['skew'] >= 0.0
+
+    if pca_class is _BlockPca:
+        assert pca._device.blocks == [(r, list(d)) for r, d in pwm_output.frame_blocks(ON_OFF)]
+        assert pca.channels == {}
+    else:
+        assert pca.channels == ON_OFF
+
+
+def test_set_pwm_fallback_does_not_change_block_timing_model():
+    scheduler = frame_scheduler.FrameScheduler()
+    byte_time = scheduler.byte_time
+    scheduler.commit(_Pca(), ON_OFF)
+    assert scheduler.byte_time == byte_time
@@ -0,0 +1,30 @@
+"""골든 트레이스: 다른 작업 디렉터리에서 기준 기록 찾기 / IK 퍼징 경계 좌표"""
+
+import pytest
+
+import golden_trace
+import kinematics
+
+
+def test_golden_lookup_from_other_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in golden_trace.PRIMITIVES:
+        assert golden_trace.load(name) is not None, name
+
+    name = 'body_move_up_down'
+    assert golden_trace.compare(golden_trace.record(name), golden_trace.load(name)) == []
+
+
+def test_fuzz_round_trips_points_near_shoulder_axis():
+    result = golden_trace.fuzz(points=20000, scalar=500)
+    assert result.near_axis > 0
+    assert result.failures == 0, result.worst
+    assert result.scalar_mismatches == []
+
+
+@pytest.mark.parametrize('leg', range(4))
+def test_shoulder_axis_with_lateral_offset_is_unreachable(leg):
+    # x == 0 이면 어깨 각도로 y를 만들 수 없음
+    *_, reachable = kinematics.ik([0.0, 0.0], [2.0, 0.0], [-14.0, -14.0],
+                                  kinematics.IS_LEFT[leg], kinematics.IS_REAR[leg])
+    assert reachable.tolist() == [False, True]
@@ -0,0 +1,95 @@
+"""I2C 전송 스레드: 예상하지 못한 예외 / 복구 실패 / 비상 동작 중 재전송"""
+
+import threading
+
+import pytest
+
+import config
+import i2c_writer
+
+FRAME = {0: (0, 300), 1: (0, 310)}
+
+
+@pytest.fixture(autouse=True)
+def fast_retry(monkeypatch):
+    monkeypatch.setattr(config, 'I2C_RETRY_BACKOFF', 0.0)
+    monkeypatch.setattr(config, 'I2C_RETRY_BACKOFF_MAX', 0.0)
+
+
+def test_survives_non_oserror_and_falls_back_to_sync_write():
+    written = []
+    calls = {'n': 0}
+
+    def write(frame):
+        calls['n'] += 1
+        if calls['n'] == 1:
+            raise ValueError("잘못된 채널")
+        written.append((threading.current_thread().name, dict(frame)))
+
+    writer = i2c_writer.I2CWriter(write)
+    writer.post(FRAME)
+    assert writer.flush()
+    assert isinstance(writer.failure, ValueError)
+    assert writer.stats()['failed']
+    assert writer._thread.is_alive()
+
+    # 실패 상태: 호출한 스레드에서 바로 전송, 성공하면 전송 스레드로 복귀
+    writer.post(FRAME)
+    assert written == [(threading.current_thread().name, FRAME)]
+    assert writer.failure is None
+
+    writer.post(FRAME)
+    assert writer.flush()
+    assert written[-1] == ('i2c-writer', FRAME)
+
+
+def test_sync_write_error_reaches_caller():
+    def write(frame):
+        raise RuntimeError("드라이버 오류")
+
+    writer = i2c_writer.I2CWriter(write)
+    writer.post(FRAME)
+    assert writer.flush()
+    with pytest.raises(RuntimeError):
+        writer.post(FRAME)
+
+
+def test_gives_up_after_reinit_limit():
+    faults = []
+    writer_ref = {}
+
+    def write(frame):
+        raise OSError(121, "Remote I/O error")
+
+    def on_fault():
+        faults.append(writer_ref['w'].reinits)
+
+    writer = i2c_writer.I2CWriter(write, reinit=lambda: None, on_fault=on_fault)
+    writer_ref['w'] = writer
+    writer.post(FRAME)
+    assert writer.flush(timeout=5.0)
+    assert faults == [config.I2C_REINIT_LIMIT]
+    assert writer.queue_depth == 0
+
+
+def test_cleared_frame_is_not_resent_after_recovery():
+    written = []
+    release = threading.Event()
+    calls = {'n': 0}
+
+    def write(frame):
+        calls['n'] += 1
+        if calls['n'] <= config.I2C_RETRY_LIMIT + 1:
+            raise OSError(121, "Remote I/O error")
+        written.append(dict(frame))
+
+    def reinit():
+        # 재초기화 도중 비상 동작이 대기 프레임을 버림
+        writer.clear()
+        release.set()
+
+    writer = i2c_writer.I2CWriter(write, reinit=reinit)
+    writer.post(FRAME)
+    assert release.wait(5.0)
+    assert writer.flush()
+    assert written == []
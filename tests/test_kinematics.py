@@ -0,0 +1,29 @@
+"""관절 ↔ 채널 각도 변환: offsets / scales 기본값"""
+
+import numpy as np
+
+import config
+import kinematics
+
+ANGLES = np.full((4, 3), 120.0)
+
+
+def _calibrate(monkeypatch):
+    monkeypatch.setattr(config, 'SERVO_CALIBRATION_OFFSET', {'front_right': [5.0, 0.0, 0.0]})
+    monkeypatch.setattr(config, 'SERVO_CALIBRATION_SCALE', {'front_right': [2.0, 1.0, 1.0]})
+
+
+def test_offsets_only_keeps_config_scales(monkeypatch):
+    _calibrate(monkeypatch)
+    offsets = np.zeros((4, 3))
+    channel = kinematics.joint_to_channel(ANGLES, offsets=offsets)
+    assert channel[0, 0] == 90.0 + 2.0 * 30.0
+    np.testing.assert_allclose(kinematics.channel_to_joint(channel, offsets=offsets), ANGLES)
+
+
+def test_scales_only_keeps_config_offsets(monkeypatch):
+    _calibrate(monkeypatch)
+    scales = np.ones((4, 3))
+    channel = kinematics.joint_to_channel(ANGLES, scales=scales)
+    assert channel[0, 0] == 120.0 + 5.0
+    np.testing.assert_allclose(kinematics.channel_to_joint(channel, scales=scales), ANGLES)
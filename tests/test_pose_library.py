@@ -0,0 +1,21 @@
+"""자세 전환: 현재 각도에서 시작 (캐시 궤적으로 순간 이동하지 않음)"""
+
+import numpy as np
+
+import pose_library
+
+
+def test_exact_pose_uses_cached_transition():
+    start = pose_library.get('lie').angles
+    transition = pose_library.plan_from(start, 'standby')
+    assert transition.start == 'lie'
+    assert transition is pose_library.plan_from(start, 'standby')
+
+
+def test_near_pose_starts_from_current_angles():
+    start = np.array(pose_library.get('lie').angles)
+    start[0, 1] += 0.5          # match()의 1° 허용 안
+    transition = pose_library.plan_from(start, 'standby')
+    assert transition.start is None
+    np.testing.assert_allclose(transition.angles[0], start, atol=1e-9)
+    np.testing.assert_allclose(transition.angles[-1], pose_library.get('standby').angles, atol=1e-9)
@@ -0,0 +1,69 @@
+"""실시간 제어 루프: 전송 오류 보고 / 루프가 멈춘 뒤 post() 실패"""
+
+import pytest
+
+import rt_control
+
+FRAME = {0: (0, 300), 1: (0, 310)}
+
+
+@pytest.fixture
+def rt():
+    controllers = []
+
+    def start(isolated=False):
+        controller = rt_control.RtController(simulate=True, isolated=isolated, ring_size=8)
+        controllers.append(controller)
+        assert controller.start()
+        return controller
+
+    yield start
+    for controller in controllers:
+        controller.close()
+
+
+def test_non_oserror_is_reported_and_loop_continues(rt, monkeypatch):
+    write = rt_control._ControlLoop._write
+    calls = {'n': 0}
+
+    def flaky_write(self, slot):
+        calls['n'] += 1
+        if calls['n'] == 1:
+            raise ValueError("잘못된 레지스터")
+        write(self, slot)
+
+    monkeypatch.setattr(rt_control._ControlLoop, '_write', flaky_write)
+    controller = rt()
+    controller.post(FRAME)
+    controller.post(FRAME)
+    assert controller.flush()
+
+    s = controller.stats()
+    assert s['errors'] == 1
+    assert s['frames'] == 2
+    assert s['alive']
+    assert 'ValueError' in s['last_error']
+
+
+def test_post_fails_after_loop_stops(rt, monkeypatch):
+    def broken_send(self, slot):
+        raise RuntimeError("드라이버 버그")
+
+    monkeypatch.setattr(rt_control._ControlLoop, '_send', broken_send)
+    controller = rt()
+    controller.post(FRAME)
+    controller._thread.join(timeout=2.0)
+
+    s = controller.stats()
+    assert not s['alive']
+    assert s['faults'] == 1
+    with pytest.raises(OSError, match="RuntimeError"):
+        controller.post(FRAME)
+
+
+def test_post_fails_after_process_exits(rt):
+    controller = rt(isolated=True)
+    controller._process.terminate()
+    controller._process.join(timeout=5.0)
+    with pytest.raises(OSError):
+        controller.post(FRAME)
@@ -0,0 +1,52 @@
+"""서보 대기 전원: 대기 시간 확인과 끄기가 activity()와 경합하지 않아야 함"""
+
+import threading
+
+import pytest
+
+import config
+import servo_power
+
+
+@pytest.fixture
+def power(monkeypatch):
+    # 감시 스레드 없이 power_down_if_idle()을 직접 호출
+    monkeypatch.setattr(config, 'SERVO_IDLE_TIMEOUT', 0.0)
+    frames = []
+    manager = servo_power.ServoPower(frames.append, lambda: {}, lambda: True)
+    monkeypatch.setattr(config, 'SERVO_IDLE_TIMEOUT', 60.0)
+    return manager, frames
+
+
+def test_recent_activity_keeps_servos_on(power):
+    manager, frames = power
+    manager.activity()
+    assert not manager.power_down_if_idle()
+    assert frames == [] and not manager.asleep
+
+
+def test_idle_servos_power_down(power, monkeypatch):
+    manager, frames = power
+    monkeypatch.setattr(config, 'SERVO_IDLE_TIMEOUT', 1e-9)
+    assert manager.power_down_if_idle()
+    assert manager.asleep and len(frames) == 1
+
+
+def test_activity_waits_for_idle_check(power, monkeypatch):
+    manager, frames = power
+    monkeypatch.setattr(config, 'SERVO_IDLE_TIMEOUT', 1e-9)
+    done = threading.Event()
+    started = []
+
+    def self_supporting():
+        # 끄는 도중 들어온 동작 알림은 끄기가 끝날 때까지 기다려야 함
+        thread = threading.Thread(target=lambda: (manager.activity(), done.set()))
+        thread.start()
+        started.append(thread)
+        assert not done.wait(0.05)
+        return True
+
+    manager._self_supporting = self_supporting
+    assert manager.power_down_if_idle()
+    started[0].join(1.0)
+    assert done.is_set()
@@ -0,0 +1,32 @@
+"""텔레메트리: 설정을 다시 불러온 뒤의 캘리브레이션으로 발 좌표 계산"""
+
+import socket
+
+import numpy as np
+
+import config
+import kinematics
+import telemetry
+
+
+def test_feet_follow_reloaded_calibration(monkeypatch):
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    receiver.settimeout(1.0)
+    sender = telemetry.TelemetrySender('127.0.0.1', receiver.getsockname()[1])
+    try:
+        channel = config.CHANNELS['front_right'][1]
+        sender.publish({channel: 60.0})
+        before = telemetry.decode(receiver.recv(1024))['feet']
+
+        # 설정 다시 불러오기 (config 값 교체)와 같은 효과
+        monkeypatch.setattr(config, 'SERVO_CALIBRATION_OFFSET', {'front_right': [0.0, 10.0, 0.0]})
+        sender.publish({})
+        after = telemetry.decode(receiver.recv(1024))['feet']
+    finally:
+        sender.sock.close()
+        receiver.close()
+
+    expected = kinematics.forward_kinematics(kinematics.channel_to_joint(sender.angles))
+    np.testing.assert_allclose(after, expected, atol=1e-4)
+    assert not np.allclose(before[0], after[0])
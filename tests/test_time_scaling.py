@@ -0,0 +1,36 @@
+"""시간 최적 보행: 제어 주기 샘플이 관절 속도 / 가속도 제한을 지켜야 함"""
+
+import numpy as np
+import pytest
+
+import config
+import time_scaling
+import trajectory
+
+
+def _peaks(timing):
+    q = timing.angles.reshape(len(timing.times), -1)
+    dt = np.diff(timing.times)
+    velocity = np.diff(q, axis=0) / dt[:, np.newaxis]
+    acceleration = np.diff(velocity, axis=0) / ((dt[1:] + dt[:-1]) / 2)[:, np.newaxis]
+    return np.abs(velocity).max(), np.abs(acceleration).max()
+
+
+@pytest.mark.parametrize('cycles', [1, 3])
+@pytest.mark.parametrize('gait_name', list(trajectory.GAITS))
+def test_gait_timing_respects_joint_limits(gait_name, cycles):
+    time_scaling.clear_cache()
+    timing = time_scaling.gait_timing(gait_name, cycles)
+    velocity, acceleration = _peaks(timing)
+    assert velocity <= config.TIME_SCALING_MAX_JOINT_SPEED * (1 + 1e-9)
+    assert acceleration <= config.TIME_SCALING_MAX_JOINT_ACCEL * (1 + 1e-9)
+    assert np.all(np.diff(timing.progress) >= 0)
+    assert timing.progress[0] == 0.0 and timing.progress[-1] == pytest.approx(1.0)
+
+
+def test_tighter_limits_are_respected():
+    timing = time_scaling.gait_timing('walk_forward', 2, max_velocity=150.0,
+                                      max_acceleration=3000.0)
+    velocity, acceleration = _peaks(timing)
+    assert velocity <= 150.0 * (1 + 1e-9)
+    assert acceleration <= 3000.0 * (1 + 1e-9)
@@ -0,0 +1,28 @@
+"""워치독: 동작 호출 사이 대기 시간에 개입하지 않아야 함"""
+
+import time
+
+import pytest
+
+import config
+import emergency_stop
+import watchdog
+
+STANDBY = (config.STANDBY_X, config.STANDBY_Y, config.STANDBY_Z)
+
+
+@pytest.mark.parametrize('call', [
+    lambda c: c.set_leg_angles('front_right', [90, 45, 135]),
+    lambda c: c.set_all_legs_angles({leg: [90, 90, 90] for leg in config.LEG_NAMES}),
+    lambda c: c.set_leg_position_xyz('front_right', *STANDBY, duration=0.05, steps=3),
+    lambda c: c.set_all_legs_position_xyz({leg: STANDBY for leg in config.LEG_NAMES},
+                                          duration=0.05, steps=3),
+    lambda c: c.stand_up(),
+], ids=['set_leg_angles', 'set_all_legs_angles', 'set_leg_position_xyz',
+        'set_all_legs_position_xyz', 'stand_up'])
+def test_idle_after_direct_call_does_not_trigger(controller, call):
+    controller.init_watchdog()
+    call(controller)
+    assert not watchdog.armed()
+    time.sleep(config.WATCHDOG_TIMEOUT * 5)
+    assert not emergency_stop.triggered(), emergency_stop.trigger_source
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 시간 최적 경로 매개변수화 (관절 속도 / 가속도 제한 보행 타이밍)
+
+다리별 발 경로(모양)는 그대로 두고, IK 후 모든 관절이 속도 / 가속도 제한
+(선택: ZMP 안정 여유) 안에 있도록 하는 가장 빠른 시간 배분을 계산합니다.
+
+경로 진행도 s (0~1)에서 관절 각도 q(s)의 미분을 q', q''라 하면
+    관절 속도     q' ṡ
+    관절 가속도   q' s̈ + q'' ṡ²
+이므로 x = ṡ², u = s̈로 두면 모든 제약이 (u, x)에 대한 선형 부등식이 됩니다.
+경로 샘플마다 도달 가능한 x의 최댓값을 뒤에서부터 한 번 (끝에서 정지),
+앞에서부터 한 번 (처음에 정지, 가장 큰 가속) 훑어 각 샘플의 속도를 정합니다.
+제약 계산은 전체 경로를 배열로 한 번에 하고, 두 번의 훑기만 샘플 단위로 돕니다.
+
+키프레임 보행 (trajectory.GAITS)은 step_duration에 비례해 시간이 늘어나므로
+같은 제약으로 "키프레임 비율을 그대로 둔 최소 step_duration"도 함께 구합니다.
+
+사용법:
+    python time_scaling.py                    # 보행별 최소 step_duration / 시간 최적 스텝 시간
+    python time_scaling.py walk_forward --margin 0.5
+"""
+
+import argparse
+import collections
+import functools
+import sys
+
+import numpy as np
+import config
+import kinematics
+import stability
+import trajectory
+
+# 중력 가속도 (cm/s²)
+GRAVITY = 981.0
+
+# 경로 진행 속도 상한 (경로 전체를 이 시간보다 빨리 지나지 않음, 제약이 없는 구간용)
+_MIN_PATH_TIME = 1e-3
+
+# 리샘플 결과가 제한을 넘을 때 전체를 늦추는 최대 횟수 (한 번에 넘은 비율만큼 늦춤)
+_MAX_SLOWDOWNS = 10
+
+TimedPath = collections.namedtuple(
+    'TimedPath', ['times', 'positions', 'angles', 'progress', 'duration', 'path_times',
+                  'uniform_duration', 'unstable'])
+TimedPath.__doc__ = """
+시간 최적 경로
+
+    times: (M,) 제어 주기 샘플 시각 (초, 0부터)
+    positions, angles: (M, 4, 3) 샘플 발 좌표 / 관절 각도
+    progress: (M,) 샘플의 경로 진행도 (0~1)
+    duration: 시간 최적 전체 시간 (초)
+    path_times: (N,) 입력 경로 샘플별 도달 시각
+    uniform_duration: 경로 속도를 일정 비율로만 바꿀 때 (원래 시간 배분 유지) 최소 시간
+    unstable: (N,) 시간 배분으로 고칠 수 없어 안정 여유 제약을 뺀 샘플
+              (접지 발 2개 이하이거나 정지 상태에서도 여유가 부족함, 여유 제약을 쓸 때만)
+"""
+
+GaitTiming = collections.namedtuple(
+    'GaitTiming', ['name', 'times', 'positions', 'angles', 'progress', 'step_duration',
+                   'step_time', 'unstable'])
+GaitTiming.__doc__ = """
+보행 속도 한계
+
+    times, positions, angles, progress: 시간 최적 궤적 (TimedPath와 같음, 읽기 전용)
+    step_duration: 키프레임 비율을 유지할 때 최소 step_duration 파라미터 (GAITS에 그대로 전달)
+    step_time: 시간 최적 배분으로 스텝 하나에 걸리는 시간 (초)
+    unstable: 안정 여유 제약을 적용하지 못한 경로 샘플 비율 (0~1)
+"""
+
+
+# ============================================================================
+# 제약
+# ============================================================================
+
+def _constraints(angles, positions, progress, max_velocity, max_acceleration, min_margin):
+    """
+    경로 샘플별 선형 제약 a·u + b·x ≤ c 와 속도 제약 x ≤ x_limit
+
+    Returns:
+        (a, b, c, x_limit, unstable): (N, K) 세 개, (N,), (N,) bool
+    """
+    count = len(progress)
+    q = angles.reshape(count, -1)
+    dq = np.gradient(q, progress, axis=0)
+    ddq = np.gradient(dq, progress, axis=0)
+
+    # 관절 속도 |q'| ṡ ≤ V
+    with np.errstate(divide='ignore'):
+        x_limit = np.min((max_velocity / np.abs(dq))**2, axis=1)
+    x_limit = np.minimum(x_limit, 1.0 / _MIN_PATH_TIME**2)
+
+    # 관절 가속도 |q' u + q'' x| ≤ A
+    a = [dq, -dq]
+    b = [ddq, -ddq]
+    c = [np.full_like(dq, max_acceleration)] * 2
+    unstable = np.zeros(count, dtype=bool)
+
+    if min_margin is not None:
+        # ZMP = COM - (h / g)·COM 가속도, 지지 다각형 각 변에서 여유 이상 안쪽
+        # 접지 발은 미끄러지지 않으므로 몸체의 실제 가속도는 접지 발 (몸체 기준) 가속도의 반대
+        contacts = stability.infer_contacts(positions)
+        distance, normal, com = stability.edge_distances(positions, contacts)
+        weight = contacts / contacts.sum(axis=1, keepdims=True)
+        com_d1 = np.gradient(com[:, :2], progress, axis=0)
+        com_d2 = np.gradient(com_d1, progress, axis=0)
+        foot_d1 = np.gradient(positions[..., :2], progress, axis=0)
+        foot_d2 = np.gradient(foot_d1, progress, axis=0)
+        d1 = com_d1 - (foot_d1 * weight[..., np.newaxis]).sum(axis=1)
+        d2 = com_d2 - (foot_d2 * weight[..., np.newaxis]).sum(axis=1)
+        height = -(positions[..., 2] * weight).sum(axis=1) / GRAVITY
+
+        slack = distance - min_margin
+        edges = np.isfinite(distance) & (normal != 0).any(axis=-1)
+        unstable = (contacts.sum(axis=1) < 3) | (edges & (slack < 0)).any(axis=1)
+        active = edges & ~unstable[:, np.newaxis]
+        scale = np.where(active, height[:, np.newaxis], 0.0)
+        a.append(scale * (normal * d1[:, np.newaxis]).sum(axis=-1))
+        b.append(scale * (normal * d2[:, np.newaxis]).sum(axis=-1))
+        c.append(np.where(active, slack, 1.0))
+
+    return (np.concatenate(a, axis=1), np.concatenate(b, axis=1), np.concatenate(c, axis=1),
+            x_limit, unstable)
+
+
+def _bounds(a, b, c, x_limit):
+    """
+    제약을 s̈ 한계 직선으로 정리
+
+    a > 0 인 제약은 u ≤ r + m·x (위 한계), a < 0 은 u ≥ r + m·x (아래 한계),
+    a ≈ 0 은 x 상한이 됩니다. 위 / 아래 한계가 만나는 x도 상한 (x_max)에 넣습니다.
+
+    Returns:
+        (r, m, upper, lower, x_max): (N, K) 직선 / 마스크, (N,) x 상한
+    """
+    scale = np.maximum(np.abs(a).max(axis=1, keepdims=True), 1e-12)
+    upper = a > 1e-9 * scale
+    lower = a < -1e-9 * scale
+    safe = np.where(upper | lower, a, 1.0)
+    r = c / safe
+    m = -b / safe
+
+    x_max = x_limit.copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        flat = ~(upper | lower) & (b > 0)
+        x_max = np.minimum(x_max, np.where(flat, c / np.where(flat, b, 1.0), np.inf).min(axis=1))
+        # 아래 한계 j ≤ 위 한계 k: (m_j - m_k)·x ≤ r_k - r_j
+        gap = m[:, :, np.newaxis] - m[:, np.newaxis, :]
+        room = r[:, np.newaxis, :] - r[:, :, np.newaxis]
+        pair = lower[:, :, np.newaxis] & upper[:, np.newaxis, :] & (gap > 0)
+        x_max = np.minimum(x_max, np.where(pair, room / np.where(pair, gap, 1.0),
+                                           np.inf).min(axis=(1, 2)))
+    return r, m, upper, lower, np.maximum(x_max, 0.0)
+
+
+def _solve(a, b, c, x_limit, step):
+    """
+    샘플별 가장 큰 경로 속도 제곱 x = ṡ² (양 끝 정지)
+
+    Args:
+        step: 경로 샘플 간격 Δs
+
+    Returns:
+        np.ndarray: (N,) x
+    """
+    r, m, upper, lower, x_max = _bounds(a, b, c, x_limit)
+    count = len(x_max)
+    two = 2.0 * step
+
+    # 뒤에서부터: 가장 큰 감속으로 다음 샘플의 도달 가능 범위 [0, reach[i+1]]에 들어가는 최대 x
+    # x + 2Δs·u_lo(x) ≤ X 와 x + 2Δs·u_hi(x) ≥ 0 을 직선별로 풀어 상한을 구함
+    reach = np.zeros(count)
+    lo_coef = np.where(lower, 1.0 + two * m, 0.0)
+    hi_coef = np.where(upper, 1.0 + two * m, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hi_bound = np.where(hi_coef < 0, -two * r / hi_coef, np.inf).min(axis=1)
+    cap = np.minimum(x_max, hi_bound)
+    for i in range(count - 2, -1, -1):
+        coef = lo_coef[i]
+        bound = (reach[i + 1] - two * r[i]) / np.where(coef > 0, coef, 1.0)
+        reach[i] = min(cap[i], np.where(coef > 0, bound, np.inf).min())
+    reach = np.maximum(reach, 0.0)
+
+    # 앞에서부터: 다음 샘플 도달 범위 안에서 가장 큰 가속
+    x = np.zeros(count)
+    r_up = np.where(upper, r, np.inf)
+    m_up = np.where(upper, m, 0.0)
+    for i in range(count - 1):
+        u = (r_up[i] + m_up[i] * x[i]).min()
+        x[i + 1] = max(min(x[i] + two * u, reach[i + 1]), 0.0)
+    return x
+
+
+def _uniform_duration(a, b, c, x_limit):
+    """
+    원래 시간 배분을 유지할 때 (s = t / T, ṡ = 1 / T, s̈ = 0) 최소 전체 시간
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accel = np.where(b > 0, c / np.where(b > 0, b, 1.0), np.inf).min()
+    return float(1.0 / np.sqrt(min(x_limit.min(), accel)))
+
+
+# ============================================================================
+# 매개변수화
+# ============================================================================
+
+def _lerp(values, progress, at):
+    """경로 샘플 (N, ...)을 진행도 at (M,)에서 선형 보간"""
+    index = np.clip(np.searchsorted(progress, at, side='right') - 1, 0, len(progress) - 2)
+    w = (at - progress[index]) / (progress[index + 1] - progress[index])
+    w = w.reshape((-1,) + (1,) * (values.ndim - 1))
+    return values[index] * (1 - w) + values[index + 1] * w
+
+
+def _overshoot(angles, times, max_velocity, max_acceleration):
+    """
+    제어 주기 샘플의 관절 속도 / 가속도가 제한을 넘는 비율 (1 이하면 제한 안)
+
+    전체 시간을 f배 늘리면 속도는 1/f, 가속도는 1/f²배가 되므로 넘은 비율을 f로 돌려줍니다.
+    """
+    if len(times) < 3:
+        return 0.0
+    q = angles.reshape(len(times), -1)
+    dt = np.diff(times)
+    velocity = np.diff(q, axis=0) / dt[:, np.newaxis]
+    acceleration = np.diff(velocity, axis=0) / ((dt[1:] + dt[:-1]) / 2)[:, np.newaxis]
+    return max(np.abs(velocity).max() / max_velocity,
+               np.sqrt(np.abs(acceleration).max() / max_acceleration))
+
+
+def parameterize(positions, progress=None, max_velocity=None, max_acceleration=None,
+                 min_margin=None, rate=None):
+    """
+    발 경로를 관절 속도 / 가속도 제한 안에서 가장 빠르게 지나는 시간 배분
+
+    Args:
+        positions: (N, 4, 3) 발 경로 샘플 (config.LEG_NAMES 순서, 촘촘할수록 정확)
+        progress: (N,) 샘플별 경로 진행도 (단조 증가), None이면 균등
+        max_velocity: 관절 속도 제한 (도/초), None이면 config.TIME_SCALING_MAX_JOINT_SPEED
+        max_acceleration: 관절 가속도 제한 (도/초²), None이면 config.TIME_SCALING_MAX_JOINT_ACCEL
+        min_margin: ZMP 안정 여유 (cm), None이면 config.TIME_SCALING_MIN_MARGIN (None이면 사용 안 함)
+        rate: 출력 샘플링 주기 (Hz), None이면 config.CONTROL_RATE
+
+    Returns:
+        TimedPath (제어 주기 샘플도 속도 / 가속도 제한 안 - 경로 샘플 사이 보간으로 넘으면
+        전체를 같은 비율로 늦춤)
+
+    Raises:
+        ValueError: 도달 불가능한 좌표가 있을 때
+    """
+    if max_velocity is None:
+        max_velocity = config.TIME_SCALING_MAX_JOINT_SPEED
+    if max_acceleration is None:
+        max_acceleration = config.TIME_SCALING_MAX_JOINT_ACCEL
+    if min_margin is None:
+        min_margin = config.TIME_SCALING_MIN_MARGIN
+
+    positions = np.asarray(positions, dtype=float)
+    if progress is None:
+        progress = np.linspace(0.0, 1.0, len(positions))
+    progress = np.asarray(progress, dtype=float)
+    if len(positions) < 3 or np.any(np.diff(progress) <= 0):
+        raise ValueError("경로 샘플은 3개 이상, 진행도는 단조 증가해야 합니다")
+
+    angles, reachable = kinematics.inverse_kinematics(positions)
+    if not reachable.all():
+        raise ValueError("경로에 도달 불가능한 좌표가 있습니다")
+
+    a, b, c, x_limit, unstable = _constraints(angles, positions, progress, max_velocity,
+                                              max_acceleration, min_margin)
+    # 진행도 간격이 균등하지 않으면 평균 간격으로 풀고 시간은 실제 간격으로 계산
+    x = _solve(a, b, c, x_limit, (progress[-1] - progress[0]) / (len(progress) - 1))
+    speed = np.sqrt(x)
+    ds = np.diff(progress)
+    dt = 2.0 * ds / np.maximum(speed[:-1] + speed[1:], 1e-12)
+    path_times = np.concatenate([[0.0], np.cumsum(dt)])
+
+    # 경로 샘플 사이 (꺾이는 곳의 보간 / 제어 주기 이산화)에서 제한을 넘으면 전체를 늦춤
+    for _ in range(_MAX_SLOWDOWNS):
+        times = trajectory.sample_times(path_times[-1], rate)
+        at = np.interp(times, path_times, progress)
+        sampled = _lerp(angles, progress, at)
+        factor = _overshoot(sampled, times, max_velocity, max_acceleration)
+        if factor <= 1.0:
+            break
+        path_times = path_times * factor * 1.001
+    duration = float(path_times[-1])
+
+    return TimedPath(times=times, positions=_lerp(positions, progress, at),
+                     angles=sampled, progress=at, duration=duration,
+                     path_times=path_times,
+                     uniform_duration=_uniform_duration(a, b, c, x_limit)
+                     * (progress[-1] - progress[0]),
+                     unstable=unstable)
+
+
+# ============================================================================
+# 키프레임 보행
+# ============================================================================
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+@functools.lru_cache(maxsize=32)
+def _gait_timing_cached(gait_name, cycles, rate, kind, params_items, limits):
+    params = dict(params_items)
+    max_velocity, max_acceleration, min_margin = limits
+    times, keyframes = trajectory.gait_keyframes(gait_name, cycles, **params)
+    spline = trajectory.KeyframeSpline(times, keyframes, kind=kind)
+
+    # 원래 시간 비례 진행도 (일정 비율로 늘이면 step_duration을 바꾼 것과 같음)
+    # 키프레임이 많은 보행 (crawl)은 꺾이는 곳이 많으므로 키프레임 구간마다 같은 샘플 수
+    progress = np.linspace(0.0, 1.0, config.TIME_SCALING_PATH_SAMPLES * (len(times) - 1) + 1)
+    path = parameterize(spline(progress * spline.duration), progress, max_velocity,
+                        max_acceleration, min_margin, rate)
+    scale = path.uniform_duration / spline.duration
+    return GaitTiming(
+        name=gait_name,
+        times=_read_only(path.times),
+        positions=_read_only(path.positions),
+        angles=_read_only(path.angles),
+        progress=_read_only(path.progress),
+        step_duration=params['step_duration'] * scale,
+        step_time=path.duration / cycles,
+        unstable=float(path.unstable.mean()),
+    )
+
+
+def gait_timing(gait_name, cycles=1, rate=None, max_velocity=None, max_acceleration=None,
+                min_margin=None, **params):
+    """
+    키프레임 보행의 속도 한계 (결과는 캐시됨)
+
+    Args:
+        gait_name: trajectory.GAITS의 보행 이름
+        cycles: 스텝 수
+        rate: 출력 샘플링 주기 (Hz), None이면 config.CONTROL_RATE
+        max_velocity, max_acceleration, min_margin: 제약, None이면 config.TIME_SCALING_* 값
+        **params: 보행 파라미터 (발 경로 모양, step_duration은 키프레임 비율 기준으로만 사용)
+
+    Returns:
+        GaitTiming
+
+    Raises:
+        ValueError: 알 수 없는 보행 / 파라미터, 도달 불가능한 경로
+    """
+    if max_velocity is None:
+        max_velocity = config.TIME_SCALING_MAX_JOINT_SPEED
+    if max_acceleration is None:
+        max_acceleration = config.TIME_SCALING_MAX_JOINT_ACCEL
+    if min_margin is None:
+        min_margin = config.TIME_SCALING_MIN_MARGIN
+    key = trajectory.gait_cache_key(gait_name, cycles, rate, **params)
+    return _gait_timing_cached(*key, limits=(float(max_velocity), float(max_acceleration),
+                                             min_margin))
+
+
+def minimum_step_duration(gait_name, **params):
+    """키프레임 비율을 유지할 때 제한을 지키는 최소 step_duration (gait_timing 참고)"""
+    return gait_timing(gait_name, **params).step_duration
+
+
+# 보행 타이밍 캐시가 의존하는 설정 (config_loader 패턴, 바뀌면 clear_cache)
+CONFIG_DEPENDENCIES = trajectory.CONFIG_DEPENDENCIES + (
+    'TIME_SCALING_*', 'STABILITY_CONTACT_THRESHOLD', 'BODY_*', 'COM_OFFSET_*', '*_MASS')
+
+
+def clear_cache():
+    """보행 타이밍 캐시 비우기 (설정 변경 후 호출)"""
+    _gait_timing_cached.cache_clear()
+
+
+# ============================================================================
+# 보고
+# ============================================================================
+
+def report(gait_names=None, min_margin=None):
+    """보행별 속도 한계 출력"""
+    print(f"관절 제한: {config.TIME_SCALING_MAX_JOINT_SPEED:.0f}°/s, "
+          f"{config.TIME_SCALING_MAX_JOINT_ACCEL:.0f}°/s²"
+          + (f", ZMP 여유 {min_margin}cm" if min_margin is not None else ""))
+    for name in gait_names or trajectory.GAITS:
+        current = trajectory.gait_params(name)['step_duration']
+        try:
+            timing = gait_timing(name, min_margin=min_margin)
+        except ValueError as e:
+            print(f"✗ {name}: {e}")
+            continue
+        # 키프레임 스텝 시간은 step_duration에 비례
+        step_time = trajectory.gait_keyframes(name)[0][-1] / current * timing.step_duration
+        mark = "✓" if current >= timing.step_duration else "⚠"
+        line = (f"{mark} {name}: step_duration {current:.3f} → 최소 {timing.step_duration:.3f} "
+                f"(스텝 {step_time:.3f}초), 시간 최적 스텝 {timing.step_time:.3f}초")
+        if min_margin is not None and timing.unstable > 0:
+            line += f" (여유 제약 불가 구간 {timing.unstable:.0%})"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="보행 속도 한계 (시간 최적 경로 매개변수화)")
+    parser.add_argument('gaits', nargs='*', help="보행 이름 (기본: trajectory.GAITS 전체)")
+    parser.add_argument('--margin', type=float, default=None,
+                        help="ZMP 안정 여유 (cm, 기본: config.TIME_SCALING_MIN_MARGIN)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.gaits if name not in trajectory.GAITS]
+    if unknown:
+        print(f"✗ 알 수 없는 보행: {', '.join(unknown)} (사용 가능: {', '.join(trajectory.GAITS)})")
+        return 2
+    margin = args.margin if args.margin is not None else config.TIME_SCALING_MIN_MARGIN
+    report(args.gaits, margin)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
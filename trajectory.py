@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 스플라인 발 궤적
+
+기존 보행 함수(walk_forward, strafe_*, rotate_body_*)의 키프레임
+(STANDBY → PUSH → LIFT → STANDBY ...)을 데이터로 정의하고,
+각 다리의 키프레임 시퀀스를 속도가 연속인 스플라인으로 연결합니다.
+
+- 'cubic':   3차 Hermite (단조 접선, 오버슈트 없음, 속도 연속)
+- 'quintic': 5차 Hermite (같은 접선 + 키프레임에서 가속도 0, 가속도 연속)
+
+제어 주기(config.CONTROL_RATE)로 촘촘하게 샘플링한 좌표/각도 배열은
+보행 종류와 파라미터별로 캐시됩니다.
+"""
+
+import collections
+import functools
+
+import numpy as np
+import config
+import kinematics
+import stability
+
+# ============================================================================
+# 보행 키프레임 정의
+# ============================================================================
+
+def _coord(dx=0.0, dy=0.0, dz=0.0):
+    """STANDBY 기준 좌표"""
+    return (config.STANDBY_X + dx, config.STANDBY_Y + dy, config.STANDBY_Z + dz)
+
+
+def _frame(front_right=None, rear_right=None, front_left=None, rear_left=None):
+    """다리별 좌표 → (4, 3) 배열 (지정하지 않은 다리는 STANDBY)"""
+    legs = {
+        'front_right': front_right,
+        'rear_right': rear_right,
+        'front_left': front_left,
+        'rear_left': rear_left,
+    }
+    return [legs[leg] if legs[leg] is not None else _coord() for leg in config.LEG_NAMES]
+
+
+def _walk_forward_keyframes(step_duration):
+    """walk_forward()의 한 스텝 (대각선 쌍 트로트)"""
+    push = config.WALK_PUSH_COORD
+    lift = config.WALK_LIFT_COORD
+    push_time = step_duration * 0.3
+    lift_time = step_duration * 0.3
+    land_time = step_duration * 0.4
+
+    return [
+        # Phase 1: 오른쪽 앞 + 왼쪽 뒤
+        (push_time, _frame(front_right=push, rear_left=push)),
+        (lift_time, _frame(front_right=push, rear_right=lift, front_left=lift, rear_left=push)),
+        (land_time, _frame()),
+        # Phase 2: 왼쪽 앞 + 오른쪽 뒤
+        (push_time * 0.5, _frame(rear_right=push, front_left=push)),
+        (lift_time * 0.5, _frame(front_right=lift, rear_right=push, front_left=push, rear_left=lift)),
+        (land_time, _frame()),
+    ]
+
+
+def _strafe_keyframes(step_duration, turn_angle_offset):
+    """strafe_left()/strafe_right()의 한 스텝 (오른쪽 이동은 음수 오프셋)"""
+    h = config.TURN_LIFT_HEIGHT
+    off = turn_angle_offset
+    lift_time = step_duration * 0.3
+    rotate_time = step_duration * 0.4
+    land_time = step_duration * 0.3
+
+    return [
+        # 첫 번째 쌍: 오른쪽 앞 + 왼쪽 뒤
+        (lift_time, _frame(front_right=_coord(dz=h), rear_left=_coord(dz=h))),
+        (rotate_time, _frame(front_right=_coord(dy=off, dz=h), rear_left=_coord(dy=off, dz=h))),
+        (land_time, _frame(front_right=_coord(dy=off), rear_left=_coord(dy=off))),
+        # 두 번째 쌍: 왼쪽 앞 + 오른쪽 뒤
+        (lift_time, _frame(front_right=_coord(dy=off), rear_right=_coord(dz=h),
+                           front_left=_coord(dz=h), rear_left=_coord(dy=off))),
+        (rotate_time, _frame(front_right=_coord(dy=off), rear_right=_coord(dy=off, dz=h),
+                             front_left=_coord(dy=off, dz=h), rear_left=_coord(dy=off))),
+        (land_time, _frame()),
+    ]
+
+
+def _rotate_body_left_keyframes(step_duration, rotate_offset):
+    """rotate_body_left()의 한 스텝"""
+    h = config.TURN_LIFT_HEIGHT
+    off = rotate_offset
+    lift_time = step_duration * 0.25
+    rotate_time = step_duration * 0.35
+    land_time = step_duration * 0.25
+    adjust_time = step_duration * 0.15
+
+    return [
+        (lift_time, _frame(front_right=_coord(dz=h), rear_left=_coord(dz=h))),
+        (rotate_time, _frame(front_right=_coord(dz=h), rear_right=_coord(dy=-off),
+                             front_left=_coord(dy=off), rear_left=_coord(dz=h))),
+        (land_time, _frame(rear_right=_coord(dy=-off), front_left=_coord(dy=off))),
+        (land_time, _frame()),
+        (lift_time, _frame(rear_right=_coord(dz=h), front_left=_coord(dz=h))),
+        (rotate_time, _frame(rear_right=_coord(dy=off, dz=h), front_left=_coord(dy=-off, dz=h))),
+        (rotate_time, _frame(rear_right=_coord(dy=off), front_left=_coord(dy=-off))),
+        (land_time + adjust_time, _frame()),
+    ]
+
+
+def _rotate_body_right_keyframes(step_duration, rotate_offset):
+    """rotate_body_right()의 한 스텝"""
+    h = config.TURN_LIFT_HEIGHT
+    off = rotate_offset
+    lift_time = step_duration * 0.25
+    rotate_time = step_duration * 0.35
+    land_time = step_duration * 0.25
+    adjust_time = step_duration * 0.15
+
+    return [
+        (lift_time, _frame(rear_right=_coord(dz=h), front_left=_coord(dz=h))),
+        (rotate_time, _frame(rear_right=_coord(dy=-off, dz=h), front_left=_coord(dy=off, dz=h))),
+        (land_time, _frame(rear_right=_coord(dy=-off), front_left=_coord(dy=off))),
+        (lift_time, _frame()),
+        (lift_time, _frame(front_right=_coord(dz=h), rear_left=_coord(dz=h))),
+        (rotate_time, _frame(front_right=_coord(dy=-off, dz=h), rear_left=_coord(dy=off, dz=h))),
+        (rotate_time, _frame(front_right=_coord(dy=-off), rear_left=_coord(dy=off))),
+        (land_time + adjust_time, _frame()),
+    ]
+
+
+def _triangle_halfplanes(vertices, margin):
+    """
+    삼각형 세 변에서 margin 이상 안쪽인 영역 (normals @ p >= offsets)
+
+    Returns:
+        (normals, offsets): 변별 안쪽 단위 법선 (3, 2), (3,)
+    """
+    # 반시계 순서로 맞춤 (변의 왼쪽이 안쪽)
+    a, b, c = vertices
+    if (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0]) < 0:
+        vertices = vertices[::-1]
+    edges = np.roll(vertices, -1, axis=0) - vertices
+    normals = np.stack([-edges[:, 1], edges[:, 0]], axis=1)
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals, (normals * vertices).sum(axis=1) + margin
+
+
+def _nearest_feasible(start, rows, bounds, weight, priority):
+    """
+    rows @ s >= bounds 를 만족하면서 start에서 가장 가까운 s (2차원, Y 거리는 weight배)
+
+    최적점은 start 자체, 제약 직선 하나 위의 투영점, 두 직선의 교점 중 하나이므로
+    후보를 모두 계산해 고릅니다. 만족하는 후보가 없으면 priority를 곱한 위반량이
+    가장 작은 후보를 씁니다.
+    """
+    scale = np.array([1.0, weight])
+    g = rows / scale                      # Y를 weight배 늘린 좌표계
+    z0 = start * scale
+    candidates = [z0]
+    for gi, hi in zip(g, bounds):
+        candidates.append(z0 + (hi - gi @ z0) / (gi @ gi) * gi)
+    for i in range(len(g)):
+        for j in range(i + 1, len(g)):
+            pair = g[[i, j]]
+            if abs(np.linalg.det(pair)) > 1e-9:
+                candidates.append(np.linalg.solve(pair, bounds[[i, j]]))
+    candidates = np.array(candidates)
+
+    violation = (np.maximum(bounds - candidates @ g.T, 0.0) * priority).max(axis=1)
+    cost = ((candidates - z0)**2).sum(axis=1)
+    best = np.lexsort((cost, np.round(violation, 9)))[0]
+    return candidates[best] / scale
+
+
+@functools.lru_cache(maxsize=8)
+def _foot_x_range(z, margin=0.5):
+    """
+    발 높이 z에서 모든 다리 관절이 각도 제한 안에 있는 발 X 범위 (Y = STANDBY_Y)
+
+    STANDBY_X에서 이어지는 구간만 (다리를 끝까지 뻗은 먼 자세는 제외),
+    STANDBY_X부터 제한을 넘으면 STANDBY_X 한 점
+    """
+    reach = config.UPPER_SEG_LENGTH + config.LOWER_SEG_LENGTH
+    x = np.arange(-reach, reach, 0.05)
+    *angles, reachable = kinematics.ik(x[:, np.newaxis], config.STANDBY_Y, z,
+                                       kinematics.IS_LEFT, kinematics.IS_REAR)
+    angles = np.stack(angles, axis=-1)
+    ok = (reachable & (angles >= config.ANGLE_MIN_LIMIT + margin).all(axis=-1)
+          & (angles <= config.ANGLE_MAX_LIMIT - margin).all(axis=-1)).all(axis=1)
+    center = int(np.argmin(np.abs(x - config.STANDBY_X)))
+    if not ok[center]:
+        return config.STANDBY_X, config.STANDBY_X
+    blocked = np.flatnonzero(~ok)
+    low = blocked[blocked < center]
+    high = blocked[blocked > center]
+    return (float(x[low[-1] + 1]) if len(low) else float(x[0]),
+            float(x[high[0] - 1]) if len(high) else float(x[-1]))
+
+
+def _crawl_keyframes(step_duration, stride):
+    """
+    크롤 보행 한 스텝 (한 번에 한 다리씩 스윙, 나머지 세 다리 지지)
+
+    몸체를 config.CRAWL_Z 높이로 옮긴 뒤 (다리를 더 펴서 발 X 범위를 넓힘)
+    다리마다: 몸체를 앞으로 stride / 4 진행하면서 무게중심을 나머지 세 발의
+    지지 삼각형 안쪽 (config.CRAWL_STABILITY_MARGIN)으로 옮긴 뒤, 다리를 들어
+    stride만큼 앞으로 옮겨 내려놓습니다. 네 다리가 모두 옮겨지면 몸체를 가운데로
+    되돌린 뒤 STANDBY로 돌아옵니다.
+
+    몸체 이동은 이전 위치에서 가장 적게 움직이는 곳으로 고르되, 옆 이동은
+    config.CRAWL_LATERAL_WEIGHT배 비싸게 보고 (발 Y 이동은 어깨 각도를 크게 바꿈),
+    모든 발이 관절 각도 제한 안에 있도록 (발 X 범위, 어깨 각도) 합니다. 그 안에서
+    여유를 다 만들 수 없으면 가능한 가장 큰 여유로 줄어듭니다
+    (stability.analyze_trajectory로 확인).
+    """
+    h = config.CRAWL_SWING_HEIGHT
+    dz = config.CRAWL_Z - config.STANDBY_Z
+    order = [config.LEG_NAMES.index(leg) for leg in config.CRAWL_LEG_ORDER]
+    phase = step_duration / len(order)
+    shift_time = phase * 0.35
+    lift_time = phase * 0.15
+    swing_time = phase * 0.35
+    land_time = phase * 0.15
+
+    # 몸체 이동 s만큼 발 (몸체 기준)은 -s, 무게중심은 다리 질량만큼 덜 움직임
+    hips = stability.hip_positions()[:, :2]
+    total_mass = config.BODY_MASS + 4 * config.LEG_MASS
+    follow = 1.0 - 2.0 * config.LEG_MASS / total_mass
+    # 스윙하는 동안 다리 질량이 옮겨져 생기는 무게중심 이동 (가운데 기준 절반씩 여유 추가)
+    swing_shift = abs(stride) * config.LEG_MASS / (2 * total_mass)
+    margin = config.CRAWL_STABILITY_MARGIN + swing_shift / 2
+    stance_low, stance_high = _foot_x_range(config.CRAWL_Z)
+    lift_low, lift_high = _foot_x_range(config.CRAWL_Z + h)
+    slope = np.tan(np.radians(config.CRAWL_MAX_SHOULDER_SWING))
+
+    def frame(dx, shift, lifted=None, lift=0.0):
+        legs = {}
+        for i, leg in enumerate(config.LEG_NAMES):
+            legs[leg] = _coord(dx=dx[i] - shift[0], dy=-shift[1], dz=dz + (lift if i == lifted else 0.0))
+        return _frame(**legs)
+
+    dx = np.zeros(4)
+    shift = np.zeros(2)
+    keyframes = [(shift_time, frame(dx, shift))]
+    for leg in order:
+        dx -= stride / len(order)
+        stance = [i for i in range(4) if i != leg]
+        feet = np.array(_frame(), dtype=float)
+        feet[:, 0] += dx
+        feet[:, 2] += dz
+        feet[leg, 0] += stride / 2            # 스윙 중간 위치 기준
+        com = stability.center_of_mass(feet)[:2]
+
+        # 무게중심 여유: normals @ (com + follow·s) >= offsets
+        normals, offsets = _triangle_halfplanes(hips[stance] + feet[stance, :2], margin)
+        rows = [follow * normals]
+        bounds = [offsets - normals @ com]
+        # 발 X 범위: 지지 발 STANDBY_X + dx - s_x, 스윙 발은 든 높이에서 시작 / 끝 위치
+        foot_x = config.STANDBY_X + dx
+        swing_x = foot_x[leg] + np.array([0.0, stride])
+        stance_x = foot_x[stance]
+        rows.append([[1.0, 0.0], [-1.0, 0.0]])
+        bounds.append([max(stance_x.max() - stance_high, swing_x.max() - lift_high),
+                       -min(stance_x.min() - stance_low, swing_x.min() - lift_low)])
+        # 어깨 회전 (atan2(y, |x|)) 제한: 발마다 |s_y| <= slope·(x - s_x), 발은 어깨 앞쪽
+        for x in np.concatenate([stance_x, swing_x]):
+            rows.append([[-slope, -1.0], [-slope, 1.0]])
+            bounds.append([-slope * x, -slope * x])
+        # 발 범위 / 어깨 각도 제한이 무게중심 여유보다 우선
+        priority = np.concatenate([np.ones(3), np.full(12, 100.0)])
+        shift = _nearest_feasible(shift, np.vstack(rows), np.concatenate(bounds),
+                                  config.CRAWL_LATERAL_WEIGHT, priority)
+
+        keyframes.append((shift_time, frame(dx, shift)))
+        keyframes.append((lift_time, frame(dx, shift, leg, h)))
+        dx[leg] += stride
+        keyframes.append((swing_time, frame(dx, shift, leg, h)))
+        keyframes.append((land_time, frame(dx, shift)))
+    keyframes.append((shift_time, frame(dx, np.zeros(2))))
+    keyframes.append((shift_time, _frame()))
+    return keyframes
+
+
+# 보행 이름 → (키프레임 생성 함수, 기본 파라미터)
+GAITS = {
+    'walk_forward': (_walk_forward_keyframes, {'step_duration': 0.3}),
+    'strafe_left': (_strafe_keyframes, {'step_duration': 0.4, 'turn_angle_offset': 0.2}),
+    'strafe_right': (lambda step_duration, turn_angle_offset:
+                     _strafe_keyframes(step_duration, -turn_angle_offset),
+                     {'step_duration': 0.4, 'turn_angle_offset': 0.2}),
+    'rotate_body_left': (_rotate_body_left_keyframes, {'step_duration': 0.4, 'rotate_offset': 0.2}),
+    'rotate_body_right': (_rotate_body_right_keyframes, {'step_duration': 0.4, 'rotate_offset': 0.2}),
+    'crawl': (_crawl_keyframes, {'step_duration': 4.8, 'stride': 2.0}),
+}
+
+
+def gait_params(gait_name, **params):
+    """기본 파라미터에 사용자 파라미터를 덮어쓴 딕셔너리"""
+    if gait_name not in GAITS:
+        raise ValueError(f"알 수 없는 보행 '{gait_name}' (사용 가능: {', '.join(GAITS)})")
+    _, defaults = GAITS[gait_name]
+    merged = dict(defaults)
+    for key, value in params.items():
+        if key not in defaults:
+            raise ValueError(f"'{gait_name}' 보행에 없는 파라미터: {key}")
+        if value is not None:
+            merged[key] = value
+    return merged
+
+
+def gait_keyframes(gait_name, cycles=1, **params):
+    """
+    보행 키프레임 (STANDBY에서 시작, 각 스텝이 STANDBY로 끝남)
+
+    Args:
+        gait_name: GAITS의 보행 이름
+        cycles: 반복할 스텝 수
+        **params: 보행 파라미터 (step_duration, turn_angle_offset 등)
+
+    Returns:
+        (times, positions):
+            times: (K,) 키프레임 도달 시각 (초), times[0] = 0
+            positions: (K, 4, 3) 발 좌표 (cm)
+    """
+    builder, _ = GAITS[gait_name]
+    step = builder(**gait_params(gait_name, **params))
+
+    times = [0.0]
+    positions = [_frame()]
+    for _ in range(cycles):
+        for duration, frame in step:
+            times.append(times[-1] + duration)
+            positions.append(frame)
+    return np.array(times), np.array(positions, dtype=float)
+
+
+# ============================================================================
+# 스플라인
+# ============================================================================
+
+def _hermite_tangents(times, values, periodic):
+    """단조 보존 접선 (Fritsch-Carlson), values: (K, M)"""
+    h = np.diff(times)
+    if np.any(h <= 0):
+        raise ValueError("키프레임 시각은 단조 증가해야 합니다")
+    delta = np.diff(values, axis=0) / h[:, np.newaxis]
+
+    def blend(d0, d1, h0, h1):
+        w1 = 2 * h1 + h0
+        w2 = h1 + 2 * h0
+        same_sign = d0 * d1 > 0
+        safe_d0 = np.where(same_sign, d0, 1.0)
+        safe_d1 = np.where(same_sign, d1, 1.0)
+        return np.where(same_sign, (w1 + w2) / (w1 / safe_d0 + w2 / safe_d1), 0.0)
+
+    tangents = np.zeros_like(values)
+    tangents[1:-1] = blend(delta[:-1], delta[1:], h[:-1, np.newaxis], h[1:, np.newaxis])
+    if periodic and len(h) > 1:
+        wrap = blend(delta[-1], delta[0], h[-1], h[0])
+        tangents[0] = wrap
+        tangents[-1] = wrap
+    return tangents
+
+
+class KeyframeSpline:
+    """
+    키프레임을 지나는 Hermite 스플라인 (여러 좌표를 한 번에 처리)
+
+    Args:
+        times: (K,) 키프레임 시각
+        values: (K, ...) 키프레임 값 (예: (K, 4, 3) 발 좌표)
+        kind: 'cubic' 또는 'quintic'
+        periodic: True면 마지막 키프레임과 첫 키프레임의 속도를 연결,
+                  False면 양 끝에서 속도 0 (정지 상태에서 시작/종료)
+    """
+
+    def __init__(self, times, values, kind='cubic', periodic=False):
+        if kind not in ('cubic', 'quintic'):
+            raise ValueError(f"지원하지 않는 스플라인 종류: {kind}")
+        values = np.asarray(values, dtype=float)
+        self.kind = kind
+        self.times = np.asarray(times, dtype=float)
+        self.value_shape = values.shape[1:]
+        self.values = values.reshape(len(self.times), -1)
+        self.tangents = _hermite_tangents(self.times, self.values, periodic)
+        self.duration = float(self.times[-1] - self.times[0])
+
+    def _locate(self, t):
+        t = np.clip(np.asarray(t, dtype=float), self.times[0], self.times[-1])
+        idx = np.searchsorted(self.times, t, side='right') - 1
+        idx = np.clip(idx, 0, len(self.times) - 2)
+        h = self.times[idx + 1] - self.times[idx]
+        s = (t - self.times[idx]) / h
+        return idx, h[:, np.newaxis], s[:, np.newaxis]
+
+    def __call__(self, t, derivative=0):
+        """
+        시각 배열에서 값(또는 1차 미분) 계산
+
+        Args:
+            t: (N,) 시각 배열
+            derivative: 0 = 위치, 1 = 속도
+
+        Returns:
+            np.ndarray: (N, ...) 값 배열
+        """
+        idx, h, s = self._locate(np.atleast_1d(t))
+        p0 = self.values[idx]
+        p1 = self.values[idx + 1]
+        m0 = self.tangents[idx] * h
+        m1 = self.tangents[idx + 1] * h
+
+        s2 = s * s
+        s3 = s2 * s
+        if self.kind == 'cubic':
+            if derivative == 0:
+                b = (2 * s3 - 3 * s2 + 1, s3 - 2 * s2 + s, -2 * s3 + 3 * s2, s3 - s2)
+            else:
+                b = (6 * s2 - 6 * s, 3 * s2 - 4 * s + 1, -6 * s2 + 6 * s, 3 * s2 - 2 * s)
+        else:
+            s4 = s3 * s
+            s5 = s4 * s
+            if derivative == 0:
+                b = (1 - 10 * s3 + 15 * s4 - 6 * s5,
+                     s - 6 * s3 + 8 * s4 - 3 * s5,
+                     10 * s3 - 15 * s4 + 6 * s5,
+                     -4 * s3 + 7 * s4 - 3 * s5)
+            else:
+                b = (-30 * s2 + 60 * s3 - 30 * s4,
+                     1 - 18 * s2 + 32 * s3 - 15 * s4,
+                     30 * s2 - 60 * s3 + 30 * s4,
+                     -12 * s2 + 28 * s3 - 15 * s4)
+
+        out = b[0] * p0 + b[1] * m0 + b[2] * p1 + b[3] * m1
+        if derivative == 1:
+            out = out / h
+        return out.reshape((-1,) + self.value_shape)
+
+
+def sample_times(duration, rate=None):
+    """제어 주기에 맞춘 샘플 시각 (0 ~ duration, 끝점 포함)"""
+    if rate is None:
+        rate = config.CONTROL_RATE
+    count = max(int(round(duration * rate)), 1)
+    return np.linspace(0.0, duration, count + 1)
+
+
+# ============================================================================
+# 컴파일된 보행 (캐시)
+# ============================================================================
+
+CompiledGait = collections.namedtuple(
+    'CompiledGait', ['name', 'times', 'positions', 'angles', 'reachable'])
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+# 시작 캐시에서 불러온 보행 {gait_cache_key(): CompiledGait}
+_preloaded = {}
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_gait_cached(gait_name, cycles, rate, kind, params_items):
+    times, positions = gait_keyframes(gait_name, cycles, **dict(params_items))
+    spline = KeyframeSpline(times, positions, kind=kind)
+
+    t = sample_times(spline.duration, rate)
+    sampled = spline(t)
+    angles, reachable = kinematics.inverse_kinematics(sampled)
+
+    return CompiledGait(
+        name=gait_name,
+        times=_read_only(t),
+        positions=_read_only(sampled),
+        angles=_read_only(angles),
+        reachable=bool(reachable.all()),
+    )
+
+
+def gait_cache_key(gait_name, cycles=1, rate=None, kind=None, **params):
+    """compile_gait() 결과를 구분하는 키 (시작 캐시 저장용)"""
+    if rate is None:
+        rate = config.CONTROL_RATE
+    if kind is None:
+        kind = config.TRAJECTORY_SPLINE
+    merged = gait_params(gait_name, **params)
+    return (gait_name, int(cycles), float(rate), kind, tuple(sorted(merged.items())))
+
+
+def preload(key, gait):
+    """미리 계산한 보행 등록 (startup_cache에서 불러온 배열)"""
+    _preloaded[key] = gait
+
+
+def compile_gait(gait_name, cycles=1, rate=None, kind=None, **params):
+    """
+    보행을 제어 주기로 샘플링한 좌표/각도 배열로 변환 (결과는 캐시됨)
+
+    Args:
+        gait_name: GAITS의 보행 이름
+        cycles: 스텝 수
+        rate: 샘플링 주기 (Hz), None이면 config.CONTROL_RATE
+        kind: 'cubic' 또는 'quintic', None이면 config.TRAJECTORY_SPLINE
+        **params: 보행 파라미터
+
+    Returns:
+        CompiledGait: times (N,), positions (N, 4, 3), angles (N, 4, 3), reachable
+        배열은 읽기 전용입니다.
+    """
+    key = gait_cache_key(gait_name, cycles, rate, kind, **params)
+    gait = _preloaded.get(key)
+    if gait is None:
+        gait = _compile_gait_cached(*key)
+    return gait
+
+
+# 컴파일된 보행 캐시가 의존하는 설정 (config_loader 패턴, 바뀌면 clear_cache)
+CONFIG_DEPENDENCIES = ('CONTROL_RATE', 'TRAJECTORY_SPLINE', 'STANDBY_*', 'WALK_*_COORD',
+                       'TURN_LIFT_HEIGHT', 'UPPER_SEG_LENGTH', 'LOWER_SEG_LENGTH',
+                       'IK_SHOULDER_OFFSET', 'CRAWL_*', 'BODY_*', 'COM_OFFSET_*', '*_MASS',
+                       'ANGLE_*_LIMIT')
+
+
+def clear_cache():
+    """컴파일된 보행 캐시 비우기 (설정 변경 후 호출)"""
+    _preloaded.clear()
+    _compile_gait_cached.cache_clear()
+    _foot_x_range.cache_clear()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Spot Micro Robot - 제어 루프 워치독
+
+파이썬 프로세스가 멈추면 (GC, I/O, I2C 응답 없음 등) 서보는 마지막 펄스를
+계속 유지합니다. 워치독 스레드는 제어 루프의 하트비트를 감시하다가
+예상 시각을 넘기면 등록된 처리 함수(비상 정지 / 출력 차단)를 호출합니다.
+
+- heartbeat(expected_gap): 제어 루프가 살아 있음을 알림.
+  다음 하트비트가 expected_gap + WATCHDOG_TIMEOUT 안에 와야 합니다.
+  (emergency_stop.sleep()과 프레임 전송 시 자동으로 호출됨)
+- disarm(): 사용자 입력 대기처럼 의도적으로 멈춘 구간에서 감시 해제.
+  다음 heartbeat()에서 다시 감시를 시작합니다.
+  (동작 함수가 끝날 때 / 궤적 계산 전에 컨트롤러가 호출함)
+- command_received(): 스트리밍 명령(원격 조종/비전)의 최신성 감시.
+  WATCHDOG_COMMAND_TIMEOUT 동안 새 명령이 없으면 처리 함수를 호출합니다.
+- add_check(check): 추가 상태 검사 (예: I2C 전송 스레드 멈춤).
+  문제가 있으면 이유 문자열을 반환하는 함수를 등록합니다.
+
+놓친 데드라인 수와 여유 시간(slack) 통계를 stats()로 확인해서
+제어 주기 여유를 조정할 수 있습니다.
+"""
+
+import threading
+import time
+
+import config
+
+_lock = threading.Lock()
+_thread = None
+_on_timeout = None
+
+_deadline = None          # 다음 하트비트 마감 시각 (None = 감시 안 함)
+_command_deadline = None  # 다음 명령 마감 시각 (None = 감시 안 함)
+_last_heartbeat = None
+_checks = []              # 추가 상태 검사 함수 목록
+_failing = set()          # 현재 실패 중인 검사 (한 번만 개입)
+
+_stats = {
+    'heartbeats': 0,
+    'missed_deadlines': 0,
+    'stale_commands': 0,
+    'failed_checks': 0,
+    'takeovers': 0,
+    'max_lateness': 0.0,     # 마감을 넘긴 최대 시간 (초)
+    'min_slack': None,       # 하트비트가 마감보다 일찍 온 최소 여유 (초)
+}
+
+
+def start(on_timeout, check_interval=None):
+    """
+    워치독 스레드 시작
+
+    Args:
+        on_timeout: 마감을 넘겼을 때 호출할 함수 (reason 문자열 인자, 워치독 스레드에서 실행)
+        check_interval: 검사 주기 (초), None이면 제어 주기의 1/4
+    """
+    global _thread, _on_timeout
+    _on_timeout = on_timeout
+    if _thread is not None:
+        return
+    if check_interval is None:
+        check_interval = 0.25 / config.CONTROL_RATE
+
+    _thread = threading.Thread(target=_run, args=(check_interval,), name='watchdog', daemon=True)
+    _thread.start()
+
+
+def heartbeat(expected_gap=0.0):
+    """
+    제어 루프 하트비트
+
+    Args:
+        expected_gap: 다음 하트비트까지 예상 시간 (예: 곧 sleep할 시간, 초)
+    """
+    global _deadline, _last_heartbeat
+    now = time.perf_counter()
+    with _lock:
+        if _deadline is not None:
+            slack = _deadline - now
+            if _stats['min_slack'] is None or slack < _stats['min_slack']:
+                _stats['min_slack'] = slack
+        _deadline = now + expected_gap + config.WATCHDOG_TIMEOUT
+        _last_heartbeat = now
+        _stats['heartbeats'] += 1
+
+
+def disarm():
+    """하트비트 감시 해제 (의도적인 대기 구간)"""
+    global _deadline
+    with _lock:
+        _deadline = None
+
+
+def armed():
+    """하트비트 감시 중인지 (마감 시각이 설정되어 있는지)"""
+    with _lock:
+        return _deadline is not None
+
+
+def command_received():
+    """스트리밍 명령 수신 알림 (WATCHDOG_COMMAND_TIMEOUT > 0일 때만 감시)"""
+    global _command_deadline
+    if config.WATCHDOG_COMMAND_TIMEOUT > 0:
+        with _lock:
+            _command_deadline = time.perf_counter() + config.WATCHDOG_COMMAND_TIMEOUT
+
+
+def end_commands():
+    """스트리밍 명령 종료 (명령 최신성 감시 해제)"""
+    global _command_deadline
+    with _lock:
+        _command_deadline = None
+
+
+def add_check(check):
+    """
+    추가 상태 검사 등록 (워치독 스레드에서 검사 주기마다 호출)
+
+    Args:
+        check: 정상이면 None, 문제가 있으면 이유 문자열을 반환하는 함수
+    """
+    _checks.append(check)
+
+
+def _run(check_interval):
+    global _deadline, _command_deadline
+    while True:
+        time.sleep(check_interval)
+        now = time.perf_counter()
+        reason = None
+
+        with _lock:
+            if _deadline is not None and now > _deadline:
+                lateness = now - _deadline
+                _stats['missed_deadlines'] += 1
+                _stats['max_lateness'] = max(_stats['max_lateness'], lateness)
+                _deadline = None
+                reason = f"제어 루프 응답 없음 (마감 {lateness * 1000:.1f}ms 초과)"
+            elif _command_deadline is not None and now > _command_deadline:
+                _stats['stale_commands'] += 1
+                _command_deadline = None
+                reason = "명령 수신 끊김"
+
+        for check in _checks:
+            failure = check()
+            if failure is None:
+                _failing.discard(check)
+            elif check not in _failing:
+                # 같은 문제가 계속되는 동안에는 한 번만 개입
+                _failing.add(check)
+                _stats['failed_checks'] += 1
+                reason = reason or failure
+
+        if reason is not None and config.WATCHDOG_ACTION != 'count' and _on_timeout is not None:
+            _stats['takeovers'] += 1
+            _on_timeout(reason)
+
+
+def stats():
+    """워치독 통계 (복사본)"""
+    with _lock:
+        return dict(_stats)
+
+
+def report():
+    s = stats()
+    slack = s['min_slack']
+    slack_text = f"{slack * 1000:.1f}ms" if slack is not None else "-"
+    print(f"워치독: 하트비트 {s['heartbeats']}회, 마감 초과 {s['missed_deadlines']}회 "
+          f"(최대 {s['max_lateness'] * 1000:.1f}ms), 명령 끊김 {s['stale_commands']}회, "
+          f"상태 검사 실패 {s['failed_checks']}회, "
+          f"개입 {s['takeovers']}회, 최소 여유 {slack_text}")